@@ -1,19 +1,133 @@
-from flask import Flask, request, jsonify, render_template, send_from_directory
+import time
+
+# Момент запуска процесса для измерения холодного старта
+PROCESS_STARTED_AT = time.perf_counter()
+
+from flask import Flask, request, jsonify, render_template, send_from_directory, g, Response, stream_with_context
 from flask_cors import CORS
 import os
-import pickle
-import pandas as pd
-import numpy as np
+import logging
+import threading
+import json
 from model import JobRoadmapGenerator
+from seeding import content_etag
+import metrics
 
 # Инициализация Flask приложения
 app = Flask(__name__, static_folder='static')
 # Включаем CORS для всех маршрутов
 CORS(app)
 
-# Загрузка или создание модели
-model_path = os.path.join(os.path.dirname(__file__), 'model', 'roadmap_model.pkl')
-roadmap_model = JobRoadmapGenerator(model_path)
+# Путь к модели; сама модель создается лениво, чтобы сервер начинал отвечать сразу после импорта
+model_path = os.path.join(os.path.dirname(__file__), 'model', 'roadmap_model')
+
+# Интервал повторной проверки LM Studio фоновой пробой (в секундах)
+READINESS_PROBE_INTERVAL = 30
+
+# Максимальное число профессий в одном пакетном запросе
+MAX_BATCH_SIZE = 500
+
+# SERVER_TIMING=1 добавляет к ответам заголовок Server-Timing с длительностями этапов
+SERVER_TIMING_ENABLED = os.environ.get('SERVER_TIMING', '0') == '1'
+
+_roadmap_model = None
+_roadmap_model_lock = threading.Lock()
+_warmup_started = False
+
+# Состояние запуска для /readyz
+startup_state = {
+    'model_loaded': False,
+    'llm_probed': False,
+    'llm_available': None,
+    'model_load_seconds': None,
+    'cold_start_seconds': None,
+    'error': None
+}
+
+
+def get_roadmap_model():
+    """Возвращает генератор дорожных карт, создавая его при первом обращении"""
+    global _roadmap_model
+    if _roadmap_model is None:
+        with _roadmap_model_lock:
+            if _roadmap_model is None:
+                started = time.perf_counter()
+                _roadmap_model = JobRoadmapGenerator(model_path)
+                startup_state['model_load_seconds'] = round(time.perf_counter() - started, 3)
+                startup_state['model_loaded'] = True
+    return _roadmap_model
+
+
+def _readiness_probe():
+    """Фоновая инициализация модели и периодическая проверка доступности LM Studio"""
+    try:
+        roadmap_model = get_roadmap_model()
+        llm = roadmap_model.get_local_llm()
+    except Exception as e:
+        startup_state['error'] = str(e)
+        logging.error(f"Ошибка при фоновой инициализации модели: {e}")
+        return
+    
+    while True:
+        startup_state['llm_available'] = llm.is_available()
+        if not startup_state['llm_probed']:
+            startup_state['llm_probed'] = True
+            startup_state['cold_start_seconds'] = round(time.perf_counter() - PROCESS_STARTED_AT, 3)
+            metrics.COLD_START_SECONDS.set(startup_state['cold_start_seconds'])
+            logging.info(f"Холодный старт завершен за {startup_state['cold_start_seconds']} с "
+                         f"(загрузка модели {startup_state['model_load_seconds']} с, "
+                         f"LM Studio {'доступен' if startup_state['llm_available'] else 'недоступен'})")
+        time.sleep(READINESS_PROBE_INTERVAL)
+
+
+def start_readiness_probe():
+    """Запускает фоновую пробу готовности (однократно)"""
+    global _warmup_started
+    if _warmup_started:
+        return
+    _warmup_started = True
+    threading.Thread(target=_readiness_probe, name='readiness-probe', daemon=True).start()
+
+
+# ROADMAP_WARMUP=0 отключает фоновый прогрев (например, при замере времени импорта)
+if os.environ.get('ROADMAP_WARMUP', '1') != '0':
+    start_readiness_probe()
+
+# Начало сбора длительностей этапов запроса
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    metrics.start_request_timings()
+
+# Учет длительности запроса и заголовок Server-Timing
+@app.after_request
+def record_request_metrics(response):
+    started = getattr(g, 'request_started', None)
+    if started is None:
+        return response
+    duration = time.perf_counter() - started
+    metrics.REQUEST_SECONDS.observe(duration, endpoint=request.endpoint or 'unknown', status=response.status_code)
+    if SERVER_TIMING_ENABLED:
+        timings = metrics.get_request_timings() + [('total', duration)]
+        response.headers['Server-Timing'] = metrics.server_timing_header(timings)
+    return response
+
+# Метрики в текстовом формате Prometheus
+@app.route('/metrics')
+def metrics_endpoint():
+    return Response(metrics.REGISTRY.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+# Проверка живости: процесс запущен и обрабатывает запросы
+@app.route('/healthz')
+def healthz():
+    return jsonify({'status': 'ok'})
+
+# Проверка готовности: модель загружена и выполнена первая проверка LM Studio
+@app.route('/readyz')
+def readyz():
+    ready = startup_state['model_loaded'] and startup_state['llm_probed']
+    payload = dict(startup_state, status='ready' if ready else 'starting')
+    return jsonify(payload), 200 if ready else 503
 
 # Маршрут для главной страницы
 @app.route('/')
@@ -25,12 +139,31 @@ def index():
 def faq():
     return render_template('faq.html')
 
+def json_with_etag(payload):
+    """
+    JSON-ответ со строгим ETag (хеш тела ответа)
+    
+    Ответы /api/analyze и /api/resources воспроизводимы для одного и того же запроса,
+    поэтому по тегу клиент может сравнить ответы. Ответ 304 на If-None-Match RFC 9110
+    определяет только для GET и HEAD, поэтому на POST тело возвращается всегда.
+    """
+    response = jsonify(payload)
+    etag = content_etag(response.get_data())
+    if request.method in ('GET', 'HEAD') and request.if_none_match.contains(etag):
+        response = Response(status=304)
+    response.set_etag(etag)
+    return response
+
 # Маршрут для статических файлов
 @app.route('/static/<path:path>')
 def serve_static(path):
     return send_from_directory('static', path)
 
 # API для анализа вакансии и региона
+# Обработчик синхронный: Flask (WSGI) выполняет async-обработчик в отдельном цикле событий,
+# создаваемом на каждый запрос, и все равно занимает поток воркера на время ожидания LLM.
+# Число одновременных генераций ограничено числом потоков WSGI-сервера; асинхронный
+# транспорт (JobRoadmapGenerator.agenerate_roadmap) обслуживает /api/roadmaps:batch
 @app.route('/api/analyze', methods=['POST'])
 def analyze():
     # Получаем данные из запроса
@@ -54,16 +187,57 @@ def analyze():
     
     try:
         # Получаем дорожную карту с помощью модели
-        result = roadmap_model.generate_roadmap(
-            profession, 
-            region=region,
-            user_info=combined_user_info
-        )
-        return jsonify(result)
+        with metrics.QUEUE_DEPTH.track_inprogress(endpoint='analyze'):
+            result = get_roadmap_model().generate_roadmap(
+                profession, 
+                region=region,
+                user_info=combined_user_info
+            )
+        with metrics.span('serialization'):
+            return json_with_etag(result)
     except Exception as e:
         print(f"Ошибка при генерации дорожной карты: {e}")
         return jsonify({'error': 'Произошла ошибка при анализе данных. Пожалуйста, попробуйте позже.'}), 500
 
+# Пакетная генерация дорожных карт (для HR-партнеров и B2B-интеграций)
+# Результаты отдаются в формате NDJSON по мере готовности, последняя строка - итог
+@app.route('/api/roadmaps:batch', methods=['POST'])
+def roadmaps_batch():
+    data = request.get_json(silent=True) or {}
+    items = data.get('items', [])
+    default_region = data.get('region', '')
+    
+    if not items or not isinstance(items, list):
+        return jsonify({'error': 'Необходимо указать список профессий в поле items'}), 400
+    
+    if len(items) > MAX_BATCH_SIZE:
+        return jsonify({'error': f'В одном запросе можно указать не более {MAX_BATCH_SIZE} профессий'}), 400
+    
+    # Элемент может быть строкой с профессией или объектом {profession, region, userInfo}
+    normalized_items = []
+    for item in items:
+        if isinstance(item, str):
+            item = {'profession': item}
+        if not isinstance(item, dict) or not str(item.get('profession', '')).strip():
+            return jsonify({'error': 'Каждый элемент должен содержать название профессии'}), 400
+        normalized_items.append({
+            'profession': str(item['profession']),
+            'region': str(item.get('region') or ''),
+            'userInfo': str(item.get('userInfo') or '')
+        })
+    
+    def generate():
+        completed = 0
+        errors = 0
+        for result in get_roadmap_model().generate_roadmaps_batch(normalized_items, default_region=default_region):
+            completed += 1
+            if result['status'] != 'ok':
+                errors += 1
+            yield json.dumps(result, ensure_ascii=False) + '\n'
+        yield json.dumps({'done': True, 'total': len(normalized_items), 'unique': completed, 'errors': errors}) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 # API для получения образовательных ресурсов
 @app.route('/api/resources', methods=['POST'])
 def get_resources():
@@ -80,8 +254,8 @@ def get_resources():
     
     try:
         # Используем модель для получения образовательных ресурсов
-        resources = roadmap_model.find_education_resources(profession, topics)
-        return jsonify(resources)
+        resources = get_roadmap_model().find_education_resources(profession, topics)
+        return json_with_etag(resources)
     except Exception as e:
         print(f"Ошибка при поиске образовательных ресурсов: {e}")
         return jsonify({'error': 'Произошла ошибка при поиске ресурсов. Пожалуйста, попробуйте позже.'}), 500
@@ -0,0 +1,92 @@
+"""
+Замер построения дорожной карты без LLM.
+
+Строит карты шаблонным движком (fallback.py) для набора профессий и
+регионов, проверяет, что в каждой карте заполнены все разделы, и измеряет
+время построения шаблонной части и полной карты (с зарплатами и
+образовательными ресурсами, как в ответе /api/analyze при недоступном
+LM Studio). Завершается с ненулевым кодом, если карта неполная или
+99-й перцентиль построения шаблонной части превышает --budget-ms.
+
+Запуск из корня репозитория:
+    python benchmarks/fallback.py
+    python benchmarks/fallback.py --requests 20000 --budget-ms 1
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from fallback import get_fallback_engine  # noqa: E402
+
+PROFESSIONS = [
+    'Python разработчик', 'Программисты', 'разработчица', 'Системный администратор', 'Программист 1С',
+    'Data Scientist', 'Аналитик данных', 'UI/UX дизайнер', 'Шеф-повар', 'Повар', 'Врач-терапевт',
+    'Главный бухгалтер', 'Маркетолог', 'Менеджер по продажам', 'Учитель', 'Юрист', 'Кладовщик', 'Космонавт',
+]
+REGIONS = ['Москва', 'Санкт-Петербург', 'Казань', 'Новосибирск', '', None]
+SECTIONS = ('hardSkills', 'softSkills', 'learningPlan', 'futureInsights')
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def timed_ms(function, requests):
+    durations = []
+    for profession, region in requests:
+        started = time.perf_counter()
+        function(profession, region)
+        durations.append((time.perf_counter() - started) * 1000)
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Построение дорожной карты без LLM')
+    parser.add_argument('--requests', type=int, default=5000, help='Количество запросов')
+    parser.add_argument('--budget-ms', type=float, default=1.0, help='Допустимый 99-й перцентиль, мс')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    requests = [(rng.choice(PROFESSIONS), rng.choice(REGIONS)) for _ in range(args.requests)]
+
+    started = time.perf_counter()
+    engine = get_fallback_engine()
+    print(f"Каталог и шаблоны загружены за {(time.perf_counter() - started) * 1000:.1f} мс")
+
+    incomplete = 0
+    for profession in PROFESSIONS:
+        roadmap = engine.render(profession, 'Москва')
+        missing = [section for section in SECTIONS if not roadmap.get(section)]
+        if missing:
+            incomplete += 1
+            print(f"Неполная карта для {profession!r}: нет разделов {', '.join(missing)}")
+
+    # Полная карта - как в ответе /api/analyze: шаблоны, зарплаты, ресурсы
+    from model import JobRoadmapGenerator
+    generator = JobRoadmapGenerator()
+    generator.get_default_roadmap(PROFESSIONS[0], region=REGIONS[0])
+
+    print(f"{'Этап':22} {'p50, мс':>9} {'p99, мс':>9}")
+    template = timed_ms(engine.render, requests)
+    full = timed_ms(lambda profession, region: generator.get_default_roadmap(profession, region=region), requests)
+    for title, durations in (('шаблонная часть', template), ('полная карта', full)):
+        print(f"{title:22} {percentile(durations, 0.5):9.3f} {percentile(durations, 0.99):9.3f}")
+
+    if incomplete:
+        print(f"Неполных карт: {incomplete}")
+        return 1
+    if percentile(template, 0.99) > args.budget_ms:
+        print(f"99-й перцентиль шаблонной части превышает {args.budget_ms} мс")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
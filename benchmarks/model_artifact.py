@@ -0,0 +1,99 @@
+"""
+Сравнение загрузки индекса навыков из pickle и из каталога модели (mmap).
+
+Строит индекс на синтетическом корпусе (см. benchmarks/skill_index.py),
+сохраняет его обоими способами во временный каталог и измеряет время
+загрузки и прирост памяти процесса (RSS) после загрузки.
+
+Запуск из корня репозитория:
+    python benchmarks/model_artifact.py
+    python benchmarks/model_artifact.py --vacancies 50000 --skills 20000
+"""
+import argparse
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import model_artifact  # noqa: E402
+from skill_index import SkillIndex  # noqa: E402
+
+
+def resident_kb():
+    """RSS процесса в КБ (Linux) или None"""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def timed(function):
+    before = resident_kb()
+    started = time.perf_counter()
+    result = function()
+    elapsed = (time.perf_counter() - started) * 1000
+    after = resident_kb()
+    return result, elapsed, (after - before) // 1024 if before is not None and after is not None else None
+
+
+def main():
+    import importlib.util
+
+    parser = argparse.ArgumentParser(description='Загрузка индекса навыков: pickle и mmap')
+    parser.add_argument('--vacancies', type=int, default=20000, help='Количество вакансий в корпусе')
+    parser.add_argument('--professions', type=int, default=300, help='Количество профессий')
+    parser.add_argument('--skills', type=int, default=5000, help='Размер словаря навыков')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    # Генератор корпуса из замера индекса навыков (модуль с тем же именем, что и skill_index.py)
+    spec = importlib.util.spec_from_file_location('skill_index_benchmark',
+                                                  os.path.join(os.path.dirname(__file__), 'skill_index.py'))
+    corpus = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(corpus)
+
+    vacancies, links = corpus.build_corpus(args.vacancies, args.professions, args.skills, args.seed)
+    index = SkillIndex.build(vacancies, links)
+    arrays, strings, metadata = index.to_artifact()
+
+    directory = tempfile.mkdtemp(prefix='roadmap_model_')
+    try:
+        pickle_path = os.path.join(directory, 'roadmap_model.pkl')
+        with open(pickle_path, 'wb') as f:
+            pickle.dump({'arrays': arrays, 'strings': strings, 'metadata': metadata}, f)
+        artifact_path = os.path.join(directory, 'roadmap_model')
+        model_artifact.save_artifact(artifact_path, arrays, strings, metadata)
+        del arrays, strings, index
+
+        def load_pickle():
+            with open(pickle_path, 'rb') as f:
+                data = pickle.load(f)
+            return SkillIndex.from_artifact(data['arrays'], data['strings'], data['metadata'])
+
+        def load_mmap():
+            metadata, arrays, strings = model_artifact.load_artifact(artifact_path)
+            return SkillIndex.from_artifact(arrays, strings, metadata)
+
+        print(f"Индекс: {args.vacancies} вакансий, размер pickle {os.path.getsize(pickle_path) // 1024} КБ")
+        print(f"{'Загрузка':10} {'время, мс':>10} {'RSS, МБ':>8}")
+        for title, function in (('mmap', load_mmap), ('pickle', load_pickle)):
+            loaded, elapsed, memory = timed(function)
+            loaded.profession_skills(next(iter(links)), 10)
+            print(f"{title:10} {elapsed:10.1f} {memory if memory is not None else '-':>8}")
+            del loaded
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+Замер построения региональных трендов (region_trends.py) на синтетических вакансиях.
+
+Генерирует вакансии по регионам дерева HH (data/hh_areas_seed.json и
+вложенные города) за --windows окон, строит таблицу и сверяет ее счетчики
+(вакансии, вакансии с навыком, зарплаты по регионам и окнам с учетом
+предков) с подсчетом в цикле по вакансиям. Затем измеряет поиск трендов для
+всех регионов дерева и проверяет, что тренды из сохраненной таблицы попадают
+в дорожную карту (поле regionTrends ответа /api/analyze). Завершается с
+ненулевым кодом при расхождении, если трендов нет в дорожной карте или если
+99-й перцентиль поиска превышает --budget-ms.
+
+Запуск из корня репозитория:
+    python benchmarks/region_trends.py
+    python benchmarks/region_trends.py --vacancies 200000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import model_artifact  # noqa: E402
+import region_trends  # noqa: E402
+from hh_areas import SEED_PATH, AreaIndex  # noqa: E402
+from region_trends import ALL_REGIONS, RegionTrends, vacancy_time  # noqa: E402
+from salary_stats import salary_value  # noqa: E402
+from skill_index import normalize_skill  # noqa: E402
+
+SKILLS = ['Python', 'SQL', 'Git', 'Docker', 'Kubernetes', 'Linux', 'JavaScript', 'React', 'Go', 'Java',
+          '1С', 'Excel', 'Power BI', 'Figma', 'Jira', 'PostgreSQL', 'Kafka', 'Airflow', 'Pandas', 'Английский язык']
+DAY = 24 * 3600
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def synthetic_vacancies(count, area_ids, windows, window_days, rng):
+    """Вакансии с растущим со временем спросом на Kubernetes и Go"""
+    now = datetime(2025, 6, 1, tzinfo=timezone.utc).timestamp()
+    vacancies = []
+    for number in range(count):
+        age = rng.random() * windows * window_days * DAY
+        recency = 1 - age / (windows * window_days * DAY)
+        skills = rng.sample(SKILLS, rng.randint(1, 6))
+        if rng.random() < 0.3 * recency:
+            skills += ['Kubernetes', 'Go']
+        salary = rng.choice([None, (80000, 150000), (120000, None), (None, 250000)])
+        published = datetime.fromtimestamp(now - age, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S+0000')
+        vacancies.append({
+            'id': str(number), 'area_id': rng.choice(area_ids), 'published_at': published,
+            'salary_from': salary[0] if salary else None, 'salary_to': salary[1] if salary else None,
+            'salary_currency': 'RUR' if salary else None, 'salary_gross': 0, 'skills': skills,
+            'fetched_at': now,
+        })
+    return vacancies
+
+
+def reference_counts(vacancies, parents, windows, window_days):
+    """Счетчики в цикле по вакансиям: {(регион, окно): вакансии}, {(регион, окно, навык): вакансии}, зарплаты"""
+    times = [vacancy_time(vacancy) for vacancy in vacancies]
+    reference = max(times)
+    demand, skill_counts, salary_sum = Counter(), Counter(), Counter()
+    for vacancy, moment in zip(vacancies, times):
+        window = windows - 1 - int((reference - moment) // (window_days * DAY))
+        if window < 0:
+            continue
+        regions = []
+        area_id = vacancy['area_id']
+        while area_id:
+            regions.append(area_id)
+            area_id = parents.get(area_id)
+        regions.append(ALL_REGIONS)
+        salary = salary_value(vacancy['salary_from'], vacancy['salary_to'], vacancy['salary_currency'],
+                              vacancy['salary_gross'], {'RUR': 1.0})
+        for region in regions:
+            demand[region, window] += 1
+            salary_sum[region, window] += salary or 0
+            for key in {normalize_skill(skill) for skill in vacancy['skills']}:
+                skill_counts[region, window, key] += 1
+    return demand, skill_counts, salary_sum
+
+
+def compare(table, demand, skill_counts, salary_sum):
+    mismatches = 0
+    columns = {normalize_skill(skill): column for column, skill in enumerate(table.skills)}
+    counts = table.skill_counts.toarray()
+    for row, region in enumerate(table.regions):
+        for window in range(table.windows):
+            if int(table.demand[row, window]) != demand[region, window]:
+                mismatches += 1
+            if abs(float(table.salary_sum[row, window]) - salary_sum[region, window]) > 1e-3 * max(1, salary_sum[region, window]):
+                mismatches += 1
+            for key, column in columns.items():
+                if int(counts[row * table.windows + window, column]) != skill_counts[region, window, key]:
+                    mismatches += 1
+    return mismatches
+
+
+def roadmap_trends(table, region):
+    """Тренды региона в дорожной карте, построенной по сохраненной таблице трендов"""
+    from model import JobRoadmapGenerator
+    with tempfile.TemporaryDirectory() as directory:
+        region_trends.TRENDS_PATH = os.path.join(directory, 'region_trends')
+        model_artifact.save_artifact(region_trends.TRENDS_PATH, *table.to_artifact())
+        region_trends._trends_checked_at = 0
+        roadmap = JobRoadmapGenerator().get_default_roadmap('Python разработчик', region=region)
+    return roadmap.get('regionTrends')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Построение региональных трендов')
+    parser.add_argument('--vacancies', type=int, default=50000, help='Количество синтетических вакансий')
+    parser.add_argument('--windows', type=int, default=6)
+    parser.add_argument('--window-days', type=int, default=30)
+    parser.add_argument('--budget-ms', type=float, default=1.0, help='Допустимый 99-й перцентиль поиска, мс')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with open(SEED_PATH, 'r', encoding='utf-8') as f:
+        areas_tree = json.load(f)
+    # Города внутри регионов дерева: вакансии учитываются и в городе, и в регионе
+    for country in areas_tree:
+        for number, region in enumerate(country.get('areas') or []):
+            region['areas'] = [{'id': f"{region['id']}0{city}", 'parent_id': region['id'],
+                                'name': f"{region['name']} {city}", 'areas': []} for city in range(number % 3)]
+    area_index = AreaIndex(areas_tree)
+    parents = {area_id: parent for area_id, parent in area_index.parents.items()}
+    vacancies = synthetic_vacancies(args.vacancies, list(parents), args.windows, args.window_days, rng)
+
+    started = time.perf_counter()
+    table = RegionTrends.build(vacancies, parents, rates={'RUR': 1.0}, windows=args.windows,
+                               window_days=args.window_days)
+    print(f"Таблица построена за {(time.perf_counter() - started) * 1000:.0f} мс: "
+          f"{table.metadata['vacancies']} вакансий, {len(table.regions)} регионов, {len(table.skills)} навыков")
+
+    mismatches = compare(table, *reference_counts(vacancies, parents, args.windows, args.window_days))
+
+    started = time.perf_counter()
+    covered = table.cover(parents)
+    print(f"Регионов HH с трендами: {covered} из {len(parents)} ({(time.perf_counter() - started) * 1000:.1f} мс)")
+
+    durations = []
+    for area_id in list(parents) * 20:
+        started = time.perf_counter()
+        table.trends(area_id, parents)
+        durations.append((time.perf_counter() - started) * 1000)
+    print(f"Поиск трендов: p50 {percentile(durations, 0.5):.3f} мс, p99 {percentile(durations, 0.99):.3f} мс")
+    print('\n'.join(table.trends('1', parents)))
+
+    expected = table.trends('1', parents)
+    in_roadmap = roadmap_trends(table, 'Москва')
+    print(f"Тренды в дорожной карте: {'совпадают с таблицей' if in_roadmap == expected else in_roadmap}")
+
+    if mismatches:
+        print(f"Расхождений со счетом в цикле: {mismatches}")
+        return 1
+    if in_roadmap != expected:
+        print("В дорожной карте нет трендов из таблицы")
+        return 1
+    if covered != len(parents):
+        print("Не для всех регионов найдены тренды")
+        return 1
+    if percentile(durations, 0.99) > args.budget_ms:
+        print(f"99-й перцентиль поиска превышает {args.budget_ms} мс")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Проверка семантического кеша карьерных планов (semantic_cache.py).
+
+Для каждой пары запросов в пустой кеш сохраняется план первого запроса и
+ищется план второго. Близкие, но разные профессии (python и java
+разработчик, junior и senior, бухгалтер и главный бухгалтер, тот же запрос
+в другом регионе) не должны получать чужой план; для перефразированных
+запросов выводится доля попаданий. Затем кеш заполняется запросами из
+множества регионов, и проверяется, что число групп (регион и уровень) не
+превышает числа записей, а также измеряется время поиска в полном кеше.
+Завершается с ненулевым кодом, если близкая профессия получила чужой план
+или групп больше, чем записей.
+
+По умолчанию используются детерминированные эмбеддинги по триграммам;
+порог для модели LM Studio проверяется с --backend lmstudio.
+
+Запуск из корня репозитория:
+    python benchmarks/semantic_cache.py
+    python benchmarks/semantic_cache.py --backend lmstudio
+"""
+import argparse
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from embeddings import create_embedder  # noqa: E402
+from semantic_cache import SEMANTIC_CACHE_THRESHOLD, SemanticCache  # noqa: E402
+
+# (сохраненный запрос, регион), (новый запрос, регион): разные планы
+NEAR_MISSES = [
+    (('Python разработчик', 'Москва'), ('Java разработчик', 'Москва')),
+    (('python developer', 'Москва'), ('java developer', 'Москва')),
+    (('Frontend разработчик', 'Москва'), ('Backend разработчик', 'Москва')),
+    (('Go разработчик', 'Москва'), ('Rust разработчик', 'Москва')),
+    (('C++ разработчик', 'Москва'), ('C# разработчик', 'Москва')),
+    (('Junior Python разработчик', 'Москва'), ('Senior Python разработчик', 'Москва')),
+    (('Junior аналитик данных', 'Казань'), ('Senior аналитик данных', 'Казань')),
+    (('Python разработчик', 'Москва'), ('Senior Python разработчик', 'Москва')),
+    (('Бухгалтер', 'Москва'), ('Главный бухгалтер', 'Москва')),
+    (('Врач-терапевт', 'Москва'), ('Врач-хирург', 'Москва')),
+    (('Разработчик на Python', 'Москва'), ('Разработчик на Java', 'Москва')),
+    (('Тестировщик мобильных приложений', 'Москва'), ('Тестировщик веб-приложений', 'Москва')),
+    (('Python разработчик', 'Москва'), ('Python разработчик', 'Казань')),
+]
+
+# Перефразированные запросы: желательно один план
+PARAPHRASES = [
+    (('Python разработчик', 'Москва'), ('Программист Python', 'Москва')),
+    (('Python разработчик', 'Москва'), ('python dev', 'москва')),
+    (('Junior Python разработчик', 'Москва'), ('Младший python-разработчик', 'Москва')),
+    (('Инженер-робототехник', 'Москва'), ('инженер робототехник', 'Москва')),
+    (('Python разработчик', 'Москва'), ('Разработчик на Python', 'Москва')),
+    (('Аналитик данных', 'Казань'), ('Data analyst', 'Казань')),
+]
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def shared_plan(embedder, stored, query):
+    cache = SemanticCache(embedder, max_entries=16)
+    cache.put(*stored, {'stored': stored})
+    return cache.get(*query)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Семантический кеш карьерных планов')
+    parser.add_argument('--backend', default='hashing', help='Модель эмбеддингов: hashing или lmstudio')
+    parser.add_argument('--api-base', default='http://127.0.0.1:1234/v1', help='Адрес API LM Studio')
+    parser.add_argument('--entries', type=int, default=2048, help='Размер кеша для замера поиска')
+    args = parser.parse_args()
+
+    embedder = create_embedder(args.api_base, backend=args.backend)
+    print(f"Порог сходства: {SEMANTIC_CACHE_THRESHOLD}")
+
+    failures = 0
+    for stored, query in NEAR_MISSES:
+        hit = shared_plan(embedder, stored, query)
+        if hit is not None:
+            failures += 1
+            print(f"Чужой план: {query} получил план {stored} (сходство {hit.similarity:.3f})")
+
+    hits = 0
+    for stored, query in PARAPHRASES:
+        hit = shared_plan(embedder, stored, query)
+        hits += hit is not None
+        print(f"{'попадание' if hit else 'промах':10} {query[0]!r} -> {stored[0]!r}"
+              + (f" ({hit.similarity:.3f})" if hit else ''))
+    print(f"Близких профессий с чужим планом: {failures} из {len(NEAR_MISSES)}, "
+          f"попаданий перефразированных запросов: {hits} из {len(PARAPHRASES)}")
+
+    # Регионы приходят от пользователей: группы вытесненных записей должны освобождаться
+    cache = SemanticCache(embedder, max_entries=args.entries)
+    professions = [stored[0] for stored, _ in NEAR_MISSES + PARAPHRASES]
+    for number in range(args.entries * 3):
+        cache.put(professions[number % len(professions)], f"регион {number}", {'number': number})
+    groups = len(cache._group_ids)
+    print(f"Записей: {len(cache)}, групп: {groups}")
+    if groups > len(cache):
+        failures += 1
+        print("Групп больше, чем записей: номера групп вытесненных записей не освобождаются")
+
+    durations = []
+    for number in range(2000):
+        started = time.perf_counter()
+        cache.get(professions[number % len(professions)], f"регион {args.entries * 3 - 1 - number}")
+        durations.append((time.perf_counter() - started) * 1000)
+    print(f"Поиск в полном кеше: p50 {percentile(durations, 0.5):.3f} мс, p99 {percentile(durations, 0.99):.3f} мс")
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,184 @@
+"""
+Замер извлечения навыков на сохраненных страницах вакансий HH.ru.
+
+Сравнивает SkillExtractor (паттерны скомпилированы заранее, один проход триггера)
+с исходной реализацией (отдельный re.finditer на каждый паттерн и медицинский термин)
+на страницах из benchmarks/fixtures и проверяет, что результаты совпадают.
+Завершается с ненулевым кодом при расхождении.
+
+Запуск из корня репозитория:
+    python benchmarks/skill_extraction.py
+    python benchmarks/skill_extraction.py --scale 20 --repeat 50
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(REPO_ROOT, 'benchmarks', 'fixtures')
+sys.path.insert(0, REPO_ROOT)
+
+from model import vacancy_page_texts  # noqa: E402
+from skill_extraction import skill_extractor  # noqa: E402
+
+
+def reference_extract(all_text, list_items=(), full_text='', key_skills=()):
+    """Исходная реализация извлечения навыков (эталон для сравнения)"""
+    # Паттерны для поиска навыков (расширенный список)
+    skill_patterns = [
+        # Стандартные паттерны
+        r'знание\s+([^;,.]+)',
+        r'опыт\s+работы\s+с\s+([^;,.]+)',
+        r'опыт\s+([^;,.]+)',
+        r'навыки\s+([^;,.]+)',
+        r'умение\s+([^;,.]+)',
+        r'владение\s+([^;,.]+)',
+        
+        # Добавляем паттерны для медицинских специальностей
+        r'диагностика\s+([^;,.]+)',
+        r'лечение\s+([^;,.]+)',
+        r'опыт\s+проведения\s+([^;,.]+)',
+        r'методы\s+([^;,.]+)',
+        r'работа\s+с\s+([^;,.]+аппарат[^;,.]+)',
+        r'работа\s+с\s+([^;,.]+оборудован[^;,.]+)',
+        r'профилактика\s+([^;,.]+)',
+        r'([^;,.]+)\s+обследовани[^;,.]+',
+        r'([^;,.]+)\s+манипуляци[^;,.]+',
+        r'([^;,.]+)\s+терапи[^;,.]+',
+        r'([^;,.]+)\s+хирурги[^;,.]+',
+        
+        # Паттерны для списков навыков
+        r'•\s+([^;•]+)',
+        r'‣\s+([^;‣]+)',
+        r'-\s+([^;-]+)',
+        r'◦\s+([^;◦]+)',
+        r'✓\s+([^;✓]+)'
+    ]
+    
+    # Поиск медицинских терминов и процедур
+    medical_terms = [
+        'диагностика', 'терапия', 'хирургия', 'манипуляция', 
+        'анализ', 'исследование', 'протокол', 'стандарт', 
+        'узи', 'кт', 'мрт', 'экг', 'рентген', 
+        'эндоскопия', 'лапароскопия', 'биопсия',
+        'реабилитация', 'профилактика', 'консультирование',
+        'операция', 'лечение', 'обследование'
+    ]
+    
+    # Извлекаем навыки с использованием регулярных выражений
+    skills = []
+    
+    # Поиск по паттернам
+    for pattern in skill_patterns:
+        matches = re.finditer(pattern, all_text, re.IGNORECASE)
+        for match in matches:
+            skill = match.group(1).strip()
+            # Проверяем длину навыка (слишком короткие или длинные исключаем)
+            if 3 < len(skill) < 100:
+                skills.append(skill)
+    
+    # Пункты HTML списков с навыками
+    for item_text in list_items:
+        item_text = item_text.strip()
+        # Проверяем длину и осмысленность текста
+        if 3 < len(item_text) < 100:
+            skills.append(item_text)
+    
+    # Дополнительный поиск медицинских терминов во всём тексте страницы
+    for term in medical_terms:
+        # Ищем в контексте фразы, содержащие медицинские термины
+        for match in re.finditer(r'[^.;:,]{0,50}' + term + r'[^.;:,]{0,100}', full_text, re.IGNORECASE):
+            context = match.group(0).strip()
+            # Проверяем длину контекста
+            if 10 < len(context) < 150:
+                skills.append(context)
+    
+    # Нормализуем и чистим список навыков
+    normalized_skills = []
+    for skill in skills:
+        # Очищаем от мусора
+        skill = re.sub(r'^\s*[-•‣◦✓]\s*', '', skill)
+        skill = skill.strip(',.;: ')
+        
+        # Проверяем минимальную длину и наличие осмысленных символов
+        if len(skill) > 3 and re.search(r'[а-яА-Яa-zA-Z]', skill):
+            normalized_skills.append(skill)
+    
+    # Навыки, указанные работодателем, добавляем без фильтра по длине (SQL, Git, 1С)
+    normalized_skills.extend(skill.strip() for skill in key_skills if skill and skill.strip())
+    
+    # Удаляем дубликаты и сортируем
+    unique_skills = list(set(normalized_skills))
+    unique_skills.sort()
+    
+    return unique_skills
+
+
+def best_time(function, args, repeat):
+    """Лучшее время выполнения function(*args) из repeat запусков, в миллисекундах"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(*args)
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def scale_page(html, scale):
+    """Увеличивает страницу, повторяя описание вакансии scale раз (модель длинных страниц HH)"""
+    if scale <= 1:
+        return html
+    start = html.find('<div data-qa="vacancy-description">')
+    end = html.find('</div></div>', start)
+    if start == -1 or end == -1:
+        return html
+    inner_start = start + len('<div data-qa="vacancy-description">')
+    return html[:inner_start] + html[inner_start:end] * scale + html[end:]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Замер извлечения навыков из страниц вакансий')
+    parser.add_argument('--repeat', type=int, default=20, help='Количество запусков для каждого замера')
+    parser.add_argument('--scale', type=int, default=1, help='Во сколько раз увеличить описание вакансий')
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(FIXTURES_DIR, 'hh_vacancy_*.html')))
+    if not paths:
+        print(f"Нет страниц вакансий в {FIXTURES_DIR}")
+        return 1
+
+    failed = False
+    total_reference = total_engine = 0.0
+    print(f"{'Страница':32} {'размер':>8} {'навыков':>8} {'эталон, мс':>11} {'движок, мс':>11} {'ускорение':>10}")
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            html = scale_page(f.read(), args.scale)
+        texts = vacancy_page_texts(html)
+
+        expected = reference_extract(*texts)
+        actual = skill_extractor.extract(*texts)
+        if expected != actual:
+            failed = True
+            missing = sorted(set(expected) - set(actual))
+            extra = sorted(set(actual) - set(expected))
+            print(f"ОШИБКА: результаты различаются для {os.path.basename(path)}: "
+                  f"нет {missing[:5]}, лишние {extra[:5]}")
+
+        reference_ms = best_time(reference_extract, texts, args.repeat)
+        engine_ms = best_time(skill_extractor.extract, texts, args.repeat)
+        total_reference += reference_ms
+        total_engine += engine_ms
+        print(f"{os.path.basename(path):32} {len(html):8} {len(actual):8} {reference_ms:11.2f} {engine_ms:11.2f} "
+              f"{reference_ms / engine_ms:9.1f}x")
+
+    print(f"{'Итого':32} {'':8} {'':8} {total_reference:11.2f} {total_engine:11.2f} "
+          f"{total_reference / total_engine:9.1f}x")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
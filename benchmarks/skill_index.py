@@ -0,0 +1,132 @@
+"""
+Замер времени запросов к TF-IDF индексу навыков.
+
+Строит индекс на синтетическом корпусе вакансий (--vacancies вакансий,
+--professions профессий, у каждой профессии свой набор частых навыков) и
+измеряет запросы "профессия -> навыки" (известная профессия и профессия,
+найденная по названию вакансий), "навык -> связанные навыки" и "что изучать
+дальше" (по приросту покрытия вакансий), а также пропускную способность
+пакетного ранжирования следующих навыков.
+Завершается с кодом 1, если 95-й перцентиль любого запроса превышает --budget-ms.
+
+Запуск из корня репозитория:
+    python benchmarks/skill_index.py
+    python benchmarks/skill_index.py --vacancies 50000 --skills 20000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from skill_index import SkillIndex  # noqa: E402
+
+TITLE_WORDS = ['разработчик', 'аналитик', 'инженер', 'менеджер', 'дизайнер', 'бухгалтер', 'врач', 'юрист',
+               'специалист', 'консультант', 'тестировщик', 'администратор']
+LEVELS = ['младший', 'старший', 'ведущий', 'главный', '']
+
+
+def build_corpus(vacancy_count, profession_count, skill_count, seed):
+    """Синтетические вакансии: навыки профессии плюс случайные навыки из общего словаря"""
+    rng = random.Random(seed)
+    skills = [f"Навык {number}" for number in range(skill_count)]
+    professions = {}
+    for number in range(profession_count):
+        title = f"{rng.choice(TITLE_WORDS)} {number}"
+        professions[title] = rng.sample(skills, 40)
+
+    vacancies = []
+    links = {}
+    titles = list(professions)
+    for number in range(vacancy_count):
+        title = rng.choice(titles)
+        vacancy_skills = rng.sample(professions[title], rng.randint(5, 15)) + rng.sample(skills, rng.randint(0, 5))
+        vacancies.append({
+            'id': str(number),
+            'name': f"{rng.choice(LEVELS)} {title}".strip(),
+            'skills': vacancy_skills
+        })
+        links.setdefault(title, []).append(str(number))
+    return vacancies, links
+
+
+def known_lists(index, rng, count):
+    """Случайные наборы известных пользователю навыков (от 0 до 8 навыков)"""
+    return [rng.sample(range(index.skill_count), rng.randint(0, 8)) for _ in range(count)]
+
+
+def measure(function, queries):
+    """Время каждого запроса в миллисекундах"""
+    timings = []
+    for query in queries:
+        started = time.perf_counter()
+        function(query)
+        timings.append((time.perf_counter() - started) * 1000)
+    return sorted(timings)
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Замер запросов к индексу навыков')
+    parser.add_argument('--vacancies', type=int, default=20000, help='Количество вакансий в корпусе')
+    parser.add_argument('--professions', type=int, default=300, help='Количество профессий')
+    parser.add_argument('--skills', type=int, default=5000, help='Размер словаря навыков')
+    parser.add_argument('--queries', type=int, default=500, help='Количество запросов каждого вида')
+    parser.add_argument('--batch', type=int, default=2000, help='Количество пользователей в пакетном ранжировании')
+    parser.add_argument('--budget-ms', type=float, default=5.0, help='Допустимый 95-й перцентиль запроса')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    vacancies, links = build_corpus(args.vacancies, args.professions, args.skills, args.seed)
+    started = time.perf_counter()
+    index = SkillIndex.build(vacancies, links)
+    print(f"Индекс: {index.vacancy_count} вакансий, {index.skill_count} навыков, {len(index.professions)} профессий, "
+          f"построен за {time.perf_counter() - started:.2f} с")
+
+    rng = random.Random(args.seed)
+    professions = list(links)
+    cases = [
+        ('профессия -> навыки', lambda query: index.profession_skills(query, 10),
+         [rng.choice(professions) for _ in range(args.queries)]),
+        ('название -> навыки', lambda query: index.profession_skills(query, 10),
+         [f"{rng.choice(LEVELS)} {rng.choice(professions)} удаленно" for _ in range(args.queries)]),
+        ('навык -> связанные', lambda query: index.related_skills(query, 10),
+         [rng.choice(index.skill_names) for _ in range(args.queries)]),
+        ('следующий навык', lambda query: index.next_skills(query[1], query[0], 1),
+         [(rng.choice(professions), known) for known in known_lists(index, rng, args.queries)]),
+        ('план из 5 навыков', lambda query: index.next_skills(query[1], query[0], 5),
+         [(rng.choice(professions), known) for known in known_lists(index, rng, args.queries)]),
+    ]
+
+    failed = False
+    print(f"{'Запрос':22} {'p50, мс':>8} {'p95, мс':>8} {'макс, мс':>9}")
+    for title, function, queries in cases:
+        function(queries[0])
+        timings = measure(function, queries)
+        p95 = percentile(timings, 0.95)
+        failed = failed or p95 > args.budget_ms
+        print(f"{title:22} {percentile(timings, 0.5):8.3f} {p95:8.3f} {timings[-1]:9.3f}")
+
+    batch = known_lists(index, rng, args.batch)
+    profession = rng.choice(professions)
+    rows, weights = index.vacancy_subset(profession)
+    started = time.perf_counter()
+    index.cooccurrence.rank_batch(batch, rows, weights, 5, key=profession)
+    elapsed = time.perf_counter() - started
+    print(f"Пакетное ранжирование: {len(batch)} пользователей за {elapsed * 1000:.1f} мс "
+          f"({len(batch) / elapsed:.0f} запросов/с)")
+
+    if failed:
+        print(f"95-й перцентиль превышает {args.budget_ms} мс")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Замер времени импорта приложения через `python -X importtime`.
+
+Скрипт импортирует `app` в отдельном процессе (с отключенным фоновым прогревом),
+разбирает вывод importtime и завершается с ненулевым кодом, если:
+- суммарное время импорта превышает бюджет;
+- при импорте подгрузились тяжелые зависимости, которые должны загружаться лениво.
+
+Запуск из корня репозитория:
+    python benchmarks/startup_importtime.py
+    python benchmarks/startup_importtime.py --budget-ms 600 --top 20
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Модули, которые не должны импортироваться при запуске сервера
+LAZY_MODULES = ['pandas', 'numpy', 'sklearn', 'scipy', 'bs4', 'aiohttp']
+
+# Бюджет на импорт `app` по умолчанию (в миллисекундах)
+DEFAULT_BUDGET_MS = 800
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def measure_import(module='app', runs=3):
+    """
+    Импортирует модуль в отдельных процессах и возвращает лучший замер
+
+    Args:
+        module (str): Имя импортируемого модуля
+        runs (int): Количество запусков (берется минимальное время)
+
+    Returns:
+        tuple: (время импорта модуля в мкс, словарь {модуль: суммарное время в мкс})
+    """
+    env = dict(os.environ, ROADMAP_WARMUP='0')
+    best_total = None
+    best_modules = {}
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            cwd=REPO_ROOT, env=env, capture_output=True, text=True
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(f"Не удалось импортировать {module}:\n{completed.stderr[-2000:]}")
+
+        modules = {}
+        total = None
+        for line in completed.stderr.splitlines():
+            match = IMPORTTIME_LINE.match(line)
+            if not match:
+                continue
+            cumulative = int(match.group(2))
+            name = match.group(4)
+            modules[name] = cumulative
+            if name == module:
+                total = cumulative
+
+        if total is not None and (best_total is None or total < best_total):
+            best_total = total
+            best_modules = modules
+
+    return best_total, best_modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Замер времени импорта приложения')
+    parser.add_argument('--module', default='app', help='Импортируемый модуль')
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS, help='Допустимое время импорта, мс')
+    parser.add_argument('--runs', type=int, default=3, help='Количество запусков')
+    parser.add_argument('--top', type=int, default=15, help='Сколько самых медленных модулей показать')
+    args = parser.parse_args()
+
+    total_us, modules = measure_import(args.module, args.runs)
+    if total_us is None:
+        print(f"В выводе importtime нет модуля {args.module}")
+        return 1
+
+    print(f"Импорт {args.module}: {total_us / 1000:.1f} мс (бюджет {args.budget_ms:.0f} мс)")
+    print("Самые медленные модули (суммарное время):")
+    for name, cumulative in sorted(modules.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {cumulative / 1000:8.1f} мс  {name}")
+
+    failed = False
+    eager = sorted({name.split('.')[0] for name in modules} & set(LAZY_MODULES))
+    if eager:
+        print(f"ОШИБКА: при запуске импортируются тяжелые зависимости: {', '.join(eager)}")
+        failed = True
+    if total_us / 1000 > args.budget_ms:
+        print(f"ОШИБКА: время импорта превышает бюджет {args.budget_ms:.0f} мс")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
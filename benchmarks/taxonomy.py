@@ -0,0 +1,183 @@
+"""
+Замер классификации названий профессий по ключевым словам.
+
+Сравнивает классификаторы из taxonomy.py (один автомат Ахо-Корасик на
+классификатор, data/taxonomy.json) с исходными цепочками проверок
+"keyword in profession" (тип профессии, категория плана обучения и категория
+образовательных ресурсов) на наборе названий и проверяет, что категории
+совпадают. Завершается с ненулевым кодом при расхождении.
+
+Запуск из корня репозитория:
+    python benchmarks/taxonomy.py
+    python benchmarks/taxonomy.py --titles 20000 --repeat 5
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from taxonomy import Taxonomy  # noqa: E402
+
+TITLES = [
+    'Python разработчик', 'Старший frontend-разработчик', 'Системный администратор Linux', 'Программист 1С',
+    'Data Scientist', 'Аналитик данных', 'Бизнес-аналитик', 'Врач-терапевт', 'Медсестра процедурной',
+    'Главный бухгалтер', 'Финансовый аналитик', 'SMM-менеджер', 'Интернет-маркетолог', 'UI/UX дизайнер',
+    'Графический дизайнер', 'Менеджер по продажам', 'Продавец-консультант', 'Учитель математики',
+    'Юрист по корпоративному праву', 'Инженер-конструктор', 'DevOps инженер', 'QA Engineer',
+    'Руководитель отдела маркетинга', 'Водитель погрузчика', 'Повар', 'Оператор call-центра', 'Кладовщик',
+]
+MODIFIERS = ['', 'младший ', 'старший ', 'ведущий ', 'junior ', 'senior ', 'удаленно ']
+
+
+def reference_profession_type(profession):
+    """Исходная реализация JobRoadmapGenerator.find_profession_type (эталон для сравнения) с каноническими названиями"""
+    # Преобразуем название профессии в нижний регистр для сравнения
+    profession_lower = profession.lower()
+    
+    # Словарь типов профессий с ключевыми словами. Классификация идет по каноническому названию
+    # (canonicalizer.py), поэтому добавлены канонические "администратор баз данных" и "hr-специалист":
+    # без них DBA относился бы к менеджменту, а HR-менеджер - к "другое"
+    profession_keywords = {
+        'IT': ['программист', 'разработчик', 'devops', 'frontend', 'backend', 'верстальщик', 
+               'тестировщик', 'qa', 'data scientist', 'аналитик данных', 'системный администратор', 
+               'администратор баз данных', 'cto', 'инженер', 'web', 'mobile', 'javascript', 'python', 'java', 'c++', 'c#', 
+               'php', 'android', 'ios', 'fullstack', 'ai', 'ml', 'devsecops', 'ui/ux'],
+               
+        'финансы': ['бухгалтер', 'финансист', 'финансовый', 'аудитор', 'экономист', 
+                    'банкир', 'трейдер', 'инвестиционный', 'казначей', 'кредитный', 'финансовый аналитик'],
+                    
+        'медицина': ['врач', 'медсестра', 'фармацевт', 'терапевт', 'хирург', 'стоматолог', 'педиатр', 
+                     'психолог', 'психиатр', 'невролог', 'фельдшер', 'кардиолог', 'онколог', 'ветеринар'],
+                     
+        'маркетинг': ['маркетолог', 'smm', 'seo', 'медиа', 'pr', 'контекстолог', 'копирайтер', 
+                      'таргетолог', 'бренд', 'продвижение', 'реклама', 'маркетинговый'],
+                      
+        'менеджмент': ['менеджер', 'руководитель', 'директор', 'управляющий', 'заведующий', 
+                       'администратор', 'супервайзер', 'координатор', 'ceo', 'coo', 'проджект-менеджер', 'hr-специалист'],
+                       
+        'продажи': ['продавец', 'sales', 'менеджер по продажам', 'торговый', 'консультант', 
+                    'агент по продажам', 'представитель', 'кассир', 'merchandiser', 'продающий'],
+                    
+        'дизайн': ['дизайнер', 'художник', 'иллюстратор', 'графический', 'промышленный дизайн', 
+                  'ui', 'ux', 'веб-дизайнер', 'motion', 'анимация', 'фотограф', 'креативный'],
+                  
+        'образование': ['учитель', 'преподаватель', 'педагог', 'воспитатель', 'тренер', 
+                       'репетитор', 'методист', 'куратор', 'наставник', 'лектор', 'инструктор'],
+                       
+        'юриспруденция': ['юрист', 'адвокат', 'нотариус', 'прокурор', 'судья', 'юрисконсульт', 
+                         'юридический', 'compliance', 'legal', 'арбитраж', 'правовой']
+    }
+    
+    # Ищем совпадения с ключевыми словами по типам профессий
+    for prof_type, keywords in profession_keywords.items():
+        for keyword in keywords:
+            if keyword in profession_lower:
+                return prof_type
+    
+    # По умолчанию возвращаем "другое"
+    return "другое"
+
+
+def reference_learning_plan(profession):
+    """Исходный выбор категории в LocalLLM._get_default_learning_plan"""
+    profession_lower = profession.lower()
+    profession_category = "общая"
+    
+    if any(keyword in profession_lower for keyword in ["админ", "сисадмин", "администратор", "devops"]):
+        profession_category = "системный_администратор"
+    elif any(keyword in profession_lower for keyword in ["разработчик", "программист", "developer", "coder"]):
+        profession_category = "разработчик"
+    elif any(keyword in profession_lower for keyword in ["дизайн", "designer", "ui", "ux"]):
+        profession_category = "дизайнер"
+    elif any(keyword in profession_lower for keyword in ["аналитик", "analyst", "data", "данные"]):
+        profession_category = "аналитик"
+    elif any(keyword in profession_lower for keyword in ["маркетолог", "smm", "маркетинг", "marketing"]):
+        profession_category = "маркетолог"
+    elif any(keyword in profession_lower for keyword in ["врач", "медик", "доктор", "medical"]):
+        profession_category = "медицина"
+    
+    return profession_category
+
+
+def reference_resource_profession(profession):
+    """Исходный выбор категории профессии в JobRoadmapGenerator.find_education_resources (с ключевым словом "маркетолог")"""
+    profession_lower = profession.lower()
+
+    # Выбираем базовую категорию профессии
+    profession_category = None
+    if any(x in profession_lower for x in ["админ", "сисадмин", "system admin", "network", "системный администратор"]):
+        profession_category = "системный администратор"
+    elif any(x in profession_lower for x in ["1с", "1c", "предприятие"]):
+        profession_category = "программист 1с"
+    elif any(x in profession_lower for x in ["web", "веб", "frontend", "backend", "фронтенд", "бэкенд", "разработчик", "программист", "developer"]):
+        profession_category = "веб-разработчик"
+    elif any(x in profession_lower for x in ["data", "данные", "аналитик", "scientist", "ml", "машинное обучение", "статистика", "статистик"]):
+        profession_category = "data scientist"
+    elif any(x in profession_lower for x in ["дизайн", "designer", "ui", "ux", "интерфейс", "графика", "web design", "product design"]):
+        profession_category = "дизайнер"
+    # "маркетолог" добавлен намеренно: каноническое название профессии "маркетолог" не содержит
+    # слова "маркетинг", и исходная проверка оставляла маркетологов без ресурсов
+    elif any(x in profession_lower for x in ["маркетинг", "маркетолог", "marketing", "smm", "контент", "реклама", "promotion", "pr", "public relations"]):
+        profession_category = "маркетолог"
+    elif any(x in profession_lower for x in ["аналитик", "analyst", "analytics", "bi", "business intelligence", "аналитика"]):
+        profession_category = "аналитик"
+    
+    return profession_category
+
+
+REFERENCES = {
+    'profession_type': reference_profession_type,
+    'learning_plan': reference_learning_plan,
+    'resource_profession': reference_resource_profession,
+}
+
+
+def measure(function, titles, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for title in titles:
+            function(title)
+    return (time.perf_counter() - started) / (repeat * len(titles)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Замер классификации профессий по ключевым словам')
+    parser.add_argument('--titles', type=int, default=5000, help='Количество названий профессий')
+    parser.add_argument('--repeat', type=int, default=3, help='Количество повторов')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    # Разные названия - для замера без кеша; повторяющиеся - для замера с lru_cache классификатора
+    titles = [f"{rng.choice(MODIFIERS)}{rng.choice(TITLES)} {number}" for number in range(args.titles)]
+    repeated = [f"{rng.choice(MODIFIERS)}{rng.choice(TITLES)}" for _ in range(args.titles)]
+
+    started = time.perf_counter()
+    taxonomy = Taxonomy.load()
+    print(f"Таксономия загружена и скомпилирована за {(time.perf_counter() - started) * 1000:.1f} мс")
+
+    mismatches = 0
+    print(f"{'Классификатор':22} {'исходный, мкс':>14} {'автомат, мкс':>13} {'из кеша, мкс':>13}")
+    for name, reference in REFERENCES.items():
+        classifier = taxonomy[name]
+        for title in titles:
+            if classifier.category(title) != reference(title):
+                mismatches += 1
+                print(f"Расхождение в {name}: {title!r}: {classifier.category(title)!r} != {reference(title)!r}")
+        baseline = measure(reference, titles, args.repeat)
+        uncached = measure(classifier.category.__wrapped__, titles, args.repeat)
+        cached = measure(classifier.category, repeated, args.repeat)
+        print(f"{name:22} {baseline:14.2f} {uncached:13.2f} {cached:13.2f}")
+
+    if mismatches:
+        print(f"Расхождений: {mismatches}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
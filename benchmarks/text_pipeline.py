@@ -0,0 +1,149 @@
+"""
+Замер обработки ответов LLM: text_pipeline против исходной очистки регулярными выражениями.
+
+Исходная обработка применяла по несколько re.sub/re.split с шаблонами в
+тексте к каждой строке ответа. text_pipeline компилирует шаблоны один раз и
+проходит по ответу один раз. На записанных ответах модели
+(benchmarks/fixtures/llm_responses.json) проверяется, что результаты
+совпадают: персональные рекомендации, очищенный JSON карьерного плана,
+тенденции и темы для поиска ресурсов. Завершается с ненулевым кодом при
+расхождении.
+
+Запуск из корня репозитория:
+    python benchmarks/text_pipeline.py
+    python benchmarks/text_pipeline.py --repeat 20000
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_PATH = os.path.join(REPO_ROOT, 'benchmarks', 'fixtures', 'llm_responses.json')
+sys.path.insert(0, REPO_ROOT)
+
+import text_pipeline  # noqa: E402
+
+
+def reference_recommendations(response):
+    """Исходный разбор персональных рекомендаций (model._parse_personal_recommendations)"""
+    raw_recommendations = []
+    current_rec = []
+    for line in response.strip().split('\n'):
+        if not line.strip() and current_rec:
+            raw_recommendations.append(' '.join(current_rec))
+            current_rec = []
+        elif line.strip():
+            current_rec.append(line.strip())
+    if current_rec:
+        raw_recommendations.append(' '.join(current_rec))
+
+    if len(raw_recommendations) <= 1 and response.strip():
+        potential_recs = re.split(r'\.\s*\n', response.strip())
+        if len(potential_recs) > 1:
+            raw_recommendations = [rec.strip() + '.' for rec in potential_recs if rec.strip()]
+        else:
+            raw_recommendations = [response.strip()]
+
+    recommendations = []
+    for rec in raw_recommendations:
+        if not rec.strip():
+            continue
+        rec = re.sub(r'^[\d\-\*\.\)\s]+', '', rec.strip())
+        rec = re.sub(r'^["\'«]', '', rec)
+        rec = re.sub(r'["\'»]$', '', rec)
+        if rec:
+            recommendations.append(rec)
+    recommendations = list(dict.fromkeys(recommendations))
+    return recommendations[:7]
+
+
+def pipeline_recommendations(response):
+    return text_pipeline.unique_items(text_pipeline.split_paragraphs(response), limit=7)
+
+
+def extract_json(text):
+    if '{' in text:
+        text = text[text.find('{'):]
+    if '}' in text:
+        text = text[:text.rfind('}') + 1]
+    return text
+
+
+def reference_roadmap(response):
+    """Исходная очистка карьерного плана (LocalLLM и JobRoadmapGenerator._enrich_roadmap)"""
+    text = re.sub(r'<think>.*?</think>', '', response, flags=re.DOTALL)
+    text = text.replace('<think>', '').replace('</think>', '').strip()
+    text = re.sub(r'^```json\s*', '', text)
+    text = re.sub(r'\s*```$', '', text)
+    roadmap = json.loads(extract_json(text))
+
+    if isinstance(roadmap.get("futureInsights"), str):
+        insights_text = roadmap["futureInsights"]
+        insights = []
+        for insight in re.split(r'[.\n]+', insights_text):
+            insight = insight.strip()
+            if insight:
+                insights.append(insight)
+        roadmap["futureInsights"] = insights or [insights_text]
+
+    topics = []
+    for step in roadmap["learningPlan"]:
+        topic = step["title"]
+        topic = re.sub(r'^(Изучение|Освоение|Практика|Знакомство с)\s+', '', topic)
+        topic = re.sub(r'^(и|практика|навыки)\s+', '', topic)
+        topics.append(topic)
+    return roadmap, topics
+
+
+def pipeline_roadmap(response):
+    text = text_pipeline.strip_code_fence(text_pipeline.strip_think(response).strip())
+    roadmap = json.loads(extract_json(text))
+    if isinstance(roadmap.get("futureInsights"), str):
+        roadmap["futureInsights"] = text_pipeline.split_insights(roadmap["futureInsights"])
+    topics = [text_pipeline.learning_topic(step["title"]) for step in roadmap["learningPlan"]]
+    return roadmap, topics
+
+
+def timed_us(function, responses, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for response in responses:
+            function(response)
+    return (time.perf_counter() - started) / (repeat * len(responses)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Обработка ответов LLM')
+    parser.add_argument('--repeat', type=int, default=5000, help='Сколько раз обработать каждый ответ')
+    args = parser.parse_args()
+
+    with open(FIXTURES_PATH, 'r', encoding='utf-8') as f:
+        fixtures = json.load(f)
+
+    cases = [
+        ('рекомендации', fixtures['personal_recommendations'], reference_recommendations, pipeline_recommendations),
+        ('карьерный план', fixtures['roadmaps'], reference_roadmap, pipeline_roadmap),
+    ]
+
+    mismatches = 0
+    print(f"{'Ответы':16} {'исходная, мкс':>14} {'pipeline, мкс':>14}")
+    for title, responses, reference, pipeline in cases:
+        for number, response in enumerate(responses):
+            expected, actual = reference(response), pipeline(response)
+            if expected != actual:
+                mismatches += 1
+                print(f"Расхождение ({title}, ответ {number}):\n  исходная: {expected!r}\n  pipeline: {actual!r}")
+        print(f"{title:16} {timed_us(reference, responses, args.repeat):14.2f} "
+              f"{timed_us(pipeline, responses, args.repeat):14.2f}")
+
+    if mismatches:
+        print(f"Расхождений: {mismatches}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
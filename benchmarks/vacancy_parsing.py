@@ -0,0 +1,117 @@
+"""
+Замер подготовки текста страницы вакансии: один обход дерева против get_text() по блокам.
+
+Исходная реализация вызывает get_text() для каждого div/p/ul, поэтому текст глубоко
+вложенных элементов собирается заново для каждого предка, и время растет квадратично
+с глубиной вложенности. vacancy_page.page_texts посещает каждый текстовый узел один раз.
+
+Страницы из benchmarks/fixtures дополнительно оборачиваются в --depth вложенных div
+(как в верстке HH) и увеличиваются в --scale раз.
+
+Запуск из корня репозитория:
+    python benchmarks/vacancy_parsing.py
+    python benchmarks/vacancy_parsing.py --depth 40 --scale 10
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(REPO_ROOT, 'benchmarks', 'fixtures')
+sys.path.insert(0, REPO_ROOT)
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+import vacancy_page  # noqa: E402
+
+
+def reference_page_texts(soup):
+    """Исходная подготовка текста (get_text() для каждого блока)"""
+    vacancy_description = ""
+    description_div = soup.find('div', {'data-qa': 'vacancy-description'})
+    if description_div:
+        vacancy_description = description_div.get_text()
+
+    requirements_block = ""
+    for block in soup.find_all(['div', 'p', 'ul']):
+        text = block.get_text().lower()
+        if 'требовани' in text or 'требуется' in text or 'необходимые навыки' in text or 'от вас' in text:
+            requirements_block += block.get_text() + "\n"
+
+    if not requirements_block:
+        requirements_block = vacancy_description
+
+    all_text = requirements_block + "\n" + vacancy_description
+    list_items = [item.get_text() for ul in soup.find_all('ul') for item in ul.find_all('li')]
+    return all_text, list_items, soup.get_text()
+
+
+def segmented_page_texts(soup):
+    """Подготовка текста за один обход дерева (без разбора HTML, как и reference_page_texts)"""
+    segments, list_items, vacancy_description, full_text = vacancy_page.segment_page(soup)
+    requirements_block = "\n".join(vacancy_page.requirement_sections(segments)) or vacancy_description
+    return requirements_block + "\n" + vacancy_description, list_items, full_text
+
+
+def build_page(html, depth, scale):
+    """Оборачивает описание вакансии в depth вложенных div и повторяет его scale раз"""
+    marker = '<div data-qa="vacancy-description">'
+    start = html.find(marker)
+    end = html.find('</div></div>', start)
+    if start == -1 or end == -1:
+        return html
+    inner = html[start + len(marker):end]
+    nested = '<div class="bloko-column">' * depth + inner * scale + '</div>' * depth
+    return html[:start + len(marker)] + nested + html[end:]
+
+
+def best_time(function, args, repeat):
+    """Лучшее время выполнения function(*args) из repeat запусков, в миллисекундах"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(*args)
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Замер подготовки текста страниц вакансий')
+    parser.add_argument('--depth', type=int, default=20, help='Глубина вложенности div вокруг описания')
+    parser.add_argument('--scale', type=int, default=5, help='Во сколько раз увеличить описание вакансий')
+    parser.add_argument('--repeat', type=int, default=5, help='Количество запусков для каждого замера')
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(FIXTURES_DIR, 'hh_vacancy_*.html')))
+    if not paths:
+        print(f"Нет страниц вакансий в {FIXTURES_DIR}")
+        return 1
+
+    print(f"{'Страница':32} {'размер':>8} {'get_text, мс':>13} {'обход, мс':>10} {'ускорение':>10} "
+          f"{'требования, симв.':>18}")
+    total_reference = total_segmented = 0.0
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            html = build_page(f.read(), args.depth, args.scale)
+        soup = BeautifulSoup(html, 'html.parser')
+
+        reference_ms = best_time(reference_page_texts, (soup,), args.repeat)
+        segmented_ms = best_time(segmented_page_texts, (soup,), args.repeat)
+        total_reference += reference_ms
+        total_segmented += segmented_ms
+
+        reference_text = reference_page_texts(soup)[0]
+        segmented_text = segmented_page_texts(soup)[0]
+        print(f"{os.path.basename(path):32} {len(html):8} {reference_ms:13.2f} {segmented_ms:10.2f} "
+              f"{reference_ms / segmented_ms:9.1f}x {len(reference_text):>8} -> {len(segmented_text):<8}")
+
+    print(f"{'Итого':32} {'':8} {total_reference:13.2f} {total_segmented:10.2f} "
+          f"{total_reference / total_segmented:9.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
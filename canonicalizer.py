@@ -0,0 +1,341 @@
+"""
+Приведение названий профессий к каноническому виду.
+
+"Программисты", "разработчица", "python dev" и "програмист" должны
+попадать в одни и те же записи кешей, хранилища вакансий и индекса навыков.
+Название проходит через несколько шагов:
+
+    1. нижний регистр, ё -> е, удаление пунктуации (кроме + # . / -
+       внутри слов: c++, c#, .net, ux/ui, веб-разработчик);
+    2. отбрасывание слов уровня и шума (junior, старший, удаленно, ...);
+    3. транслитерация латиницы, которой нет в словаре ("programmist");
+    4. синонимы и сокращения (dev -> developer, питон -> python);
+    5. стемминг (русский алгоритм Портера из Snowball);
+    6. исправление опечаток: незнакомая основа заменяется ближайшей по
+       триграммам основой словаря;
+    7. совпадение набора основ (без учета порядка слов) с названием или
+       синонимом из data/professions.json.
+
+Результат - Canonical: идентификатор (каноническое название из списка или
+нормализованный текст, если профессия не найдена), название, степень
+сходства. Файл загружается в составе каталога (catalog.py), результаты
+запоминаются в LRU-кеше снимка.
+"""
+import json
+import os
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROFESSIONS_PATH = os.environ.get('PROFESSIONS_PATH', os.path.join(BASE_DIR, 'data', 'professions.json'))
+
+# Версия формата data/professions.json
+PROFESSIONS_VERSION = 1
+
+# Количество запомненных результатов приведения
+CANONICAL_CACHE_SIZE = 8192
+
+# Минимальное сходство основ (коэффициент Дайса по триграммам), при котором слово считается опечаткой
+FUZZY_MIN_SIMILARITY = 0.7
+
+# Результат: идентификатор для ключей кешей, каноническое название (None, если не найдено) и сходство
+Canonical = namedtuple('Canonical', ['id', 'title', 'score'])
+
+_TOKEN_RE = re.compile(r'[a-zа-я0-9+#]+(?:[./\-][a-zа-я0-9+#]+)*|\.[a-z]+')
+_LATIN_RE = re.compile(r'[a-z]')
+
+
+def normalize_text(text):
+    """Нижний регистр, ё -> е, одиночные пробелы (для регионов и прочих строк без словаря)"""
+    text = (text or '').lower().replace('ё', 'е')
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def tokenize(text):
+    """Слова нормализованного текста без пунктуации"""
+    return _TOKEN_RE.findall(normalize_text(text))
+
+
+# --- Транслитерация ---------------------------------------------------------
+
+# Сначала многобуквенные сочетания, затем отдельные буквы
+_TRANSLIT = [
+    ('shch', 'щ'), ('sch', 'щ'), ('yo', 'е'), ('zh', 'ж'), ('kh', 'х'), ('ts', 'ц'), ('ch', 'ч'),
+    ('sh', 'ш'), ('yu', 'ю'), ('ya', 'я'), ('ye', 'е'), ('iy', 'ий'), ('yy', 'ый'),
+    ('a', 'а'), ('b', 'б'), ('c', 'к'), ('d', 'д'), ('e', 'е'), ('f', 'ф'), ('g', 'г'), ('h', 'х'),
+    ('i', 'и'), ('j', 'дж'), ('k', 'к'), ('l', 'л'), ('m', 'м'), ('n', 'н'), ('o', 'о'), ('p', 'п'),
+    ('q', 'к'), ('r', 'р'), ('s', 'с'), ('t', 'т'), ('u', 'у'), ('v', 'в'), ('w', 'в'), ('x', 'кс'),
+    ('y', 'ы'), ('z', 'з'),
+]
+_TRANSLIT_RE = re.compile('|'.join(latin for latin, _ in _TRANSLIT))
+_TRANSLIT_MAP = dict(_TRANSLIT)
+
+
+def transliterate(word):
+    """Латиница -> кириллица ("programmist" -> "программист")"""
+    return _TRANSLIT_RE.sub(lambda match: _TRANSLIT_MAP[match.group()], word)
+
+
+# --- Стемминг (Snowball, русский) ---------------------------------------------
+
+_VOWELS = 'аеиоуыэюя'
+
+_PERFECTIVE_GERUND = (('ившись', 'ывшись', 'ивши', 'ывши', 'ив', 'ыв'), ('вшись', 'вши', 'в'))
+_ADJECTIVE = ('ими', 'ыми', 'его', 'ого', 'ему', 'ому', 'ее', 'ие', 'ые', 'ое', 'ей', 'ий', 'ый',
+              'ой', 'ем', 'им', 'ым', 'ом', 'их', 'ых', 'ую', 'юю', 'ая', 'яя', 'ою', 'ею')
+_PARTICIPLE = (('ивш', 'ывш', 'ующ'), ('ем', 'нн', 'вш', 'ющ', 'щ'))
+_REFLEXIVE = ('ся', 'сь')
+_VERB = (('ейте', 'уйте', 'ила', 'ыла', 'ена', 'ите', 'или', 'ыли', 'ило', 'ыло', 'ено', 'ует', 'уют',
+          'ены', 'ить', 'ыть', 'ишь', 'ей', 'уй', 'ил', 'ыл', 'им', 'ым', 'ен', 'ят', 'ит', 'ыт', 'ую', 'ю'),
+         ('ете', 'йте', 'ешь', 'нно', 'ла', 'на', 'ли', 'ем', 'ло', 'но', 'ет', 'ют', 'ны', 'ть', 'й', 'л', 'н'))
+_NOUN = ('иями', 'ями', 'ами', 'ией', 'иям', 'ием', 'иях', 'ев', 'ов', 'ие', 'ье', 'еи', 'ии', 'ей', 'ой',
+         'ий', 'ям', 'ем', 'ам', 'ом', 'ах', 'ях', 'ию', 'ью', 'ия', 'ья', 'а', 'е', 'и', 'й', 'о', 'у',
+         'ы', 'ь', 'ю', 'я')
+_SUPERLATIVE = ('ейше', 'ейш')
+_DERIVATIONAL = ('ость', 'ост')
+
+
+def _sorted_endings(endings):
+    return tuple(sorted(endings, key=len, reverse=True))
+
+
+_ADJECTIVE = _sorted_endings(_ADJECTIVE)
+_NOUN = _sorted_endings(_NOUN)
+
+
+def _strip_ending(word, start, endings, after_vowel=False):
+    """Отрезает самое длинное окончание, если оно целиком лежит в word[start:]; иначе None"""
+    for ending in endings:
+        if word.endswith(ending) and len(word) - len(ending) >= start:
+            if after_vowel:
+                position = len(word) - len(ending) - 1
+                if position < start or word[position] not in 'ая':
+                    continue
+            return word[:-len(ending)]
+    return None
+
+
+def _strip_group(word, start, groups):
+    """Окончания из двух групп: вторая группа допустима только после "а" или "я"; выбирается самое длинное"""
+    best = None
+    for endings, after_vowel in ((groups[0], False), (groups[1], True)):
+        stripped = _strip_ending(word, start, _sorted_endings(endings), after_vowel)
+        if stripped is not None and (best is None or len(stripped) < len(best)):
+            best = stripped
+    return best
+
+
+def _regions(word):
+    """Начала областей RV и R2 алгоритма Портера"""
+    rv = len(word)
+    for position, char in enumerate(word):
+        if char in _VOWELS:
+            rv = position + 1
+            break
+
+    def next_region(start):
+        for position in range(start + 1, len(word)):
+            if word[position] not in _VOWELS and word[position - 1] in _VOWELS:
+                return position + 1
+        return len(word)
+
+    r1 = next_region(0)
+    return rv, next_region(r1) if r1 < len(word) else len(word)
+
+
+def stem(word):
+    """Основа русского слова (алгоритм Портера для русского языка); латиница и цифры не меняются"""
+    if len(word) < 3 or _LATIN_RE.search(word) or not any(char in _VOWELS for char in word):
+        return word
+    rv, r2 = _regions(word)
+
+    # Шаг 1
+    stripped = _strip_group(word, rv, _PERFECTIVE_GERUND)
+    if stripped is not None:
+        word = stripped
+    else:
+        word = _strip_ending(word, rv, _REFLEXIVE) or word
+        stripped = _strip_ending(word, rv, _ADJECTIVE)
+        if stripped is not None:
+            word = _strip_group(stripped, rv, _PARTICIPLE) or stripped
+        else:
+            stripped = _strip_group(word, rv, _VERB)
+            if stripped is None:
+                stripped = _strip_ending(word, rv, _NOUN)
+            if stripped is not None:
+                word = stripped
+
+    # Шаг 2
+    if word.endswith('и') and len(word) - 1 >= rv:
+        word = word[:-1]
+
+    # Шаг 3
+    word = _strip_ending(word, r2, _DERIVATIONAL) or word
+
+    # Шаг 4
+    if word.endswith('нн') and len(word) - 1 >= rv:
+        return word[:-1]
+    stripped = _strip_ending(word, rv, _SUPERLATIVE)
+    if stripped is not None:
+        word = stripped
+        if word.endswith('нн'):
+            word = word[:-1]
+    elif word.endswith('ь') and len(word) - 1 >= rv:
+        word = word[:-1]
+    return word
+
+
+# --- Триграммы -----------------------------------------------------------------
+
+def trigrams(text):
+    """Множество триграмм строки с границами слов"""
+    padded = f'  {text} '
+    return {padded[position:position + 3] for position in range(len(padded) - 2)}
+
+
+class ProfessionCanonicalizer:
+    """Каноническое название профессии по списку из data/professions.json"""
+
+    def __init__(self, data):
+        version = data.get('version')
+        if version != PROFESSIONS_VERSION:
+            raise ValueError(f"Версия списка профессий {version} не поддерживается (ожидается {PROFESSIONS_VERSION})")
+        self.stop_words = {normalize_text(word) for word in data.get('stop_words', [])}
+        # Слово уровня -> уровень ("старший" -> "senior"); в названии профессии такие слова отбрасываются
+        self.levels = {normalize_text(word): level
+                       for level, words in data.get('levels', {}).items() for word in words}
+        self.synonyms = {normalize_text(word): tokenize(replacement)
+                         for word, replacement in data.get('synonyms', {}).items()}
+        self.titles = [normalize_text(profession['title']) for profession in data.get('professions', [])]
+
+        # Слова словаря в латинице не транслитерируются
+        self.vocabulary = set(self.synonyms)
+        for profession in data.get('professions', []):
+            for name in [profession['title']] + list(profession.get('aliases', [])):
+                self.vocabulary.update(tokenize(name))
+        for replacement in self.synonyms.values():
+            self.vocabulary.update(replacement)
+        # Основа -> слово словаря (для транслитерированной латиницы и синонимов в другой форме)
+        self._vocabulary_stems = {stem(word): word for word in self.vocabulary}
+        self._synonym_stems = {}
+        for word, replacement in self.synonyms.items():
+            self._synonym_stems.setdefault(stem(word), replacement)
+
+        # Ключ (отсортированные основы) -> номер названия
+        self._keys = {}
+        for number, profession in enumerate(data.get('professions', [])):
+            for name in [profession['title']] + list(profession.get('aliases', [])):
+                stems = self._stems(name)
+                if stems:
+                    self._keys.setdefault(self._key(stems), number)
+
+        # Основы слов словаря и триграмма -> номера основ, в которых она встречается
+        self._known_stems = sorted({stem for key in self._keys for stem in key})
+        self._known_stem_set = set(self._known_stems)
+        self._trigram_index = {}
+        self._trigram_counts = []
+        for stem_number, known in enumerate(self._known_stems):
+            grams = trigrams(known)
+            self._trigram_counts.append(len(grams))
+            for gram in grams:
+                self._trigram_index.setdefault(gram, []).append(stem_number)
+
+        self.canonicalize = lru_cache(maxsize=CANONICAL_CACHE_SIZE)(self._canonicalize)
+
+    @classmethod
+    def load(cls, path=PROFESSIONS_PATH):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    @staticmethod
+    def _key(stems):
+        return tuple(sorted(set(stems)))
+
+    def _words(self, text):
+        """Слова названия после удаления шума, транслитерации и замены синонимов"""
+        words = []
+        for word in tokenize(text):
+            # "python-разработчик" -> "python", "разработчик", если слова целиком нет в словаре
+            if '-' in word and word not in self.vocabulary:
+                words.extend(self._words(word.replace('-', ' ')))
+                continue
+            if word in self.stop_words:
+                continue
+            if _LATIN_RE.search(word) and word not in self.vocabulary:
+                translit = transliterate(word)
+                if translit in self.vocabulary or stem(translit) in self._vocabulary_stems:
+                    word = translit
+            replacement = self.synonyms.get(word)
+            if replacement is None:
+                replacement = self._synonym_stems.get(stem(word))
+            words.extend(replacement if replacement is not None else (word,))
+        return words
+
+    def _stems(self, text):
+        return [stem(word) for word in self._words(text) if word not in self.stop_words]
+
+    def _correct(self, word_stem):
+        """
+        Исправление опечатки: ближайшая по триграммам основа словаря
+
+        Returns:
+            tuple: (основа, сходство); сама основа и 0.0, если похожих нет
+        """
+        if word_stem in self._known_stem_set:
+            return word_stem, 1.0
+        if len(word_stem) < 4:
+            return word_stem, 0.0
+        grams = trigrams(word_stem)
+        common = {}
+        for gram in grams:
+            for stem_number in self._trigram_index.get(gram, ()):
+                common[stem_number] = common.get(stem_number, 0) + 1
+        best, best_score = word_stem, 0.0
+        for stem_number, count in common.items():
+            score = 2 * count / (len(grams) + self._trigram_counts[stem_number])
+            if score > best_score:
+                best, best_score = self._known_stems[stem_number], score
+        if best_score < FUZZY_MIN_SIMILARITY:
+            return word_stem, best_score
+        return best, best_score
+
+    def _canonicalize(self, text):
+        words = self._words(text)
+        if not words:
+            # Название только из шума: идентификатором остается нормализованный текст
+            return Canonical(normalize_text(text), None, 0.0)
+
+        # Опечатки исправляются по отдельным словам: лишнее или незнакомое слово
+        # ("аналитик продаж") не притягивает название к похожей профессии из списка
+        stems = []
+        score = 1.0
+        for word in words:
+            corrected, similarity = self._correct(stem(word))
+            stems.append(corrected)
+            score = min(score, similarity)
+
+        number = self._keys.get(self._key(stems))
+        if number is not None:
+            return Canonical(self.titles[number], self.titles[number], score)
+        return Canonical(' '.join(words), None, 0.0)
+
+    def canonical_id(self, text):
+        """Ключ профессии для кешей, хранилища вакансий и индекса навыков"""
+        return self.canonicalize(text or '').id
+
+    def level(self, text):
+        """Уровень из названия ("Junior Python разработчик" -> "junior"); пустая строка, если не указан"""
+        for token in tokenize(text):
+            for word in token.split('-'):
+                level = self.levels.get(word)
+                if level is not None:
+                    return level
+        return ''
+
+
+def get_canonicalizer():
+    """Возвращает канонизатор из текущего снимка каталога (см. catalog.py)"""
+    from catalog import get_catalog
+
+    return get_catalog().canonicalizer
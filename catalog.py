@@ -0,0 +1,189 @@
+"""
+Справочные данные дорожных карт с горячей перезагрузкой.
+
+Каталог состоит из файлов в data/:
+    catalog.json             - базовые навыки, описания навыков, контексты профессий
+                               и региональные тренды
+    taxonomy.json            - классификаторы профессий по ключевым словам (taxonomy.py)
+    education_resources.json - ресурсы по темам плана обучения (education_resources.py)
+    professions.json         - канонические названия профессий и синонимы (canonicalizer.py)
+    fallback_roadmaps.json   - шаблоны дорожных карт на случай недоступности LLM (fallback.py)
+
+При загрузке по ним строятся индексы (автоматы ключевых слов, словари), и
+получается неизменяемый снимок Catalog. get_catalog() не чаще раза в
+RELOAD_CHECK_INTERVAL секунд сравнивает время изменения файлов и при
+изменении строит новый снимок, а затем подменяет ссылку на него. Запросы,
+которые уже получили старый снимок, дорабатывают с ним. Если новый файл не
+читается (например, записан наполовину), остается прежний снимок.
+"""
+import json
+import logging
+import os
+import threading
+import time
+
+from taxonomy import TAXONOMY_PATH, KeywordMatcher, Taxonomy
+from education_resources import RESOURCES_PATH, ResourceIndex
+from canonicalizer import PROFESSIONS_PATH, ProfessionCanonicalizer
+from fallback import FALLBACK_PATH, FallbackRoadmapEngine
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CATALOG_PATH = os.environ.get('CATALOG_PATH', os.path.join(BASE_DIR, 'data', 'catalog.json'))
+
+# Версия формата data/catalog.json
+CATALOG_VERSION = 1
+
+# Как часто проверять, изменились ли файлы каталога
+RELOAD_CHECK_INTERVAL = float(os.environ.get('CATALOG_RELOAD_INTERVAL', '2'))
+
+# Регион, тренды которого используются, если регион не найден в каталоге
+DEFAULT_REGION = 'россия'
+
+logger = logging.getLogger(__name__)
+
+
+class KeywordLookup:
+    """Ключи словаря ищутся в тексте как подстроки; побеждает ключ, который стоит в каталоге раньше"""
+
+    def __init__(self, mapping):
+        self.keys = list(mapping)
+        self.values = [mapping[key] for key in self.keys]
+        self.matcher = KeywordMatcher([key.lower() for key in self.keys])
+
+    def get(self, text, default=None):
+        number = self.matcher.best((text or '').lower())
+        return default if number is None else self.values[number]
+
+
+class Catalog:
+    """Снимок справочных данных и построенных по ним индексов (только для чтения)"""
+
+    def __init__(self, data, taxonomy, resource_index, canonicalizer, fallback_engine, versions=None):
+        version = data.get('version')
+        if version != CATALOG_VERSION:
+            raise ValueError(f"Версия каталога {version} не поддерживается (ожидается {CATALOG_VERSION})")
+        self.taxonomy = taxonomy
+        self.resource_index = resource_index
+        self.canonicalizer = canonicalizer
+        self.fallback_engine = fallback_engine
+        # Время изменения файлов, из которых построен снимок
+        self.versions = versions or {}
+
+        self.hard_skills = KeywordLookup(data.get('default_hard_skills', {}))
+        self.soft_skills = list(data.get('default_soft_skills', []))
+        self.skill_descriptions = data.get('skill_descriptions', {})
+        self.profession_contexts = KeywordLookup(data.get('profession_contexts', {}))
+        self.regional_trends = data.get('regional_trends', {})
+        self._regions = KeywordLookup(self.regional_trends)
+
+    @classmethod
+    def load(cls, catalog_path=None, taxonomy_path=None, resources_path=None, professions_path=None,
+             fallback_path=None):
+        """
+        Читает файлы каталога и строит индексы
+
+        Raises:
+            OSError, ValueError: Файл не читается, не является JSON или записан другой версией формата
+        """
+        paths = {
+            'catalog': catalog_path or CATALOG_PATH,
+            'taxonomy': taxonomy_path or TAXONOMY_PATH,
+            'resources': resources_path or RESOURCES_PATH,
+            'professions': professions_path or PROFESSIONS_PATH,
+            'fallback': fallback_path or FALLBACK_PATH,
+        }
+        # Время изменения запоминается до чтения: запись во время загрузки вызовет повторную загрузку
+        versions = file_versions(paths)
+        data = {}
+        for name, path in paths.items():
+            with open(path, 'r', encoding='utf-8') as f:
+                data[name] = json.load(f)
+
+        taxonomy = Taxonomy(data['taxonomy'])
+        resource_index = ResourceIndex(data['resources'], taxonomy['resource_profession'])
+        canonicalizer = ProfessionCanonicalizer(data['professions'])
+        fallback_engine = FallbackRoadmapEngine(data['fallback'], taxonomy['learning_plan'], canonicalizer)
+        return cls(data['catalog'], taxonomy, resource_index, canonicalizer, fallback_engine, versions)
+
+    @property
+    def paths(self):
+        return list(self.versions)
+
+    def region_trends(self, region):
+        """Тренды региона (по вхождению названия региона) или общероссийские"""
+        trends = self._regions.get(region)
+        if trends is None:
+            trends = self.regional_trends.get(DEFAULT_REGION, [])
+        return list(trends)
+
+
+def file_versions(paths):
+    """{путь: (mtime_ns, size)} для файлов каталога; (None, None) для отсутствующих"""
+    versions = {}
+    for path in (paths.values() if isinstance(paths, dict) else paths):
+        try:
+            stat = os.stat(path)
+            versions[path] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            versions[path] = (None, None)
+    return versions
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+_checked_at = 0
+# Версии файлов, которые не удалось загрузить: повторная попытка - только после следующего изменения
+_failed_versions = None
+
+
+def _reload():
+    """Строит новый снимок каталога (вызывается под _catalog_lock)"""
+    global _catalog, _failed_versions
+    try:
+        catalog = Catalog.load()
+    except (OSError, ValueError, KeyError) as e:
+        if _catalog is None:
+            raise
+        _failed_versions = file_versions(_catalog.paths)
+        logger.warning(f"Не удалось перезагрузить каталог: {e}. Используется прежняя версия")
+        return False
+    _catalog = catalog
+    _failed_versions = None
+    logger.info(f"Каталог загружен: {', '.join(os.path.basename(path) for path in catalog.paths)}")
+    return True
+
+
+def reload_catalog():
+    """
+    Перечитывает каталог и подменяет общий снимок
+
+    Returns:
+        bool: True, если снимок заменен; при ошибке остается прежний
+    """
+    with _catalog_lock:
+        return _reload()
+
+
+def get_catalog():
+    """Возвращает текущий снимок каталога, перезагружая его, если файлы изменились"""
+    global _checked_at
+    catalog = _catalog
+    if catalog is not None:
+        if time.time() - _checked_at < RELOAD_CHECK_INTERVAL:
+            return catalog
+        # Пока другой поток перезагружает каталог, запросы обслуживаются прежним снимком
+        if not _catalog_lock.acquire(blocking=False):
+            return catalog
+    else:
+        _catalog_lock.acquire()
+    try:
+        if _catalog is None:
+            _reload()
+        elif time.time() - _checked_at >= RELOAD_CHECK_INTERVAL:
+            versions = file_versions(_catalog.paths)
+            if versions != _catalog.versions and versions != _failed_versions:
+                _reload()
+        _checked_at = time.time()
+        return _catalog
+    finally:
+        _catalog_lock.release()
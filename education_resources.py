@@ -0,0 +1,298 @@
+"""
+Поиск бесплатных образовательных ресурсов по темам плана обучения.
+
+Каталог data/education_resources.json при загрузке (в составе catalog.py)
+превращается в индекс: ключевые слова тем (сети, безопасность, sql, ...)
+собраны в автомат Ахо-Корасик (см. taxonomy.KeywordMatcher), поэтому
+категории темы находятся за один проход по ее названию, а ресурсы категории
+профессии по каждой категории темы берутся из словаря. Результат для пары
+(категория профессии, тема) запоминается, список тем дорожной карты
+обрабатывается одним вызовом.
+
+Темы, в которых нет ни одного ключевого слова (формулировки LLM вроде
+"Освоение инструментов для работы с хранилищами данных"), ищутся по
+векторному индексу ResourceVectorIndex: описания ресурсов один раз
+переводятся в матрицу эмбеддингов, а все такие темы дорожной карты
+сравниваются с ней одним матричным умножением.
+"""
+import logging
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+from embeddings import EmbeddingError, HashingEmbedder, LMStudioEmbedder
+from taxonomy import KeywordMatcher
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RESOURCES_PATH = os.environ.get('EDUCATION_RESOURCES_PATH', os.path.join(BASE_DIR, 'data', 'education_resources.json'))
+
+# Версия формата data/education_resources.json
+RESOURCES_VERSION = 1
+
+# Не более стольких ресурсов на тему
+MAX_RESOURCES_PER_TOPIC = 5
+
+# Количество запомненных пар (категория профессии, тема)
+LOOKUP_CACHE_SIZE = 8192
+
+GENERAL_SECTION = "Общие ресурсы по профессии"
+UNIVERSAL_SECTION = "Универсальные ресурсы"
+
+# Эмбеддинги описаний ресурсов: hashing (триграммы, без сети) или lmstudio
+RESOURCE_EMBEDDING_BACKEND = os.environ.get('RESOURCE_EMBEDDING_BACKEND', 'hashing')
+RESOURCE_EMBEDDING_API_BASE = os.environ.get('RESOURCE_EMBEDDING_API_BASE', 'http://127.0.0.1:1234/v1')
+
+# Минимальное косинусное сходство темы и ресурса при поиске по векторам
+RESOURCE_MIN_SIMILARITY = float(os.environ.get('RESOURCE_MIN_SIMILARITY', '0.15'))
+
+# Размерность HashingEmbedder для ресурсов: описания длиннее запросов, при 256 координатах
+# совпадения хешей триграмм дают шум около 0.13
+RESOURCE_HASHING_DIMENSIONS = 1024
+
+# Не более стольких ресурсов на тему при поиске по векторам
+VECTOR_RESOURCES_PER_TOPIC = 3
+
+logger = logging.getLogger(__name__)
+
+
+def create_resource_embedders(backend=RESOURCE_EMBEDDING_BACKEND, api_base=RESOURCE_EMBEDDING_API_BASE):
+    """
+    Эмбеддеры для описаний ресурсов и для тем
+
+    Returns:
+        tuple: (эмбеддер документов, эмбеддер запросов); для nomic-embed-text
+               у них разные префиксы задачи, HashingEmbedder - один и тот же
+    """
+    if backend == 'lmstudio':
+        return (LMStudioEmbedder(api_base, prefix='search_document: '),
+                LMStudioEmbedder(api_base, prefix='search_query: '))
+    if backend != 'hashing':
+        logger.warning(f"Неизвестный RESOURCE_EMBEDDING_BACKEND={backend!r}, используются эмбеддинги по триграммам")
+    embedder = HashingEmbedder(RESOURCE_HASHING_DIMENSIONS)
+    return embedder, embedder
+
+
+def resource_document(resource, topic_category, keywords):
+    """Текст ресурса для эмбеддинга: название, описание, категория темы и ее ключевые слова"""
+    parts = [resource.get('title', ''), resource.get('description', ''), topic_category]
+    if keywords:
+        parts.append(', '.join(keywords))
+    return '. '.join(part for part in parts if part)
+
+
+class ResourceVectorIndex:
+    """
+    Матрица эмбеддингов ресурсов каталога и пакетный поиск ближайших к темам
+
+    Ресурсы раздела "общие" не индексируются: они и так попадают в ответ
+    отдельным разделом. Результаты для пар (категория профессии, тема)
+    запоминаются; в одном вызове search эмбеддинги считаются только для новых
+    тем - одним запросом к эмбеддеру.
+    """
+
+    def __init__(self, resources, topic_keywords, embedder, query_embedder=None,
+                 min_similarity=RESOURCE_MIN_SIMILARITY, per_topic=VECTOR_RESOURCES_PER_TOPIC,
+                 cache_size=LOOKUP_CACHE_SIZE):
+        import numpy as np
+
+        self.embedder = embedder
+        self.query_embedder = query_embedder or embedder
+        self.min_similarity = min_similarity
+        self.per_topic = per_topic
+        self.cache_size = cache_size
+
+        # Строка матрицы -> ресурс; номера строк каждой категории профессии
+        self.entries = []
+        self.rows_by_profession = {}
+        documents = []
+        for profession_category, sections in resources.items():
+            seen = set()
+            rows = []
+            for topic_category, items in sections.items():
+                if topic_category == 'общие':
+                    continue
+                keywords = topic_keywords.get(topic_category, [])
+                for resource in items:
+                    if resource.get('url') in seen:
+                        continue
+                    seen.add(resource.get('url'))
+                    rows.append(len(self.entries))
+                    self.entries.append(resource)
+                    documents.append(resource_document(resource, topic_category, keywords))
+            self.rows_by_profession[profession_category] = np.asarray(rows, dtype=np.intp)
+
+        if documents:
+            self.matrix = np.ascontiguousarray(self.embedder.embed(documents), dtype=np.float32)
+        else:
+            self.matrix = np.zeros((0, 0), dtype=np.float32)
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _cached(self, key):
+        with self._lock:
+            found = self._cache.get(key)
+            if found is not None:
+                self._cache.move_to_end(key)
+            return found
+
+    def _remember(self, key, resources):
+        with self._lock:
+            self._cache[key] = resources
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def search(self, topics, profession_category):
+        """
+        Ближайшие ресурсы для каждой темы
+
+        Args:
+            topics (list): Темы (строки)
+            profession_category (str): Категория профессии (ресурсы других категорий не рассматриваются)
+
+        Returns:
+            list: Для каждой темы кортеж из не более per_topic ресурсов со сходством
+                  не ниже min_similarity (пустой, если эмбеддинги недоступны)
+        """
+        import numpy as np
+
+        results = [None] * len(topics)
+        pending = {}
+        for position, topic in enumerate(topics):
+            found = self._cached((profession_category, topic))
+            if found is None:
+                pending.setdefault(topic, []).append(position)
+            else:
+                results[position] = found
+
+        if pending:
+            rows = self.rows_by_profession.get(profession_category, np.zeros(0, dtype=np.intp))
+            texts = list(pending)
+            found_lists = [()] * len(texts)
+            if len(rows):
+                try:
+                    queries = self.query_embedder.embed(texts)
+                except EmbeddingError as e:
+                    logger.warning(f"Поиск ресурсов по векторам недоступен: {e}")
+                    return [found or () for found in results]
+                # Одно умножение для всех тем: (темы x размерность) @ (размерность x ресурсы)
+                scores = queries.astype(np.float32, copy=False) @ self.matrix[rows].T
+                k = min(self.per_topic, len(rows))
+                top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                for number, candidates in enumerate(top):
+                    ordered = candidates[np.argsort(-scores[number, candidates], kind='stable')]
+                    found_lists[number] = tuple(
+                        self.entries[rows[column]] for column in ordered
+                        if scores[number, column] >= self.min_similarity
+                    )
+            for text, found in zip(texts, found_lists):
+                self._remember((profession_category, text), found)
+                for position in pending[text]:
+                    results[position] = found
+        return results
+
+
+class ResourceIndex:
+    """Инвертированный индекс: ключевое слово -> категория темы -> ресурсы категории профессии"""
+
+    def __init__(self, catalog, profession_classifier, embedders=None):
+        version = catalog.get('version')
+        if version != RESOURCES_VERSION:
+            raise ValueError(f"Версия каталога ресурсов {version} не поддерживается (ожидается {RESOURCES_VERSION})")
+        # Категория профессии -> категория темы ("общие", "сети", ...) -> список ресурсов
+        self.resources = catalog.get('resources', {})
+        self.universal = catalog.get('universal', [])
+        # Классификатор категории профессии (resource_profession из data/taxonomy.json)
+        self.profession_classifier = profession_classifier
+
+        # Категории тем в порядке каталога: в этом порядке ресурсы добавляются к теме
+        self.topic_categories = list(catalog.get('topic_keywords', {}))
+        keywords = []
+        priorities = []
+        for priority, category in enumerate(self.topic_categories):
+            for keyword in catalog['topic_keywords'][category]:
+                keywords.append(keyword.lower())
+                priorities.append(priority)
+        self.matcher = KeywordMatcher(keywords, priorities)
+        self.lookup = lru_cache(maxsize=LOOKUP_CACHE_SIZE)(self._lookup)
+
+        # Векторный индекс для тем без ключевых слов; без эмбеддингов остается только поиск по словам
+        embedder, query_embedder = embedders or create_resource_embedders()
+        try:
+            self.vectors = ResourceVectorIndex(self.resources, catalog.get('topic_keywords', {}),
+                                               embedder, query_embedder)
+        except EmbeddingError as e:
+            logger.warning(f"Векторный индекс ресурсов не построен: {e}")
+            self.vectors = None
+
+    def topic_categories_for(self, topic):
+        """Категории темы (по ключевым словам) в порядке каталога"""
+        priorities = self.matcher.priorities
+        found = {priorities[number] for _, _, number in self.matcher.find_all(topic.lower())}
+        return [self.topic_categories[priority] for priority in sorted(found)]
+
+    def _lookup(self, profession_category, topic):
+        """
+        Ресурсы для темы с учетом категории профессии
+
+        Returns:
+            tuple: Не более MAX_RESOURCES_PER_TOPIC ресурсов (пустой, если тема не распознана)
+        """
+        sections = self.resources.get(profession_category)
+        if not sections:
+            return ()
+        found = []
+        for category in self.topic_categories_for(topic):
+            found.extend(sections.get(category, ()))
+            if len(found) >= MAX_RESOURCES_PER_TOPIC:
+                break
+        return tuple(found[:MAX_RESOURCES_PER_TOPIC])
+
+    def find(self, profession, topics):
+        """
+        Ресурсы по списку тем для профессии
+
+        Args:
+            profession (str): Название профессии
+            topics (list): Темы для изучения
+
+        Returns:
+            dict: {раздел или тема: список ресурсов}; общие ресурсы категории профессии
+                  и универсальные ресурсы, если по темам ничего не найдено
+        """
+        profession_category = self.profession_classifier.category(profession)
+
+        result = {}
+        if profession_category in self.resources:
+            result[GENERAL_SECTION] = list(self.resources[profession_category].get("общие", [])[:MAX_RESOURCES_PER_TOPIC])
+
+            unique = list(dict.fromkeys(topic for topic in topics if isinstance(topic, str)))
+            found = {}
+            unmatched = []
+            for topic in unique:
+                resources = self.lookup(profession_category, topic)
+                if resources:
+                    found[topic] = resources
+                else:
+                    unmatched.append(topic)
+            # Темы без ключевых слов - одним пакетом по векторному индексу
+            if unmatched and self.vectors is not None:
+                found.update(zip(unmatched, self.vectors.search(unmatched, profession_category)))
+            for topic in unique:
+                if found.get(topic):
+                    result[topic] = list(found[topic])
+
+        # Если категория профессии не определена или нет ресурсов, добавляем универсальные
+        if len(result) <= 1:
+            result[UNIVERSAL_SECTION] = list(self.universal[:MAX_RESOURCES_PER_TOPIC])
+        return result
+
+
+def get_resource_index():
+    """Возвращает индекс ресурсов из текущего снимка каталога (см. catalog.py)"""
+    from catalog import get_catalog
+
+    return get_catalog().resource_index
@@ -0,0 +1,123 @@
+"""
+Векторные представления коротких текстов (запросов дорожных карт).
+
+LMStudioEmbedder обращается к модели эмбеддингов LM Studio
+(text-embedding-nomic-embed-text-v1.5, эндпоинт /v1/embeddings).
+HashingEmbedder - детерминированная замена без сети: хеширование триграмм
+символов; подходит для проверок и для запуска без LM Studio
+(EMBEDDING_BACKEND=hashing). Оба возвращают матрицу numpy float32 с
+нормированными строками, поэтому сходство - скалярное произведение.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+
+import requests
+
+EMBEDDING_BACKEND = os.environ.get('EMBEDDING_BACKEND', 'lmstudio')
+EMBEDDING_MODEL = os.environ.get('EMBEDDING_MODEL', 'text-embedding-nomic-embed-text-v1.5')
+
+# Таймаут запроса эмбеддингов (модель маленькая, отвечает за десятки миллисекунд)
+EMBEDDING_TIMEOUT = 10
+
+# Префикс задачи для nomic-embed-text: запросы сравниваются с запросами, а не с документами
+QUERY_PREFIX = 'clustering: '
+
+# Размерность векторов HashingEmbedder
+HASHING_DIMENSIONS = 256
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingError(Exception):
+    """Не удалось получить эмбеддинги"""
+
+
+def normalize_rows(matrix):
+    """Делит строки матрицы на их длину (нулевые строки остаются нулевыми)"""
+    import numpy as np
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class LMStudioEmbedder:
+    """Эмбеддинги модели LM Studio (OpenAI-совместимый эндпоинт /embeddings)"""
+
+    def __init__(self, api_base="http://127.0.0.1:1234/v1", model=EMBEDDING_MODEL, prefix=QUERY_PREFIX,
+                 timeout=EMBEDDING_TIMEOUT):
+        self.api_base = api_base
+        self.model = model
+        self.prefix = prefix
+        self.timeout = timeout
+
+    def embed(self, texts):
+        """
+        Returns:
+            numpy.ndarray: Матрица (len(texts), размерность) с нормированными строками
+
+        Raises:
+            EmbeddingError: Сервер недоступен или вернул некорректный ответ
+        """
+        import numpy as np
+
+        try:
+            response = requests.post(
+                f"{self.api_base}/embeddings",
+                json={"model": self.model, "input": [self.prefix + text for text in texts]},
+                timeout=self.timeout
+            )
+        except requests.exceptions.RequestException as e:
+            raise EmbeddingError(f"Ошибка запроса эмбеддингов: {e}") from e
+        if response.status_code != 200:
+            raise EmbeddingError(f"Сервер эмбеддингов вернул код {response.status_code}: {response.text[:200]}")
+        try:
+            items = sorted(response.json()['data'], key=lambda item: item['index'])
+            matrix = np.asarray([item['embedding'] for item in items], dtype=np.float32)
+        except (ValueError, KeyError, TypeError) as e:
+            raise EmbeddingError(f"Некорректный ответ сервера эмбеддингов: {e}") from e
+        if matrix.ndim != 2 or len(matrix) != len(texts):
+            raise EmbeddingError(f"Сервер эмбеддингов вернул {len(matrix)} векторов вместо {len(texts)}")
+        return normalize_rows(matrix)
+
+    async def aembed(self, texts):
+        """Асинхронная версия embed: запрос выполняется в пуле потоков"""
+        return await asyncio.to_thread(self.embed, texts)
+
+
+class HashingEmbedder:
+    """Детерминированные эмбеддинги без модели: триграммы символов, хешированные в вектор фиксированной длины"""
+
+    def __init__(self, dimensions=HASHING_DIMENSIONS):
+        self.dimensions = dimensions
+
+    def _vector(self, text, out):
+        padded = f"  {(text or '').lower().replace('ё', 'е')} "
+        for position in range(len(padded) - 2):
+            digest = hashlib.blake2b(padded[position:position + 3].encode('utf-8'), digest_size=8).digest()
+            value = int.from_bytes(digest, 'big')
+            # Младший бит - знак, остальные - номер координаты
+            out[(value >> 1) % self.dimensions] += 1.0 if value & 1 else -1.0
+
+    def embed(self, texts):
+        import numpy as np
+
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            self._vector(text, matrix[row])
+        return normalize_rows(matrix)
+
+    async def aembed(self, texts):
+        return self.embed(texts)
+
+
+def create_embedder(api_base="http://127.0.0.1:1234/v1", backend=None):
+    """Эмбеддер по имени (lmstudio или hashing); по умолчанию - из переменной окружения EMBEDDING_BACKEND"""
+    backend = backend or EMBEDDING_BACKEND
+    if backend == 'hashing':
+        return HashingEmbedder()
+    if backend != 'lmstudio':
+        logger.warning(f"Неизвестный бэкенд эмбеддингов {backend!r}, используется LM Studio")
+    return LMStudioEmbedder(api_base)
@@ -0,0 +1,155 @@
+"""
+Дорожная карта без LLM: шаблоны из data/fallback_roadmaps.json.
+
+Используется, когда LM Studio недоступен или не вернул карьерный план, а
+также для дополнения неполных ответов модели. Шаблоны компилируются при
+загрузке каталога (catalog.py): строки без подстановок сохраняются как есть,
+в остальных заранее найдены поля {profession} и {region}. Набор навыков
+выбирается по каноническому названию профессии, план обучения - по
+классификатору learning_plan из data/taxonomy.json, поэтому построение
+карты - несколько словарных поисков и форматирование пары десятков строк.
+Если известны навыки профессии в порядке изучения (индекс навыков,
+skill_index.py), план дополняется шагами практики по первым из них;
+формулировки шагов выбираются генератором с зерном от запроса (seeding.py).
+"""
+import os
+from string import Formatter
+
+from seeding import seeded_random
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FALLBACK_PATH = os.environ.get('FALLBACK_ROADMAPS_PATH', os.path.join(BASE_DIR, 'data', 'fallback_roadmaps.json'))
+
+# Версия формата data/fallback_roadmaps.json
+FALLBACK_VERSION = 1
+
+# Поля, которые можно использовать в шаблонах ({skill} - только в шагах практики навыка)
+TEMPLATE_FIELDS = ('profession', 'region', 'skill')
+
+# Не более стольких шагов практики навыков в плане обучения
+MAX_SKILL_STEPS = 3
+
+# Регион в тексте, если пользователь его не указал
+DEFAULT_REGION = 'Россия'
+
+
+def compile_template(text):
+    """
+    Returns:
+        tuple: (текст, нужно ли форматирование)
+
+    Raises:
+        ValueError: В шаблоне есть поле, которого нет в TEMPLATE_FIELDS
+    """
+    fields = {field for _, field, _, _ in Formatter().parse(text) if field is not None}
+    unknown = fields - set(TEMPLATE_FIELDS)
+    if unknown:
+        raise ValueError(f"Неизвестные поля в шаблоне: {', '.join(sorted(unknown))}")
+    return text, bool(fields)
+
+
+def _render(compiled, fields):
+    return [text.format_map(fields) if formatted else text for text, formatted in compiled]
+
+
+class FallbackRoadmapEngine:
+    """Скомпилированные шаблоны дорожных карт по категориям профессий"""
+
+    def __init__(self, data, learning_plan_classifier, canonicalizer):
+        version = data.get('version')
+        if version != FALLBACK_VERSION:
+            raise ValueError(f"Версия шаблонов дорожных карт {version} не поддерживается (ожидается {FALLBACK_VERSION})")
+        self.learning_plan_classifier = learning_plan_classifier
+        self.canonicalizer = canonicalizer
+
+        # Наборы навыков и тенденций: название -> {раздел: скомпилированные строки}
+        self.skill_sets = {}
+        # Каноническое название профессии -> набор навыков
+        self.skill_set_by_profession = {}
+        for skill_set in data.get('skill_sets', []):
+            self.skill_sets[skill_set['name']] = {
+                section: tuple(compile_template(text) for text in skill_set.get(section, []))
+                for section in ('hardSkills', 'softSkills', 'futureInsights')
+            }
+            for profession in skill_set.get('professions', []):
+                self.skill_set_by_profession[canonicalizer.canonical_id(profession)] = skill_set['name']
+        self.default_skill_set = data.get('default_skill_set')
+        if self.default_skill_set not in self.skill_sets:
+            raise ValueError(f"Набор навыков по умолчанию {self.default_skill_set!r} не найден")
+
+        # Планы обучения: категория -> ((заголовок, описание), ...) в скомпилированном виде
+        self.learning_plans = {
+            category: tuple((compile_template(step['title']), compile_template(step['description'])) for step in steps)
+            for category, steps in data.get('learning_plans', {}).items()
+        }
+        self.default_learning_plan = data.get('default_learning_plan')
+        if self.default_learning_plan not in self.learning_plans:
+            raise ValueError(f"План обучения по умолчанию {self.default_learning_plan!r} не найден")
+
+        # Шаг практики навыка: заголовок и варианты описания
+        skill_step = data.get('skill_step') or {}
+        self.skill_step_title = compile_template(skill_step.get('title', '{skill}'))
+        self.skill_step_descriptions = tuple(compile_template(text) for text in skill_step.get('descriptions', []))
+
+    def learning_plan(self, profession, region=None, skills=(), seed=None):
+        """
+        План обучения категории профессии (классификатор learning_plan) или общий план
+
+        Args:
+            profession (str): Название профессии
+            region (str): Регион; если не указан - "Россия"
+            skills (list): Навыки в порядке изучения; по первым MAX_SKILL_STEPS добавляются шаги практики
+            seed (int): Зерно запроса (seeding.request_seed); по умолчанию - каноническое название профессии
+        """
+        canonical = self.canonicalizer.canonical_id(profession)
+        if seed is None:
+            seed = canonical
+        category = self.learning_plan_classifier.category(canonical)
+        steps = self.learning_plans.get(category) or self.learning_plans[self.default_learning_plan]
+        fields = {'profession': profession, 'region': region or DEFAULT_REGION}
+        plan = [
+            {
+                "title": title.format_map(fields) if title_formatted else title,
+                "description": description.format_map(fields) if description_formatted else description
+            }
+            for (title, title_formatted), (description, description_formatted) in steps
+        ]
+        if self.skill_step_descriptions:
+            for skill in list(skills)[:MAX_SKILL_STEPS]:
+                # Формулировка зависит только от запроса и навыка: одинаковый запрос - одинаковый план
+                description = seeded_random('skill_step', seed, skill).choice(self.skill_step_descriptions)
+                plan.append({
+                    "title": _render((self.skill_step_title,), dict(fields, skill=skill))[0],
+                    "description": _render((description,), dict(fields, skill=skill))[0]
+                })
+        return plan
+
+    def render(self, profession, region=None, skills=(), seed=None):
+        """
+        Карьерный план в формате ответа модели (hardSkills, softSkills, learningPlan, futureInsights)
+
+        Args:
+            profession (str): Название профессии (подставляется в текст как есть)
+            region (str): Регион; если не указан - "Россия"
+            skills (list): Навыки профессии в порядке изучения (для шагов практики в плане обучения)
+            seed (int): Зерно запроса для выбора формулировок шагов практики
+
+        Returns:
+            dict: Новый словарь с новыми списками (его можно изменять)
+        """
+        canonical = self.canonicalizer.canonical_id(profession)
+        skill_set = self.skill_sets[self.skill_set_by_profession.get(canonical, self.default_skill_set)]
+        fields = {'profession': profession, 'region': region or DEFAULT_REGION}
+        return {
+            "hardSkills": _render(skill_set['hardSkills'], fields),
+            "softSkills": _render(skill_set['softSkills'], fields),
+            "learningPlan": self.learning_plan(profession, region, skills, seed),
+            "futureInsights": _render(skill_set['futureInsights'], fields)
+        }
+
+
+def get_fallback_engine():
+    """Возвращает шаблонный движок из текущего снимка каталога (см. catalog.py)"""
+    from catalog import get_catalog
+
+    return get_catalog().fallback_engine
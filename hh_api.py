@@ -0,0 +1,169 @@
+"""
+Работа с JSON API вакансий HH.ru.
+
+Вместо загрузки HTML-страницы вакансии (alternate_url) используется ответ
+https://api.hh.ru/vacancies/{id}: в нем есть структурированные key_skills,
+описание и зарплата, а размер ответа примерно в 10 раз меньше страницы.
+Загруженные вакансии кешируются в памяти процесса.
+"""
+import html
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import http_client
+
+API_BASE = "https://api.hh.ru"
+
+# Срок жизни вакансии в кеше и максимальное число вакансий в нем
+VACANCY_CACHE_TTL = int(os.environ.get('HH_VACANCY_CACHE_TTL', str(24 * 3600)))
+VACANCY_CACHE_SIZE = 5000
+
+_VACANCY_ID = re.compile(r'/vacanc(?:y|ies)/(\d+)')
+_BLOCK_TAGS = re.compile(r'<\s*/?\s*(?:p|div|ul|ol|li|br|h[1-6]|tr|table)\b[^>]*>', re.IGNORECASE)
+_LIST_ITEM = re.compile(r'<li\b[^>]*>(.*?)</li\s*>', re.IGNORECASE | re.DOTALL)
+_TAG = re.compile(r'<[^>]+>')
+_SPACES = re.compile(r'[ \t\r\f\v]+')
+
+logger = logging.getLogger(__name__)
+
+
+def vacancy_id_from_url(url):
+    """Возвращает id вакансии из URL вида https://hh.ru/vacancy/123 или None"""
+    if not url:
+        return None
+    if str(url).isdigit():
+        return str(url)
+    match = _VACANCY_ID.search(url)
+    return match.group(1) if match else None
+
+
+def strip_html(fragment):
+    """Удаляет теги и раскодирует HTML-сущности"""
+    text = html.unescape(_TAG.sub('', fragment))
+    return _SPACES.sub(' ', text).strip()
+
+
+def html_blocks(description_html):
+    """Разбивает HTML описания на текстовые блоки по блочным тегам (абзацы, пункты списков)"""
+    blocks = (strip_html(part) for part in _BLOCK_TAGS.split(description_html or ''))
+    return [block for block in blocks if block]
+
+
+def html_list_items(description_html):
+    """Возвращает тексты пунктов списков <li> из HTML описания"""
+    return [strip_html(item) for item in _LIST_ITEM.findall(description_html or '')]
+
+
+def vacancy_salary(vacancy):
+    """
+    Возвращает зарплату вакансии в виде словаря
+
+    Returns:
+        dict: {'from', 'to', 'currency', 'gross'} или None, если зарплата не указана
+    """
+    salary = vacancy.get('salary')
+    if not salary or (salary.get('from') is None and salary.get('to') is None):
+        return None
+    return {
+        'from': salary.get('from'),
+        'to': salary.get('to'),
+        'currency': salary.get('currency') or 'RUR',
+        'gross': salary.get('gross')
+    }
+
+
+class VacancyCache:
+    """LRU-кеш вакансий с ограниченным сроком жизни записей"""
+
+    def __init__(self, max_size=VACANCY_CACHE_SIZE, ttl=VACANCY_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, vacancy_id):
+        with self._lock:
+            entry = self._items.get(vacancy_id)
+            if entry is None:
+                return None
+            stored_at, vacancy = entry
+            if time.time() - stored_at >= self.ttl:
+                del self._items[vacancy_id]
+                return None
+            self._items.move_to_end(vacancy_id)
+            return vacancy
+
+    def put(self, vacancy_id, vacancy):
+        with self._lock:
+            self._items[vacancy_id] = (time.time(), vacancy)
+            self._items.move_to_end(vacancy_id)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+
+vacancy_cache = VacancyCache()
+
+
+def fetch_vacancy(vacancy_id, headers=None):
+    """
+    Загружает вакансию из API HH.ru (с учетом кеша)
+
+    Args:
+        vacancy_id (str): Идентификатор вакансии
+        headers (dict): Заголовки запроса
+
+    Returns:
+        dict: JSON вакансии или None, если загрузить не удалось
+    """
+    vacancy_id = str(vacancy_id)
+    vacancy = vacancy_cache.get(vacancy_id)
+    if vacancy is not None:
+        return vacancy
+
+    try:
+        response = http_client.get(f"{API_BASE}/vacancies/{vacancy_id}", headers=headers)
+        if response.status_code != 200:
+            logger.warning(f"Ошибка при загрузке вакансии {vacancy_id} из API HH: {response.status_code}")
+            return None
+        vacancy = response.json()
+    except Exception as e:
+        logger.warning(f"Не удалось загрузить вакансию {vacancy_id} из API HH: {e}")
+        return None
+
+    vacancy_cache.put(vacancy_id, vacancy)
+    return vacancy
+
+
+def fetch_vacancies(vacancy_ids, headers=None):
+    """
+    Загружает несколько вакансий параллельно; вакансии из кеша не запрашиваются повторно
+
+    Args:
+        vacancy_ids (list): Идентификаторы вакансий
+        headers (dict): Заголовки запроса
+
+    Returns:
+        dict: {id вакансии: JSON вакансии} для успешно загруженных вакансий
+    """
+    vacancies = {}
+    missing = []
+    for vacancy_id in dict.fromkeys(str(vacancy_id) for vacancy_id in vacancy_ids):
+        vacancy = vacancy_cache.get(vacancy_id)
+        if vacancy is not None:
+            vacancies[vacancy_id] = vacancy
+        else:
+            missing.append(vacancy_id)
+
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(http_client.FETCH_CONCURRENCY, len(missing)),
+                                thread_name_prefix='hh-api') as pool:
+            for vacancy_id, vacancy in zip(missing, pool.map(lambda v: fetch_vacancy(v, headers), missing)):
+                if vacancy is not None:
+                    vacancies[vacancy_id] = vacancy
+
+    return vacancies
@@ -0,0 +1,302 @@
+"""
+Справочник регионов HH.ru с индексом для быстрого поиска area_id по названию.
+
+Дерево https://api.hh.ru/areas загружается один раз, сохраняется на диск
+(model/cache/hh_areas.json) и обновляется по истечении TTL. Без доступа к сети
+используется сохраненная копия, а если ее нет - снимок data/hh_areas_seed.json
+с основными городами. Запросы к API выполняются в фоновом потоке: обработчики
+запросов получают сохраненную копию (или снимок) сразу и не ждут HH.ru.
+"""
+import bisect
+import difflib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from functools import lru_cache
+
+import requests
+
+AREAS_URL = "https://api.hh.ru/areas"
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_PATH = os.path.join(BASE_DIR, 'model', 'cache', 'hh_areas.json')
+SEED_PATH = os.path.join(BASE_DIR, 'data', 'hh_areas_seed.json')
+
+# Срок жизни сохраненного дерева регионов (по умолчанию неделя)
+AREAS_TTL_SECONDS = int(os.environ.get('HH_AREAS_TTL', str(7 * 24 * 3600)))
+
+# Через сколько секунд повторить загрузку дерева, если API HH.ru был недоступен
+# и использована устаревшая копия или снимок
+AREAS_RETRY_SECONDS = int(os.environ.get('HH_AREAS_RETRY', '600'))
+
+# Количество запомненных результатов поиска региона по названию
+RESOLVE_CACHE_SIZE = 4096
+
+# Таймаут запроса дерева регионов: при отсутствии сети быстро переходим на снимок
+AREAS_REQUEST_TIMEOUT = 5
+
+# Разговорные и сокращенные названия -> название региона в справочнике HH
+ALIASES = {
+    'питер': 'санкт-петербург',
+    'спб': 'санкт-петербург',
+    'с-петербург': 'санкт-петербург',
+    'санкт петербург': 'санкт-петербург',
+    'петербург': 'санкт-петербург',
+    'ленинград': 'санкт-петербург',
+    'saint petersburg': 'санкт-петербург',
+    'st petersburg': 'санкт-петербург',
+    'мск': 'москва',
+    'moscow': 'москва',
+    'мо': 'московская область',
+    'подмосковье': 'московская область',
+    'ло': 'ленинградская область',
+    'екб': 'екатеринбург',
+    'екат': 'екатеринбург',
+    'нск': 'новосибирск',
+    'новосиб': 'новосибирск',
+    'нн': 'нижний новгород',
+    'нижний': 'нижний новгород',
+    'ростов': 'ростов-на-дону',
+    'рф': 'россия',
+    'russia': 'россия',
+    'russian federation': 'россия',
+}
+
+# Слова, обозначающие тип региона: "Свердловская область" ищется и как "свердловская"
+AREA_TYPE_WORDS = ['автономный округ', 'автономная область', 'область', 'обл', 'край', 'республика', 'респ']
+
+_PUNCTUATION = re.compile(r'[.,;:()"«»]+')
+_SPACES = re.compile(r'\s+')
+_CITY_PREFIX = re.compile(r'^(г|город)\s+')
+_TYPE_WORDS = re.compile(r'(^|\s)(' + '|'.join(AREA_TYPE_WORDS) + r')(?=\s|$)')
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_area_name(name):
+    """Приводит название региона к виду для поиска: нижний регистр, е вместо ё, без знаков препинания"""
+    name = (name or '').lower().replace('ё', 'е')
+    name = _PUNCTUATION.sub(' ', name)
+    name = _SPACES.sub(' ', name).strip()
+    return _CITY_PREFIX.sub('', name)
+
+
+class AreaIndex:
+    """
+    Индекс дерева регионов HH.ru: нормализованное название -> area_id
+
+    Поиск выполняется по точному названию, псевдонимам, префиксу и, в последнюю
+    очередь, нечетким сравнением. Результаты поиска запоминаются.
+    """
+
+    def __init__(self, areas_tree, loaded_at=None):
+        """
+        Args:
+            areas_tree (list): Дерево регионов в формате ответа /areas
+            loaded_at (float): Время загрузки дерева (для проверки TTL)
+        """
+        self.loaded_at = loaded_at if loaded_at is not None else time.time()
+        self.names = {}
+        self.titles = {}
+        self.parents = {}
+        self._depths = {}
+        # Названия приходят от пользователей, поэтому число запомненных результатов ограничено
+        self._resolve_name = lru_cache(maxsize=RESOLVE_CACHE_SIZE)(self._resolve_normalized)
+
+        # Обход в ширину: при совпадении названий предпочитаем более крупный регион
+        level = [(area, 0) for area in areas_tree]
+        while level:
+            next_level = []
+            for area, depth in level:
+                area_id = str(area['id'])
+                self.titles[area_id] = area['name']
+                self.parents[area_id] = area.get('parent_id')
+                self._depths[area_id] = depth
+
+                name = normalize_area_name(area['name'])
+                self.names.setdefault(name, area_id)
+                short_name = _SPACES.sub(' ', _TYPE_WORDS.sub(' ', name)).strip()
+                if short_name and short_name != name:
+                    self.names.setdefault(short_name, area_id)
+
+                next_level.extend((child, depth + 1) for child in area.get('areas') or [])
+            level = next_level
+
+        self._sorted_names = sorted(self.names)
+
+    def __len__(self):
+        return len(self.titles)
+
+    def resolve(self, region):
+        """
+        Находит area_id региона по названию
+
+        Args:
+            region (str): Название региона в свободной форме ("Питер", "г. Казань", "Свердловская обл.")
+
+        Returns:
+            str: Идентификатор региона или None, если регион не найден
+        """
+        name = normalize_area_name(region)
+        if not name:
+            return None
+        return self._resolve_name(name)
+
+    def _resolve_normalized(self, name):
+        area_id = self.names.get(name)
+        if area_id is None and name in ALIASES:
+            area_id = self.names.get(ALIASES[name])
+        if area_id is None:
+            area_id = self._resolve_prefix(name)
+        if area_id is None:
+            area_id = self._resolve_fuzzy(name)
+        return area_id
+
+    def _resolve_prefix(self, name):
+        """Ищет регион, название которого начинается с name (самый крупный из подходящих)"""
+        if len(name) < 3:
+            return None
+        position = bisect.bisect_left(self._sorted_names, name)
+        candidates = []
+        for key in self._sorted_names[position:position + 50]:
+            if not key.startswith(name):
+                break
+            area_id = self.names[key]
+            candidates.append((self._depths[area_id], len(key), area_id))
+        return min(candidates)[2] if candidates else None
+
+    def _resolve_fuzzy(self, name):
+        """Нечеткий поиск для опечаток ("Новосибриск", "Екатеринбур")"""
+        matches = difflib.get_close_matches(name, self._sorted_names, n=1, cutoff=0.8)
+        return self.names[matches[0]] if matches else None
+
+
+def _read_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_json_atomic(path, data):
+    """Записывает JSON во временный файл и заменяет им целевой, чтобы не оставить файл наполовину записанным"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def load_areas_tree(cache_path=CACHE_PATH, ttl=AREAS_TTL_SECONDS, headers=None):
+    """
+    Возвращает дерево регионов: из свежего кеша, из API HH.ru или из сохраненного снимка
+
+    Args:
+        cache_path (str): Путь к сохраненному дереву
+        ttl (int): Срок жизни сохраненного дерева в секундах
+        headers (dict): Заголовки запроса к API
+
+    Returns:
+        tuple: (дерево регионов, время его загрузки). Для устаревшей копии и снимка время
+        выбрано так, чтобы загрузка повторилась через AREAS_RETRY_SECONDS, а не через ttl
+    """
+    cached_at = os.path.getmtime(cache_path) if os.path.exists(cache_path) else None
+    if cached_at is not None and time.time() - cached_at < ttl:
+        try:
+            return _read_json(cache_path), cached_at
+        except Exception as e:
+            logger.warning(f"Не удалось прочитать сохраненное дерево регионов: {e}")
+
+    try:
+        response = requests.get(AREAS_URL, headers=headers, timeout=AREAS_REQUEST_TIMEOUT)
+        if response.status_code == 200:
+            areas_tree = response.json()
+            try:
+                _write_json_atomic(cache_path, areas_tree)
+            except Exception as e:
+                logger.warning(f"Не удалось сохранить дерево регионов: {e}")
+            return areas_tree, time.time()
+        logger.warning(f"Ошибка при загрузке дерева регионов HH: {response.status_code}")
+    except requests.exceptions.RequestException as e:
+        logger.warning(f"Дерево регионов HH недоступно, используется сохраненная копия: {e}")
+
+    retry_at = time.time() - ttl + min(AREAS_RETRY_SECONDS, ttl)
+
+    # Устаревший кеш лучше снимка: в нем есть все регионы
+    if cached_at is not None:
+        try:
+            return _read_json(cache_path), retry_at
+        except Exception as e:
+            logger.warning(f"Не удалось прочитать сохраненное дерево регионов: {e}")
+
+    return _read_json(SEED_PATH), retry_at
+
+
+def load_local_areas_tree(cache_path=CACHE_PATH):
+    """
+    Возвращает сохраненное дерево регионов, а если его нет - снимок, без обращения к API
+
+    Returns:
+        tuple: (дерево регионов, время его загрузки); у снимка время 0, чтобы дерево сразу обновилось
+    """
+    if os.path.exists(cache_path):
+        try:
+            return _read_json(cache_path), os.path.getmtime(cache_path)
+        except Exception as e:
+            logger.warning(f"Не удалось прочитать сохраненное дерево регионов: {e}")
+    return _read_json(SEED_PATH), 0.0
+
+
+_area_index = None
+_area_index_lock = threading.Lock()
+_refreshing = False
+
+
+def get_area_index(headers=None):
+    """
+    Возвращает общий индекс регионов
+
+    При первом обращении индекс строится по сохраненной копии или снимку. Если дерево
+    устарело, оно перезагружается в фоновом потоке, а до конца загрузки возвращается
+    прежний индекс.
+    """
+    global _area_index
+    index = _area_index
+    if index is None:
+        with _area_index_lock:
+            if _area_index is None:
+                areas_tree, loaded_at = load_local_areas_tree()
+                _area_index = AreaIndex(areas_tree, loaded_at)
+                logger.info(f"Индекс регионов HH загружен: {len(_area_index)} регионов")
+            index = _area_index
+    if time.time() - index.loaded_at >= AREAS_TTL_SECONDS:
+        _start_refresh(headers)
+    return index
+
+
+def _start_refresh(headers):
+    """Запускает фоновую перезагрузку дерева регионов, если она еще не идет"""
+    global _refreshing
+    with _area_index_lock:
+        if _refreshing:
+            return
+        _refreshing = True
+    threading.Thread(target=_refresh_area_index, args=(headers,), name='hh-areas-refresh', daemon=True).start()
+
+
+def _refresh_area_index(headers):
+    global _area_index, _refreshing
+    try:
+        areas_tree, loaded_at = load_areas_tree(headers=headers)
+        index = AreaIndex(areas_tree, loaded_at)
+        with _area_index_lock:
+            _area_index = index
+        logger.info(f"Индекс регионов HH обновлен: {len(index)} регионов")
+    except Exception as e:
+        # Прежний индекс остается; следующая попытка - через AREAS_RETRY_SECONDS
+        logger.warning(f"Не удалось обновить индекс регионов HH: {e}")
+        _area_index.loaded_at = time.time() - AREAS_TTL_SECONDS + min(AREAS_RETRY_SECONDS, AREAS_TTL_SECONDS)
+    finally:
+        with _area_index_lock:
+            _refreshing = False
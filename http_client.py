@@ -0,0 +1,76 @@
+"""
+Общий HTTP-клиент для запросов к HH.ru.
+
+Одна сессия requests с пулом соединений на процесс (соединения переиспользуются
+между запросами и потоками) и ограничение частоты запросов к каждому хосту,
+чтобы параллельная загрузка вакансий не упиралась в лимиты HH.ru.
+"""
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Максимум одновременных загрузок (и размер пула соединений на хост)
+FETCH_CONCURRENCY = int(os.environ.get('HH_FETCH_CONCURRENCY', '16'))
+
+# Допустимое число запросов в секунду к одному хосту
+REQUESTS_PER_SECOND_PER_HOST = float(os.environ.get('HH_REQUESTS_PER_SECOND', '20'))
+
+# Таймауты (подключение, чтение) в секундах
+REQUEST_TIMEOUT = (5, 15)
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+
+class HostRateLimiter:
+    """Равномерно распределяет запросы к каждому хосту: не чаще rate запросов в секунду"""
+
+    def __init__(self, rate=REQUESTS_PER_SECOND_PER_HOST):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_allowed = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        """Блокирует поток до момента, когда к хосту из url можно отправить запрос"""
+        if not self.interval:
+            return
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_allowed.get(host, now))
+            self._next_allowed[host] = slot + self.interval
+        # Ждем вне блокировки, чтобы не задерживать запросы к другим хостам
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+_session = None
+_session_lock = threading.Lock()
+rate_limiter = HostRateLimiter()
+
+
+def get_session():
+    """Возвращает общую сессию requests с пулом соединений"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=FETCH_CONCURRENCY, max_retries=1)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers.update(DEFAULT_HEADERS)
+                _session = session
+    return _session
+
+
+def get(url, params=None, headers=None, timeout=REQUEST_TIMEOUT):
+    """GET-запрос через общую сессию с учетом ограничения частоты запросов к хосту"""
+    rate_limiter.wait(url)
+    return get_session().get(url, params=params, headers=headers, timeout=timeout)
@@ -1,4 +1,6 @@
 import requests
+import asyncio
+import atexit
 import json
 import os
 import pickle
@@ -7,7 +9,33 @@ from typing import Dict, List, Any, Optional, Union
 import logging
 import re
 import hashlib
+import threading
 import traceback
+import weakref
+
+from metrics import span, record_cache, LLM_INFLIGHT, LLM_REQUEST_SECONDS
+from fallback import get_fallback_engine
+from embeddings import create_embedder
+from semantic_cache import SEMANTIC_CACHE_ENABLED, SemanticCache
+from text_pipeline import strip_code_fence, strip_think
+
+# Через сколько секунд отказ LM Studio считается устаревшим и сервер проверяется снова при запросе
+SERVER_RECHECK_SECONDS = float(os.environ.get('LLM_RECHECK_SECONDS', '15'))
+
+# aiohttp нужен только асинхронному транспорту, поэтому импортируется при первом использовании
+_aiohttp = None
+
+
+def _get_aiohttp():
+    """Возвращает модуль aiohttp или None, если он не установлен"""
+    global _aiohttp
+    if _aiohttp is None:
+        try:
+            import aiohttp
+            _aiohttp = aiohttp
+        except ImportError:
+            _aiohttp = False
+    return _aiohttp or None
 
 # Настраиваем логирование
 logging.basicConfig(
@@ -77,31 +105,158 @@ class LocalLLM:
         self.model = model
         self.system_prompt = system_prompt
         
-        # Создаем директорию для кеша, если она не существует
+        # Директория и файл кеша; сам кеш загружается при первом обращении,
+        # а доступность сервера проверяется фоновой пробой, чтобы конструктор не блокировал запуск
         self.cache_dir = cache_dir
-        os.makedirs(self.cache_dir, exist_ok=True)
-        
-        # Путь к файлу кеша
         self.cache_file = os.path.join(self.cache_dir, "llm_cache.json")
+        self._cache = None
         
-        # Загружаем кеш, если он существует
-        self.cache = self._load_cache()
+        # Результат последней проверки LM Studio (None - проверка еще не выполнялась) и ее время
+        self._server_available = None
+        self.server_checked_at = 0.0
+        self._recheck_lock = threading.Lock()
         
-        # Проверяем доступность сервера
-        self._check_server()
+        # Сессии aiohttp по циклам событий: соединения с LM Studio переиспользуются между запросами.
+        # Сессия привязана к циклу, в котором создана, поэтому у каждого цикла своя
+        self._aiohttp_sessions = weakref.WeakKeyDictionary()
+        self._aiohttp_sessions_lock = threading.Lock()
+        atexit.register(self.close)
+        
+        # Семантический кеш карьерных планов (создается при первом обращении)
+        self._semantic_cache = None
+        self._semantic_cache_lock = threading.Lock()
+    
+    @property
+    def server_available(self) -> Optional[bool]:
+        """Результат последней проверки LM Studio"""
+        return self._server_available
+    
+    @server_available.setter
+    def server_available(self, value: Optional[bool]):
+        self._server_available = value
+        self.server_checked_at = time.monotonic()
+    
+    def server_known_down(self) -> bool:
+        """
+        True, если LM Studio недоступна по последней проверке
+        
+        Отказ старше SERVER_RECHECK_SECONDS перепроверяется синхронно, поэтому
+        после восстановления LM Studio запросы не остаются на шаблонах, даже если
+        фоновая проба остановилась. Проверяет один поток, остальные в это время
+        используют прежний результат.
+        """
+        if self.server_available is not False:
+            return False
+        if time.monotonic() - self.server_checked_at < SERVER_RECHECK_SECONDS:
+            return True
+        if not self._recheck_lock.acquire(blocking=False):
+            return True
+        try:
+            return not self._check_server()
+        finally:
+            self._recheck_lock.release()
+    
+    @property
+    def cache(self) -> Dict:
+        """Кеш ответов модели, загружаемый с диска при первом обращении"""
+        if self._cache is None:
+            self._cache = self._load_cache()
+        return self._cache
+    
+    @property
+    def semantic_cache(self) -> Optional[SemanticCache]:
+        """Семантический кеш карьерных планов или None, если он отключен (SEMANTIC_CACHE=0)"""
+        if self._semantic_cache is None and SEMANTIC_CACHE_ENABLED:
+            with self._semantic_cache_lock:
+                if self._semantic_cache is None:
+                    self._semantic_cache = SemanticCache(create_embedder(self.api_base))
+        return self._semantic_cache
+    
+    def _roadmap_cache(self, user_info: str) -> Optional[SemanticCache]:
+        """Семантический кеш для запроса: персональные планы (с информацией о пользователе) не кешируются"""
+        return None if user_info else self.semantic_cache
     
     def _check_server(self) -> bool:
         """Проверяет доступность сервера LM Studio"""
         try:
-            response = requests.get(f"{self.api_base}/models")
+            response = requests.get(f"{self.api_base}/models", timeout=5)
             if response.status_code == 200:
                 logger.info(f"LM Studio доступен и работает. Модели: {response.json()}")
+                self.server_available = True
                 return True
             else:
                 logger.warning(f"LM Studio недоступен, код ответа: {response.status_code}")
+                self.server_available = False
+                return False
+        except Exception as e:
+            logger.error(f"Ошибка при проверке LM Studio: {e}")
+            self.server_available = False
+            return False
+    
+    def is_available(self) -> bool:
+        """
+        Проверяет доступность LM Studio для периодической пробы готовности
+        
+        В отличие от _check_server, пишет в журнал только смену доступности, а не
+        список моделей при каждой проверке.
+        """
+        previous = self.server_available
+        try:
+            response = requests.get(f"{self.api_base}/models", timeout=5)
+            available = response.status_code == 200
+            reason = f"код ответа: {response.status_code}"
+        except Exception as e:
+            available, reason = False, str(e)
+        self.server_available = available
+        if available != previous:
+            if available:
+                logger.info("LM Studio доступен")
+            else:
+                logger.warning(f"LM Studio недоступен, {reason}")
+        return available
+    
+    def _aiohttp_session(self):
+        """Сессия aiohttp текущего цикла событий (создается при первом запросе из цикла)"""
+        loop = asyncio.get_running_loop()
+        with self._aiohttp_sessions_lock:
+            session = self._aiohttp_sessions.get(loop)
+            if session is None or session.closed:
+                session = _get_aiohttp().ClientSession()
+                self._aiohttp_sessions[loop] = session
+        return session
+    
+    def close(self):
+        """Закрывает сессии aiohttp циклов, работающих в других потоках (при завершении процесса)"""
+        with self._aiohttp_sessions_lock:
+            sessions = list(self._aiohttp_sessions.items())
+            self._aiohttp_sessions.clear()
+        for loop, session in sessions:
+            if loop.is_running() and not session.closed:
+                try:
+                    asyncio.run_coroutine_threadsafe(session.close(), loop).result(timeout=5)
+                except Exception as e:
+                    logger.warning(f"Не удалось закрыть сессию aiohttp: {e}")
+    
+    async def _acheck_server(self, session=None) -> bool:
+        """Асинхронно проверяет доступность сервера LM Studio"""
+        aiohttp = _get_aiohttp()
+        if aiohttp is None:
+            return await asyncio.to_thread(self._check_server)
+        
+        if session is None:
+            session = self._aiohttp_session()
+        try:
+            async with session.get(f"{self.api_base}/models", timeout=aiohttp.ClientTimeout(total=10)) as response:
+                if response.status == 200:
+                    logger.info(f"LM Studio доступен и работает. Модели: {await response.json()}")
+                    self.server_available = True
+                    return True
+                logger.warning(f"LM Studio недоступен, код ответа: {response.status}")
+                self.server_available = False
                 return False
         except Exception as e:
             logger.error(f"Ошибка при проверке LM Studio: {e}")
+            self.server_available = False
             return False
     
     def _load_cache(self) -> Dict:
@@ -118,6 +273,7 @@ class LocalLLM:
     def _save_cache(self):
         """Сохраняет кеш в файл"""
         try:
+            os.makedirs(self.cache_dir, exist_ok=True)
             with open(self.cache_file, "wb") as f:
                 pickle.dump(self.cache, f)
         except Exception as e:
@@ -146,33 +302,91 @@ class LocalLLM:
         """
         # Сокращенный ключ кеша для более эффективного поиска
         cache_key = f"{prompt}_{max_tokens}_{temperature}"
-        if use_cache and cache_key in self.cache:
-            logger.info("Используем кешированный ответ")
-            return self.cache[cache_key]
+        if use_cache:
+            record_cache('llm_response', cache_key in self.cache)
+            if cache_key in self.cache:
+                logger.info("Используем кешированный ответ")
+                return self.cache[cache_key]
         
-        messages = []
+        messages = self._build_messages(prompt, include_system_prompt)
         
-        if include_system_prompt:
-            messages.append({"role": "system", "content": self.system_prompt})
+        response_text = self._generate_with_llm(
+            messages=messages, 
+            temperature=temperature,
+            max_tokens=max_tokens,
+            top_p=top_p
+        )
         
-        messages.append({"role": "user", "content": prompt})
+        return self._finalize_response(response_text, cache_key, use_cache)
+    
+    async def agenerate(self, 
+                        prompt: str, 
+                        use_cache: bool = False,
+                        max_tokens: int = 2048,
+                        temperature: float = 0.5,
+                        top_p: float = 0.9,
+                        include_system_prompt: bool = True) -> Optional[str]:
+        """
+        Асинхронная версия generate: ожидание ответа модели не блокирует поток,
+        поэтому один процесс может одновременно держать много запросов к LM Studio
         
-        response_text = self._generate_with_llm(
+        Args:
+            prompt: Текст промпта
+            use_cache: Использовать ли кеш
+            max_tokens: Максимальное количество токенов в ответе
+            temperature: Температура генерации (0.1 - 1.0)
+            top_p: Параметр top_p для генерации
+            include_system_prompt: Включать ли системный промпт
+            
+        Returns:
+            Сгенерированный текст или None в случае ошибки
+        """
+        cache_key = f"{prompt}_{max_tokens}_{temperature}"
+        if use_cache:
+            record_cache('llm_response', cache_key in self.cache)
+            if cache_key in self.cache:
+                logger.info("Используем кешированный ответ")
+                return self.cache[cache_key]
+        
+        messages = self._build_messages(prompt, include_system_prompt)
+        
+        response_text = await self._agenerate_with_llm(
             messages=messages, 
             temperature=temperature,
             max_tokens=max_tokens,
             top_p=top_p
         )
         
+        return self._finalize_response(response_text, cache_key, use_cache)
+    
+    def _build_messages(self, prompt: str, include_system_prompt: bool = True) -> List[Dict]:
+        """Формирует список сообщений для чата из промпта"""
+        messages = []
+        
+        if include_system_prompt:
+            messages.append({"role": "system", "content": self.system_prompt})
+        
+        messages.append({"role": "user", "content": prompt})
+        return messages
+    
+    def _finalize_response(self, response_text: Optional[str], cache_key: str, use_cache: bool) -> Optional[str]:
+        """
+        Очищает сырой ответ модели и сохраняет его в кеш
+        
+        Args:
+            response_text: Сырой ответ модели
+            cache_key: Ключ кеша для ответа
+            use_cache: Сохранять ли ответ в кеш
+            
+        Returns:
+            Очищенный текст или None, если ответ пустой
+        """
         if not response_text:
             logger.warning("Получен пустой ответ от модели")
             return None
         
-        # Удаляем теги <think> из ответа
-        clean_response = re.sub(r'<think>.*?</think>', '', response_text, flags=re.DOTALL) 
-        
-        # Также удаляем все оставшиеся теги <think> и </think> (на случай, если некоторые не закрыты)
-        clean_response = clean_response.replace('<think>', '').replace('</think>', '')
+        # Удаляем теги <think> из ответа (и незакрытые теги)
+        clean_response = strip_think(response_text)
         
         # Сохраняем очищенные ответы для отладки
         try:
@@ -247,14 +461,104 @@ class LocalLLM:
         if not profession:
             logger.error("Не указана профессия для генерации плана")
             return {}
+        
+        # План для того же или похожего запроса (каноническая профессия, уровень и регион) уже получен
+        cache = self._roadmap_cache(user_info)
+        if cache is not None:
+            hit = cache.get(profession, region)
+            record_cache('semantic_roadmap', hit is not None)
+            if hit is not None:
+                logger.info(f"Карьерный план из семантического кеша: '{hit.query}' (сходство {hit.similarity:.3f})")
+                return hit.value
             
         # Проверяем доступность LM Studio перед началом генерации
         if not self._check_server():
             logger.error("LM Studio недоступен, невозможно сгенерировать карьерный план")
             return {}
         
-        # Формируем запрос для модели
-        prompt = f"""Ты - опытный карьерный консультант и эксперт по профориентации с 15-летним опытом работы. Сгенерируй детальный, конкретный карьерный план для профессии "{profession}" в регионе "{region}" в формате JSON.
+        prompt = self._build_roadmap_prompt(profession, region, user_info)
+        default_result = self._build_default_roadmap(profession, region)
+        
+        # Делаем несколько попыток получить валидный JSON от модели с разными температурами
+        for attempt in range(1, 4):
+            logger.info(f"Попытка {attempt} получить карьерный план")
+            
+            # Для модели qwen3-8b используем более низкую температуру
+            temperature = self._roadmap_temperature(attempt)
+            
+            response_text = self.generate(prompt, temperature=temperature, max_tokens=4096)
+            
+            with span('json_repair'):
+                roadmap = self._parse_roadmap_response(response_text, attempt, profession, default_result)
+            if roadmap is not None:
+                if cache is not None:
+                    cache.put(profession, region, roadmap)
+                return roadmap
+        
+        # Если все попытки неудачны, возвращаем значение по умолчанию
+        logger.warning("Все попытки получить карьерный план не удались, возвращаю значение по умолчанию")
+        
+        return default_result
+    
+    async def agenerate_roadmap(self, profession: str, region: str, user_info: str = "") -> Dict:
+        """
+        Асинхронная версия generate_roadmap с теми же попытками, проверками и значениями по умолчанию
+        
+        Args:
+            profession (str): Название профессии
+            region (str): Регион (для учета региональной специфики)
+            user_info (str): Информация о пользователе для персонализации
+            
+        Returns:
+            Dict: Структурированный план карьерного развития
+        """
+        logger.info(f"Асинхронная генерация карьерного плана для профессии '{profession}' в регионе '{region}'")
+        
+        if not profession:
+            logger.error("Не указана профессия для генерации плана")
+            return {}
+        
+        cache = self._roadmap_cache(user_info)
+        if cache is not None:
+            hit = await cache.aget(profession, region)
+            record_cache('semantic_roadmap', hit is not None)
+            if hit is not None:
+                logger.info(f"Карьерный план из семантического кеша: '{hit.query}' (сходство {hit.similarity:.3f})")
+                return hit.value
+        
+        if not await self._acheck_server():
+            logger.error("LM Studio недоступен, невозможно сгенерировать карьерный план")
+            return {}
+        
+        prompt = self._build_roadmap_prompt(profession, region, user_info)
+        default_result = self._build_default_roadmap(profession, region)
+        
+        for attempt in range(1, 4):
+            logger.info(f"Попытка {attempt} получить карьерный план")
+            
+            temperature = self._roadmap_temperature(attempt)
+            
+            response_text = await self.agenerate(prompt, temperature=temperature, max_tokens=4096)
+            
+            with span('json_repair'):
+                roadmap = self._parse_roadmap_response(response_text, attempt, profession, default_result)
+            if roadmap is not None:
+                if cache is not None:
+                    await asyncio.to_thread(cache.put, profession, region, roadmap)
+                return roadmap
+        
+        logger.warning("Все попытки получить карьерный план не удались, возвращаю значение по умолчанию")
+        
+        return default_result
+    
+    @staticmethod
+    def _roadmap_temperature(attempt: int) -> float:
+        """Температура генерации для номера попытки: каждая следующая попытка строже"""
+        return 0.1 if attempt == 1 else 0.05 if attempt == 2 else 0.02
+    
+    def _build_roadmap_prompt(self, profession: str, region: str, user_info: str = "") -> str:
+        """Формирует запрос к модели для генерации карьерного плана"""
+        return f"""Ты - опытный карьерный консультант и эксперт по профориентации с 15-летним опытом работы. Сгенерируй детальный, конкретный карьерный план для профессии "{profession}" в регионе "{region}" в формате JSON.
 
 В результат должны входить следующие разделы:
 1. hardSkills - список из 5-7 ключевых технических навыков, необходимых в профессии (ОБЯЗАТЕЛЬНО с уровнем владения и конкретными примерами применения)
@@ -294,185 +598,142 @@ class LocalLLM:
 ВАЖНО: В секции learningPlan НЕ УПОМИНАЙ конкретные ресурсы, книги, курсы или сайты. Указывай ТОЛЬКО ТЕМЫ для изучения и НАВЫКИ для освоения, без рекомендаций по учебным материалам.
 """
 
-        # Используем общий метод для стандартного плана обучения
+    def _build_default_roadmap(self, profession: str, region: str) -> Dict:
+        """Формирует карьерный план по умолчанию, которым дополняются неполные ответы модели"""
+        # Шаблоны по категориям профессий (data/fallback_roadmaps.json) скомпилированы при загрузке каталога
         logger.info(f"Использую стандартный план обучения для профессии: {profession}")
+        return get_fallback_engine().render(profession, region)
+    
+    def _parse_roadmap_response(self, response_text: Optional[str], attempt: int, profession: str,
+                                default_result: Dict) -> Optional[Dict]:
+        """
+        Разбирает ответ модели для одной попытки генерации карьерного плана
         
-        # Подготавливаем структуру для результата по умолчанию
-        if profession.lower() in ["повар", "шеф-повар", "кулинар"]:
-            default_hard_skills = [
-                "Знание технологии приготовления различных блюд, включая русскую и европейскую кухню",
-                "Умение работать с профессиональным кухонным оборудованием (пароконвектоматы, шоковая заморозка)",
-                "Знание санитарных норм и правил безопасности в соответствии с СанПиН",
-                "Навыки профессиональной нарезки продуктов разного типа и текстуры",
-                "Знание сезонных продуктов и умение составлять меню с их использованием"
-            ]
-            default_soft_skills = [
-                "Работа в команде - умение эффективно коммуницировать в условиях горячего цеха",
-                "Стрессоустойчивость - способность сохранять концентрацию во время пиковых нагрузок",
-                "Умение работать в условиях многозадачности, выполняя несколько операций одновременно",
-                "Пунктуальность - строгое соблюдение таймингов приготовления блюд",
-                "Внимание к деталям, особенно в части презентации блюд и контроля качества"
-            ]
-            default_future_insights = [
-                f"Рост спроса на национальную кухню в регионе {region}, особенно на локальные продукты",
-                "Тренд на использование сезонных локальных продуктов с минимальным углеродным следом",
-                "Увеличение спроса на здоровое питание, включая блюда для веганов и безглютеновые опции",
-                "Развитие направления онлайн мастер-классов по кулинарии как дополнительный источник дохода шеф-поваров"
-            ]
-        else:
-            default_hard_skills = [
-                f"Ключевой профессиональный навык для {profession} с указанием конкретных инструментов",
-                f"Основные технологии в профессии {profession} с примерами применения",
-                f"Специализированное программное обеспечение для {profession} с указанием версий",
-                f"Методологии работы в сфере {profession} с конкретными примерами",
-                f"Технические стандарты в профессии {profession} с требуемым уровнем знаний"
-            ]
-            default_soft_skills = [
-                "Эффективная коммуникация с различными типами стейкхолдеров в профессиональном контексте",
-                "Адаптивность к быстро меняющимся технологиям и требованиям в профессиональной сфере", 
-                "Навыки командной работы с использованием современных инструментов коллаборации", 
-                "Организованность и управление временем с применением методик тайм-менеджмента",
-                "Аналитическое мышление для решения комплексных профессиональных задач"
-            ]
-            default_future_insights = [
-                f"Изменение требований к специалистам {profession} в {region} в ближайшие 2-3 года",
-                f"Рост средней заработной платы в сфере {profession} на 15-20% в течение следующих 3-5 лет",
-                f"Появление новых специализаций внутри профессии {profession} из-за технологических изменений",
-                f"Увеличение спроса на специалистов {profession} со знанием смежных областей и технологий"
-            ]
-        
-        default_result = {
-            "hardSkills": default_hard_skills,
-            "softSkills": default_soft_skills,
-            "learningPlan": self._get_default_learning_plan(profession),
-            "futureInsights": default_future_insights
-        }
-        
-        # Делаем несколько попыток получить валидный JSON от модели с разными температурами
-        for attempt in range(1, 4):
-            logger.info(f"Попытка {attempt} получить карьерный план")
-            
-            # Для модели qwen3-8b используем более низкую температуру
-            temperature = 0.1 if attempt == 1 else 0.05 if attempt == 2 else 0.02
-            max_tokens = 4096  # Максимальное количество токенов для ответа
-            
-            response_text = self.generate(prompt, temperature=temperature, max_tokens=max_tokens)
-            
-            # Если ответ пустой, переходим к следующей попытке
-            if not response_text:
-                logger.warning(f"Получен пустой ответ в попытке {attempt}")
-                continue
+        Args:
+            response_text: Ответ модели
+            attempt: Номер попытки (на последней применяется агрессивное извлечение JSON)
+            profession: Название профессии
+            default_result: План по умолчанию для дополнения недостающих полей
             
-            # Сохраняем оригинальный ответ для отладки
-            try:
-                debug_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'model', 'debug')
-                os.makedirs(debug_dir, exist_ok=True)
-                with open(os.path.join(debug_dir, f'roadmap_attempt_{attempt}.txt'), 'w', encoding='utf-8') as f:
-                    f.write(response_text)
-            except Exception as e:
-                logger.warning(f"Не удалось сохранить ответ для отладки: {e}")
+        Returns:
+            Карьерный план или None, если нужна следующая попытка
+        """
+        default_hard_skills = default_result["hardSkills"]
+        default_soft_skills = default_result["softSkills"]
+        default_learning_plan = default_result["learningPlan"]
+        default_future_insights = default_result["futureInsights"]
+        
+        # Если ответ пустой, переходим к следующей попытке
+        if not response_text:
+            logger.warning(f"Получен пустой ответ в попытке {attempt}")
+            return None
+        
+        # Сохраняем оригинальный ответ для отладки
+        try:
+            debug_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'model', 'debug')
+            os.makedirs(debug_dir, exist_ok=True)
+            with open(os.path.join(debug_dir, f'roadmap_attempt_{attempt}.txt'), 'w', encoding='utf-8') as f:
+                f.write(response_text)
+        except Exception as e:
+            logger.warning(f"Не удалось сохранить ответ для отладки: {e}")
+        
+        # Очищаем ответ от возможных текстовых обрамлений
+        cleaned_response = response_text
+        
+        # Удаляем маркеры кода markdown, если они есть
+        cleaned_response = strip_code_fence(cleaned_response)
+        
+        # Удаляем вводный текст до начала JSON
+        if '{' in cleaned_response:
+            start_idx = cleaned_response.find('{')
+            cleaned_response = cleaned_response[start_idx:]
+        
+        # Удаляем текст после JSON
+        if '}' in cleaned_response:
+            end_idx = cleaned_response.rfind('}') + 1
+            cleaned_response = cleaned_response[:end_idx]
+        
+        logger.info(f"Очищенный ответ: {cleaned_response[:100]}...")
+        
+        # Пробуем извлечь JSON из очищенного ответа
+        try:
+            roadmap = json.loads(cleaned_response)
+            logger.info("Успешно извлечен JSON из очищенного ответа")
             
-            # Очищаем ответ от возможных текстовых обрамлений
-            cleaned_response = response_text
+            # Проверяем наличие необходимых полей и корректность их формата
+            is_valid = True
             
-            # Удаляем маркеры кода markdown, если они есть
-            cleaned_response = re.sub(r'^```json\s*', '', cleaned_response)
-            cleaned_response = re.sub(r'\s*```$', '', cleaned_response)
+            # Проверка hardSkills
+            if 'hardSkills' not in roadmap or not isinstance(roadmap['hardSkills'], list) or len(roadmap['hardSkills']) < 3:
+                logger.warning("Отсутствуют или недостаточно hardSkills")
+                is_valid = False
+                # Если поле есть, но некорректное - исправляем
+                if 'hardSkills' in roadmap and (not isinstance(roadmap['hardSkills'], list) or len(roadmap['hardSkills']) < 3):
+                    roadmap['hardSkills'] = default_hard_skills
             
-            # Удаляем вводный текст до начала JSON
-            if '{' in cleaned_response:
-                start_idx = cleaned_response.find('{')
-                cleaned_response = cleaned_response[start_idx:]
+            # Проверка softSkills
+            if 'softSkills' not in roadmap or not isinstance(roadmap['softSkills'], list) or len(roadmap['softSkills']) < 3:
+                logger.warning("Отсутствуют или недостаточно softSkills")
+                is_valid = False
+                # Если поле есть, но некорректное - исправляем
+                if 'softSkills' in roadmap and (not isinstance(roadmap['softSkills'], list) or len(roadmap['softSkills']) < 3):
+                    roadmap['softSkills'] = default_soft_skills
             
-            # Удаляем текст после JSON
-            if '}' in cleaned_response:
-                end_idx = cleaned_response.rfind('}') + 1
-                cleaned_response = cleaned_response[:end_idx]
+            # Проверка learningPlan
+            if 'learningPlan' not in roadmap or not isinstance(roadmap['learningPlan'], list) or len(roadmap['learningPlan']) < 3:
+                logger.warning("Отсутствует или недостаточно этапов в learningPlan")
+                is_valid = False
+                # Если поле есть, но некорректное - исправляем
+                if 'learningPlan' in roadmap and (not isinstance(roadmap['learningPlan'], list) or len(roadmap['learningPlan']) < 3):
+                    roadmap['learningPlan'] = default_learning_plan
             
-            logger.info(f"Очищенный ответ: {cleaned_response[:100]}...")
+            # Проверка futureInsights
+            if 'futureInsights' not in roadmap or not isinstance(roadmap['futureInsights'], list) or len(roadmap['futureInsights']) < 3:
+                logger.warning("Отсутствуют или недостаточно futureInsights")
+                is_valid = False
+                # Если поле есть, но некорректное - исправляем
+                if 'futureInsights' in roadmap and (not isinstance(roadmap['futureInsights'], list) or len(roadmap['futureInsights']) < 3):
+                    roadmap['futureInsights'] = default_future_insights
             
-            # Пробуем извлечь JSON из очищенного ответа
-            try:
-                roadmap = json.loads(cleaned_response)
-                logger.info("Успешно извлечен JSON из очищенного ответа")
-                
-                # Проверяем наличие необходимых полей и корректность их формата
-                is_valid = True
-                
-                # Проверка hardSkills
-                if 'hardSkills' not in roadmap or not isinstance(roadmap['hardSkills'], list) or len(roadmap['hardSkills']) < 3:
-                    logger.warning("Отсутствуют или недостаточно hardSkills")
-                    is_valid = False
-                    # Если поле есть, но некорректное - исправляем
-                    if 'hardSkills' in roadmap and (not isinstance(roadmap['hardSkills'], list) or len(roadmap['hardSkills']) < 3):
-                        roadmap['hardSkills'] = default_hard_skills
-                
-                # Проверка softSkills
-                if 'softSkills' not in roadmap or not isinstance(roadmap['softSkills'], list) or len(roadmap['softSkills']) < 3:
-                    logger.warning("Отсутствуют или недостаточно softSkills")
-                    is_valid = False
-                    # Если поле есть, но некорректное - исправляем
-                    if 'softSkills' in roadmap and (not isinstance(roadmap['softSkills'], list) or len(roadmap['softSkills']) < 3):
-                        roadmap['softSkills'] = default_soft_skills
+            # Если план в целом валидный или мы исправили все проблемы, возвращаем его
+            if is_valid:
+                logger.info(f"Успешно сгенерирован карьерный план в попытке {attempt}")
+                return roadmap
+            else:
+                # Если удалось извлечь JSON, но некоторые поля отсутствуют или некорректны,
+                # добавляем недостающие поля из дефолтных значений
+                for key in default_result:
+                    if key not in roadmap or not roadmap[key]:
+                        roadmap[key] = default_result[key]
                 
-                # Проверка learningPlan
-                if 'learningPlan' not in roadmap or not isinstance(roadmap['learningPlan'], list) or len(roadmap['learningPlan']) < 3:
-                    logger.warning("Отсутствует или недостаточно этапов в learningPlan")
-                    is_valid = False
-                    # Если поле есть, но некорректное - исправляем
-                    if 'learningPlan' in roadmap and (not isinstance(roadmap['learningPlan'], list) or len(roadmap['learningPlan']) < 3):
-                        roadmap['learningPlan'] = self._get_default_learning_plan(profession)
+                logger.info("Карьерный план был неполным, но успешно дополнен недостающими полями")
+                return roadmap
                 
-                # Проверка futureInsights
-                if 'futureInsights' not in roadmap or not isinstance(roadmap['futureInsights'], list) or len(roadmap['futureInsights']) < 3:
-                    logger.warning("Отсутствуют или недостаточно futureInsights")
-                    is_valid = False
-                    # Если поле есть, но некорректное - исправляем
-                    if 'futureInsights' in roadmap and (not isinstance(roadmap['futureInsights'], list) or len(roadmap['futureInsights']) < 3):
-                        roadmap['futureInsights'] = default_future_insights
+        except json.JSONDecodeError as e:
+            logger.error(f"Ошибка при разборе JSON: {e}")
+            # Переходим к агрессивному извлечению или следующей попытке
+        
+        # Если с прямым извлечением не получилось, пробуем агрессивные методы
+        if attempt == 3:  # На последней попытке
+            try:
+                # Пробуем извлечь JSON агрессивным методом
+                roadmap = self._aggressive_json_extract(response_text)
                 
-                # Если план в целом валидный или мы исправили все проблемы, возвращаем его
-                if is_valid:
-                    logger.info(f"Успешно сгенерирован карьерный план в попытке {attempt}")
-                    return roadmap
-                else:
-                    # Если удалось извлечь JSON, но некоторые поля отсутствуют или некорректны,
-                    # добавляем недостающие поля из дефолтных значений
+                # Если что-то удалось извлечь
+                if roadmap:
+                    logger.info("Удалось извлечь JSON агрессивным методом")
+                    
+                    # Проверяем и дополняем недостающие поля
                     for key in default_result:
                         if key not in roadmap or not roadmap[key]:
                             roadmap[key] = default_result[key]
-                    
-                    logger.info("Карьерный план был неполным, но успешно дополнен недостающими полями")
+                            
                     return roadmap
                     
-            except json.JSONDecodeError as e:
-                logger.error(f"Ошибка при разборе JSON: {e}")
-                # Продолжаем цикл для следующей попытки
-            
-            # Если с прямым извлечением не получилось, пробуем агрессивные методы
-            if attempt == 3:  # На последней попытке
-                try:
-                    # Пробуем извлечь JSON агрессивным методом
-                    roadmap = self._aggressive_json_extract(response_text)
-                    
-                    # Если что-то удалось извлечь
-                    if roadmap:
-                        logger.info("Удалось извлечь JSON агрессивным методом")
-                        
-                        # Проверяем и дополняем недостающие поля
-                        for key in default_result:
-                            if key not in roadmap or not roadmap[key]:
-                                roadmap[key] = default_result[key]
-                                
-                        return roadmap
-                        
-                except Exception as e:
-                    logger.error(f"Ошибка при агрессивном извлечении JSON: {e}")
-        
-        # Если все попытки неудачны, возвращаем значение по умолчанию
-        logger.warning("Все попытки получить карьерный план не удались, возвращаю значение по умолчанию")
+            except Exception as e:
+                logger.error(f"Ошибка при агрессивном извлечении JSON: {e}")
         
-        return default_result
+        return None
     
     def _generate_with_llm(self, messages, temperature=0.7, max_tokens=2048, top_p=0.9, user_prompt=None):
         """
@@ -500,43 +761,9 @@ class LocalLLM:
             if result:
                 return result
         
-        # Подготовка сообщений в формате ChatML
-        formatted_messages = []
-        for msg in messages:
-            formatted_messages.append({
-                "role": msg["role"], 
-                "content": msg["content"]
-            })
-        
-        # Устанавливаем таймаут в зависимости от модели
-        # qwen3-8b требует больше времени для генерации
-        if "qwen" in self.model.lower():
-            base_timeout_seconds = 600  # 10 минут для qwen моделей
-            logger.info(f"Установлен увеличенный таймаут {base_timeout_seconds} секунд для модели {self.model}")
-        else:
-            base_timeout_seconds = 300  # 5 минут для других моделей
-            
-        # Формируем запрос к API
-        api_url = f"http://{self.host}:{self.port}/v1/chat/completions"
-        
-        # Проверяем, что выбранная модель доступна
-        available_models = self._get_available_models()
-        if available_models and self.model not in available_models:
-            logger.warning(f"Модель {self.model} не найдена среди доступных моделей: {available_models}")
-            # Если модель недоступна, используем первую доступную
-            if available_models:
-                logger.info(f"Переключение на доступную модель: {available_models[0]}")
-                self.model = available_models[0]
-        
-        # Составляем тело запроса
-        request_body = {
-            "model": self.model,
-            "messages": formatted_messages,
-            "temperature": temperature,
-            "max_tokens": max_tokens,
-            "top_p": top_p,
-            "stream": False
-        }
+        api_url, request_body, base_timeout_seconds = self._prepare_chat_request(
+            messages, temperature, max_tokens, top_p, self._get_available_models()
+        )
         
         # Выполняем запрос с повторными попытками
         max_retries = 3
@@ -556,74 +783,27 @@ class LocalLLM:
                 
             try:
                 logger.info(f"Отправка запроса к {api_url} для модели {self.model}")
-                response = requests.post(
-                    api_url,
-                    json=request_body,
-                    timeout=timeout_seconds
-                )
+                request_started = time.perf_counter()
+                with LLM_INFLIGHT.track_inprogress():
+                    try:
+                        response = requests.post(
+                            api_url,
+                            json=request_body,
+                            timeout=timeout_seconds
+                        )
+                    finally:
+                        LLM_REQUEST_SECONDS.observe(time.perf_counter() - request_started, transport='requests')
                 
-                # Сохраняем весь ответ для отладки
-                try:
-                    debug_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'model', 'debug')
-                    os.makedirs(debug_dir, exist_ok=True)
-                    with open(os.path.join(debug_dir, "api_response.json"), "w", encoding="utf-8") as f:
-                        f.write(response.text)
-                except Exception as e:
-                    logger.warning(f"Не удалось сохранить API ответ: {e}")
-                
-                # Проверяем код ответа
-                if response.status_code != 200:
-                    logger.error(f"Ошибка API: {response.status_code} - {response.text}")
-                    if current_retry < max_retries:
-                        logger.info(f"Повторная попытка {current_retry + 1}...")
-                        continue
-                    return None
-                
-                # Пытаемся распарсить JSON ответ
-                try:
-                    data = response.json()
-                except json.JSONDecodeError as e:
-                    logger.error(f"Ошибка парсинга JSON ответа: {e}")
-                    logger.error(f"Ответ API: {response.text[:500]}...")
-                    if current_retry < max_retries:
-                        continue
-                    return None
-                
-                # Проверяем структуру ответа
-                if 'choices' not in data or not data['choices'] or 'message' not in data['choices'][0]:
-                    logger.error(f"Некорректная структура ответа: {data}")
-                    if current_retry < max_retries:
-                        continue
-                    return None
+                content, should_retry = self._extract_chat_content(
+                    response.status_code, response.text, current_retry < max_retries
+                )
+                if should_retry:
+                    continue
                 
-                # Извлекаем содержимое ответа
-                if 'content' in data['choices'][0]['message'] and data['choices'][0]['message']['content']:
-                    content = data['choices'][0]['message']['content']
-                    
-                    # Проверка на очень короткие ответы (потенциально некорректные)
-                    if len(content.strip()) < 10 and current_retry < max_retries:
-                        logger.warning(f"Получен слишком короткий ответ: '{content}', повторная попытка...")
-                        continue
-                    
-                    # Если пришел корректный ответ, сохраняем в кеш и возвращаем
-                    if user_prompt and content:
-                        self._add_to_cache(cache_key, content)
-                    return content
-                    
-                else:
-                    # Для модели qwen проверяем, не находится ли контент внутри JSON в поле text
-                    raw_message = data['choices'][0]['message']
-                    if isinstance(raw_message, dict) and raw_message.get('role') == 'assistant' and 'content' in raw_message:
-                        content = raw_message['content']
-                        if content:
-                            if user_prompt:
-                                self._add_to_cache(cache_key, content)
-                            return content
-                            
-                    logger.warning(f"Пустой контент в ответе модели: {data['choices'][0]['message']}")
-                    if current_retry < max_retries:
-                        continue
-                    return None
+                # Если пришел корректный ответ, сохраняем в кеш и возвращаем
+                if user_prompt and content:
+                    self._add_to_cache(cache_key, content)
+                return content
                     
             except requests.exceptions.Timeout:
                 logger.error(f"Превышено время ожидания ответа от API (таймаут {timeout_seconds} сек) в попытке {current_retry}")
@@ -648,163 +828,211 @@ class LocalLLM:
         # Если все попытки исчерпаны, возвращаем None
         logger.error("Все попытки запроса к API исчерпаны, возвращаю None")
         return None
-
-    def _get_default_learning_plan(self, profession):
+    
+    async def _agenerate_with_llm(self, messages, temperature=0.7, max_tokens=2048, top_p=0.9):
         """
-        Возвращает план обучения по умолчанию для указанной профессии
+        Асинхронно генерирует ответ модели на основе сообщений через aiohttp
+        
+        Повторяет логику _generate_with_llm (повторные попытки, растущий таймаут,
+        проверка структуры ответа), но ожидание ответа не занимает поток.
         
         Args:
-            profession (str): Название профессии
+            messages: Список сообщений для запроса
+            temperature: Температура генерации
+            max_tokens: Максимальное количество токенов в ответе
+            top_p: Параметр top_p для генерации
             
         Returns:
-            list: Список этапов обучения
+            Сгенерированный текст
         """
-        # Определяем категорию профессии для более персонализированного плана
-        profession_lower = profession.lower()
-        profession_category = "общая"
-        
-        if any(keyword in profession_lower for keyword in ["админ", "сисадмин", "администратор", "devops"]):
-            profession_category = "системный_администратор"
-        elif any(keyword in profession_lower for keyword in ["разработчик", "программист", "developer", "coder"]):
-            profession_category = "разработчик"
-        elif any(keyword in profession_lower for keyword in ["дизайн", "designer", "ui", "ux"]):
-            profession_category = "дизайнер"
-        elif any(keyword in profession_lower for keyword in ["аналитик", "analyst", "data", "данные"]):
-            profession_category = "аналитик"
-        elif any(keyword in profession_lower for keyword in ["маркетолог", "smm", "маркетинг", "marketing"]):
-            profession_category = "маркетолог"
-        elif any(keyword in profession_lower for keyword in ["врач", "медик", "доктор", "medical"]):
-            profession_category = "медицина"
-        
-        # Планы обучения для разных категорий профессий
-        learning_plans = {
-            "системный_администратор": [
-                {
-                    "title": "Освоение основ операционных систем",
-                    "description": "Изучение архитектуры и принципов работы операционных систем Windows и Linux. Практика с базовыми командами, файловыми системами и права доступа в обеих ОС. Настройка пользовательских учетных записей, групп и разрешений безопасности. Понимание процессов загрузки и инициализации системы. Рекомендуемая продолжительность этапа: 6-8 недель с ежедневной практикой по 2-3 часа."
-                },
-                {
-                    "title": "Изучение сетевых технологий и протоколов",
-                    "description": "Глубокое погружение в модель OSI и стек протоколов TCP/IP. Настройка сетевых интерфейсов, маршрутизации и DNS. Практика с инструментами диагностики сети (ping, traceroute, netstat, tcpdump). Понимание принципов работы VPN, VLAN и беспроводных сетей. Настройка DHCP-сервера и управление IP-адресами. Работа с межсетевыми экранами и правилами фильтрации трафика. Продолжительность: 8-10 недель."
-                },
-                {
-                    "title": "Управление серверной инфраструктурой",
-                    "description": "Установка и настройка серверных ОС (Windows Server, Linux). Развертывание и администрирование веб-серверов (Apache, Nginx), почтовых серверов (Postfix, Exchange) и серверов баз данных (MySQL, PostgreSQL, MS SQL). Управление доменной структурой и службой каталогов (Active Directory, LDAP). Настройка групповых политик и автоматизация управления серверами. Планирование резервного копирования и восстановления данных. Продолжительность: 10-12 недель."
-                },
-                {
-                    "title": "Обеспечение безопасности ИТ-инфраструктуры",
-                    "description": "Разработка политик безопасности и их внедрение. Настройка межсетевых экранов и IDS/IPS систем. Управление антивирусной защитой и обновлениями безопасности. Аудит системных событий и мониторинг потенциальных угроз. Защита от сетевых атак и социальной инженерии. Шифрование данных и управление цифровыми сертификатами. Настройка двухфакторной аутентификации и других механизмов контроля доступа. Продолжительность: 8-10 недель."
-                },
-                {
-                    "title": "Внедрение систем мониторинга и диагностики",
-                    "description": "Установка и настройка систем мониторинга (Zabbix, Nagios, Prometheus). Создание панелей мониторинга для отслеживания производительности серверов и сетевого оборудования. Настройка оповещений о критических событиях и автоматическое реагирование. Сбор и анализ системных логов с использованием ELK-стека. Мониторинг доступности сервисов и исследование причин отказов. Анализ трендов производительности и планирование мощностей. Продолжительность: 6-8 недель."
-                },
-                {
-                    "title": "Автоматизация задач администрирования",
-                    "description": "Изучение языков и инструментов для автоматизации (PowerShell, Bash, Python). Создание скриптов для выполнения рутинных административных задач. Внедрение систем управления конфигурациями (Ansible, Puppet, Chef). Практика с инструментами непрерывной интеграции и доставки (CI/CD). Автоматизация развертывания серверов и приложений. Создание пайплайнов для автоматического тестирования и обновления инфраструктуры. Продолжительность: 8-10 недель."
-                },
-                {
-                    "title": "Освоение облачных технологий и виртуализации",
-                    "description": "Изучение принципов работы с облачными платформами (AWS, Azure, GCP). Развертывание виртуальных машин и контейнеров (VMware, Hyper-V, Docker). Управление облачной инфраструктурой через консоль и API. Настройка масштабирования и балансировки нагрузки. Управление ресурсами и оптимизация затрат в облаке. Обеспечение безопасности и соответствия требованиям в облачной среде. Построение гибридных инфраструктур. Продолжительность: 10-12 недель."
-                }
-            ],
-            "разработчик": [
-                {
-                    "title": "Изучение основ программирования и алгоритмов",
-                    "description": "Освоение синтаксиса выбранного языка программирования (Python, Java, JavaScript и т.д.). Изучение базовых структур данных (массивы, списки, словари, хеш-таблицы) и алгоритмов (сортировка, поиск, обход графов). Практика написания простых программ для решения алгоритмических задач. Понимание принципов структурного и объектно-ориентированного программирования. Освоение техник отладки и тестирования кода. Продолжительность: 8-10 недель интенсивного обучения."
-                },
-                {
-                    "title": "Разработка пользовательских интерфейсов и клиентской части",
-                    "description": "Изучение HTML, CSS и JavaScript для создания интерактивных веб-страниц. Освоение современных фреймворков для фронтенд-разработки (React, Angular, Vue). Работа с DOM и событиями браузера. Создание адаптивных интерфейсов, работающих на различных устройствах. Оптимизация производительности клиентских приложений. Изучение принципов UX/UI дизайна для создания удобных интерфейсов. Работа с AJAX и асинхронными запросами. Продолжительность: 10-12 недель."
-                },
-                {
-                    "title": "Освоение серверной разработки и работы с базами данных",
-                    "description": "Создание серверных приложений на выбранной технологии (Node.js, Django, Spring, ASP.NET). Изучение принципов работы с реляционными базами данных (MySQL, PostgreSQL) и языка SQL. Освоение ORM-технологий для взаимодействия с базами данных. Проектирование схем данных и оптимизация запросов. Работа с NoSQL базами данных (MongoDB, Redis) для специфических сценариев. Обеспечение безопасности доступа к данным. Изучение принципов REST API и микросервисной архитектуры. Продолжительность: 10-12 недель."
-                },
-                {
-                    "title": "Внедрение методологий и инструментов разработки",
-                    "description": "Освоение системы контроля версий Git и платформ для совместной разработки (GitHub, GitLab). Изучение принципов Agile-разработки, Scrum и Kanban. Внедрение практик непрерывной интеграции и доставки (CI/CD). Настройка автоматического тестирования и интеграционных тестов. Работа с инструментами управления проектами и отслеживания задач. Изучение методологий code review и парного программирования. Автоматизация сборки проектов и управление зависимостями. Продолжительность: 6-8 недель."
-                },
-                {
-                    "title": "Создание масштабируемых и отказоустойчивых систем",
-                    "description": "Изучение принципов проектирования высоконагруженных систем. Освоение техник оптимизации производительности и масштабирования приложений. Внедрение кэширования на различных уровнях системы. Работа с очередями сообщений и асинхронной обработкой (RabbitMQ, Kafka). Изучение паттернов проектирования для создания гибких и поддерживаемых систем. Обеспечение отказоустойчивости и разработка стратегий восстановления при сбоях. Мониторинг и профилирование приложений. Продолжительность: 8-10 недель."
-                },
-                {
-                    "title": "Обеспечение безопасности и тестирование приложений",
-                    "description": "Изучение основных уязвимостей веб-приложений (OWASP Top 10). Внедрение защиты от XSS, CSRF, SQL-инъекций и других атак. Работа с аутентификацией и авторизацией пользователей. Создание комплексной стратегии тестирования (модульные, интеграционные, функциональные тесты). Освоение инструментов для автоматизированного тестирования. Внедрение практик безопасной разработки в процесс создания приложений. Проведение код-ревью с фокусом на безопасность. Продолжительность: 8-10 недель."
-                },
-                {
-                    "title": "Освоение DevOps-практик и облачных технологий",
-                    "description": "Изучение принципов DevOps и культуры взаимодействия разработки и эксплуатации. Работа с контейнерами (Docker) и оркестрацией (Kubernetes). Автоматизация развертывания в облачных платформах (AWS, Azure, GCP). Настройка мониторинга и логирования в распределенных системах. Внедрение инфраструктуры как кода (Terraform, CloudFormation). Автоматизация управления конфигурациями (Ansible, Chef, Puppet). Оптимизация процессов доставки ПО и управления релизами. Продолжительность: 10-12 недель."
-                }
-            ],
-            "дизайнер": [
-                {
-                    "title": "Освоение фундаментальных принципов дизайна",
-                    "description": "Изучение основ композиции, цветоведения, типографики и теории визуального восприятия. Практическое применение принципов баланса, контраста, ритма, пропорции в дизайн-макетах. Понимание психологии цвета и создание гармоничных цветовых схем. Освоение типографических приемов и правил для улучшения читаемости и визуальной иерархии. Развитие насмотренности через анализ работ признанных дизайнеров. Создание первых проектов с применением изученных принципов. Продолжительность: 6-8 недель."
-                },
-                {
-                    "title": "Изучение графических редакторов и инструментов дизайна",
-                    "description": "Освоение профессиональных графических редакторов (Figma, Adobe Photoshop, Illustrator). Изучение интерфейса программ, горячих клавиш и оптимальных рабочих процессов. Работа с растровой и векторной графикой, слоями, масками, эффектами. Создание и редактирование графических элементов, иллюстраций, иконок. Настройка экспорта материалов для различных платформ и устройств. Освоение принципов работы с прототипирующими инструментами. Организация файлов и настройка системы хранения дизайн-материалов. Продолжительность: 8-10 недель."
-                },
-                {
-                    "title": "Проектирование пользовательских интерфейсов (UI Design)",
-                    "description": "Изучение основных элементов интерфейса и принципов их организации. Создание макетов для различных платформ (веб, мобильные приложения, десктоп). Освоение сеток и модульных систем для выравнивания элементов. Разработка системы стилей, компонентов и паттернов для последовательного дизайна. Создание адаптивных интерфейсов для различных размеров экранов. Работа с микроанимацией и интерактивными элементами. Освоение принципов доступности (accessibility) в дизайне. Продолжительность: 10-12 недель."
-                },
-                {
-                    "title": "Изучение пользовательского опыта (UX Design)",
-                    "description": "Освоение методологии проектирования, ориентированного на пользователя. Изучение методов исследования потребностей и поведения пользователей. Создание персон, сценариев использования и карт путей пользователей. Проектирование информационной архитектуры и структуры приложений. Разработка прототипов различной степени детализации (wireframes, mockups). Проведение юзабилити-тестирования и итерационное улучшение дизайна на основе обратной связи. Изучение метрик UX и способов измерения эффективности дизайн-решений. Продолжительность: 8-10 недель."
-                },
-                {
-                    "title": "Создание профессионального портфолио",
-                    "description": "Организация и структурирование лучших работ в портфолио. Написание кейс-стади с описанием процесса работы над проектами (проблема, решение, результат). Создание личного сайта-портфолио или профиля на специализированных платформах (Behance, Dribbble). Подготовка презентаций дизайн-проектов для потенциальных клиентов/работодателей. Получение обратной связи от профессионального сообщества и доработка портфолио. Регулярное обновление и поддержание актуальности представленных работ. Продолжительность: 4-6 недель."
-                },
-                {
-                    "title": "Освоение специализированных направлений дизайна",
-                    "description": "Углубленное изучение выбранной специализации: брендинг, упаковка, иллюстрация, motion-дизайн, 3D-моделирование и т.д. Освоение специфических инструментов и методик работы в выбранном направлении. Изучение отраслевых стандартов, форматов и требований. Создание специализированных проектов для расширения портфолио. Изучение успешных кейсов и лучших практик в выбранной области. Взаимодействие со специалистами смежных областей (разработчики, маркетологи, копирайтеры). Продолжительность: 10-12 недель."
-                },
-                {
-                    "title": "Развитие навыков коммуникации и презентации дизайн-решений",
-                    "description": "Освоение техник эффективной презентации дизайн-концепций клиентам и команде. Развитие навыков аргументации дизайн-решений на основе исследований и данных. Изучение методов получения и обработки обратной связи о дизайне. Освоение профессиональной терминологии для точной коммуникации с заказчиками и коллегами. Практика проведения дизайн-ревью и воркшопов. Развитие навыков ведения клиентских проектов и управления ожиданиями заказчика. Изучение принципов оценки трудозатрат и формирования коммерческих предложений. Продолжительность: 6-8 недель."
-                }
-            ],
-            "общая": [
-                {
-                    "title": f"Освоение фундаментальных основ профессии {profession}",
-                    "description": f"Изучение базовых концепций, терминологии и принципов работы в сфере профессии {profession}. Знакомство с историей развития отрасли и ключевыми методологиями. Понимание структуры рынка труда и основных требований работодателей. Освоение профессиональных стандартов и этических норм. Изучение актуальной законодательной базы, регулирующей отрасль. Формирование общего представления о карьерных путях в профессии и требуемых компетенциях на разных уровнях. Продолжительность: 6-8 недель интенсивного обучения."
-                },
-                {
-                    "title": f"Развитие базовых технических навыков {profession}",
-                    "description": f"Освоение основных инструментов и технологий, необходимых для работы в сфере {profession}. Изучение стандартных рабочих процессов и методик выполнения ключевых задач. Практика использования специализированного программного обеспечения и платформ. Отработка типовых профессиональных задач под руководством наставников. Изучение систем отчетности и документации, принятых в отрасли. Формирование навыков эффективной работы с профессиональными ресурсами и источниками информации. Продолжительность: 8-10 недель с практическими заданиями."
-                },
-                {
-                    "title": f"Углубленное изучение специализированных областей {profession}",
-                    "description": f"Детальное освоение отдельных направлений и специализаций в рамках профессии {profession}. Изучение продвинутых методик и подходов к решению сложных профессиональных задач. Работа с кейсами и реальными проектами для формирования практического опыта. Анализ успешных практик и типичных ошибок в профессиональной деятельности. Развитие критического мышления и аналитических навыков для принятия обоснованных решений. Формирование собственного профессионального подхода и стиля работы. Продолжительность: 10-12 недель углубленного изучения."
-                },
-                {
-                    "title": f"Практическое применение знаний и навыков в проектной работе",
-                    "description": f"Участие в полноценных проектах с применением полученных знаний о профессии {profession}. Решение комплексных задач, требующих интеграции различных навыков и технологий. Работа в команде и взаимодействие со специалистами смежных областей. Развитие навыков управления проектами и соблюдения сроков. Документирование процессов и результатов работы в соответствии с профессиональными стандартами. Получение и интеграция обратной связи для улучшения качества работы. Анализ эффективности применяемых подходов и методик. Продолжительность: 8-10 недель интенсивной практики."
-                },
-                {
-                    "title": f"Создание и оптимизация профессионального портфолио",
-                    "description": f"Систематизация выполненных проектов и работ для демонстрации профессиональных компетенций в сфере {profession}. Описание методологии, процессов и результатов каждого проекта. Фокусирование на демонстрации ключевых навыков, востребованных в индустрии. Оптимизация представления проектов для различных аудиторий (работодатели, клиенты, коллеги). Получение экспертной оценки портфолио и внесение улучшений. Подготовка сопроводительных материалов, усиливающих презентацию работ. Разработка стратегии регулярного обновления и расширения портфолио. Продолжительность: 4-6 недель."
-                },
-                {
-                    "title": f"Развитие профессиональных связей и участие в сообществе",
-                    "description": f"Активное включение в профессиональные сообщества специалистов в области {profession}. Участие в отраслевых мероприятиях, конференциях, воркшопах и хакатонах. Выстраивание сети профессиональных контактов с коллегами, экспертами и потенциальными работодателями. Обмен опытом и знаниями через участие в дискуссиях, форумах и онлайн-группах. Получение менторской поддержки от опытных специалистов. Отслеживание трендов и инноваций в индустрии через коммуникацию в сообществе. Продолжительность: непрерывный процесс, 6-8 недель для формирования базовой сети контактов."
-                },
-                {
-                    "title": f"Планирование дальнейшего развития и непрерывное обучение",
-                    "description": f"Разработка индивидуальной стратегии профессионального роста в сфере {profession} на ближайшие 3-5 лет. Определение приоритетных направлений для углубления экспертизы и расширения компетенций. Создание системы отслеживания новых технологий, методологий и инструментов в отрасли. Формирование привычки регулярного самообучения и рефлексии. Планирование получения дополнительных сертификаций и специализаций. Определение долгосрочных карьерных целей и промежуточных этапов их достижения. Разработка мер по предотвращению профессионального выгорания. Продолжительность: 4-6 недель для создания плана, затем постоянная реализация."
-                }
-            ]
-        }
+        aiohttp = _get_aiohttp()
+        if aiohttp is None:
+            # Без aiohttp выполняем блокирующий запрос в пуле потоков, чтобы не останавливать цикл событий
+            logger.warning("Модуль aiohttp не найден, асинхронный запрос выполняется в пуле потоков")
+            return await asyncio.to_thread(
+                self._generate_with_llm, messages, temperature, max_tokens, top_p
+            )
         
-        # Возвращаем план обучения для определенной категории профессии или общий план
-        if profession_category in learning_plans:
-            return learning_plans[profession_category]
+        session = self._aiohttp_session()
+        if not await self._acheck_server(session):
+            logger.error("LLM сервер недоступен")
+            return None
+        
+        api_url, request_body, base_timeout_seconds = self._prepare_chat_request(
+            messages, temperature, max_tokens, top_p, await self._aget_available_models(session)
+        )
+        
+        max_retries = 3
+        current_retry = 0
+        timeout_seconds = base_timeout_seconds
+        
+        while current_retry < max_retries:
+            current_retry += 1
+            logger.info(f"Попытка {current_retry} из {max_retries} для модели {self.model}")
+            
+            if current_retry > 1:
+                await asyncio.sleep(2)
+                timeout_seconds = base_timeout_seconds + (current_retry - 1) * 120
+                logger.info(f"Установлен увеличенный таймаут {timeout_seconds} секунд")
+            
+            try:
+                logger.info(f"Отправка асинхронного запроса к {api_url} для модели {self.model}")
+                request_started = time.perf_counter()
+                with LLM_INFLIGHT.track_inprogress():
+                    try:
+                        async with session.post(
+                            api_url,
+                            json=request_body,
+                            timeout=aiohttp.ClientTimeout(total=timeout_seconds)
+                        ) as response:
+                            status_code = response.status
+                            response_text = await response.text()
+                    finally:
+                        LLM_REQUEST_SECONDS.observe(time.perf_counter() - request_started, transport='aiohttp')
+                
+                content, should_retry = self._extract_chat_content(
+                    status_code, response_text, current_retry < max_retries
+                )
+                if should_retry:
+                    continue
+                return content
+            
+            except asyncio.TimeoutError:
+                logger.error(f"Превышено время ожидания ответа от API (таймаут {timeout_seconds} сек) в попытке {current_retry}")
+                if current_retry < max_retries:
+                    continue
+                return None
+            
+            except aiohttp.ClientError as e:
+                logger.error(f"Ошибка запроса: {e}")
+                logger.error(traceback.format_exc())
+                if current_retry < max_retries:
+                    continue
+                return None
+            
+            except Exception as e:
+                logger.error(f"Неизвестная ошибка при запросе к API: {e}")
+                logger.error(traceback.format_exc())
+                if current_retry < max_retries:
+                    continue
+                return None
+    
+        logger.error("Все попытки запроса к API исчерпаны, возвращаю None")
+        return None
+    
+    def _prepare_chat_request(self, messages, temperature, max_tokens, top_p, available_models):
+        """
+        Готовит URL, тело запроса и базовый таймаут для /chat/completions
+        
+        Args:
+            messages: Список сообщений для запроса
+            temperature: Температура генерации
+            max_tokens: Максимальное количество токенов в ответе
+            top_p: Параметр top_p для генерации
+            available_models: Список моделей, загруженных в LM Studio
+            
+        Returns:
+            tuple: (api_url, request_body, base_timeout_seconds)
+        """
+        # Подготовка сообщений в формате ChatML
+        formatted_messages = []
+        for msg in messages:
+            formatted_messages.append({
+                "role": msg["role"], 
+                "content": msg["content"]
+            })
+        
+        # Устанавливаем таймаут в зависимости от модели
+        # qwen3-8b требует больше времени для генерации
+        if "qwen" in self.model.lower():
+            base_timeout_seconds = 600  # 10 минут для qwen моделей
+            logger.info(f"Установлен увеличенный таймаут {base_timeout_seconds} секунд для модели {self.model}")
         else:
-            return learning_plans["общая"]
+            base_timeout_seconds = 300  # 5 минут для других моделей
+            
+        # Формируем запрос к API
+        api_url = f"http://{self.host}:{self.port}/v1/chat/completions"
+        
+        # Проверяем, что выбранная модель доступна
+        if available_models and self.model not in available_models:
+            logger.warning(f"Модель {self.model} не найдена среди доступных моделей: {available_models}")
+            # Если модель недоступна, используем первую доступную
+            logger.info(f"Переключение на доступную модель: {available_models[0]}")
+            self.model = available_models[0]
+        
+        # Составляем тело запроса
+        request_body = {
+            "model": self.model,
+            "messages": formatted_messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "top_p": top_p,
+            "stream": False
+        }
+        
+        return api_url, request_body, base_timeout_seconds
+    
+    def _extract_chat_content(self, status_code: int, response_text: str, can_retry: bool):
+        """
+        Проверяет ответ /chat/completions и извлекает из него текст модели
+        
+        Args:
+            status_code: HTTP-код ответа
+            response_text: Тело ответа
+            can_retry: Остались ли попытки для повторного запроса
+            
+        Returns:
+            tuple: (content, should_retry) - текст ответа (или None) и нужно ли повторить запрос
+        """
+        # Сохраняем весь ответ для отладки
+        try:
+            debug_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'model', 'debug')
+            os.makedirs(debug_dir, exist_ok=True)
+            with open(os.path.join(debug_dir, "api_response.json"), "w", encoding="utf-8") as f:
+                f.write(response_text)
+        except Exception as e:
+            logger.warning(f"Не удалось сохранить API ответ: {e}")
+        
+        # Проверяем код ответа
+        if status_code != 200:
+            logger.error(f"Ошибка API: {status_code} - {response_text}")
+            if can_retry:
+                logger.info("Повторная попытка...")
+            return None, can_retry
+        
+        # Пытаемся распарсить JSON ответ
+        try:
+            data = json.loads(response_text)
+        except json.JSONDecodeError as e:
+            logger.error(f"Ошибка парсинга JSON ответа: {e}")
+            logger.error(f"Ответ API: {response_text[:500]}...")
+            return None, can_retry
+        
+        # Проверяем структуру ответа
+        if 'choices' not in data or not data['choices'] or 'message' not in data['choices'][0]:
+            logger.error(f"Некорректная структура ответа: {data}")
+            return None, can_retry
+        
+        # Извлекаем содержимое ответа
+        if 'content' in data['choices'][0]['message'] and data['choices'][0]['message']['content']:
+            content = data['choices'][0]['message']['content']
+            
+            # Проверка на очень короткие ответы (потенциально некорректные)
+            if len(content.strip()) < 10 and can_retry:
+                logger.warning(f"Получен слишком короткий ответ: '{content}', повторная попытка...")
+                return None, True
+            
+            return content, False
+        
+        # Для модели qwen проверяем, не находится ли контент внутри JSON в поле text
+        raw_message = data['choices'][0]['message']
+        if isinstance(raw_message, dict) and raw_message.get('role') == 'assistant' and 'content' in raw_message:
+            content = raw_message['content']
+            if content:
+                return content, False
+                
+        logger.warning(f"Пустой контент в ответе модели: {data['choices'][0]['message']}")
+        return None, can_retry
 
     def _get_available_models(self):
         """
@@ -837,3 +1065,32 @@ class LocalLLM:
             logger.error(f"Ошибка при получении списка моделей: {e}")
             logger.error(traceback.format_exc())
             return []
+    
+    async def _aget_available_models(self, session):
+        """
+        Асинхронно получает список доступных моделей с сервера LM Studio
+        
+        Args:
+            session: Открытая сессия aiohttp
+            
+        Returns:
+            list: Список доступных моделей или пустой список в случае ошибки
+        """
+        aiohttp = _get_aiohttp()
+        try:
+            url = f"http://{self.host}:{self.port}/v1/models"
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    logger.info(f"LM Studio доступен и работает. Модели: {data}")
+                    
+                    if 'data' in data and isinstance(data['data'], list):
+                        return [model['id'] for model in data['data'] if 'id' in model]
+                
+                logger.warning(f"Не удалось получить список моделей. Статус: {response.status}")
+                return []
+        
+        except Exception as e:
+            logger.error(f"Ошибка при получении списка моделей: {e}")
+            logger.error(traceback.format_exc())
+            return []
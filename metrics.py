@@ -0,0 +1,258 @@
+"""
+Метрики приложения в текстовом формате Prometheus.
+
+Модуль не зависит от prometheus_client: счетчики, gauge и гистограммы хранятся
+в памяти процесса и отдаются эндпоинтом /metrics. Кроме того, span() собирает
+длительности этапов текущего запроса для заголовка Server-Timing.
+"""
+import contextlib
+import contextvars
+import threading
+import time
+
+# Границы корзин гистограмм (в секундах): от быстрых этапов до ответов LLM длиной в минуты
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+def _format_labels(label_names, label_values, extra=None):
+    """Форматирует метки метрики в виде {name="value",...}"""
+    pairs = list(zip(label_names, label_values))
+    if extra:
+        pairs.extend(extra)
+    if not pairs:
+        return ''
+    escaped = []
+    for name, value in pairs:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        escaped.append(f'{name}="{value}"')
+    return '{' + ','.join(escaped) + '}'
+
+
+def _format_value(value):
+    """Форматирует число так, как его ожидает Prometheus"""
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Базовый класс метрики с набором меток"""
+
+    metric_type = 'untyped'
+
+    def __init__(self, name, documentation, label_names=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"Метрика {self.name} ожидает метки {self.label_names}, получены {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.metric_type}']
+        lines.extend(self._render_samples())
+        return '\n'.join(lines)
+
+    def _render_samples(self):
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Монотонно растущий счетчик"""
+
+    metric_type = 'counter'
+
+    def __init__(self, name, documentation, label_names=()):
+        super().__init__(name, documentation, label_names)
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+    def _render_samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f'{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}' for key, value in items]
+
+
+class Gauge(_Metric):
+    """Значение, которое может расти и уменьшаться"""
+
+    metric_type = 'gauge'
+
+    def __init__(self, name, documentation, label_names=()):
+        super().__init__(name, documentation, label_names)
+        self._values = {}
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def get(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+    @contextlib.contextmanager
+    def track_inprogress(self, **labels):
+        """Увеличивает значение на время выполнения блока"""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+    def _render_samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f'{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}' for key, value in items]
+
+
+class Histogram(_Metric):
+    """Гистограмма с фиксированными корзинами"""
+
+    metric_type = 'histogram'
+
+    def __init__(self, name, documentation, label_names=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self._series = {}
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['counts'][index] += 1
+                    break
+            series['sum'] += value
+            series['count'] += 1
+
+    def _render_samples(self):
+        with self._lock:
+            items = sorted((key, dict(series, counts=list(series['counts']))) for key, series in self._series.items())
+        lines = []
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series['counts']):
+                cumulative += count
+                labels = _format_labels(self.label_names, key, [('le', _format_value(bound))])
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = _format_labels(self.label_names, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(series["sum"])}')
+            lines.append(f'{self.name}_count{labels} {series["count"]}')
+        return lines
+
+
+class MetricsRegistry:
+    """Набор метрик процесса"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                return self._metrics[metric.name]
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, documentation, label_names=()):
+        return self._register(Counter(name, documentation, label_names))
+
+    def gauge(self, name, documentation, label_names=()):
+        return self._register(Gauge(name, documentation, label_names))
+
+    def histogram(self, name, documentation, label_names=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, documentation, label_names, buckets))
+
+    def render(self):
+        """Возвращает все метрики в текстовом формате Prometheus"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(metric.render() for metric in metrics) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    'roadmap_stage_seconds', 'Длительность этапов генерации дорожной карты', ['stage'])
+REQUEST_SECONDS = REGISTRY.histogram(
+    'http_request_seconds', 'Длительность обработки HTTP-запросов', ['endpoint', 'status'])
+LLM_REQUEST_SECONDS = REGISTRY.histogram(
+    'llm_request_seconds', 'Длительность запросов к LM Studio', ['transport'])
+LLM_INFLIGHT = REGISTRY.gauge(
+    'llm_inflight_requests', 'Количество запросов к LM Studio, ожидающих ответа')
+QUEUE_DEPTH = REGISTRY.gauge(
+    'roadmap_queue_depth', 'Количество принятых и еще не завершенных запросов на генерацию', ['endpoint'])
+CACHE_REQUESTS = REGISTRY.counter(
+    'cache_requests_total', 'Обращения к кешам по результату (hit/miss)', ['cache', 'result'])
+CACHE_HIT_RATIO = REGISTRY.gauge(
+    'cache_hit_ratio', 'Доля попаданий в кеш с момента запуска', ['cache'])
+FALLBACK_ROADMAPS = REGISTRY.counter(
+    'roadmap_fallback_total', 'Дорожные карты, построенные по шаблонам без LLM', ['reason'])
+COLD_START_SECONDS = REGISTRY.gauge(
+    'app_cold_start_seconds', 'Время от запуска процесса до готовности к обработке запросов')
+
+# Длительности этапов текущего запроса для заголовка Server-Timing
+_request_timings = contextvars.ContextVar('request_timings', default=None)
+
+
+def record_cache(cache, hit):
+    """Учитывает обращение к кешу и обновляет долю попаданий"""
+    CACHE_REQUESTS.inc(cache=cache, result='hit' if hit else 'miss')
+    hits = CACHE_REQUESTS.get(cache=cache, result='hit')
+    total = hits + CACHE_REQUESTS.get(cache=cache, result='miss')
+    CACHE_HIT_RATIO.set(hits / total, cache=cache)
+
+
+def start_request_timings():
+    """Начинает сбор длительностей этапов для текущего запроса"""
+    timings = []
+    _request_timings.set(timings)
+    return timings
+
+
+def get_request_timings():
+    """Возвращает список (этап, длительность) текущего запроса"""
+    return _request_timings.get() or []
+
+
+@contextlib.contextmanager
+def span(stage):
+    """Замеряет длительность этапа: пишет ее в гистограмму и в тайминги текущего запроса"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - started
+        STAGE_SECONDS.observe(duration, stage=stage)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.append((stage, duration))
+
+
+def server_timing_header(timings):
+    """Формирует значение заголовка Server-Timing из списка (этап, длительность в секундах)"""
+    return ', '.join(f'{stage};dur={duration * 1000:.1f}' for stage, duration in timings)
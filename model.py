@@ -1,17 +1,57 @@
-import requests
-import re
-import random
-import pickle
 import os
 import time
-from bs4 import BeautifulSoup
-import pandas as pd
-import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
+import asyncio
 from collections import Counter
 import traceback
 import logging
 import json
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from metrics import span, QUEUE_DEPTH, FALLBACK_ROADMAPS
+from hh_areas import get_area_index
+import http_client
+import hh_api
+from skill_extraction import skill_extractor
+import vacancy_page
+from vacancy_store import get_vacancy_store
+import skill_index
+import model_artifact
+from seeding import request_seed
+from salary_stats import get_salary_stats
+from taxonomy import get_taxonomy
+from education_resources import get_resource_index
+from catalog import get_catalog
+from canonicalizer import get_canonicalizer, normalize_text
+from fallback import MAX_SKILL_STEPS, get_fallback_engine
+from text_pipeline import learning_topic, split_insights, split_paragraphs, unique_items
+from region_trends import get_region_trends
+
+# Сколько дорожных карт пакетные запросы генерируют одновременно (на весь процесс).
+# Значение меньше числа слотов LM Studio оставляет запас для интерактивных запросов /api/analyze
+BATCH_MAX_CONCURRENCY = int(os.environ.get('BATCH_MAX_CONCURRENCY', '2'))
+
+# Пакетные генерации всех запросов выполняются в одном цикле событий в отдельном потоке:
+# ожидание ответов LM Studio не занимает потоки, а сессия aiohttp цикла общая для всех пакетов
+_batch_loop = None
+_batch_loop_lock = threading.Lock()
+# Семафор создается и используется только в потоке цикла
+_batch_slots = None
+
+
+def _get_batch_loop():
+    """Цикл событий пакетной генерации (запускается при первом пакетном запросе)"""
+    global _batch_loop
+    with _batch_loop_lock:
+        if _batch_loop is None:
+            _batch_loop = asyncio.new_event_loop()
+            threading.Thread(target=_batch_loop.run_forever, name='roadmap-batch-loop', daemon=True).start()
+    return _batch_loop
+
+# Не более стольких персональных рекомендаций из ответа LLM
+MAX_PERSONAL_RECOMMENDATIONS = 7
 
 # Импортируем класс для работы с локальной моделью
 try:
@@ -21,6 +61,120 @@ except ImportError:
     LLM_AVAILABLE = False
     logging.warning("Модуль llm_integration не найден. Локальная модель LLM не будет использоваться.")
 
+
+def parse_vacancy_skills(html):
+    """
+    Извлекает навыки из HTML-страницы вакансии HH.ru
+    
+    Функция не обращается к сети и не использует состояние генератора,
+    поэтому ее можно выполнять в пуле процессов.
+    
+    Args:
+        html (str): HTML страницы вакансии
+        
+    Returns:
+        list: Отсортированный список уникальных навыков
+    """
+    return extract_skills_from_text(*vacancy_page_texts(html))
+
+
+def vacancy_page_texts(html):
+    """
+    Готовит тексты HTML-страницы вакансии для поиска навыков
+    
+    Args:
+        html (str): HTML страницы вакансии
+        
+    Returns:
+        tuple: (блоки требований и описание, тексты пунктов списков, полный текст страницы)
+    """
+    # Страница обходится один раз, текст каждого узла относится к ближайшему блоку
+    return vacancy_page.page_texts(html)
+
+
+def parse_vacancy_json_skills(vacancy):
+    """
+    Извлекает навыки из JSON вакансии API HH.ru (/vacancies/{id})
+    
+    Структурированные key_skills добавляются как есть, описание разбирается
+    теми же паттернами, что и HTML-страница, но без BeautifulSoup.
+    
+    Args:
+        vacancy (dict): Ответ API для одной вакансии
+        
+    Returns:
+        list: Отсортированный список уникальных навыков
+    """
+    description_html = vacancy.get('description') or ''
+    blocks = hh_api.html_blocks(description_html)
+    vacancy_description = "\n".join(blocks)
+    
+    # Блоки с требованиями, как и для HTML-страницы
+    requirements_block = ""
+    for block in blocks:
+        text = block.lower()
+        if any(trigger in text for trigger in vacancy_page.REQUIREMENT_TRIGGERS):
+            requirements_block += block + "\n"
+    if not requirements_block:
+        requirements_block = vacancy_description
+    
+    all_text = requirements_block + "\n" + vacancy_description
+    key_skills = [skill.get('name', '') for skill in vacancy.get('key_skills') or []]
+    
+    return extract_skills_from_text(all_text, hh_api.html_list_items(description_html),
+                                    vacancy_description, key_skills)
+
+
+def extract_skills_from_text(all_text, list_items=(), full_text='', key_skills=()):
+    """
+    Извлекает навыки из текста вакансии по паттернам
+    
+    Args:
+        all_text (str): Блоки требований и описание вакансии
+        list_items (list): Тексты пунктов списков
+        full_text (str): Полный текст страницы (для поиска медицинских терминов)
+        key_skills (list): Навыки, указанные работодателем явно
+        
+    Returns:
+        list: Отсортированный список уникальных навыков
+    """
+    return skill_extractor.extract(all_text, list_items, full_text, key_skills)
+
+
+# Источник данных о вакансиях: api - JSON из api.hh.ru, html - разбор страниц hh.ru
+EXTRACTION_MODE = os.environ.get('HH_EXTRACTION_MODE', 'api')
+
+# Число процессов для разбора страниц вакансий (0 - разбирать в потоках загрузки)
+PARSE_WORKERS = int(os.environ.get('HH_PARSE_WORKERS', str(min(4, os.cpu_count() or 1))))
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+
+def _get_parse_pool():
+    """Возвращает пул процессов для разбора HTML или None, если он отключен или недоступен"""
+    global _parse_pool
+    if _parse_pool is None and PARSE_WORKERS > 0:
+        with _parse_pool_lock:
+            if _parse_pool is None:
+                try:
+                    # spawn вместо fork: процесс сервера многопоточный
+                    _parse_pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS,
+                                                      mp_context=multiprocessing.get_context('spawn'))
+                except (OSError, NotImplementedError, ValueError) as e:
+                    logging.warning(f"Пул процессов для разбора вакансий недоступен: {e}")
+                    _parse_pool = False
+    return _parse_pool or None
+
+
+def _discard_parse_pool(pool):
+    """Убирает сломанный пул процессов, чтобы при следующем обращении создать новый"""
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is pool:
+            _parse_pool = None
+    pool.shutdown(wait=False)
+
+
 class JobRoadmapGenerator:
     """
     Класс для анализа вакансий и генерации персонализированной дорожной карты
@@ -35,146 +189,174 @@ class JobRoadmapGenerator:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         
-        # Базовые наборы навыков (используются, если не удается получить данные из интернета)
-        self.default_hard_skills = {
-            'программист': ['Python', 'SQL', 'Git', 'Алгоритмы и структуры данных', 'API', 'Объектно-ориентированное программирование', 'Docker', 'CI/CD', 'Тестирование'],
-            'frontend': ['JavaScript', 'HTML', 'CSS', 'React', 'Git', 'TypeScript', 'Webpack', 'REST API', 'Redux', 'Адаптивная верстка', 'Кросс-браузерная совместимость'],
-            'бэкенд': ['Python/Java/C#', 'SQL', 'NoSQL', 'REST API', 'Git', 'Docker', 'Архитектура приложений', 'Оптимизация запросов', 'Многопоточность', 'Микросервисы'],
-            'дизайнер': ['Figma', 'Adobe Photoshop', 'Adobe Illustrator', 'UI/UX', 'Прототипирование', 'Анимация', 'Адаптивный дизайн', 'Дизайн-системы', 'Исследование пользователей'],
-            'маркетолог': ['SEO', 'SMM', 'Контекстная реклама', 'Аналитика', 'Копирайтинг', 'Email-маркетинг', 'Стратегическое планирование', 'A/B тестирование', 'Маркетинговые исследования'],
-            'аналитик': ['SQL', 'Excel', 'Python', 'BI-инструменты', 'Статистика', 'Визуализация данных', 'A/B тестирование', 'Machine Learning', 'Прогнозирование', 'Сегментация'],
-            'менеджер': ['Управление проектами', 'Agile/Scrum', 'MS Office', 'CRM', 'Бюджетирование', 'Стратегическое планирование', 'Soft skills', 'Управление персоналом', 'Переговоры']
-        }
+        # Базовые наборы навыков, описания навыков, региональные тренды и образовательные платформы
+        # хранятся в data/catalog.json (см. catalog.py) и перечитываются при изменении файла
         
-        self.default_soft_skills = [
-            'Коммуникабельность', 'Работа в команде', 'Критическое мышление', 
-            'Решение проблем', 'Адаптивность', 'Управление временем', 
-            'Креативность', 'Эмоциональный интеллект', 'Стрессоустойчивость',
-            'Лидерство', 'Самообучение', 'Мультизадачность', 'Проактивность'
-        ]
-        
-        # Региональные особенности
-        self.regional_trends = {
-            'москва': [
-                'Высокая конкуренция требует постоянного совершенствования навыков и специализации',
-                'Востребованы знания английского языка для работы в международных компаниях',
-                'Акцент на инновационные технологии и стартап-культуру',
-                'Активное внедрение AI и machine learning во все сферы деятельности'
-            ],
-            'санкт-петербург': [
-                'Развитие креативных индустрий и IT-сектора',
-                'Баланс между классическим подходом и инновациями',
-                'Востребованы специалисты с опытом работы в международных проектах',
-                'Активное развитие образовательных технологий и финтеха'
-            ],
-            'новосибирск': [
-                'Развитие научно-технологического кластера и сотрудничество с Академгородком',
-                'Рост потребности в специалистах по автоматизации и робототехнике',
-                'Междисциплинарные проекты на стыке науки и IT',
-                'Увеличение числа распределенных команд с головными офисами в Москве'
-            ],
-            'екатеринбург': [
-                'Рост промышленных IT-решений и цифровизация производства',
-                'Развитие региональных IT-хабов и сотрудничество с промышленностью',
-                'Востребованность навыков в сфере информационной безопасности',
-                'Увеличение запроса на специалистов по интеграции систем'
-            ],
-            'казань': [
-                'Активное развитие исламского банкинга и финтех-решений',
-                'Государственная поддержка IT-стартапов и образовательных проектов',
-                'Рост запроса на двуязычных специалистов (русский/татарский)',
-                'Развитие региональных IT-парков и инкубаторов'
-            ],
-            'россия': [
-                'Тренд на импортозамещение программного обеспечения и технологий',
-                'Рост спроса на специалистов по информационной безопасности',
-                'Увеличение проектов в сфере государственных цифровых услуг',
-                'Развитие удаленной работы и распределенных команд'
-            ]
-        }
+        # Инициализация базовых компонентов модели
+        # (scikit-learn, numpy и bs4 импортируются при первом использовании, чтобы не замедлять запуск)
+        # TF-IDF индекс навыков строится офлайн (python skill_index.py) и хранится в каталоге модели
+        # (model_artifact.py); его массивы открываются через mmap и общие для всех воркеров
+        self.skill_index = None
+        # Данные о профессиях строятся по хранилищу вакансий (см. profession_data)
+        self._vacancy_store = None
         
-        # Детальные описания навыков
-        self.skill_descriptions = {
-            'Python': 'ключевой язык для автоматизации, анализа данных и бэкенд-разработки',
-            'SQL': 'необходим для эффективной работы с базами данных и анализа информации',
-            'Git': 'позволяет эффективно организовать командную работу над проектами',
-            'JavaScript': 'основа современной веб-разработки и интерактивных интерфейсов',
-            'HTML': 'фундамент создания веб-страниц и структурирования контента',
-            'CSS': 'необходим для стилизации интерфейсов и создания отзывчивого дизайна',
-            'React': 'востребованная библиотека для создания динамичных пользовательских интерфейсов',
-            'TypeScript': 'повышает надежность кода благодаря статической типизации',
-            'Docker': 'позволяет создавать изолированные среды для приложений',
-            'REST API': 'стандарт взаимодействия между клиентской и серверной частями',
-            'NoSQL': 'позволяет работать с неструктурированными данными в распределенных системах',
-            'Agile/Scrum': 'методология для гибкого управления проектами и командной работы',
-            'Excel': 'необходим для обработки данных, анализа и визуализации информации',
-            'BI-инструменты': 'позволяют преобразовывать данные в наглядные бизнес-отчеты',
-            'UI/UX': 'обеспечивает создание понятных и удобных пользовательских интерфейсов',
-            'SEO': 'помогает повысить видимость сайтов в поисковых системах',
-            'SMM': 'необходим для эффективного продвижения в социальных сетях',
-            'Figma': 'современный инструмент для дизайна интерфейсов и прототипирования'
-        }
+        if model_path:
+            self._load_model(model_path)
         
-        # Инициализация базовых компонентов модели
-        self.vectorizer = TfidfVectorizer()
-        self.skill_vectors = None
-        self.profession_data = {}
+        # Клиент LLM создается лениво в get_local_llm, чтобы конструктор не обращался к LM Studio
+        self.llm = None
+        self.use_llm = LLM_AVAILABLE
+        self._llm_lock = threading.Lock()
+    
+    @property
+    def catalog(self):
+        """Текущий снимок справочных данных (data/catalog.json и связанные файлы)"""
+        return get_catalog()
+    
+    @property
+    def vacancy_store(self):
+        """Хранилище вакансий (открывается при первом обращении)"""
+        if self._vacancy_store is None:
+            self._vacancy_store = get_vacancy_store()
+        return self._vacancy_store
+    
+    @property
+    def profession_data(self):
+        """
+        Сводка по профессиям из хранилища вакансий: число вакансий, частые навыки и время обновления.
+        Доступна без обращения к сети.
+        """
+        return self.vacancy_store.profession_view()
+    
+    def refresh_vacancy_store(self, profession, region=None, limit=50):
+        """
+        Ищет вакансии профессии и загружает в хранилище только новые и изменившиеся
         
-        # Загрузка модели, если путь указан и файл существует
-        if model_path and os.path.exists(model_path):
-            try:
-                with open(model_path, 'rb') as f:
-                    data = pickle.load(f)
-                    if isinstance(data, dict):
-                        if 'vectorizer' in data:
-                            self.vectorizer = data.get('vectorizer')
-                        if 'skill_vectors' in data:
-                            self.skill_vectors = data.get('skill_vectors')
-                        if 'profession_data' in data:
-                            self.profession_data = data.get('profession_data', {})
-                print(f"Модель успешно загружена из {model_path}")
-            except Exception as e:
-                print(f"Ошибка при загрузке модели: {e}. Будет создана новая модель.")
+        Args:
+            profession (str): Название профессии
+            region (str): Регион поиска
+            limit (int): Сколько вакансий запросить в поиске
+            
+        Returns:
+            dict: {'found': найдено в поиске, 'fetched': загружено из API, 'cached': взято из хранилища}
+        """
+        items = self.search_hh_vacancy_items(profession, region, limit)
+        store = self.vacancy_store
         
-        # Сохранение новой модели, если путь указан, но файл не существует
-        if model_path and not os.path.exists(model_path):
-            self.save_model(model_path)
-            print(f"Создана новая модель в {model_path}")
+        stale_ids = store.stale_ids(items)
+        vacancies = hh_api.fetch_vacancies(stale_ids, self.headers) if stale_ids else {}
+        skills = {vacancy_id: parse_vacancy_json_skills(vacancy) for vacancy_id, vacancy in vacancies.items()}
+        store.upsert_vacancies(vacancies, skills)
         
-        # Проверяем доступность LLM модели и инициализируем ее
-        self.llm = None
-        self.use_llm = False
+        area_id = get_area_index(self.headers).resolve(region) if region else ''
+        store.link_profession(self.canonical_profession(profession), area_id,
+                              [item['id'] for item in items if item.get('id')])
         
-        if LLM_AVAILABLE:
+        return {'found': len(items), 'fetched': len(vacancies), 'cached': len(items) - len(stale_ids)}
+    
+    def _load_model(self, model_path):
+        """
+        Открывает каталог модели; устаревший roadmap_model.pkl один раз переводится в каталог
+        """
+        path = model_artifact.artifact_path(model_path)
+        if os.path.isdir(model_artifact.current_version(path)):
+            try:
+                metadata, arrays, strings = model_artifact.load_artifact(path)
+                if metadata.get('skill_index'):
+                    self.skill_index = skill_index.SkillIndex.from_artifact(arrays, strings, metadata)
+                print(f"Модель успешно загружена из {path}")
+            except model_artifact.ArtifactError as e:
+                # Каталог не перезаписывается: его можно пересобрать командой python skill_index.py
+                print(f"Ошибка при загрузке модели: {e}. Индекс навыков не используется.")
+            return
+        
+        legacy = model_artifact.legacy_path(model_path)
+        if os.path.exists(legacy):
+            # Индекс из pickle записан прежней версией классов, поэтому он строится заново по хранилищу
             try:
-                self.llm = LocalLLM(model="qwen3-8b")  # Явно указываем использование модели qwen3-8b
-                self.use_llm = True
-                logging.info("Локальная LLM модель qwen3-8b успешно инициализирована")
+                self.build_skill_index()
             except Exception as e:
-                logging.error(f"Ошибка при инициализации LLM модели: {e}")
+                print(f"Не удалось построить индекс навыков: {e}")
+            self.save_model(path)
+            print(f"Модель из {legacy} перенесена в {path}; файл {legacy} больше не используется")
+            return
+        
+        # Сохранение новой модели, если каталог еще не создан
+        self.save_model(path)
+        print(f"Создана новая модель в {path}")
+    
+    @property
+    def vectorizer(self):
+        """TfidfVectorizer индекса навыков (None, если индекс не построен)"""
+        return self.skill_index.vectorizer if self.skill_index is not None else None
+    
+    @property
+    def skill_vectors(self):
+        """Нормированные TF-IDF векторы навыков (None, если индекс не построен)"""
+        return self.skill_index.skill_vectors if self.skill_index is not None else None
+    
+    def build_skill_index(self):
+        """
+        Обучает TF-IDF индекс навыков на вакансиях из хранилища
+        
+        Returns:
+            SkillIndex: Построенный индекс или None, если в хранилище нет вакансий с навыками
+        """
+        index = skill_index.build_from_store(self.vacancy_store)
+        if index is not None:
+            self.skill_index = index
+        return index
+    
+    def get_profession_skills(self, profession, limit=10):
+        """
+        Ключевые навыки профессии: по TF-IDF индексу вакансий, а если индекс не построен
+        или профессия в нем не найдена - по базовым наборам навыков
+        
+        Args:
+            profession (str): Название профессии
+            limit (int): Сколько навыков вернуть
+            
+        Returns:
+            list: Названия навыков по убыванию значимости
+        """
+        if self.skill_index is not None:
+            skills = self.skill_index.profession_skills(self.canonical_profession(profession), limit)
+            if skills:
+                return [skill for skill, _ in skills]
+        
+        return self.catalog.hard_skills.get(profession, [])[:limit]
+    
+    def get_related_skills(self, skill, limit=10):
+        """
+        Навыки, которые в вакансиях чаще всего требуются вместе с данным
+        
+        Returns:
+            list: Названия навыков; пустой список, если индекс не построен или навык неизвестен
+        """
+        if self.skill_index is None:
+            return []
+        return [related for related, _ in self.skill_index.related_skills(skill, limit)]
     
     def save_model(self, model_path=None):
         """
-        Сохранение модели в файл
+        Сохранение модели в каталог (см. model_artifact.py)
+        
+        Данные о профессиях не сохраняются: они строятся по хранилищу вакансий.
         """
         if model_path is None:
-            # Создаем директорию model, если она не существует
-            os.makedirs('model', exist_ok=True)
-            model_path = os.path.join('model', 'roadmap_model.pkl')
+            model_path = os.path.join('model', 'roadmap_model')
+        path = model_artifact.artifact_path(model_path)
         
         # Создаем директорию model, если она не существует
-        os.makedirs(os.path.dirname(model_path), exist_ok=True)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
         
-        data = {
-            'vectorizer': self.vectorizer,
-            'skill_vectors': self.skill_vectors,
-            'profession_data': self.profession_data
-        }
+        arrays, strings, metadata = {}, {}, {'skill_index': False}
+        if self.skill_index is not None:
+            arrays, strings, metadata = self.skill_index.to_artifact()
+            metadata = dict(metadata, skill_index=True)
+        model_artifact.save_artifact(path, arrays, strings, metadata)
         
-        with open(model_path, 'wb') as f:
-            pickle.dump(data, f)
-        
-        print(f"Модель сохранена в {model_path}")
+        print(f"Модель сохранена в {path}")
     
     def find_profession_type(self, profession):
         """
@@ -186,49 +368,10 @@ class JobRoadmapGenerator:
         Returns:
             str: Тип профессии (IT, финансы, медицина и т.д.)
         """
-        # Преобразуем название профессии в нижний регистр для сравнения
-        profession_lower = profession.lower()
-        
-        # Словарь типов профессий с ключевыми словами
-        profession_keywords = {
-            'IT': ['программист', 'разработчик', 'devops', 'frontend', 'backend', 'верстальщик', 
-                   'тестировщик', 'qa', 'data scientist', 'аналитик данных', 'системный администратор', 
-                   'cto', 'инженер', 'web', 'mobile', 'javascript', 'python', 'java', 'c++', 'c#', 
-                   'php', 'android', 'ios', 'fullstack', 'ai', 'ml', 'devsecops', 'ui/ux'],
-                   
-            'финансы': ['бухгалтер', 'финансист', 'финансовый', 'аудитор', 'экономист', 
-                        'банкир', 'трейдер', 'инвестиционный', 'казначей', 'кредитный', 'финансовый аналитик'],
-                        
-            'медицина': ['врач', 'медсестра', 'фармацевт', 'терапевт', 'хирург', 'стоматолог', 'педиатр', 
-                         'психолог', 'психиатр', 'невролог', 'фельдшер', 'кардиолог', 'онколог', 'ветеринар'],
-                         
-            'маркетинг': ['маркетолог', 'smm', 'seo', 'медиа', 'pr', 'контекстолог', 'копирайтер', 
-                          'таргетолог', 'бренд', 'продвижение', 'реклама', 'маркетинговый'],
-                          
-            'менеджмент': ['менеджер', 'руководитель', 'директор', 'управляющий', 'заведующий', 
-                           'администратор', 'супервайзер', 'координатор', 'ceo', 'coo', 'проджект-менеджер'],
-                           
-            'продажи': ['продавец', 'sales', 'менеджер по продажам', 'торговый', 'консультант', 
-                        'агент по продажам', 'представитель', 'кассир', 'merchandiser', 'продающий'],
-                        
-            'дизайн': ['дизайнер', 'художник', 'иллюстратор', 'графический', 'промышленный дизайн', 
-                      'ui', 'ux', 'веб-дизайнер', 'motion', 'анимация', 'фотограф', 'креативный'],
-                      
-            'образование': ['учитель', 'преподаватель', 'педагог', 'воспитатель', 'тренер', 
-                           'репетитор', 'методист', 'куратор', 'наставник', 'лектор', 'инструктор'],
-                           
-            'юриспруденция': ['юрист', 'адвокат', 'нотариус', 'прокурор', 'судья', 'юрисконсульт', 
-                             'юридический', 'compliance', 'legal', 'арбитраж', 'правовой']
-        }
-        
-        # Ищем совпадения с ключевыми словами по типам профессий
-        for prof_type, keywords in profession_keywords.items():
-            for keyword in keywords:
-                if keyword in profession_lower:
-                    return prof_type
-        
-        # По умолчанию возвращаем "другое"
-        return "другое"
+        # Ключевые слова типов профессий - в data/taxonomy.json (классификатор profession_type);
+        # если ни одно не найдено, возвращается "другое". Классифицируется каноническое название,
+        # поэтому "разработчица" и "python dev" находят ключевое слово "разработчик"
+        return get_taxonomy().category('profession_type', self.canonical_profession(profession))
     
     def search_hh_vacancies(self, profession, region=None, limit=5):
         """
@@ -242,8 +385,22 @@ class JobRoadmapGenerator:
         Returns:
             list: Список URL вакансий
         """
+        return [item['alternate_url'] for item in self.search_hh_vacancy_items(profession, region, limit)]
+    
+    def search_hh_vacancy_items(self, profession, region=None, limit=5):
+        """
+        Поиск вакансий на HH.ru по профессии и региону
+        
+        Args:
+            profession (str): Название профессии
+            region (str): Название региона (город, область)
+            limit (int): Максимальное количество вакансий
+            
+        Returns:
+            list: Краткие данные вакансий из поиска API (id, name, alternate_url, salary и т.д.)
+        """
         try:
-            base_url = "https://api.hh.ru/vacancies"
+            base_url = f"{hh_api.API_BASE}/vacancies"
             
             # Подготовка запроса
             params = {
@@ -253,52 +410,11 @@ class JobRoadmapGenerator:
             }
             
             # Если указан регион, добавляем его в запрос
+            # Код региона ищется по индексу справочника HH, который загружается один раз
             if region:
-                # Карта кодов популярных регионов (можно расширить)
-                region_codes = {
-                    "москва": "1",
-                    "санкт-петербург": "2",
-                    "новосибирск": "4",
-                    "екатеринбург": "3",
-                    "казань": "88",
-                    "нижний новгород": "66",
-                    "челябинск": "104",
-                    "омск": "68",
-                    "самара": "78",
-                    "ростов-на-дону": "76",
-                    "уфа": "99",
-                    "красноярск": "54",
-                    "пермь": "72",
-                    "воронеж": "26"
-                }
-                
-                # Пытаемся найти код региона
-                region_lower = region.lower().strip()
-                if region_lower in region_codes:
-                    params["area"] = region_codes[region_lower]
-                else:
-                    # Если регион не найден в нашей карте кодов, делаем дополнительный запрос
-                    # для поиска кода региона
-                    region_search_url = "https://api.hh.ru/areas"
-                    region_response = requests.get(region_search_url, headers=self.headers)
-                    
-                    if region_response.status_code == 200:
-                        all_areas = region_response.json()
-                        
-                        # Функция для рекурсивного поиска региона
-                        def find_area_id(areas, region_name):
-                            for area in areas:
-                                if region_name.lower() in area['name'].lower():
-                                    return area['id']
-                                if area.get('areas'):
-                                    found_id = find_area_id(area['areas'], region_name)
-                                    if found_id:
-                                        return found_id
-                            return None
-                        
-                        area_id = find_area_id(all_areas, region_lower)
-                        if area_id:
-                            params["area"] = area_id
+                area_id = get_area_index(self.headers).resolve(region)
+                if area_id:
+                    params["area"] = area_id
             
             # Добавляем дополнительные параметры для медицинских профессий
             if any(med_term in profession.lower() for med_term in [
@@ -315,7 +431,7 @@ class JobRoadmapGenerator:
                 params["professional_role"] = "17"
             
             # Выполняем запрос
-            response = requests.get(base_url, params=params, headers=self.headers)
+            response = http_client.get(base_url, params=params, headers=self.headers)
             
             # Проверяем успешность запроса
             if response.status_code != 200:
@@ -334,21 +450,15 @@ class JobRoadmapGenerator:
                     del params['professional_role']
                 
                 # Делаем запрос с более общими параметрами
-                simplified_response = requests.get(base_url, params=params, headers=self.headers)
+                simplified_response = http_client.get(base_url, params=params, headers=self.headers)
                 if simplified_response.status_code == 200:
                     data = simplified_response.json()
             
-            # Извлекаем URL вакансий
-            vacancy_urls = []
-            for item in data.get('items', []):
-                vacancy_urls.append(item['alternate_url'])
-                
-                # Ограничиваем количество
-                if len(vacancy_urls) >= limit:
-                    break
+            # Ограничиваем количество
+            vacancy_items = data.get('items', [])[:limit]
             
-            print(f"Найдено {len(vacancy_urls)} вакансий для профессии '{profession}'")
-            return vacancy_urls
+            print(f"Найдено {len(vacancy_items)} вакансий для профессии '{profession}'")
+            return vacancy_items
             
         except Exception as e:
             print(f"Ошибка при поиске вакансий: {str(e)}")
@@ -357,396 +467,226 @@ class JobRoadmapGenerator:
     def extract_skills_from_vacancy(self, vacancy_url):
         """
         Извлечение навыков из описания вакансии на HH.ru
+        
+        В режиме api (по умолчанию) используется JSON вакансии из API HH.ru,
+        HTML-страница загружается, только если id вакансии не удалось определить
+        или API не ответило.
         """
         try:
-            # Получаем содержимое страницы
-            response = requests.get(vacancy_url, headers=self.headers)
-            response.raise_for_status()
-            html = response.text
-            soup = BeautifulSoup(html, 'html.parser')
+            vacancy_id = hh_api.vacancy_id_from_url(vacancy_url) if EXTRACTION_MODE == 'api' else None
+            if vacancy_id:
+                vacancy = hh_api.fetch_vacancy(vacancy_id, self.headers)
+                if vacancy is not None:
+                    return parse_vacancy_json_skills(vacancy)
             
-            # Извлекаем текст описания вакансии
-            vacancy_description = ""
-            description_div = soup.find('div', {'data-qa': 'vacancy-description'})
-            if description_div:
-                vacancy_description = description_div.get_text()
-            
-            # Ищем блок с требованиями
-            requirements_block = ""
-            for block in soup.find_all(['div', 'p', 'ul']):
-                text = block.get_text().lower()
-                if 'требовани' in text or 'требуется' in text or 'необходимые навыки' in text or 'от вас' in text:
-                    requirements_block += block.get_text() + "\n"
-            
-            # Если блок требований не найден, используем все описание
-            if not requirements_block:
-                requirements_block = vacancy_description
-            
-            # Комбинируем текст для анализа
-            all_text = requirements_block + "\n" + vacancy_description
-            
-            # Паттерны для поиска навыков (расширенный список)
-            skill_patterns = [
-                # Стандартные паттерны
-                r'знание\s+([^;,.]+)',
-                r'опыт\s+работы\s+с\s+([^;,.]+)',
-                r'опыт\s+([^;,.]+)',
-                r'навыки\s+([^;,.]+)',
-                r'умение\s+([^;,.]+)',
-                r'владение\s+([^;,.]+)',
-                
-                # Добавляем паттерны для медицинских специальностей
-                r'диагностика\s+([^;,.]+)',
-                r'лечение\s+([^;,.]+)',
-                r'опыт\s+проведения\s+([^;,.]+)',
-                r'методы\s+([^;,.]+)',
-                r'работа\s+с\s+([^;,.]+аппарат[^;,.]+)',
-                r'работа\s+с\s+([^;,.]+оборудован[^;,.]+)',
-                r'профилактика\s+([^;,.]+)',
-                r'([^;,.]+)\s+обследовани[^;,.]+',
-                r'([^;,.]+)\s+манипуляци[^;,.]+',
-                r'([^;,.]+)\s+терапи[^;,.]+',
-                r'([^;,.]+)\s+хирурги[^;,.]+',
-                
-                # Паттерны для списков навыков
-                r'•\s+([^;•]+)',
-                r'‣\s+([^;‣]+)',
-                r'-\s+([^;-]+)',
-                r'◦\s+([^;◦]+)',
-                r'✓\s+([^;✓]+)'
-            ]
-            
-            # Поиск медицинских терминов и процедур
-            medical_terms = [
-                'диагностика', 'терапия', 'хирургия', 'манипуляция', 
-                'анализ', 'исследование', 'протокол', 'стандарт', 
-                'узи', 'кт', 'мрт', 'экг', 'рентген', 
-                'эндоскопия', 'лапароскопия', 'биопсия',
-                'реабилитация', 'профилактика', 'консультирование',
-                'операция', 'лечение', 'обследование'
-            ]
-            
-            # Извлекаем навыки с использованием регулярных выражений
-            skills = []
-            
-            # Поиск по паттернам
-            for pattern in skill_patterns:
-                matches = re.finditer(pattern, all_text, re.IGNORECASE)
-                for match in matches:
-                    skill = match.group(1).strip()
-                    # Проверяем длину навыка (слишком короткие или длинные исключаем)
-                    if 3 < len(skill) < 100:
-                        skills.append(skill)
-            
-            # Ищем HTML списки с навыками
-            ul_lists = soup.find_all('ul')
-            for ul in ul_lists:
-                items = ul.find_all('li')
-                for item in items:
-                    item_text = item.get_text().strip()
-                    # Проверяем длину и осмысленность текста
-                    if 3 < len(item_text) < 100:
-                        skills.append(item_text)
-            
-            # Дополнительный поиск медицинских терминов во всём тексте страницы
-            full_page_text = soup.get_text()
-            for term in medical_terms:
-                # Ищем в контексте фразы, содержащие медицинские термины
-                for match in re.finditer(r'[^.;:,]{0,50}' + term + r'[^.;:,]{0,100}', full_page_text, re.IGNORECASE):
-                    context = match.group(0).strip()
-                    # Проверяем длину контекста
-                    if 10 < len(context) < 150:
-                        skills.append(context)
+            html = self._fetch_vacancy_page(vacancy_url)
+            return parse_vacancy_skills(html)
+        
+        except Exception as e:
+            print(f"Ошибка при извлечении навыков из вакансии {vacancy_url}: {str(e)}")
+            return []
+    
+    def _fetch_vacancy_page(self, vacancy_url):
+        """Загружает HTML страницы вакансии через общую сессию с ограничением частоты запросов"""
+        response = http_client.get(vacancy_url, headers=self.headers)
+        response.raise_for_status()
+        return response.text
+    
+    def extract_skills_from_vacancies(self, vacancy_urls):
+        """
+        Извлечение навыков из нескольких вакансий одновременно
+        
+        Страницы загружаются параллельно (не более HH_FETCH_CONCURRENCY запросов),
+        каждая загруженная страница сразу отправляется на разбор в пул процессов,
+        поэтому общее время близко к времени самой медленной загрузки.
+        
+        Args:
+            vacancy_urls (list): Список URL вакансий
             
-            # Нормализуем и чистим список навыков
-            normalized_skills = []
-            for skill in skills:
-                # Очищаем от мусора
-                skill = re.sub(r'^\s*[-•‣◦✓]\s*', '', skill)
-                skill = skill.strip(',.;: ')
+        Returns:
+            list: Навыки, отсортированные по числу вакансий, в которых они встречаются
+        """
+        urls = list(dict.fromkeys(vacancy_urls))
+        if not urls:
+            return []
+        
+        skill_counts = Counter()
+        total = len(urls)
+        
+        # JSON из API разбирается регулярными выражениями без BeautifulSoup, пул процессов не нужен
+        if EXTRACTION_MODE == 'api':
+            ids = {url: hh_api.vacancy_id_from_url(url) for url in urls}
+            vacancies = hh_api.fetch_vacancies([vacancy_id for vacancy_id in ids.values() if vacancy_id], self.headers)
+            for vacancy in vacancies.values():
+                skill_counts.update(parse_vacancy_json_skills(vacancy))
+            # Страницы загружаем только для вакансий, которых нет в API
+            urls = [url for url in urls if ids[url] not in vacancies]
+        
+        parse_pool = submitted_pool = _get_parse_pool() if urls else None
+        parses = {}
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(http_client.FETCH_CONCURRENCY, len(urls))),
+                                thread_name_prefix='vacancy-fetch') as fetch_pool:
+            fetches = {fetch_pool.submit(self._fetch_vacancy_page, url): url for url in urls}
+            for future in as_completed(fetches):
+                url = fetches[future]
+                try:
+                    html = future.result()
+                except Exception as e:
+                    print(f"Ошибка при загрузке вакансии {url}: {str(e)}")
+                    continue
                 
-                # Проверяем минимальную длину и наличие осмысленных символов
-                if len(skill) > 3 and re.search(r'[а-яА-Яa-zA-Z]', skill):
-                    normalized_skills.append(skill)
-            
-            # Удаляем дубликаты и сортируем
-            unique_skills = list(set(normalized_skills))
-            unique_skills.sort()
-            
-            return unique_skills
+                if parse_pool is not None:
+                    try:
+                        parses[parse_pool.submit(parse_vacancy_skills, html)] = (url, html)
+                        continue
+                    except BrokenProcessPool:
+                        _discard_parse_pool(parse_pool)
+                        parse_pool = None
+                skill_counts.update(self._parse_vacancy_safely(url, html))
+        
+        for future in as_completed(parses):
+            url, html = parses[future]
+            try:
+                skill_counts.update(future.result())
+            except BrokenProcessPool:
+                # Пул процессов сломан (например, рабочий процесс завершился) - разбираем в текущем потоке
+                _discard_parse_pool(submitted_pool)
+                skill_counts.update(self._parse_vacancy_safely(url, html))
+            except Exception as e:
+                print(f"Ошибка при извлечении навыков из вакансии {url}: {str(e)}")
+        
+        print(f"Извлечено {len(skill_counts)} навыков из {total} вакансий")
+        return sorted(skill_counts, key=lambda skill: (-skill_counts[skill], skill))
+    
+    def get_vacancies_details(self, vacancy_urls):
+        """
+        Возвращает структурированные данные вакансий из API HH.ru
         
+        Args:
+            vacancy_urls (list): URL или идентификаторы вакансий
+            
+        Returns:
+            list: Словари с id, названием, регионом, навыками, зарплатой и датой публикации
+        """
+        ids = [vacancy_id for vacancy_id in map(hh_api.vacancy_id_from_url, vacancy_urls) if vacancy_id]
+        vacancies = hh_api.fetch_vacancies(ids, self.headers)
+        details = []
+        for vacancy_id in dict.fromkeys(ids):
+            vacancy = vacancies.get(vacancy_id)
+            if vacancy is None:
+                continue
+            details.append({
+                'id': vacancy_id,
+                'name': vacancy.get('name', ''),
+                'area': (vacancy.get('area') or {}).get('name', ''),
+                'skills': parse_vacancy_json_skills(vacancy),
+                'salary': hh_api.vacancy_salary(vacancy),
+                'experience': (vacancy.get('experience') or {}).get('id'),
+                'published_at': vacancy.get('published_at')
+            })
+        return details
+    
+    @staticmethod
+    def _parse_vacancy_safely(url, html):
+        """Разбирает страницу вакансии в текущем потоке, возвращая пустой список при ошибке"""
+        try:
+            return parse_vacancy_skills(html)
         except Exception as e:
-            print(f"Ошибка при извлечении навыков из вакансии {vacancy_url}: {str(e)}")
+            print(f"Ошибка при извлечении навыков из вакансии {url}: {str(e)}")
             return []
 
     def generate_skill_description(self, skill, profession):
         """
         Генерация детального описания навыка с учетом профессии
         """
-        # Проверяем, есть ли готовое описание для навыка
-        if skill in self.skill_descriptions:
-            base_description = self.skill_descriptions[skill]
-        else:
-            # Если нет готового описания, генерируем обобщенное
-            base_description = "важный инструмент для профессионального роста"
+        # Готовое описание навыка или обобщенное, если его нет в каталоге
+        catalog = self.catalog
+        base_description = catalog.skill_descriptions.get(skill, "важный инструмент для профессионального роста")
         
         # Добавляем контекст профессии и значимость
-        profession_contexts = {
-            'программист': f'для разработки эффективных и масштабируемых приложений',
-            'разработчик': f'для создания современного программного обеспечения',
-            'frontend': f'для создания современных и интерактивных пользовательских интерфейсов',
-            'бэкенд': f'для разработки надежной серверной части приложений',
-            'дизайнер': f'для создания привлекательных и удобных интерфейсов',
-            'аналитик': f'для проведения глубокого анализа данных и формирования инсайтов',
-            'маркетолог': f'для эффективного продвижения продуктов и услуг',
-            'менеджер': f'для успешной координации и реализации проектов'
-        }
-        
-        # Определяем подходящий контекст
-        context = 'в современной IT-сфере'
-        for key, value in profession_contexts.items():
-            if key in profession.lower():
-                context = value
-                break
+        context = catalog.profession_contexts.get(profession, 'в современной IT-сфере')
         
         return f"{base_description}. Этот навык особенно ценен {context}."
     
     def get_region_trends(self, region):
         """
         Получение региональных трендов в зависимости от указанного региона
-        """
-        region_lower = region.lower()
-        
-        # Проверяем, есть ли прямое соответствие региону
-        for key in self.regional_trends.keys():
-            if key in region_lower:
-                return self.regional_trends[key]
         
-        # Если нет прямого соответствия, возвращаем общероссийские тренды
-        return self.regional_trends['россия']
+        Тренды считаются офлайн по вакансиям из хранилища (python region_trends.py): рост спроса
+        на навыки, число вакансий и зарплаты в регионе или ближайшем регионе выше по дереву HH.
+        Пока таблица трендов не построена, используются тренды из каталога.
+        """
+        trends_table = get_region_trends()
+        if trends_table is not None:
+            area_index = get_area_index(self.headers)
+            area_id = area_index.resolve(region) if region else None
+            trends = trends_table.trends(area_id, area_index.parents)
+            if trends:
+                return trends
+        # Тренды региона по вхождению его названия, иначе общероссийские
+        return self.catalog.region_trends(region)
     
-    def generate_learning_steps(self, profession, skills, experience_level='junior'):
+    def get_next_skills(self, profession, user_info=None, limit=5):
         """
-        Генерация пошагового плана обучения для достижения уровня в профессии
+        Навыки, которые стоит изучить следующими, среди всех навыков вакансий профессии
         
-        Args:
-            profession (str): Название профессии
-            skills (list): Список требуемых навыков
-            experience_level (str): Уровень опыта (junior, middle, senior)
-            
         Returns:
-            list: Список шагов обучения с заголовком и описанием
+            list: [(навык, ценность)]; пустой список, если индекс навыков не построен
         """
-        # Определяем тип профессии для подбора соответствующих рекомендаций
-        profession_type = self.find_profession_type(profession)
-        
-        # Выбираем количество месяцев для разных уровней опыта
-        timeline_months = {
-            'junior': 6,
-            'middle': 12,
-            'senior': 18
-        }.get(experience_level.lower(), 6)
-        
-        # Отбираем наиболее важные навыки для изучения
-        if len(skills) > 5:
-            selected_skills = skills[:5]
-        else:
-            selected_skills = skills
-            
-        # Шаблоны для описания процесса обучения
-        learning_templates = {
-            'it': [
-                "Изучение {skill} через практические проекты и задачи",
-                "Освоение {skill} с использованием онлайн-курсов и документации",
-                "Практическое применение {skill} в учебных проектах",
-                "Углубленное понимание {skill} через решение практических задач",
-                "Разработка собственных проектов с использованием {skill}"
-            ],
-            'финансы': [
-                "Изучение основ {skill} и их применение в финансовом анализе",
-                "Применение {skill} в моделировании финансовых процессов",
-                "Решение практических кейсов по {skill}",
-                "Анализ реальных ситуаций с применением {skill}",
-                "Построение сложных финансовых моделей с использованием {skill}"
-            ],
-            'медицина': [
-                "Изучение теоретических основ {skill} и клинических случаев",
-                "Практическое применение {skill} в симулированных условиях",
-                "Наблюдение за применением {skill} у опытных специалистов",
-                "Ассистирование при применении {skill} под наблюдением",
-                "Самостоятельное применение {skill} и анализ результатов"
-            ],
-            'маркетинг': [
-                "Изучение принципов {skill} и успешных кейсов",
-                "Разработка стратегий {skill} для учебных проектов",
-                "Применение {skill} в небольших маркетинговых кампаниях",
-                "Анализ эффективности {skill} на реальных примерах",
-                "Построение комплексных маркетинговых планов с использованием {skill}"
-            ],
-            'образование': [
-                "Изучение методик и подходов к {skill}",
-                "Разработка учебных материалов с применением {skill}",
-                "Проведение пробных занятий с использованием {skill}",
-                "Анализ эффективности {skill} и корректировка подхода",
-                "Интеграция {skill} в комплексную образовательную программу"
-            ],
-            'юриспруденция': [
-                "Изучение нормативной базы по {skill}",
-                "Анализ судебной практики в области {skill}",
-                "Составление юридических документов с применением {skill}",
-                "Моделирование правовых ситуаций в сфере {skill}",
-                "Комплексный анализ сложных кейсов с применением {skill}"
-            ],
-            'инженерия': [
-                "Изучение теоретических основ {skill}",
-                "Практическое применение {skill} в простых проектах",
-                "Разработка технических решений с использованием {skill}",
-                "Оптимизация и улучшение решений на основе {skill}",
-                "Внедрение инновационных подходов в применении {skill}"
-            ],
-            'дизайн': [
-                "Изучение базовых принципов {skill} и успешных примеров",
-                "Создание учебных проектов с применением {skill}",
-                "Разработка собственного стиля применения {skill}",
-                "Получение обратной связи и улучшение навыков {skill}",
-                "Применение {skill} в комплексных дизайн-проектах"
-            ]
-        }
-        
-        # Технические термины для различных профессиональных областей
-        technical_terms = {
-            'it': ['фреймворки', 'библиотеки', 'микросервисы', 'алгоритмы', 'архитектура', 'паттерны проектирования'],
-            'финансы': ['финансовые показатели', 'бюджетирование', 'управленческий учет', 'аудит', 'налоговая оптимизация'],
-            'медицина': ['диагностика', 'методы лечения', 'протоколы', 'фармакология', 'реабилитация', 'профилактика'],
-            'маркетинг': ['маркетинговый анализ', 'продвижение', 'таргетирование', 'конверсия', 'лидогенерация'],
-            'образование': ['методики обучения', 'педагогические технологии', 'компетенции', 'оценка знаний'],
-            'юриспруденция': ['судебная практика', 'нормативные акты', 'правовые прецеденты', 'юридическая техника'],
-            'инженерия': ['проектирование', 'моделирование', 'расчеты', 'технические стандарты', 'оптимизация'],
-            'дизайн': ['композиция', 'прототипирование', 'юзабилити', 'визуальная иерархия', 'интерактивность']
-        }
-        
-        # Общие базовые шаги для любой профессии
-        common_steps = [
-            {
-                "title": "Изучение теоретических основ профессии",
-                "description": f"Получение базовых знаний о профессии {profession.capitalize()}, понимание ключевых концепций и фундаментальных принципов работы."
-            },
-            {
-                "title": "Освоение базовых инструментов и технологий",
-                "description": f"Знакомство с основными инструментами, необходимыми для работы в профессии {profession.capitalize()}, и практика их использования."
-            },
-            {
-                "title": "Получение практического опыта",
-                "description": "Решение реальных задач, выполнение учебных проектов и накопление практического опыта работы в профессиональной среде."
-            },
-            {
-                "title": "Развитие профессиональных связей",
-                "description": "Участие в профессиональных сообществах, посещение отраслевых мероприятий и налаживание контактов с другими специалистами в области."
-            },
-            {
-                "title": "Постоянное самосовершенствование",
-                "description": "Отслеживание актуальных тенденций в отрасли, изучение новых технологий и подходов для повышения профессионального уровня."
-            }
-        ]
-        
-        # Если не удалось определить тип профессии или нет специализированных шаблонов
-        if profession_type not in learning_templates:
-            return common_steps
-        
-        # Создаем шаги на основе выбранных навыков
-        steps = []
-        
-        # Начинаем с ознакомительного шага
-        steps.append({
-            "title": f"Основы профессии {profession.capitalize()}",
-            "description": f"Знакомство с базовыми принципами работы {profession.capitalize()}, понимание ключевых концепций и требований рынка."
-        })
-        
-        # Добавляем шаги по навыкам
-        for i, skill in enumerate(selected_skills):
-            templates = learning_templates.get(profession_type, learning_templates['it'])
-            
-            # Генерируем описание на основе шаблона
-            description = templates[i % len(templates)].format(skill=skill)
-            
-            # Добавляем технические термины для более профессионального звучания
-            terms = technical_terms.get(profession_type, ['методология', 'специализация', 'компетенции', 'практика'])
-            term = random.choice(terms)
-            
-            steps.append({
-                "title": f"Изучение и практика: {skill}",
-                "description": f"{description}. Освоение {term} в контексте {skill} для повышения эффективности работы."
-            })
-        
-        # Добавляем заключительный шаг по проектному портфолио
-        steps.append({
-            "title": "Создание профессионального портфолио",
-            "description": f"Формирование набора проектов и примеров работ, демонстрирующих ваши навыки и опыт в области {profession.capitalize()}."
-        })
-        
-        # Ограничиваем количество шагов для разных уровней
-        max_steps = min(7, len(steps))
-        
-        return steps[:max_steps]
+        if self.skill_index is None:
+            return []
+        known = self.skill_index.skills_in_text(user_info)
+        return self.skill_index.next_skills(known, self.canonical_profession(profession), limit)
     
-    def get_default_roadmap(self, profession, experience_level='junior', region=None):
+    def get_default_roadmap(self, profession, experience_level='junior', region=None, user_info=None, reason='llm_unavailable'):
         """
-        Возвращает дефолтную дорожную карту, если произошла ошибка
+        Возвращает дорожную карту без LLM (LM Studio недоступен или не вернул карьерный план)
+        
+        Карта строится по скомпилированным шаблонам (fallback.py) и дополняется так же,
+        как ответ модели: зарплатами, образовательными ресурсами и шаблонными
+        персональными рекомендациями. Шаги практики в плане обучения идут в порядке
+        get_next_skills (по приросту покрытия вакансий профессии).
         
         Args:
             profession (str): Название профессии
-            experience_level (str): Уровень опыта
+            experience_level (str): Уровень опыта (шаблоны от него не зависят)
             region (str): Регион пользователя
+            user_info (str): Информация о пользователе
+            reason (str): Причина для метрики roadmap_fallback_total
             
         Returns:
-            dict: Дефолтная дорожная карта
+            dict: Дорожная карта в формате ответа /api/analyze с признаком fallback
         """
-        profession_type = self.find_profession_type(profession)
-        
-        # Базовые навыки для разных типов профессий
-        default_skills = {
-            "it": ["Программирование", "Алгоритмы и структуры данных", "Базы данных", "Сетевые технологии"],
-            "финансы": ["Финансовый анализ", "Бухгалтерский учет", "Excel", "Финансовое моделирование"],
-            "медицина": ["Анатомия", "Физиология", "Фармакология", "Клиническое мышление"],
-            "маркетинг": ["Маркетинговые исследования", "Брендинг", "SMM", "Аналитика"],
-            "образование": ["Педагогика", "Психология", "Методика преподавания", "Ораторское искусство"],
-            "юриспруденция": ["Гражданское право", "Уголовное право", "Юридическое письмо", "Навыки переговоров"],
-            "инженерия": ["Черчение", "Проектирование", "Моделирование", "Технический анализ"],
-            "дизайн": ["Композиция", "Типографика", "Графические редакторы", "UX/UI дизайн"],
-        }
+        FALLBACK_ROADMAPS.inc(reason=reason)
+        next_skills = [skill for skill, _ in self.get_next_skills(profession, user_info, MAX_SKILL_STEPS)]
+        # Зерно от канонического запроса: формулировки шагов практики (а значит, и ETag) воспроизводимы
+        seed = request_seed(self.canonical_profession(profession), get_canonicalizer().level(profession),
+                            normalize_text(region), (user_info or '').strip())
+        with span('fallback_roadmap'):
+            roadmap = get_fallback_engine().render(profession, region, next_skills, seed)
+        roadmap["fallback"] = True
+        self._enrich_roadmap(roadmap, profession, region)
+        if user_info:
+            roadmap["personalRecommendations"] = self.generate_personal_recommendations(user_info)
+        return roadmap
+    
+    def _roadmap_llm(self):
+        """
+        LocalLLM для генерации дорожной карты или None, если LLM недоступна
         
-        # Получаем навыки в зависимости от типа профессии
-        skills = default_skills.get(profession_type, ["Профессиональные знания", "Коммуникабельность", "Аналитическое мышление"])
-        
-        # Форматируем навыки с описаниями
-        formatted_skills = self.format_skills_with_descriptions(skills, profession)
-        
-        # Генерируем шаги обучения
-        steps = self.generate_learning_steps(profession, skills, experience_level)
-        
-        # Получаем ресурсы для обучения
-        resources = self.get_learning_resources(profession_type, skills)
-        
-        # Получаем региональные рекомендации
-        regional_recommendations = self.get_regional_recommendations(profession, region)
-        
-        # Определяем перспективы карьерного роста
-        career_prospects = self.generate_career_prospects(profession, skills, experience_level)
-        
-        return {
-            "profession": profession.capitalize(),
-            "profession_type": profession_type,
-            "description": f"{profession.capitalize()} - специалист, который {self.get_profession_description(profession)}",
-            "skills": formatted_skills,
-            "learning_steps": steps,
-            "education": ["Высшее профильное образование", 
-                          "Дополнительное профессиональное образование", 
-                          "Профессиональные сертификаты"],
-            "resources": resources,
-            "career_prospects": career_prospects,
-            "regional_recommendations": regional_recommendations,
-            "trends": self.get_industry_trends(profession_type)
-        }
+        Фоновая проба (app.py) и каждая генерация обновляют server_available, поэтому
+        во время сбоя LM Studio запросы сразу обслуживаются шаблонами, без ожидания таймаутов.
+        Устаревший отказ перепроверяется (LocalLLM.server_known_down).
+        """
+        try:
+            llm = self.get_local_llm()
+        except Exception as e:
+            logging.warning(f"LLM недоступна, дорожная карта строится по шаблонам: {e}")
+            return None
+        if llm.server_known_down():
+            return None
+        return llm
     
     def get_local_llm(self):
         """
@@ -757,13 +697,14 @@ class JobRoadmapGenerator:
             LocalLLM: Экземпляр класса для работы с локальной моделью
         """
         if not self.llm and LLM_AVAILABLE:
-            try:
-                from llm_integration import LocalLLM
-                self.llm = LocalLLM(model="qwen3-8b")  # Явно указываем использование модели qwen3-8b
-                self.use_llm = True
-                logging.info("Локальная LLM модель qwen3-8b успешно инициализирована в get_local_llm")
-            except Exception as e:
-                logging.error(f"Ошибка при инициализации LLM модели в get_local_llm: {e}")
+            with self._llm_lock:
+                if not self.llm:
+                    try:
+                        self.llm = LocalLLM(model="qwen3-8b")  # Явно указываем использование модели qwen3-8b
+                        self.use_llm = True
+                        logging.info("Локальная LLM модель qwen3-8b успешно инициализирована в get_local_llm")
+                    except Exception as e:
+                        logging.error(f"Ошибка при инициализации LLM модели в get_local_llm: {e}")
                 
         if not self.llm:
             raise Exception("Локальная LLM модель недоступна. Проверьте наличие модуля llm_integration.py и доступность LM Studio на порту 1234.")
@@ -788,30 +729,172 @@ class JobRoadmapGenerator:
         if not region or region.strip().lower() in ["россия", "рф", "russia", "russian federation"]:
             region = "Россия"
         
-        # Используем локальную модель
-        local_llm = self.get_local_llm()
+        # Используем локальную модель; если она недоступна - шаблонную дорожную карту
+        local_llm = self._roadmap_llm()
+        if local_llm is None:
+            return self.get_default_roadmap(user_input, region=original_region, user_info=user_info)
         
         # Генерируем карьерную карту
-        roadmap = local_llm.generate_roadmap(user_input, original_region, user_info)
+        with span('llm_roadmap'):
+            roadmap = local_llm.generate_roadmap(user_input, original_region, user_info)
+        if not roadmap:
+            return self.get_default_roadmap(user_input, region=original_region, user_info=user_info, reason='llm_failed')
+        self._enrich_roadmap(roadmap, user_input, original_region)
+        
+        # Генерируем персональные рекомендации если предоставлена информация о пользователе
+        if user_info:
+            # Используем LLM модель для генерации персональных рекомендаций
+            with span('personal_recommendations'):
+                personal_recommendations = self.generate_personal_recommendations_with_llm(user_input, region, user_info, local_llm)
+            roadmap["personalRecommendations"] = personal_recommendations
+        
+        # Возвращаем результат
+        return roadmap
+    
+    async def agenerate_roadmap(self, user_input, region=None, user_info=None):
+        """Асинхронная версия generate_roadmap: запросы к LLM не блокируют поток.
+        
+        Args:
+            user_input (str): Введенная пользователем профессия
+            region (str): Регион (по умолчанию Россия)
+            user_info (str): Информация о пользователе в свободной форме
+            
+        Returns:
+            dict: Структурированная информация о карьерной дорожной карте
+        """
+        print(f"Получен асинхронный запрос на генерацию карьерной карты для: {user_input} в регионе: {region}")
+        
+        original_region = region
+        if not region or region.strip().lower() in ["россия", "рф", "russia", "russian federation"]:
+            region = "Россия"
+        
+        # Проверка LM Studio, шаблонная карта и дополнение ответа читают файлы и могут обращаться
+        # к HH.ru, поэтому выполняются в пуле потоков, не останавливая цикл событий
+        local_llm = await asyncio.to_thread(self._roadmap_llm)
+        if local_llm is None:
+            return await asyncio.to_thread(self.get_default_roadmap, user_input, region=original_region,
+                                           user_info=user_info)
+        
+        with span('llm_roadmap'):
+            roadmap = await local_llm.agenerate_roadmap(user_input, original_region, user_info)
+        if not roadmap:
+            return await asyncio.to_thread(self.get_default_roadmap, user_input, region=original_region,
+                                           user_info=user_info, reason='llm_failed')
+        await asyncio.to_thread(self._enrich_roadmap, roadmap, user_input, original_region)
+        
+        if user_info:
+            with span('personal_recommendations'):
+                roadmap["personalRecommendations"] = await self.agenerate_personal_recommendations_with_llm(
+                    user_input, region, user_info, local_llm
+                )
+        
+        return roadmap
+    
+    @staticmethod
+    def canonical_profession(profession):
+        """
+        Каноническое название профессии - ключ для кешей, хранилища вакансий и индекса навыков
+        
+        "Программисты", "программистка" и "програмист" дают "программист" (см. canonicalizer.py);
+        профессия не из списка data/professions.json приводится к нормализованному тексту.
+        """
+        return get_canonicalizer().canonical_id(profession)
+    
+    def generate_roadmaps_batch(self, items, default_region=None):
+        """Генерирует дорожные карты для списка профессий с ограниченной параллельностью.
+        
+        Одинаковые запросы (по каноническому названию профессии, уровню, региону и
+        информации о пользователе) генерируются один раз. Генерации выполняются асинхронным
+        транспортом (agenerate_roadmap) в общем для процесса цикле событий; семафор цикла
+        ограничивает число одновременных генераций всех пакетных запросов.
+        
+        Args:
+            items (list): Список словарей с ключами profession, region, userInfo
+            default_region (str): Регион для элементов, в которых он не указан
+            
+        Yields:
+            dict: Результат для уникального запроса в порядке завершения генерации;
+                  indices - позиции элемента во входном списке
+        """
+        jobs = {}
+        for index, item in enumerate(items):
+            profession = item.get('profession', '')
+            region = item.get('region') or default_region or ''
+            user_info = item.get('userInfo', '')
+            # Каноническое название без уровня: "Junior" и "Senior" - разные запросы
+            key = (self.canonical_profession(profession), get_canonicalizer().level(profession),
+                   normalize_text(region), user_info.strip())
+            if key in jobs:
+                jobs[key]['indices'].append(index)
+            else:
+                jobs[key] = {'indices': [index], 'profession': profession.strip(), 'region': region, 'user_info': user_info}
+        
+        async def run_job(job):
+            global _batch_slots
+            if _batch_slots is None:
+                _batch_slots = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+            async with _batch_slots:
+                return await self.agenerate_roadmap(job['profession'], region=job['region'], user_info=job['user_info'])
+        
+        QUEUE_DEPTH.inc(len(jobs), endpoint='batch')
+        loop = _get_batch_loop()
+        futures = {}
+        try:
+            for job in jobs.values():
+                future = asyncio.run_coroutine_threadsafe(run_job(job), loop)
+                # Колбэк срабатывает и при отмене, поэтому глубина очереди не "зависает"
+                future.add_done_callback(lambda _: QUEUE_DEPTH.dec(endpoint='batch'))
+                futures[future] = job
+            for future in as_completed(futures):
+                job = futures[future]
+                result = {'indices': job['indices'], 'profession': job['profession'], 'region': job['region']}
+                try:
+                    result['roadmap'] = future.result()
+                    result['status'] = 'ok'
+                except Exception as e:
+                    logging.error(f"Ошибка при пакетной генерации дорожной карты для '{job['profession']}': {e}")
+                    result['status'] = 'error'
+                    result['error'] = 'Не удалось сгенерировать дорожную карту'
+                yield result
+        finally:
+            # Если клиент отключился, отменяем оставшиеся генерации
+            for future in futures:
+                future.cancel()
+    
+    def _enrich_roadmap(self, roadmap, user_input, original_region):
+        """Дополняет ответ модели профессией, регионом, зарплатами, трендами региона и образовательными ресурсами.
         
+        Args:
+            roadmap (dict): Карьерный план от LLM (изменяется на месте)
+            user_input (str): Введенная пользователем профессия
+            original_region (str): Регион в том виде, в котором его указал пользователь
+        """
         # Добавляем информацию о профессии и регионе в результат
         roadmap["profession"] = user_input
         roadmap["region"] = original_region or "Россия"
         
+        # Зарплаты по вакансиям из хранилища, если их достаточно
+        try:
+            salary_stats = self.get_salary_stats(user_input, original_region)
+        except Exception as e:
+            logging.warning(f"Не удалось получить статистику зарплат: {e}")
+            salary_stats = None
+        if salary_stats is not None:
+            roadmap["salaryStats"] = salary_stats
+        
+        # Тренды региона: по таблице трендов из вакансий, иначе из каталога
+        try:
+            region_trends = self.get_region_trends(original_region)
+        except Exception as e:
+            logging.warning(f"Не удалось получить тренды региона: {e}")
+            region_trends = None
+        if region_trends:
+            roadmap["regionTrends"] = region_trends
+        
         # Проверяем, что futureInsights представлен в виде списка
         if "futureInsights" in roadmap and isinstance(roadmap["futureInsights"], str):
             # Преобразуем строку в массив, разбивая по точке или новой строке
-            insights_text = roadmap["futureInsights"]
-            insights = []
-            for insight in re.split(r'[.\n]+', insights_text):
-                insight = insight.strip()
-                if insight:  # Добавляем только непустые строки
-                    insights.append(insight)
-            
-            if not insights:  # Если после разбивки нет элементов, используем весь текст
-                insights = [insights_text]
-                
-            roadmap["futureInsights"] = insights
+            roadmap["futureInsights"] = split_insights(roadmap["futureInsights"])
         
         # Извлекаем темы для изучения из плана обучения
         learning_topics = []
@@ -819,10 +902,7 @@ class JobRoadmapGenerator:
             for step in roadmap["learningPlan"]:
                 if isinstance(step, dict) and "title" in step:
                     # Убираем общие фразы из названия темы
-                    topic = step["title"]
-                    topic = re.sub(r'^(Изучение|Освоение|Практика|Знакомство с)\s+', '', topic)
-                    topic = re.sub(r'^(и|практика|навыки)\s+', '', topic)
-                    learning_topics.append(topic)
+                    learning_topics.append(learning_topic(step["title"]))
         
         # Добавляем хард-скиллы как дополнительные темы
         if "hardSkills" in roadmap and isinstance(roadmap["hardSkills"], list):
@@ -832,18 +912,10 @@ class JobRoadmapGenerator:
         
         # Находим образовательные ресурсы для тем
         if learning_topics:
-            educational_resources = self.find_education_resources(user_input, learning_topics)
+            with span('education_resources'):
+                educational_resources = self.find_education_resources(user_input, learning_topics)
             roadmap["educationalResources"] = educational_resources
         
-        # Генерируем персональные рекомендации если предоставлена информация о пользователе
-        if user_info:
-            # Используем LLM модель для генерации персональных рекомендаций
-            personal_recommendations = self.generate_personal_recommendations_with_llm(user_input, region, user_info, local_llm)
-            roadmap["personalRecommendations"] = personal_recommendations
-        
-        # Возвращаем результат
-        return roadmap
-    
     def generate_personal_recommendations_with_llm(self, profession, region, user_info, llm=None):
         """Генерирует персональные рекомендации, используя LLM модель.
         
@@ -861,7 +933,52 @@ class JobRoadmapGenerator:
                 llm = self.get_local_llm()
                 
             # Создаем промпт для генерации персональных рекомендаций
-            prompt = f"""Ты опытный карьерный консультант и коуч по профессиональному развитию с 15-летним стажем. 
+            prompt = self._build_personal_recommendations_prompt(profession, region, user_info)
+            # Генерируем ответ от модели с улучшенными параметрами для большей детализации
+            response = llm.generate(
+                prompt, 
+                temperature=0.5,  # Увеличиваем температуру для более творческих ответов
+                max_tokens=2048,  # Увеличиваем лимит токенов для более детальных рекомендаций
+                top_p=0.95        # Увеличиваем разнообразие ответов
+            )
+            
+            return self._parse_personal_recommendations(response, user_info)
+            
+        except Exception as e:
+            logging.error(f"Ошибка при генерации персональных рекомендаций с LLM: {e}")
+            logging.error(traceback.format_exc())
+            # В случае ошибки используем стандартный метод
+            return self.generate_personal_recommendations(user_info)
+    
+    async def agenerate_personal_recommendations_with_llm(self, profession, region, user_info, llm=None):
+        """Асинхронная версия generate_personal_recommendations_with_llm.
+        
+        Args:
+            profession (str): Название профессии
+            region (str): Название региона
+            user_info (str): Информация о пользователе
+            llm (LocalLLM, optional): Экземпляр LocalLLM для генерации рекомендаций
+            
+        Returns:
+            list: Список персонализированных рекомендаций
+        """
+        try:
+            if not llm:
+                llm = self.get_local_llm()
+            
+            prompt = self._build_personal_recommendations_prompt(profession, region, user_info)
+            response = await llm.agenerate(prompt, temperature=0.5, max_tokens=2048, top_p=0.95)
+            
+            return self._parse_personal_recommendations(response, user_info)
+            
+        except Exception as e:
+            logging.error(f"Ошибка при асинхронной генерации персональных рекомендаций с LLM: {e}")
+            logging.error(traceback.format_exc())
+            return self.generate_personal_recommendations(user_info)
+    
+    def _build_personal_recommendations_prompt(self, profession, region, user_info):
+        """Формирует промпт для генерации персональных рекомендаций"""
+        return f"""Ты опытный карьерный консультант и коуч по профессиональному развитию с 15-летним стажем. 
 На основе предоставленной информации о пользователе сгенерируй 5-7 глубоко персонализированных карьерных рекомендаций для профессии "{profession}" в регионе "{region}".
 
 ИНФОРМАЦИЯ О ПОЛЬЗОВАТЕЛЕ:
@@ -908,78 +1025,32 @@ class JobRoadmapGenerator:
 
 Верни ТОЛЬКО сами рекомендации, каждую с новой строки, без дополнительного текста, вступлений или заключений.
 """
-            # Генерируем ответ от модели с улучшенными параметрами для большей детализации
-            response = llm.generate(
-                prompt, 
-                temperature=0.5,  # Увеличиваем температуру для более творческих ответов
-                max_tokens=2048,  # Увеличиваем лимит токенов для более детальных рекомендаций
-                top_p=0.95        # Увеличиваем разнообразие ответов
-            )
-            
-            if not response:
-                logging.warning("Не удалось получить ответ от LLM модели для персональных рекомендаций")
-                return self.generate_personal_recommendations(user_info)
-                
-            # Преобразуем ответ в список рекомендаций
-            # Разделяем текст на абзацы, считая что пустая строка разделяет рекомендации
-            raw_recommendations = []
-            current_rec = []
-            
-            for line in response.strip().split('\n'):
-                if not line.strip() and current_rec:  # Пустая строка и есть накопленный текст
-                    raw_recommendations.append(' '.join(current_rec))
-                    current_rec = []
-                elif line.strip():  # Непустая строка
-                    current_rec.append(line.strip())
-            
-            # Добавляем последнюю рекомендацию, если она осталась
-            if current_rec:
-                raw_recommendations.append(' '.join(current_rec))
-            
-            # Если получен сплошной текст без разделителей, пробуем разделить по другим признакам
-            if len(raw_recommendations) <= 1 and response.strip():
-                # Пробуем разделить по точке и новой строке
-                potential_recs = re.split(r'\.\s*\n', response.strip())
-                if len(potential_recs) > 1:
-                    raw_recommendations = [rec.strip() + '.' for rec in potential_recs if rec.strip()]
-                else:
-                    # Если не удалось разделить, просто берем весь текст как одну рекомендацию
-                    raw_recommendations = [response.strip()]
-            
-            # Очищаем каждую рекомендацию от маркеров и кавычек
-            recommendations = []
-            for rec in raw_recommendations:
-                if not rec.strip():
-                    continue
-                # Удаляем нумерацию и маркеры списков
-                rec = re.sub(r'^[\d\-\*\.\)\s]+', '', rec.strip())
-                # Удаляем кавычки в начале строки
-                rec = re.sub(r'^["\'«]', '', rec)
-                # Удаляем кавычки в конце строки
-                rec = re.sub(r'["\'»]$', '', rec)
-                if rec:
-                    recommendations.append(rec)
-            
-            # Удаляем дубликаты
-            recommendations = list(dict.fromkeys(recommendations))  # Удаление дубликатов с сохранением порядка
-            
-            # Если не удалось получить рекомендации, используем стандартный метод
-            if not recommendations:
-                logging.warning("После обработки ответа LLM модели не осталось рекомендаций, использую стандартный метод")
-                return self.generate_personal_recommendations(user_info)
-                
-            # Ограничиваем количество рекомендаций
-            if len(recommendations) > 7:
-                recommendations = recommendations[:7]
+
+    def _parse_personal_recommendations(self, response, user_info):
+        """Преобразует ответ LLM в список рекомендаций.
+        
+        Args:
+            response (str): Ответ модели (может быть пустым)
+            user_info (str): Информация о пользователе для запасного варианта
             
-            return recommendations
+        Returns:
+            list: Список персонализированных рекомендаций
+        """
+        if not response:
+            logging.warning("Не удалось получить ответ от LLM модели для персональных рекомендаций")
+            return self.generate_personal_recommendations(user_info)
             
-        except Exception as e:
-            logging.error(f"Ошибка при генерации персональных рекомендаций с LLM: {e}")
-            logging.error(traceback.format_exc())
-            # В случае ошибки используем стандартный метод
+        # Абзацы (пустая строка разделяет рекомендации) без маркеров списков, кавычек и повторов;
+        # не более MAX_PERSONAL_RECOMMENDATIONS
+        recommendations = unique_items(split_paragraphs(response), limit=MAX_PERSONAL_RECOMMENDATIONS)
+        
+        # Если не удалось получить рекомендации, используем стандартный метод
+        if not recommendations:
+            logging.warning("После обработки ответа LLM модели не осталось рекомендаций, использую стандартный метод")
             return self.generate_personal_recommendations(user_info)
-    
+        
+        return recommendations
+        
     def generate_personal_recommendations(self, user_info):
         """Генерирует персональные рекомендации на основе информации о пользователе.
         Используется как запасной вариант, если генерация с LLM не удалась.
@@ -1057,19 +1128,40 @@ class JobRoadmapGenerator:
         
         return recommendations
     
-    def _estimate_average_salary(self, profession, experience_level):
+    def get_salary_stats(self, profession, region=None, experience_level=None):
+        """
+        Квартили зарплаты (руб. в месяц на руки) по вакансиям профессии из хранилища
+        
+        Args:
+            profession (str): Название профессии
+            region (str): Регион (None - все регионы)
+            experience_level (str): junior, middle или senior (None - любой опыт)
+            
+        Returns:
+            dict: {'p25', 'p50', 'p75', 'count', 'region', 'level'} или None, если вакансий с зарплатой мало
+        """
+        area_id = get_area_index(self.headers).resolve(region) if region else None
+        stats = get_salary_stats(self.vacancy_store, self.headers)
+        return stats.lookup(self.canonical_profession(profession), area_id, experience_level)
+    
+    def _estimate_average_salary(self, profession, experience_level, region=None):
         """Оценивает среднюю зарплату для указанной профессии и уровня опыта.
         
-        Упрощенная логика, в реальном приложении здесь был бы более сложный алгоритм
-        или обращение к базе данных/API зарплат.
+        Используется медиана зарплат вакансий из хранилища; если вакансий с зарплатой
+        недостаточно - базовая зарплата по типу профессии с множителем опыта.
         
         Args:
             profession (str): Название профессии
             experience_level (str): Уровень опыта
+            region (str): Регион
             
         Returns:
             int: Оценка средней зарплаты в рублях или None, если невозможно оценить
         """
+        stats = self.get_salary_stats(profession, region, experience_level)
+        if stats is not None:
+            return stats['p50']
+        
         # Базовые зарплаты для разных типов профессий (очень упрощенно)
         base_salaries = {
             "разработчик": 120000,
@@ -1108,258 +1200,6 @@ class JobRoadmapGenerator:
         
         return int(base_salary * multiplier)
     
-    def get_learning_resources(self, profession_type, skills):
-        """
-        Генерирует рекомендуемые ресурсы для обучения на основе типа профессии и навыков
-        
-        Args:
-            profession_type (str): Тип/категория профессии
-            skills (list): Список технических навыков
-            
-        Returns:
-            list: Список рекомендуемых ресурсов для обучения
-        """
-        # Базовые образовательные платформы по категориям
-        platforms_by_category = {
-            'it': [
-                'Coursera - специализированные курсы по IT-направлениям',
-                'Stepik - курсы по программированию и информатике',
-                'Udemy - обширная база практических курсов от экспертов в IT',
-                'GeekBrains - специализированные программы обучения IT-специальностям',
-                'Skillbox - комплексные курсы с поддержкой менторов',
-                'LeetCode - для отработки алгоритмических задач',
-                'GitHub - для изучения открытых проектов и практики',
-                'Stack Overflow - для решения технических вопросов',
-                'Хабр - статьи и обсуждения IT-тематики на русском языке'
-            ],
-            'финансы': [
-                'Нетология - курсы по финансовому анализу и менеджменту',
-                'Высшая Школа Экономики - программы дополнительного профессионального образования',
-                'Coursera - курсы от ведущих бизнес-школ',
-                'Банк России - обучающие материалы по финансовой грамотности',
-                'СберУниверситет - программы в сфере финансов и экономики',
-                'Финам - обучающие материалы по финансовым рынкам',
-                'Библиотека финансового аналитика - профессиональная литература',
-                'CFI (Corporate Finance Institute) - сертификационные программы'
-            ],
-            'маркетинг': [
-                'Нетология - курсы по маркетингу и SMM',
-                'Skillbox - комплексные программы по маркетингу',
-                'Яндекс.Практикум - курсы по интернет-маркетингу',
-                'Google Digital Workshop - бесплатные курсы по цифровому маркетингу',
-                'ВШЭ - программы дополнительного образования в сфере маркетинга',
-                'Специализированные блоги (Texterra, Cossa, vc.ru) - актуальные тренды',
-                'HubSpot Academy - бесплатные курсы по маркетингу и продажам',
-                'MarketingProfs - профессиональные статьи и вебинары'
-            ],
-            'медицина': [
-                'Медицинский образовательный портал для врачей - непрерывное медицинское образование',
-                'Портал непрерывного медицинского и фармацевтического образования Минздрава России',
-                'WebMed - образовательная платформа для медицинских работников',
-                'MedElement - обучающие материалы и тесты для врачей',
-                'PubMed - медицинские исследования и публикации',
-                'Московский государственный медицинский университет им. И.М. Сеченова - курсы повышения квалификации',
-                'Российское общество симуляционного обучения в медицине - тренинги и симуляции',
-                'Специализированные медицинские журналы и издания'
-            ],
-            'образование': [
-                'Педагогический университет "Первое сентября" - курсы для учителей',
-                'Инфоурок - образовательный портал для педагогов',
-                'Российская электронная школа - методические материалы',
-                'Институт ЮНЕСКО по информационным технологиям в образовании - курсы по цифровой педагогике',
-                'Академия Минпросвещения России - программы повышения квалификации',
-                'Межрегиональная школа профессионального мастерства - обмен опытом между педагогами',
-                'Профессиональные сообщества учителей-предметников',
-                'Электронные библиотеки педагогических исследований'
-            ],
-            'строительство': [
-                'Национальное объединение строителей (НОСТРОЙ) - курсы повышения квалификации',
-                'МГСУ (НИУ) - дополнительное профессиональное образование',
-                'Академия КНАУФ - обучение современным строительным технологиям',
-                'Портал СметаРу - обучение сметному делу',
-                'Строительный эксперт - профессиональное сообщество и обучающие материалы',
-                'НОУ ИНТУИТ - курсы по САПР и строительному проектированию',
-                'Специализированные строительные выставки и семинары',
-                'Профессиональные ассоциации по различным строительным специальностям'
-            ],
-            'дизайн': [
-                'Skillbox - комплексные курсы по графическому, веб- и UX/UI дизайну',
-                'Нетология - обучающие программы по дизайну',
-                'Bang Bang Education - курсы от ведущих дизайнеров',
-                'Британская высшая школа дизайна - короткие интенсивные программы',
-                'Behance - портфолио и вдохновение',
-                'Dribbble - сообщество дизайнеров и работы',
-                'Canva Design School - бесплатные уроки по дизайну',
-                'Специализированные YouTube-каналы по дизайну',
-                'Дизайн-сообщества в Telegram'
-            ],
-            'право': [
-                'LF Академия - курсы для юристов',
-                'Система КонсультантПлюс - обучающие материалы и семинары',
-                'ГАРАНТ - образовательные проекты для юристов',
-                'Российская школа частного права - программы повышения квалификации',
-                'Юридический институт М-Логос - курсы и семинары',
-                'Legal Academy - профессиональные курсы для юристов',
-                'Специализированные юридические журналы и издания',
-                'Профессиональные юридические сообщества и ассоциации'
-            ]
-        }
-        
-        # Общие образовательные ресурсы
-        general_resources = [
-            'Coursera - онлайн-курсы от ведущих университетов мира',
-            'Stepik - образовательная платформа с курсами на русском языке',
-            'Открытое образование - курсы от ведущих российских вузов',
-            'Универсариум - открытая система электронного образования',
-            'YouTube - образовательные каналы по различным направлениям',
-            'Профильные сообщества в Telegram и VK',
-            'Профессиональная литература и периодические издания',
-            'Отраслевые конференции и семинары (онлайн и офлайн)'
-        ]
-        
-        # Выбираем ресурсы в зависимости от типа профессии
-        resources = []
-        
-        if profession_type in platforms_by_category:
-            # Добавляем специализированные ресурсы для данного типа профессии
-            resources.extend(random.sample(platforms_by_category[profession_type], 
-                                         min(5, len(platforms_by_category[profession_type]))))
-        
-        # Добавляем общие ресурсы
-        general_to_add = random.sample(general_resources, min(3, len(general_resources)))
-        resources.extend(general_to_add)
-        
-        # Добавляем книги и ресурсы на основе навыков
-        if skills:
-            # Выбираем случайные навыки из списка для рекомендации книг
-            selected_skills = random.sample(skills, min(3, len(skills)))
-            for skill in selected_skills:
-                resources.append(f"Книги и специализированные ресурсы по теме '{skill}'")
-        
-        # Перемешиваем ресурсы для более естественной рекомендации
-        random.shuffle(resources)
-        
-        return resources[:8]  # Возвращаем не более 8 ресурсов 
-
-    def generate_education_resources(self, profession, skills, experience_level='junior'):
-        """
-        Генерирует рекомендации по образовательным ресурсам для изучения профессии
-        
-        Args:
-            profession (str): Название профессии
-            skills (list): Список навыков для изучения
-            experience_level (str): Уровень опыта ('junior', 'middle', 'senior')
-            
-        Returns:
-            dict: Структурированный словарь с рекомендациями по образовательным ресурсам
-        """
-        profession_type = self.find_profession_type(profession)
-        
-        # Базовые платформы для онлайн-обучения по типу профессии
-        online_platforms = {
-            'it': ['Coursera', 'Udemy', 'Stepik', 'Яндекс Практикум', 'SkillBox', 'Хекслет', 'Geekbrains', 'Otus'],
-            'финансы': ['Coursera', 'Нетология', 'Финам', 'BAS', 'ЧУ ДПО Финансовый университет'],
-            'медицина': ['Медунивер', 'Osmosis', 'Medscape', 'НМО портал', 'Consilium Medicum'],
-            'маркетинг': ['Нетология', 'SkillBox', 'Geekbrains', 'Яндекс Практикум', 'Marketing.by'],
-            'образование': ['Фоксфорд', 'Инфоурок', 'Универсариум', 'Педсовет'],
-            'юриспруденция': ['Национальная юридическая академия', 'Garant.ru', 'LF Академия', 'Закон.ру'],
-            'инженерия': ['Stepik', 'Numeca', 'Лекториум', 'Ansys Learning'],
-            'дизайн': ['Behance', 'SkillBox', 'Bang Bang Education', 'Нетология', 'Design Spot']
-        }
-        
-        # Выбираем платформы по типу профессии
-        platforms = online_platforms.get(profession_type, ['Coursera', 'Stepik', 'Нетология', 'SkillBox'])
-        
-        # Выбираем количество ресурсов в зависимости от уровня опыта
-        if experience_level == 'junior':
-            num_resources = 5  # Больше ресурсов для начинающих
-        elif experience_level == 'middle':
-            num_resources = 4
-        else:  # senior
-            num_resources = 3  # Меньше базовых ресурсов для опытных специалистов
-            
-        # Выбираем случайные платформы
-        selected_platforms = random.sample(platforms, min(num_resources, len(platforms)))
-        
-        # Словарь с шаблонами для разных видов ресурсов
-        resource_templates = {
-            'онлайн_курсы': [
-                "Курс «{skill} для начинающих» на платформе {platform}",
-                "Интенсив «{skill}: от основ к практике» на {platform}",
-                "Профессия «{profession}» на {platform}",
-                "Специализация «{skill}» на платформе {platform}",
-            ],
-            'книги': [
-                "«{skill}: практическое руководство» под редакцией экспертов в области",
-                "«Основы {skill} для профессии {profession}»",
-                "«{skill} на практике: подходы и методики»",
-                "«Современные тенденции в области {skill}»",
-            ],
-            'сообщества': [
-                "Профессиональное сообщество {profession} в Telegram",
-                "Форум специалистов по {skill} на Habr",
-                "Группа {profession} на платформе LinkedIn",
-                "Сообщество практиков {skill} в Discord",
-            ],
-            'youtube': [
-                "Канал «{skill} для профессионалов»",
-                "Уроки по {skill} от ведущих экспертов",
-                "Видеокурс «{profession} с нуля до профи»",
-                "Вебинары по {skill} для специалистов разного уровня",
-            ]
-        }
-        
-        # Генерируем рекомендации по образовательным ресурсам
-        education_resources = {}
-        
-        # Добавляем онлайн-курсы
-        online_courses = []
-        for i in range(num_resources):
-            platform = selected_platforms[i % len(selected_platforms)]
-            skill = skills[i % len(skills)]
-            template = random.choice(resource_templates['онлайн_курсы'])
-            course = template.format(skill=skill, platform=platform, profession=profession)
-            online_courses.append(course)
-        education_resources['онлайн_курсы'] = online_courses
-        
-        # Добавляем книги
-        books = []
-        for i in range(min(3, num_resources)):
-            skill = skills[(i + 1) % len(skills)]
-            template = random.choice(resource_templates['книги'])
-            book = template.format(skill=skill, profession=profession)
-            books.append(book)
-        education_resources['книги'] = books
-        
-        # Добавляем профессиональные сообщества
-        communities = []
-        for i in range(2):
-            skill = skills[(i + 2) % len(skills)]
-            template = random.choice(resource_templates['сообщества'])
-            community = template.format(skill=skill, profession=profession)
-            communities.append(community)
-        education_resources['профессиональные_сообщества'] = communities
-        
-        # Добавляем YouTube-каналы
-        youtube_channels = []
-        for i in range(min(2, num_resources - 1)):
-            skill = skills[(i + 3) % len(skills)]
-            template = random.choice(resource_templates['youtube'])
-            channel = template.format(skill=skill, profession=profession)
-            youtube_channels.append(channel)
-        education_resources['youtube'] = youtube_channels
-        
-        # Для продвинутых специалистов добавляем дополнительные ресурсы
-        if experience_level in ['middle', 'senior']:
-            advanced_resources = [
-                f"Профессиональная конференция по {profession} (ежегодная)",
-                f"Специализированные воркшопы по {skills[0] if skills else profession}",
-                f"Менторство от экспертов в области {profession}"
-            ]
-            education_resources['продвинутые_ресурсы'] = advanced_resources
-            
-        return education_resources 
-
     def find_education_resources(self, profession: str, topics: list) -> dict:
         """
         Находит образовательные ресурсы по списку тем, с учетом профессии
@@ -1371,268 +1211,6 @@ class JobRoadmapGenerator:
         Returns:
             dict: Словарь с ресурсами по каждой теме
         """
-        # Словарь доступных бесплатных курсов и ресурсов для различных профессий
-        free_resources = {
-            "системный администратор": {
-                "общие": [
-                    {"title": "Cisco Networking Academy", "url": "https://www.netacad.com/", "description": "Бесплатные курсы по сетевым технологиям"},
-                    {"title": "Microsoft Learn", "url": "https://learn.microsoft.com/", "description": "Обучающие материалы по продуктам Microsoft"},
-                    {"title": "Linux Foundation Training", "url": "https://training.linuxfoundation.org/free-courses/", "description": "Бесплатные курсы по Linux"},
-                    {"title": "Хабр", "url": "https://habr.com/ru/hub/system_administration/", "description": "Статьи по системному администрированию"}
-                ],
-                "сети": [
-                    {"title": "Введение в сетевые технологии", "url": "https://www.netacad.com/courses/networking/networking-essentials", "description": "Базовый курс по сетям от Cisco"},
-                    {"title": "Network Chuck (YouTube)", "url": "https://www.youtube.com/c/NetworkChuck", "description": "Обучающие видео по сетевым технологиям"},
-                    {"title": "Сети для самых маленьких", "url": "https://habr.com/ru/post/134892/", "description": "Популярная серия статей об основах сетей"}
-                ],
-                "безопасность": [
-                    {"title": "Cybersecurity Essentials", "url": "https://www.netacad.com/courses/cybersecurity/cybersecurity-essentials", "description": "Основы кибербезопасности от Cisco"},
-                    {"title": "SecurityLab", "url": "https://www.securitylab.ru/", "description": "Новости и статьи о безопасности"},
-                    {"title": "Practical Networking (YouTube)", "url": "https://www.youtube.com/c/PracticalNetworking", "description": "Видео о сетевой безопасности"}
-                ],
-                "операционные системы": [
-                    {"title": "Курс по Linux", "url": "https://stepik.org/course/762/", "description": "Введение в Linux"},
-                    {"title": "Windows Server Administration", "url": "https://learn.microsoft.com/en-us/training/windows-server/", "description": "Администрирование Windows Server"},
-                    {"title": "Курс Основы Linux от Яндекс Практикум", "url": "https://practicum.yandex.ru/profile/linux-administrating/", "description": "Интенсивный курс по основам Linux"}
-                ],
-                "мониторинг": [
-                    {"title": "Zabbix Documentation", "url": "https://www.zabbix.com/documentation/", "description": "Документация по Zabbix"},
-                    {"title": "Prometheus - Мониторинг систем и сервисов", "url": "https://prometheus.io/docs/introduction/overview/", "description": "Документация по Prometheus"},
-                    {"title": "Grafana Tutorials", "url": "https://grafana.com/tutorials/", "description": "Уроки по работе с Grafana"}
-                ],
-                "автоматизация": [
-                    {"title": "Ansible Documentation", "url": "https://docs.ansible.com/", "description": "Документация по Ansible"},
-                    {"title": "PowerShell for Sysadmins", "url": "https://learning.oreilly.com/library/view/powershell-for-sysadmins/9781098139445/", "description": "Книга по PowerShell"},
-                    {"title": "Terraform Tutorials", "url": "https://learn.hashicorp.com/terraform", "description": "Уроки по Terraform"}
-                ]
-            },
-            "программист 1с": {
-                "общие": [
-                    {"title": "Учебные материалы 1С", "url": "https://edu.1cfresh.com/", "description": "Бесплатные курсы от 1С"},
-                    {"title": "1С:Учебный центр №1", "url": "https://www.1c.ru/rus/partners/training/uc1/course.jsp", "description": "Курсы по разработке на 1С"},
-                    {"title": "Инфостарт", "url": "https://infostart.ru/", "description": "Сообщество разработчиков 1С с массой полезных статей"}
-                ],
-                "программирование": [
-                    {"title": "Введение в конфигурирование в 1С", "url": "https://edu.1cfresh.com/courses/course-v1:1C+1C-ERP-1+2020/about", "description": "Базовый курс по 1С:Предприятие"},
-                    {"title": "1С:Предприятие 8.3. Практическое пособие разработчика", "url": "https://its.1c.ru/db/pubv83dev", "description": "Практическое пособие разработчика"},
-                    {"title": "YouTube-канал \"Курсы 1С программирования\"", "url": "https://www.youtube.com/user/Courses1C", "description": "Обучающие видео по программированию в 1С"}
-                ],
-                "интерфейсы": [
-                    {"title": "Курс по разработке интерфейсов в 1С", "url": "https://курсы-по-1с.рф/free/ui-ux-разработка-интерфейсов-в-1с/", "description": "Бесплатный курс по UI/UX в 1С"},
-                    {"title": "Разработка современных пользовательских интерфейсов", "url": "https://its.1c.ru/db/metod8dev/content/2358/hdoc", "description": "Методические рекомендации по разработке интерфейсов"}
-                ]
-            },
-            "веб-разработчик": {
-                "общие": [
-                    {"title": "MDN Web Docs", "url": "https://developer.mozilla.org/ru/", "description": "Документация по веб-технологиям"},
-                    {"title": "freeCodeCamp", "url": "https://www.freecodecamp.org/", "description": "Интерактивные курсы по веб-разработке"},
-                    {"title": "HTML Academy", "url": "https://htmlacademy.ru/courses", "description": "Интерактивные курсы по веб-разработке"},
-                    {"title": "Хекслет", "url": "https://ru.hexlet.io/professions/frontend", "description": "Профессия фронтенд-разработчик"}
-                ],
-                "frontend": [
-                    {"title": "JavaScript.info", "url": "https://javascript.info/", "description": "Современный учебник по JavaScript"},
-                    {"title": "React Documentation", "url": "https://react.dev/", "description": "Официальная документация React"},
-                    {"title": "CSS-Tricks", "url": "https://css-tricks.com/", "description": "Статьи и руководства по CSS"},
-                    {"title": "Frontend Masters", "url": "https://frontendmasters.com/learn/", "description": "Схема обучения фронтенд-разработке"}
-                ],
-                "backend": [
-                    {"title": "Django Documentation", "url": "https://docs.djangoproject.com/", "description": "Документация по Django"},
-                    {"title": "Node.js Documentation", "url": "https://nodejs.org/en/docs/", "description": "Документация по Node.js"},
-                    {"title": "PHP: The Right Way", "url": "https://phptherightway.com/", "description": "Руководство по современному PHP"},
-                    {"title": "Spring Framework Documentation", "url": "https://spring.io/guides", "description": "Руководства по Spring Framework"}
-                ],
-                "базы данных": [
-                    {"title": "PostgreSQL Tutorial", "url": "https://www.postgresqltutorial.com/", "description": "Руководство по PostgreSQL"},
-                    {"title": "MongoDB University", "url": "https://university.mongodb.com/", "description": "Бесплатные курсы по MongoDB"},
-                    {"title": "SQL Academy", "url": "https://sql-academy.org/ru", "description": "Интерактивный курс по SQL"}
-                ],
-                "devops": [
-                    {"title": "Docker Documentation", "url": "https://docs.docker.com/get-started/", "description": "Начало работы с Docker"},
-                    {"title": "Kubernetes Documentation", "url": "https://kubernetes.io/docs/home/", "description": "Документация по Kubernetes"},
-                    {"title": "GitHub Actions", "url": "https://docs.github.com/en/actions", "description": "Руководство по CI/CD с GitHub Actions"}
-                ]
-            },
-            "data scientist": {
-                "общие": [
-                    {"title": "Kaggle Learn", "url": "https://www.kaggle.com/learn", "description": "Бесплатные курсы по анализу данных"},
-                    {"title": "DataCamp", "url": "https://www.datacamp.com/courses", "description": "Курсы по работе с данными (часть бесплатно)"},
-                    {"title": "Открытое образование: Введение в Data Science", "url": "https://openedu.ru/course/mipt/INTRODS/", "description": "Курс от МФТИ по основам Data Science"}
-                ],
-                "машинное обучение": [
-                    {"title": "Machine Learning Crash Course", "url": "https://developers.google.com/machine-learning/crash-course", "description": "Курс по ML от Google"},
-                    {"title": "Курс по машинному обучению от ODS", "url": "https://mlcourse.ai/", "description": "Открытый курс по машинному обучению"},
-                    {"title": "Практический курс по нейронным сетям", "url": "https://stepik.org/course/50352/", "description": "Курс на Stepik"}
-                ],
-                "python": [
-                    {"title": "Python Data Science Handbook", "url": "https://jakevdp.github.io/PythonDataScienceHandbook/", "description": "Книга по работе с данными на Python"},
-                    {"title": "Python для анализа данных", "url": "https://www.coursera.org/specializations/python-for-data-analysis-ru", "description": "Специализация на Coursera от МФТИ и Яндекс"},
-                    {"title": "Курс по Pandas", "url": "https://stepik.org/course/77845/", "description": "Интерактивный курс по библиотеке Pandas"}
-                ],
-                "визуализация": [
-                    {"title": "Plotly Documentation", "url": "https://plotly.com/python/", "description": "Руководство по созданию интерактивных визуализаций"},
-                    {"title": "Seaborn Tutorial", "url": "https://seaborn.pydata.org/tutorial.html", "description": "Учебник по библиотеке Seaborn"},
-                    {"title": "D3.js Gallery", "url": "https://observablehq.com/@d3/gallery", "description": "Галерея примеров визуализации на D3.js"}
-                ]
-            },
-            "дизайнер": {
-                "общие": [
-                    {"title": "Обучение в Figma", "url": "https://help.figma.com/hc/en-us/categories/360002051613-Get-Started", "description": "Официальные руководства по Figma"},
-                    {"title": "Дизайн-курсы от Skillbox", "url": "https://skillbox.ru/design/", "description": "Подборка бесплатных материалов по дизайну"},
-                    {"title": "Behance", "url": "https://www.behance.net/", "description": "Платформа для вдохновения и портфолио"}
-                ],
-                "ui": [
-                    {"title": "UI Design Daily", "url": "https://www.uidesigndaily.com/", "description": "Ежедневные UI компоненты для вдохновения"},
-                    {"title": "UI/UX Design Patterns", "url": "https://uipatterns.io/", "description": "Коллекция паттернов UI/UX дизайна"},
-                    {"title": "Material Design", "url": "https://material.io/design", "description": "Руководство по дизайну от Google"}
-                ],
-                "ux": [
-                    {"title": "Nielsen Norman Group", "url": "https://www.nngroup.com/articles/", "description": "Статьи о пользовательском опыте"},
-                    {"title": "UX Planet", "url": "https://uxplanet.org/", "description": "Публикации о UX дизайне"},
-                    {"title": "Practical UX Methods", "url": "https://www.practical-ux-methods.com/", "description": "Практические методы UX исследований"}
-                ],
-                "типографика": [
-                    {"title": "Typewolf", "url": "https://www.typewolf.com/", "description": "Ресурс о типографике и шрифтах"},
-                    {"title": "Практическая типографика", "url": "https://www.artlebedev.ru/izdal/typography/", "description": "Классическая книга по типографике"},
-                    {"title": "Google Fonts", "url": "https://fonts.google.com/", "description": "Бесплатные шрифты для использования в дизайне"}
-                ]
-            },
-            "маркетолог": {
-                "общие": [
-                    {"title": "HubSpot Academy", "url": "https://academy.hubspot.com/", "description": "Бесплатные курсы по маркетингу"},
-                    {"title": "Нетология: Маркетинг", "url": "https://netology.ru/marketing", "description": "Бесплатные материалы по маркетингу"},
-                    {"title": "Marketing Teaching", "url": "https://blog.marketingteaching.ru/", "description": "Образовательный блог о маркетинге"}
-                ],
-                "smm": [
-                    {"title": "SMM Planner", "url": "https://smmplanner.com/blog/", "description": "Блог о SMM"},
-                    {"title": "Buffer Resources", "url": "https://buffer.com/resources/", "description": "Ресурсы для SMM специалистов"},
-                    {"title": "ВКонтакте для бизнеса", "url": "https://vk.com/business", "description": "Руководства по маркетингу в ВКонтакте"}
-                ],
-                "контент-маркетинг": [
-                    {"title": "Content Marketing Institute", "url": "https://contentmarketinginstitute.com/", "description": "Ресурс о контент-маркетинге"},
-                    {"title": "Блог Texterra", "url": "https://texterra.ru/blog/", "description": "Статьи о контент-маркетинге"},
-                    {"title": "Школа контент-маркетинга", "url": "https://semrush.com/academy/courses/content-marketing", "description": "Бесплатный курс по контент-маркетингу"}
-                ],
-                "аналитика": [
-                    {"title": "Google Analytics Academy", "url": "https://analytics.google.com/analytics/academy/", "description": "Бесплатные курсы по Google Analytics"},
-                    {"title": "Основы Яндекс.Метрики", "url": "https://yandex.ru/adv/edu/metrika-start", "description": "Руководство по Яндекс.Метрике"},
-                    {"title": "DataReporter", "url": "https://datareporter.ru/", "description": "Блог об аналитике для маркетологов"}
-                ]
-            },
-            "аналитик": {
-                "общие": [
-                    {"title": "Аналитика от Яндекс Практикум", "url": "https://practicum.yandex.ru/data-analyst/", "description": "Материалы по аналитике данных"},
-                    {"title": "SkillFactory: Аналитика", "url": "https://skillfactory.ru/analytics", "description": "Бесплатные материалы по аналитике"},
-                    {"title": "AnalyticsVidhya", "url": "https://www.analyticsvidhya.com/", "description": "Ресурс для аналитиков данных"}
-                ],
-                "sql": [
-                    {"title": "SQL Academy", "url": "https://sql-academy.org/ru", "description": "Интерактивный курс по SQL"},
-                    {"title": "PostgreSQL Tutorial", "url": "https://www.postgresqltutorial.com/", "description": "Туториалы по PostgreSQL"},
-                    {"title": "Практический курс SQL", "url": "https://stepik.org/course/63054/", "description": "Курс на Stepik"}
-                ],
-                "bi": [
-                    {"title": "Power BI от Microsoft", "url": "https://learn.microsoft.com/ru-ru/power-bi/", "description": "Руководства по Power BI"},
-                    {"title": "Tableau Public", "url": "https://public.tableau.com/en-us/s/resources", "description": "Ресурсы по Tableau"},
-                    {"title": "Datalens документация", "url": "https://datalens.yandex/docs", "description": "Документация по Yandex DataLens"}
-                ],
-                "статистика": [
-                    {"title": "Анализ данных в Python", "url": "https://stepik.org/course/126346/", "description": "Курс по анализу данных"},
-                    {"title": "Основы статистики", "url": "https://stepik.org/course/76/", "description": "Базовый курс по статистике"},
-                    {"title": "StatSoft", "url": "http://www.statsoft.ru/home/textbook/", "description": "Электронный учебник по статистике"}
-                ]
-            }
-        }
-        
-        # Словарь с ключевыми словами для сопоставления тем и ресурсов
-        keywords = {
-            "сети": ["сеть", "сетевой", "network", "cisco", "routing", "маршрутизация", "коммутация", "switching", "tcp/ip", "dns", "dhcp", "vlan"],
-            "безопасность": ["безопасность", "security", "защита", "encryption", "шифрование", "firewall", "брандмауэр", "уязвимость", "vulnerability", "атака", "attack", "пентест", "pentest"],
-            "операционные системы": ["windows", "linux", "unix", "операционная система", "ubuntu", "debian", "centos", "red hat", "системное администрирование", "administration"],
-            "программирование": ["1с", "1c", "программирование", "разработка", "конфигурирование", "метаданные", "справочники", "программист", "разработчик", "developer", "coding", "алгоритм"],
-            "frontend": ["javascript", "html", "css", "react", "vue", "angular", "фронтенд", "интерфейс", "верстка", "webpack", "typescript", "sass", "less"],
-            "backend": ["server", "django", "flask", "node.js", "php", "ruby", "backend", "бэкенд", "сервер", "api", "rest", "express", "spring", "laravel", "symfony"],
-            "базы данных": ["sql", "database", "база данных", "субд", "postgresql", "mysql", "oracle", "mongodb", "sqlite", "nosql", "replication", "репликация", "индексы", "запрос", "query"],
-            "devops": ["docker", "kubernetes", "ci/cd", "jenkins", "gitlab", "github actions", "автоматизация", "automation", "деплой", "deployment", "контейнер", "container", "инфраструктура", "infrastructure"],
-            "машинное обучение": ["ml", "machine learning", "машинное обучение", "нейронная сеть", "neural network", "ai", "искусственный интеллект", "deep learning", "глубокое обучение", "модель", "алгоритм", "классификация", "регрессия"],
-            "python": ["python", "питон", "pandas", "numpy", "scipy", "matplotlib", "sklearn", "tensorflow", "pytorch", "jupyter", "anaconda", "django", "flask"],
-            "визуализация": ["visualization", "визуализация", "dashboard", "дашборд", "chart", "график", "диаграмма", "tableau", "power bi", "superset", "grafana", "d3.js", "plotly", "seaborn"],
-            "ui": ["ui", "интерфейс", "дизайн", "design", "макет", "layout", "компонент", "component", "сетка", "grid", "адаптивный", "responsive", "figma", "sketch", "adobe xd"],
-            "ux": ["ux", "usability", "юзабилити", "пользовательский опыт", "user experience", "исследование", "research", "прототип", "prototype", "тестирование", "testing", "персона", "persona"],
-            "типографика": ["typography", "типографика", "шрифт", "font", "текст", "text", "заголовок", "heading", "контраст", "contrast", "читаемость", "readability"],
-            "smm": ["smm", "social media", "социальные сети", "контент", "content", "таргетинг", "targeting", "аудитория", "audience", "engagement", "вовлеченность", "продвижение", "promotion"],
-            "контент-маркетинг": ["content marketing", "контент-маркетинг", "статья", "article", "блог", "blog", "копирайтинг", "copywriting", "редактура", "editing", "seo", "оптимизация", "optimization"],
-            "аналитика": ["analytics", "аналитика", "метрики", "metrics", "google analytics", "яндекс метрика", "yandex metrica", "conversion", "конверсия", "reporting", "отчетность", "attribution", "атрибуция"],
-            "sql": ["sql", "запрос", "query", "база данных", "database", "таблица", "table", "join", "объединение", "группировка", "group by", "индекс", "index", "оптимизация запросов", "query optimization"],
-            "bi": ["bi", "business intelligence", "бизнес-аналитика", "dashboard", "дашборд", "отчет", "report", "визуализация", "visualization", "power bi", "tableau", "qlik", "datalens", "superset"],
-            "статистика": ["statistics", "статистика", "вероятность", "probability", "распределение", "distribution", "выборка", "sample", "корреляция", "correlation", "регрессия", "regression", "анализ данных", "data analysis"],
-            "мониторинг": ["monitoring", "мониторинг", "наблюдение", "alerting", "оповещение", "zabbix", "nagios", "prometheus", "grafana", "логи", "logs", "метрики", "metrics", "трассировка", "tracing"],
-            "автоматизация": ["automation", "автоматизация", "скрипт", "script", "powershell", "bash", "ansible", "puppet", "chef", "terraform", "iac", "infrastructure as code", "ci/cd", "pipeline"]
-        }
-        
-        # Нормализация названия профессии
-        profession_lower = profession.lower()
-        
-        # Выбираем базовую категорию профессии
-        profession_category = None
-        if any(x in profession_lower for x in ["админ", "сисадмин", "system admin", "network", "системный администратор"]):
-            profession_category = "системный администратор"
-        elif any(x in profession_lower for x in ["1с", "1c", "предприятие"]):
-            profession_category = "программист 1с"
-        elif any(x in profession_lower for x in ["web", "веб", "frontend", "backend", "фронтенд", "бэкенд", "разработчик", "программист", "developer"]):
-            profession_category = "веб-разработчик"
-        elif any(x in profession_lower for x in ["data", "данные", "аналитик", "scientist", "ml", "машинное обучение", "статистика", "статистик"]):
-            profession_category = "data scientist"
-        elif any(x in profession_lower for x in ["дизайн", "designer", "ui", "ux", "интерфейс", "графика", "web design", "product design"]):
-            profession_category = "дизайнер"
-        elif any(x in profession_lower for x in ["маркетинг", "marketing", "smm", "контент", "реклама", "promotion", "pr", "public relations"]):
-            profession_category = "маркетолог"
-        elif any(x in profession_lower for x in ["аналитик", "analyst", "analytics", "bi", "business intelligence", "аналитика"]):
-            profession_category = "аналитик"
-        
-        result = {}
-        
-        # Добавляем общие ресурсы для категории профессии, если она определена
-        if profession_category and profession_category in free_resources:
-            result["Общие ресурсы по профессии"] = free_resources[profession_category].get("общие", [])
-        
-        # Находим релевантные ресурсы для каждой темы
-        for topic in topics:
-            topic_lower = topic.lower()
-            resources_for_topic = []
-            
-            # Определяем категории ключевых слов, присутствующих в теме
-            matching_categories = []
-            for category, words in keywords.items():
-                if any(word in topic_lower for word in words):
-                    matching_categories.append(category)
-            
-            # Если найдены совпадения и определена категория профессии
-            if matching_categories and profession_category and profession_category in free_resources:
-                for category in matching_categories:
-                    if category in free_resources[profession_category]:
-                        resources_for_topic.extend(free_resources[profession_category][category])
-            
-            # Если есть ресурсы для темы, добавляем их в результат
-            if resources_for_topic:
-                result[topic] = resources_for_topic
-        
-        # Если категория профессии не определена или нет ресурсов, добавляем универсальные
-        if not result or len(result) <= 1:
-            # Добавляем универсальные ресурсы для любой профессии
-            universal_resources = [
-                {"title": "Coursera", "url": "https://www.coursera.org/", "description": "Платформа с курсами от ведущих университетов (многие доступны для бесплатного просмотра)"},
-                {"title": "edX", "url": "https://www.edx.org/", "description": "Курсы от ведущих университетов мира"},
-                {"title": "Stepik", "url": "https://stepik.org/", "description": "Платформа с множеством бесплатных курсов на русском языке"},
-                {"title": "YouTube", "url": "https://www.youtube.com/", "description": "Огромное количество бесплатных обучающих видео по любой теме"},
-                {"title": "Хабр", "url": "https://habr.com/ru/", "description": "Статьи и туториалы по информационным технологиям"},
-                {"title": "LinkedIn Learning", "url": "https://www.linkedin.com/learning/", "description": "Курсы по различным профессиональным навыкам (некоторые бесплатные)"},
-                {"title": "Открытое образование", "url": "https://openedu.ru/", "description": "Платформа с бесплатными онлайн-курсами от ведущих вузов России"},
-                {"title": "Академия Яндекса", "url": "https://academy.yandex.ru/", "description": "Образовательные проекты Яндекса по различным IT-направлениям"}
-            ]
-            
-            result["Универсальные ресурсы"] = universal_resources
-        
-        # Ограничиваем количество ресурсов для каждой темы (не более 5)
-        for topic, resources in result.items():
-            result[topic] = resources[:5]
-        
-        return result
\ No newline at end of file
+        # Каталог ресурсов (data/education_resources.json) загружается один раз в индекс;
+        # ресурсы для пары (категория профессии, тема) запоминаются
+        return get_resource_index().find(self.canonical_profession(profession), topics)
\ No newline at end of file
@@ -0,0 +1,232 @@
+"""
+Версионированный каталог с данными модели вместо roadmap_model.pkl.
+
+Состав каталога:
+    manifest.json   - версия формата, метаданные и описание массивов (тип, форма, dtype)
+    strings.json    - списки строк (словарь навыков, названия профессий и т.п.)
+    <имя>.npy       - плотные массивы
+    <имя>.data.npy, <имя>.indices.npy, <имя>.indptr.npy - разреженные матрицы CSR
+
+Массивы открываются через numpy.load(mmap_mode='r'): загрузка занимает
+миллисекунды, а процессы-воркеры делят страницы через кеш страниц ОС, не
+копируя данные. Каталог с другой версией формата или с массивами, которые не
+совпадают с манифестом, отклоняется (ArtifactError), а не загружается частично.
+
+Каждая версия записывается в отдельный каталог рядом (<путь>.v<время>), а имя
+текущей версии - в файл-указатель <путь>.current, который подменяется через
+os.replace. Подмена атомарна (в том числе в Windows, где символические ссылки
+требуют прав администратора): читатель видит либо старую, либо новую версию
+целиком. Сам каталог <путь> не изменяется и читается, пока указателя нет (модель
+из репозитория). load_artifact разрешает указатель один раз, поэтому все файлы
+читаются из одной версии. Предыдущая версия хранится до следующей записи (для
+читателей, начавших загрузку до подмены), более старые удаляются; уже открытые
+mmap остаются рабочими после удаления файлов.
+"""
+import json
+import os
+import shutil
+import time
+
+# Версия формата каталога; увеличивается при несовместимых изменениях состава массивов
+FORMAT_VERSION = 1
+
+MANIFEST_NAME = 'manifest.json'
+STRINGS_NAME = 'strings.json'
+LEGACY_SUFFIX = '.pkl'
+VERSION_INFIX = '.v'
+POINTER_SUFFIX = '.current'
+
+# Сколько раз load_artifact перечитывает каталог, если его версию заменили во время чтения
+PUBLISH_RETRIES = 3
+
+_CSR_PARTS = ('data', 'indices', 'indptr')
+
+
+class ArtifactError(Exception):
+    """Каталог модели отсутствует, поврежден или записан несовместимой версией"""
+
+
+def artifact_path(model_path):
+    """Каталог модели для пути вида model/roadmap_model или устаревшего model/roadmap_model.pkl"""
+    if model_path.endswith(LEGACY_SUFFIX):
+        return model_path[:-len(LEGACY_SUFFIX)]
+    return model_path
+
+
+def legacy_path(model_path):
+    """Путь к устаревшему pickle-файлу модели, соответствующему каталогу"""
+    return artifact_path(model_path) + LEGACY_SUFFIX
+
+
+def save_artifact(path, arrays=None, strings=None, metadata=None):
+    """
+    Записывает новую версию каталога модели и переключает на нее указатель path
+
+    Args:
+        path (str): Каталог модели (текущая версия - по указателю <path>.current)
+        arrays (dict): {имя: numpy.ndarray или разреженная матрица scipy}
+        strings (dict): {имя: список строк}
+        metadata (dict): Произвольные метаданные (JSON)
+    """
+    import numpy as np
+
+    path = os.path.abspath(path)
+    temporary = f"{path}{VERSION_INFIX}{time.time_ns()}-{os.getpid()}"
+    os.makedirs(temporary)
+
+    entries = {}
+    for name, value in (arrays or {}).items():
+        if hasattr(value, 'tocsr'):
+            matrix = value.tocsr()
+            for part in _CSR_PARTS:
+                np.save(os.path.join(temporary, f"{name}.{part}.npy"), np.ascontiguousarray(getattr(matrix, part)))
+            entries[name] = {'type': 'csr', 'shape': list(matrix.shape), 'dtype': str(matrix.dtype),
+                             'index_dtype': str(matrix.indices.dtype)}
+        else:
+            array = np.ascontiguousarray(value)
+            np.save(os.path.join(temporary, f"{name}.npy"), array)
+            entries[name] = {'type': 'dense', 'shape': list(array.shape), 'dtype': str(array.dtype)}
+
+    with open(os.path.join(temporary, STRINGS_NAME), 'w', encoding='utf-8') as f:
+        json.dump(strings or {}, f, ensure_ascii=False)
+
+    manifest = {
+        'format_version': FORMAT_VERSION,
+        'created_at': time.time(),
+        'numpy_version': np.__version__,
+        'metadata': metadata or {},
+        'arrays': entries
+    }
+    # Манифест пишется последним: каталог без манифеста не считается моделью
+    with open(os.path.join(temporary, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    _publish(path, temporary)
+
+
+def current_version(path):
+    """
+    Каталог текущей версии модели
+
+    Returns:
+        str: Каталог из указателя <path>.current, а если указателя нет - сам path
+    """
+    try:
+        with open(path + POINTER_SUFFIX, 'r', encoding='utf-8') as f:
+            name = f.read().strip()
+    except OSError:
+        name = ''
+    if name:
+        return os.path.join(os.path.dirname(os.path.abspath(path)), name)
+    # Каталог, записанный до перехода на указатель, мог быть символической ссылкой на версию
+    return os.path.realpath(path)
+
+
+def _publish(path, version_dir):
+    """Переключает указатель path на каталог версии и удаляет версии старше предыдущей"""
+    previous = current_version(path)
+
+    pointer = path + POINTER_SUFFIX
+    temporary = f"{pointer}-{os.getpid()}"
+    with open(temporary, 'w', encoding='utf-8') as f:
+        # Имя относительно каталога модели: указатель остается верным при переносе каталога целиком
+        f.write(os.path.basename(version_dir))
+    for attempt in range(PUBLISH_RETRIES):
+        try:
+            os.replace(temporary, pointer)
+            break
+        except PermissionError:
+            # В Windows файл, открытый читателем, нельзя подменить; чтение указателя занимает микросекунды
+            if attempt == PUBLISH_RETRIES - 1:
+                raise
+            time.sleep(0.05)
+
+    keep = {os.path.abspath(version_dir), previous, os.path.realpath(path)}
+    parent, prefix = os.path.dirname(path), os.path.basename(path) + VERSION_INFIX
+    for name in os.listdir(parent):
+        candidate = os.path.join(parent, name)
+        if name.startswith(prefix) and name[len(prefix):][:1].isdigit() and candidate not in keep:
+            shutil.rmtree(candidate, ignore_errors=True)
+
+
+def read_manifest(path):
+    """Читает и проверяет манифест каталога модели"""
+    manifest_path = os.path.join(path, MANIFEST_NAME)
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        raise ArtifactError(f"В {path} нет {MANIFEST_NAME}")
+    except (OSError, ValueError) as e:
+        raise ArtifactError(f"Не удалось прочитать {manifest_path}: {e}")
+
+    version = manifest.get('format_version')
+    if version != FORMAT_VERSION:
+        raise ArtifactError(f"Версия формата модели {version} в {path} не поддерживается (ожидается {FORMAT_VERSION})")
+    return manifest
+
+
+def _load_array(path, file_name, mmap_mode, expected_shape, expected_dtype):
+    import numpy as np
+
+    try:
+        array = np.load(os.path.join(path, file_name), mmap_mode=mmap_mode, allow_pickle=False)
+    except (OSError, ValueError) as e:
+        raise ArtifactError(f"Не удалось загрузить {file_name}: {e}")
+    if expected_shape is not None and list(array.shape) != expected_shape:
+        raise ArtifactError(f"Форма {file_name} {list(array.shape)} не совпадает с манифестом {expected_shape}")
+    if str(array.dtype) != expected_dtype:
+        raise ArtifactError(f"Тип {file_name} {array.dtype} не совпадает с манифестом {expected_dtype}")
+    return array
+
+
+def load_artifact(path, mmap_mode='r'):
+    """
+    Открывает каталог модели
+
+    Args:
+        path (str): Каталог модели
+        mmap_mode (str): Режим numpy.load ('r' - только чтение через mmap, None - чтение в память)
+
+    Returns:
+        tuple: (metadata, {имя: массив или матрица CSR}, {имя: список строк})
+
+    Raises:
+        ArtifactError: Каталог отсутствует, поврежден или записан другой версией формата
+    """
+    # Указатель разрешается один раз: запись новой версии во время загрузки не смешивает файлы версий.
+    # Если версию удалили во время чтения (за это время опубликованы еще две), читается текущая
+    for _ in range(PUBLISH_RETRIES):
+        version_dir = current_version(path)
+        try:
+            return _load_version(version_dir, mmap_mode)
+        except ArtifactError:
+            if current_version(path) == version_dir:
+                raise
+    return _load_version(current_version(path), mmap_mode)
+
+
+def _load_version(path, mmap_mode):
+    manifest = read_manifest(path)
+
+    arrays = {}
+    for name, entry in manifest.get('arrays', {}).items():
+        if entry.get('type') == 'csr':
+            from scipy import sparse
+
+            data = _load_array(path, f"{name}.data.npy", mmap_mode, None, entry['dtype'])
+            indices = _load_array(path, f"{name}.indices.npy", mmap_mode, list(data.shape), entry['index_dtype'])
+            indptr = _load_array(path, f"{name}.indptr.npy", mmap_mode, [entry['shape'][0] + 1], entry['index_dtype'])
+            arrays[name] = sparse.csr_matrix((data, indices, indptr), shape=tuple(entry['shape']), copy=False)
+        elif entry.get('type') == 'dense':
+            arrays[name] = _load_array(path, f"{name}.npy", mmap_mode, entry['shape'], entry['dtype'])
+        else:
+            raise ArtifactError(f"Неизвестный тип массива {name}: {entry.get('type')}")
+
+    try:
+        with open(os.path.join(path, STRINGS_NAME), 'r', encoding='utf-8') as f:
+            strings = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ArtifactError(f"Не удалось прочитать {STRINGS_NAME}: {e}")
+
+    return manifest.get('metadata', {}), arrays, strings
@@ -7,12 +7,15 @@ import os
 import time
 from concurrent.futures import ThreadPoolExecutor
 import random
-import pandas as pd
 from urllib.parse import quote
 from typing import List, Dict, Tuple, Set, Optional, Any
 from datetime import datetime
 import urllib.parse
 
+from taxonomy import get_taxonomy
+from canonicalizer import get_canonicalizer
+from seeding import seeded_random
+
 class ProfessionAnalyzer:
     """
     Класс для анализа профессий на основе данных из интернета.
@@ -36,55 +39,6 @@ class ProfessionAnalyzer:
             'Mozilla/5.0 (Macintosh; Intel Mac OS X 11_5_1) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.2 Safari/605.1.15',
         ]
         
-        # Словарь соответствия профессий категориям
-        self.profession_categories = {
-            'программист': 'IT',
-            'разработчик': 'IT',
-            'frontend': 'IT',
-            'бэкенд': 'IT',
-            'аналитик': 'IT',
-            'тестировщик': 'IT',
-            'devops': 'IT',
-            
-            'врач': 'медицина',
-            'медсестра': 'медицина',
-            'фармацевт': 'медицина',
-            'лаборант': 'медицина',
-            'стоматолог': 'медицина',
-            
-            'учитель': 'образование',
-            'преподаватель': 'образование',
-            'воспитатель': 'образование',
-            'педагог': 'образование',
-            
-            'экономист': 'финансы',
-            'бухгалтер': 'финансы',
-            'финансист': 'финансы',
-            'банкир': 'финансы',
-            
-            'маркетолог': 'маркетинг',
-            'менеджер': 'менеджмент',
-            'hr': 'HR',
-            'рекрутер': 'HR',
-            
-            'юрист': 'право',
-            'адвокат': 'право',
-            
-            'повар': 'кулинария',
-            'официант': 'сервис',
-            'бармен': 'сервис',
-            
-            'водитель': 'транспорт',
-            'механик': 'транспорт',
-            
-            'журналист': 'медиа',
-            'редактор': 'медиа',
-            
-            'дизайнер': 'дизайн',
-            'художник': 'искусство',
-            'фотограф': 'медиа'
-        }
-        
         # Списки базовых источников для различных категорий профессий
         self.base_sources = {
             'IT': ['hh.ru', 'habr.com', 'tproger.ru', 'geekbrains.ru', 'proglib.io'],
@@ -129,14 +83,17 @@ class ProfessionAnalyzer:
         # Создаем директорию для кэширования, если её нет
         os.makedirs(self.cache_dir, exist_ok=True)
     
+    @property
+    def taxonomy(self):
+        """Классификаторы профессий (data/taxonomy.json, перечитывается при изменении файла)"""
+        return get_taxonomy()
+    
     def find_category(self, profession):
         """Определение категории профессии"""
-        profession_lower = profession.lower()
-        
-        # Проверяем прямое соответствие
-        for prof, category in self.profession_categories.items():
-            if prof in profession_lower:
-                return category
+        # Проверяем прямое соответствие каноническому названию (классификатор profession_category в data/taxonomy.json)
+        category = self.taxonomy.category('profession_category', get_canonicalizer().canonical_id(profession))
+        if category:
+            return category
         
         # Если прямого соответствия не найдено, используем поиск
         return self._search_profession_category(profession)
@@ -151,55 +108,17 @@ class ProfessionAnalyzer:
         Returns:
             str: Тип профессии (IT, финансы, медицина и т.д.)
         """
-        # Преобразуем название профессии в нижний регистр для сравнения
-        profession_lower = profession.lower()
-        
-        # Словарь типов профессий с ключевыми словами
-        profession_keywords = {
-            'IT': ['программист', 'разработчик', 'devops', 'frontend', 'backend', 'верстальщик', 
-                   'тестировщик', 'qa', 'data scientist', 'аналитик данных', 'системный администратор', 
-                   'cto', 'инженер', 'web', 'mobile', 'javascript', 'python', 'java', 'c++', 'c#', 
-                   'php', 'android', 'ios', 'fullstack', 'ai', 'ml', 'devsecops', 'ui/ux'],
-                   
-            'финансы': ['бухгалтер', 'финансист', 'финансовый', 'аудитор', 'экономист', 
-                        'банкир', 'трейдер', 'инвестиционный', 'казначей', 'кредитный', 'финансовый аналитик'],
-                        
-            'медицина': ['врач', 'медсестра', 'фармацевт', 'терапевт', 'хирург', 'стоматолог', 'педиатр', 
-                         'психолог', 'психиатр', 'невролог', 'фельдшер', 'кардиолог', 'онколог', 'ветеринар'],
-                         
-            'маркетинг': ['маркетолог', 'smm', 'seo', 'медиа', 'pr', 'контекстолог', 'копирайтер', 
-                          'таргетолог', 'бренд', 'продвижение', 'реклама', 'маркетинговый'],
-                          
-            'менеджмент': ['менеджер', 'руководитель', 'директор', 'управляющий', 'заведующий', 
-                           'администратор', 'супервайзер', 'координатор', 'ceo', 'coo', 'проджект-менеджер'],
-                           
-            'продажи': ['продавец', 'sales', 'менеджер по продажам', 'торговый', 'консультант', 
-                        'агент по продажам', 'представитель', 'кассир', 'merchandiser', 'продающий'],
-                        
-            'дизайн': ['дизайнер', 'художник', 'иллюстратор', 'графический', 'промышленный дизайн', 
-                      'ui', 'ux', 'веб-дизайнер', 'motion', 'анимация', 'фотограф', 'креативный'],
-                      
-            'образование': ['учитель', 'преподаватель', 'педагог', 'воспитатель', 'тренер', 
-                           'репетитор', 'методист', 'куратор', 'наставник', 'лектор', 'инструктор'],
-                           
-            'юриспруденция': ['юрист', 'адвокат', 'нотариус', 'прокурор', 'судья', 'юрисконсульт', 
-                             'юридический', 'compliance', 'legal', 'арбитраж', 'правовой']
-        }
+        # Типы профессий и их ключевые слова - классификатор profession_type в data/taxonomy.json
+        profession_types = self.taxonomy['profession_type']
         
         # Проверяем прямое соответствие в нашем словаре категорий профессий
         category = self.find_category(profession)
-        if category and category in profession_keywords:
+        if category and category in profession_types.categories:
             return category
             
         # Если категория не найдена или не в нашем словаре ключевых слов,
-        # ищем совпадения с ключевыми словами по типам профессий
-        for prof_type, keywords in profession_keywords.items():
-            for keyword in keywords:
-                if keyword in profession_lower:
-                    return prof_type
-        
-        # По умолчанию возвращаем "другое"
-        return "другое"
+        # ищем совпадения с ключевыми словами по типам профессий (по умолчанию "другое")
+        return profession_types.category(get_canonicalizer().canonical_id(profession))
     
     def _search_profession_category(self, profession):
         """Поиск категории профессии через запрос в интернет"""
@@ -877,17 +796,20 @@ class ProfessionAnalyzer:
             result["error"] = f"Ошибка при обработке портала вакансий: {str(e)}"
             return result
 
-    def generate_skill_description(self, skills, profession):
+    def generate_skill_description(self, skills, profession, seed=None):
         """
         Генерирует расширенные описания для навыков на основе контекста профессии.
         
         Args:
             skills (list): Список навыков для генерации описаний.
             profession (str): Профессия для контекста.
+            seed (int): Зерно запроса (seeding.request_seed); по умолчанию - каноническое название профессии.
             
         Returns:
             dict: Словарь с расширенными описаниями навыков.
         """
+        if seed is None:
+            seed = get_canonicalizer().canonical_id(profession)
         cache_file = os.path.join(self.cache_dir, f"skills_desc_{profession.replace(' ', '_')}.json")
         
         # Проверяем кэш
@@ -1002,10 +924,12 @@ class ProfessionAnalyzer:
             else:
                 skill_type = 'технические'  # По умолчанию считаем навык техническим
             
-            # Выбираем случайный шаблон и заполняем его
-            template = random.choice(skill_templates[skill_type])
-            action = random.choice(skill_actions[skill_type])
-            context = random.choice(skill_contexts[skill_type])
+            # Выбираем шаблон и заполняем его; генератор зависит только от запроса и навыка,
+            # поэтому описание навыка не меняется от порядка навыков в списке
+            rng = seeded_random('skill_description', seed, skill)
+            template = rng.choice(skill_templates[skill_type])
+            action = rng.choice(skill_actions[skill_type])
+            context = rng.choice(skill_contexts[skill_type])
             
             description = template.replace('{профессия}', profession)
             description = description.replace('{действие}', action)
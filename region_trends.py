@@ -0,0 +1,503 @@
+"""
+Региональные тренды по вакансиям из хранилища.
+
+Пакетная задача (python region_trends.py) раскладывает сохраненные вакансии
+по регионам HH и временным окнам по дате публикации. Вакансия учитывается в
+своем регионе, во всех регионах выше по дереву HH (город -> область -> страна)
+и в сводке по всем регионам. Счетчики считаются произведениями разреженных
+матриц "регион x окно -> вакансии" и "вакансия -> навыки" и сохраняются в
+каталог в формате model_artifact.py:
+    demand              - вакансий в регионе за окно (регион x окно)
+    salary_sum/count    - сумма и число зарплат в рублях на руки (регион x окно)
+    skill_counts        - вакансий с навыком (регион*окно x навык, CSR)
+    skill_salary_sum/count - зарплаты вакансий с навыком (регион*окно x навык, CSR)
+
+При загрузке по ним один раз вычисляются сводки для каждого региона: рост
+доли вакансий с навыком (последние RECENT_WINDOWS окон против предыдущих),
+самые востребованные навыки, изменение числа вакансий и зарплат, надбавка к
+зарплате за навык. Любой регион HH получает тренды своего ближайшего предка,
+по которому достаточно вакансий.
+
+Обновление из командной строки (после загрузки вакансий, см. vacancy_store.py):
+    python region_trends.py --windows 6 --window-days 30
+"""
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+import model_artifact
+from salary_stats import load_currency_rates, salary_value
+from skill_index import normalize_skill
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TRENDS_PATH = os.environ.get('REGION_TRENDS_PATH', os.path.join(BASE_DIR, 'model', 'region_trends'))
+
+# Временные окна: количество и длина в днях (последнее окно заканчивается самой свежей публикацией)
+TREND_WINDOWS = int(os.environ.get('REGION_TREND_WINDOWS', '6'))
+TREND_WINDOW_DAYS = int(os.environ.get('REGION_TREND_WINDOW_DAYS', '30'))
+
+# Сколько последних окон сравнивается с предыдущими
+RECENT_WINDOWS = 2
+
+# Сколько самых частых навыков попадает в таблицу
+MAX_TREND_SKILLS = 2000
+
+# Сколько навыков в каждой сводке региона
+TOP_TREND_SKILLS = 5
+
+# Регион без такого числа вакансий в последних окнах заменяется регионом выше по дереву
+MIN_REGION_VACANCIES = int(os.environ.get('REGION_TREND_MIN_VACANCIES', '20'))
+
+# Навык участвует в сводках, если он встречается хотя бы в стольких недавних вакансиях
+MIN_SKILL_VACANCIES = 5
+
+# Рост доли навыка считается трендом, если z-статистика разности долей не меньше этого значения
+# (в небольших регионах случайные колебания долей достигают десятков процентов, а навыков - тысячи)
+MIN_GROWTH_Z = 3.0
+
+# Строка сводки по всем регионам
+ALL_REGIONS = ''
+
+# Как часто проверять, не пересобран ли каталог трендов
+RELOAD_CHECK_INTERVAL = 30
+
+logger = logging.getLogger(__name__)
+
+
+def vacancy_time(vacancy):
+    """Время публикации вакансии (unix time); если дата не разбирается - время загрузки"""
+    published = vacancy.get('published_at')
+    if published:
+        try:
+            return datetime.strptime(published, '%Y-%m-%dT%H:%M:%S%z').timestamp()
+        except ValueError:
+            try:
+                return datetime.fromisoformat(published).timestamp()
+            except ValueError:
+                pass
+    return vacancy.get('fetched_at')
+
+
+def _region_chain(area_id, parents):
+    """Регион вакансии, его предки в дереве HH и сводка по всем регионам"""
+    chain = []
+    seen = set()
+    while area_id and area_id not in seen:
+        seen.add(area_id)
+        chain.append(area_id)
+        area_id = parents.get(area_id)
+    chain.append(ALL_REGIONS)
+    return chain
+
+
+def _change(recent, past):
+    """Относительное изменение recent к past (nan, если сравнивать не с чем)"""
+    import numpy as np
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(past > 0, recent / np.where(past > 0, past, 1) - 1, np.nan).astype(np.float32)
+
+
+def _top_columns(scores, k):
+    """
+    Номера k лучших столбцов каждой строки по убыванию (nan и -inf не выбираются)
+
+    Returns:
+        numpy.ndarray: (строки, k), недостающие позиции заполнены -1
+    """
+    import numpy as np
+
+    scores = np.where(np.isnan(scores), -np.inf, scores)
+    k = min(k, scores.shape[1])
+    if k == 0:
+        return np.full((scores.shape[0], 0), -1, dtype=np.int32)
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1, kind='stable')
+    top = np.take_along_axis(top, order, axis=1)
+    top[~np.isfinite(np.take_along_axis(scores, top, axis=1))] = -1
+    return top.astype(np.int32)
+
+
+class RegionTrends:
+    """Таблица "регион x навык x окно" и предрасчитанные сводки трендов по регионам"""
+
+    def __init__(self, regions, skills, demand, salary_sum, salary_count, skill_counts, skill_salary_sum,
+                 skill_salary_count, metadata):
+        import numpy as np
+        from scipy import sparse
+
+        self.regions = list(regions)
+        self.skills = list(skills)
+        self.metadata = dict(metadata)
+        self.windows = int(self.metadata['windows'])
+        self.window_days = int(self.metadata['window_days'])
+        self.row_by_region = {region: row for row, region in enumerate(self.regions)}
+
+        self.demand = demand
+        self.salary_sum = salary_sum
+        self.salary_count = salary_count
+        self.skill_counts = skill_counts
+        self.skill_salary_sum = skill_salary_sum
+        self.skill_salary_count = skill_salary_count
+
+        # Суммы по недавним и предыдущим окнам: селекторы (регион x регион*окно) в одном умножении
+        count = len(self.regions)
+        recent_windows = min(RECENT_WINDOWS, self.windows)
+        recent = np.zeros(self.windows, dtype=bool)
+        recent[self.windows - recent_windows:] = True
+        columns = np.arange(count * self.windows)
+        region_of_column = columns // self.windows
+        is_recent = recent[columns % self.windows]
+        selector = {
+            name: sparse.csr_matrix((np.ones(mask.sum(), dtype=np.float64), (region_of_column[mask], columns[mask])),
+                                    shape=(count, count * self.windows))
+            for name, mask in (('recent', is_recent), ('past', ~is_recent))
+        }
+
+        def split(matrix):
+            return tuple(np.asarray((selector[name] @ matrix).todense(), dtype=np.float64)
+                         for name in ('recent', 'past'))
+
+        demand = np.asarray(self.demand, dtype=np.float64)
+        self.recent_demand = demand[:, recent].sum(axis=1)
+        past_demand = demand[:, ~recent].sum(axis=1)
+        past_windows = max(self.windows - recent_windows, 1)
+        self.demand_change = _change(self.recent_demand / recent_windows, past_demand / past_windows)
+
+        salary_sum = np.asarray(self.salary_sum, dtype=np.float64)
+        salary_count = np.asarray(self.salary_count, dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            recent_salary = salary_sum[:, recent].sum(axis=1) / salary_count[:, recent].sum(axis=1)
+            past_salary = salary_sum[:, ~recent].sum(axis=1) / salary_count[:, ~recent].sum(axis=1)
+        self.recent_salary = recent_salary.astype(np.float32)
+        self.salary_change = _change(np.nan_to_num(recent_salary), np.nan_to_num(past_salary))
+
+        recent_counts, past_counts = split(self.skill_counts)
+        eligible = recent_counts >= MIN_SKILL_VACANCIES
+        # Доля вакансий с навыком со сглаживанием Лапласа: редкие навыки не дают роста в разы
+        recent_share = (recent_counts + 1) / (self.recent_demand[:, None] + 2)
+        past_share = (past_counts + 1) / (past_demand[:, None] + 2)
+        growth = np.where(eligible & (past_demand[:, None] > 0), recent_share / past_share - 1, np.nan)
+        # Двухвыборочный z-критерий для долей: рост должен быть заметнее случайных колебаний
+        total = np.maximum(self.recent_demand + past_demand, 1)[:, None]
+        pooled = (recent_counts + past_counts) / total
+        with np.errstate(divide='ignore', invalid='ignore'):
+            spread = np.sqrt(pooled * (1 - pooled) * (1 / np.maximum(self.recent_demand, 1)[:, None]
+                                                      + 1 / np.maximum(past_demand, 1)[:, None]))
+            z = (recent_counts / np.maximum(self.recent_demand, 1)[:, None]
+                 - past_counts / np.maximum(past_demand, 1)[:, None]) / spread
+        growth[(growth <= 0) | ~(z >= MIN_GROWTH_Z)] = np.nan
+        self.skill_share = np.where(eligible, recent_counts / np.maximum(self.recent_demand[:, None], 1), np.nan)
+        self.skill_growth = growth.astype(np.float32)
+
+        recent_skill_salary, _ = split(self.skill_salary_sum)
+        recent_skill_salary_count, _ = split(self.skill_salary_count)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            premium = recent_skill_salary / recent_skill_salary_count / recent_salary[:, None] - 1
+        premium[(recent_skill_salary_count < MIN_SKILL_VACANCIES) | ~np.isfinite(premium) | (premium <= 0)] = np.nan
+        self.salary_premium = premium.astype(np.float32)
+
+        self.top_growing = _top_columns(self.skill_growth, TOP_TREND_SKILLS)
+        self.top_demanded = _top_columns(self.skill_share, TOP_TREND_SKILLS)
+        self.top_premium = _top_columns(self.salary_premium, TOP_TREND_SKILLS)
+
+        self._area_rows = {}
+        self._area_parents = None
+
+    @classmethod
+    def build(cls, vacancies, parents, rates=None, windows=TREND_WINDOWS, window_days=TREND_WINDOW_DAYS):
+        """
+        Строит таблицу по вакансиям
+
+        Args:
+            vacancies (list): Вакансии в формате VacancyStore.vacancies()
+            parents (dict): {area_id: id родительского региона} из дерева HH (AreaIndex.parents)
+            rates (dict): Курсы валют HH; None - загрузить, если есть зарплаты не в рублях
+            windows (int): Количество временных окон
+            window_days (int): Длина окна в днях
+
+        Returns:
+            RegionTrends или None, если нет вакансий с датой
+        """
+        import numpy as np
+        from scipy import sparse
+
+        dated = [(vacancy, vacancy_time(vacancy)) for vacancy in vacancies]
+        dated = [(vacancy, moment) for vacancy, moment in dated if moment is not None]
+        if not dated:
+            return None
+        reference = max(moment for _, moment in dated)
+        window_seconds = window_days * 24 * 3600
+        kept = []
+        window_of = []
+        for vacancy, moment in dated:
+            window = windows - 1 - int((reference - moment) // window_seconds)
+            if window >= 0:
+                kept.append(vacancy)
+                window_of.append(window)
+
+        # Словарь навыков: самые частые нормализованные навыки, название - самое частое написание
+        frequency = Counter()
+        spellings = {}
+        vacancy_keys = []
+        for vacancy in kept:
+            keys = {}
+            for skill in vacancy.get('skills') or []:
+                key = normalize_skill(skill)
+                if key:
+                    keys.setdefault(key, skill)
+            vacancy_keys.append(keys)
+            frequency.update(keys.keys())
+            for key, skill in keys.items():
+                spellings.setdefault(key, Counter())[skill] += 1
+        vocabulary = [key for key, _ in sorted(frequency.items(), key=lambda item: (-item[1], item[0]))[:MAX_TREND_SKILLS]]
+        column_of = {key: column for column, key in enumerate(vocabulary)}
+        skills = [min(spellings[key].items(), key=lambda item: (-item[1], item[0]))[0] for key in vocabulary]
+
+        # Регионы: вакансия попадает в строки своего региона, его предков и сводки по всем регионам
+        if any(vacancy.get('salary_currency') not in (None, 'RUR') for vacancy in kept) and rates is None:
+            rates = load_currency_rates()
+        rates = rates or {'RUR': 1.0}
+        region_row = {}
+        chains = {}
+        rw_rows, rw_columns, skill_rows, skill_columns = [], [], [], []
+        salaries = np.zeros(len(kept), dtype=np.float64)
+        for number, (vacancy, window) in enumerate(zip(kept, window_of)):
+            area_id = str(vacancy.get('area_id') or '')
+            chain = chains.get(area_id)
+            if chain is None:
+                chain = chains[area_id] = [region_row.setdefault(region, len(region_row))
+                                           for region in _region_chain(area_id, parents)]
+            rw_rows.extend(row * windows + window for row in chain)
+            rw_columns.extend([number] * len(chain))
+            for key in vacancy_keys[number]:
+                column = column_of.get(key)
+                if column is not None:
+                    skill_rows.append(number)
+                    skill_columns.append(column)
+            value = salary_value(vacancy.get('salary_from'), vacancy.get('salary_to'),
+                                 vacancy.get('salary_currency'), vacancy.get('salary_gross'), rates)
+            if value is not None:
+                salaries[number] = value
+
+        regions = sorted(region_row, key=region_row.get)
+        region_windows = sparse.csr_matrix(
+            (np.ones(len(rw_rows), dtype=np.float64), (rw_rows, rw_columns)),
+            shape=(len(regions) * windows, len(kept))
+        )
+        vacancy_skills = sparse.csr_matrix(
+            (np.ones(len(skill_rows), dtype=np.float64), (skill_rows, skill_columns)),
+            shape=(len(kept), len(skills))
+        )
+        has_salary = (salaries > 0).astype(np.float64)
+        salaried = region_windows @ sparse.diags(has_salary)
+        paid = region_windows @ sparse.diags(salaries)
+
+        metadata = {'windows': windows, 'window_days': window_days, 'reference_time': reference,
+                    'vacancies': len(kept), 'built_at': time.time()}
+        return cls(
+            regions, skills,
+            demand=np.asarray(region_windows.sum(axis=1), dtype=np.int32).reshape(len(regions), windows),
+            salary_sum=(region_windows @ salaries).reshape(len(regions), windows),
+            salary_count=np.asarray(region_windows @ has_salary, dtype=np.int32).reshape(len(regions), windows),
+            skill_counts=(region_windows @ vacancy_skills).astype(np.int32).tocsr(),
+            skill_salary_sum=(paid @ vacancy_skills).tocsr(),
+            skill_salary_count=(salaried @ vacancy_skills).astype(np.int32).tocsr(),
+            metadata=metadata
+        )
+
+    def to_artifact(self):
+        """Массивы, строки и метаданные для model_artifact.save_artifact"""
+        arrays = {
+            'demand': self.demand, 'salary_sum': self.salary_sum, 'salary_count': self.salary_count,
+            'skill_counts': self.skill_counts, 'skill_salary_sum': self.skill_salary_sum,
+            'skill_salary_count': self.skill_salary_count,
+        }
+        return arrays, {'regions': self.regions, 'skills': self.skills}, dict(self.metadata, region_trends=True)
+
+    @classmethod
+    def from_artifact(cls, arrays, strings, metadata):
+        return cls(strings['regions'], strings['skills'], arrays['demand'], arrays['salary_sum'],
+                   arrays['salary_count'], arrays['skill_counts'], arrays['skill_salary_sum'],
+                   arrays['skill_salary_count'], metadata)
+
+    def row_for(self, area_id, parents):
+        """
+        Строка таблицы для региона HH: сам регион или ближайший предок с достаточным числом вакансий
+
+        Args:
+            area_id (str): Регион HH (None - все регионы)
+            parents (dict): {area_id: id родительского региона}
+        """
+        if parents is not self._area_parents:
+            self._area_rows = {}
+            self._area_parents = parents
+        key = str(area_id or ALL_REGIONS)
+        row = self._area_rows.get(key)
+        if row is None:
+            row = self.row_by_region.get(ALL_REGIONS)
+            for region in _region_chain(key if area_id else None, parents):
+                candidate = self.row_by_region.get(region)
+                if candidate is not None and self.recent_demand[candidate] >= MIN_REGION_VACANCIES:
+                    row = candidate
+                    break
+            self._area_rows[key] = row
+        return row
+
+    def cover(self, parents):
+        """Заранее сопоставляет строки таблицы всем регионам дерева HH"""
+        for area_id in parents:
+            self.row_for(area_id, parents)
+        return len(self._area_rows)
+
+    def _skills(self, top, values, row):
+        return [(self.skills[column], round(float(values[row, column]), 3)) for column in top[row] if column >= 0]
+
+    def metrics(self, area_id, parents):
+        """
+        Сводка трендов региона
+
+        Returns:
+            dict: {'region', 'vacancies', 'demandChange', 'salary', 'salaryChange', 'growingSkills',
+                   'topSkills', 'salaryPremiumSkills', 'demandSeries', 'windowDays'} или None, если данных нет;
+                  region - регион, по которому фактически посчитана сводка ('' - все регионы)
+        """
+        import numpy as np
+
+        row = self.row_for(area_id, parents)
+        if row is None or not self.recent_demand[row]:
+            return None
+
+        def number(value):
+            return None if np.isnan(value) else round(float(value), 3)
+
+        return {
+            'region': self.regions[row],
+            'vacancies': int(self.recent_demand[row]),
+            'demandChange': number(self.demand_change[row]),
+            'salary': None if np.isnan(self.recent_salary[row]) else int(round(float(self.recent_salary[row]))),
+            'salaryChange': number(self.salary_change[row]),
+            'growingSkills': self._skills(self.top_growing, self.skill_growth, row),
+            'topSkills': self._skills(self.top_demanded, self.skill_share, row),
+            'salaryPremiumSkills': self._skills(self.top_premium, self.salary_premium, row),
+            'demandSeries': [int(value) for value in self.demand[row]],
+            'windowDays': self.window_days,
+        }
+
+    def trends(self, area_id, parents):
+        """Тренды региона текстом (как региональные тренды каталога) или пустой список"""
+        metrics = self.metrics(area_id, parents)
+        if metrics is None:
+            return []
+        days = min(RECENT_WINDOWS, self.windows) * self.window_days
+        trends = []
+        change = metrics['demandChange']
+        trends.append(f"Вакансий за последние {days} дней: {metrics['vacancies']}"
+                      + (f" ({change:+.0%} к предыдущему периоду)" if change is not None else ""))
+        if metrics['growingSkills']:
+            trends.append("Растет спрос на навыки: "
+                          + ", ".join(f"{skill} ({growth:+.0%})" for skill, growth in metrics['growingSkills']))
+        if metrics['topSkills']:
+            trends.append("Самые востребованные навыки: "
+                          + ", ".join(f"{skill} ({share:.0%} вакансий)" for skill, share in metrics['topSkills']))
+        if metrics['salary'] is not None:
+            change = metrics['salaryChange']
+            trends.append(f"Средняя зарплата в вакансиях: {metrics['salary']:,} руб.".replace(',', ' ')
+                          + (f" ({change:+.0%})" if change is not None else ""))
+        if metrics['salaryPremiumSkills']:
+            trends.append("Выше оплачиваются вакансии с навыками: "
+                          + ", ".join(f"{skill} ({premium:+.0%})" for skill, premium in metrics['salaryPremiumSkills']))
+        return trends
+
+
+def build_from_store(store, parents, windows=TREND_WINDOWS, window_days=TREND_WINDOW_DAYS):
+    """Строит таблицу трендов по всем вакансиям хранилища"""
+    started = time.time()
+    table = RegionTrends.build(store.vacancies(), parents, windows=windows, window_days=window_days)
+    if table is None:
+        logger.warning("В хранилище нет вакансий с датой публикации, региональные тренды не построены")
+    else:
+        logger.info(f"Региональные тренды построены за {time.time() - started:.2f} с: "
+                    f"{table.metadata['vacancies']} вакансий, {len(table.regions)} регионов, "
+                    f"{len(table.skills)} навыков")
+    return table
+
+
+def load_region_trends(path=TRENDS_PATH):
+    """
+    Raises:
+        model_artifact.ArtifactError: Каталог отсутствует, поврежден или не содержит таблицу трендов
+    """
+    metadata, arrays, strings = model_artifact.load_artifact(path)
+    if not metadata.get('region_trends'):
+        raise model_artifact.ArtifactError(f"В {path} нет таблицы региональных трендов")
+    return RegionTrends.from_artifact(arrays, strings, metadata)
+
+
+_trends = None
+_trends_version = None
+_trends_checked_at = 0
+_trends_lock = threading.Lock()
+
+
+def _manifest_version(path):
+    try:
+        stat = os.stat(os.path.join(model_artifact.current_version(path), model_artifact.MANIFEST_NAME))
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def get_region_trends():
+    """
+    Возвращает таблицу трендов, перечитывая ее после пересборки (проверка раз в RELOAD_CHECK_INTERVAL секунд)
+
+    Returns:
+        RegionTrends или None, если таблица еще не построена
+    """
+    global _trends, _trends_version, _trends_checked_at
+    if time.time() - _trends_checked_at < RELOAD_CHECK_INTERVAL:
+        return _trends
+    with _trends_lock:
+        if time.time() - _trends_checked_at >= RELOAD_CHECK_INTERVAL:
+            version = _manifest_version(TRENDS_PATH)
+            if version != _trends_version:
+                try:
+                    _trends = load_region_trends(TRENDS_PATH) if version is not None else None
+                except model_artifact.ArtifactError as e:
+                    logger.warning(f"Региональные тренды не загружены: {e}")
+                    _trends = None
+                _trends_version = version
+            _trends_checked_at = time.time()
+    return _trends
+
+
+def main():
+    import argparse
+    from hh_areas import AreaIndex, load_areas_tree
+    from vacancy_store import get_vacancy_store
+
+    parser = argparse.ArgumentParser(description='Построение региональных трендов по хранилищу вакансий')
+    parser.add_argument('--path', default=TRENDS_PATH, help='Каталог, в который сохраняется таблица трендов')
+    parser.add_argument('--windows', type=int, default=TREND_WINDOWS, help='Количество временных окон')
+    parser.add_argument('--window-days', type=int, default=TREND_WINDOW_DAYS, help='Длина окна в днях')
+    args = parser.parse_args()
+
+    # Пакетная задача дожидается загрузки полного дерева регионов
+    area_index = AreaIndex(*load_areas_tree())
+    table = build_from_store(get_vacancy_store(), area_index.parents, args.windows, args.window_days)
+    if table is None:
+        print("В хранилище нет вакансий. Сначала загрузите вакансии: python vacancy_store.py \"профессия\"")
+        return 1
+    arrays, strings, metadata = table.to_artifact()
+    model_artifact.save_artifact(args.path, arrays, strings, metadata)
+    print(f"Вакансий: {table.metadata['vacancies']}, регионов: {len(table.regions)}, навыков: {len(table.skills)}, "
+          f"регионов HH с трендами: {table.cover(area_index.parents)}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
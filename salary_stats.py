@@ -0,0 +1,263 @@
+"""
+Статистика зарплат по вакансиям из хранилища (vacancy_store.py).
+
+Зарплата вакансии приводится к рублям "на руки": суммы в валюте переводятся по
+курсам из справочника HH (https://api.hh.ru/dictionaries, загружается в фоновом
+потоке, до ответа - встроенные курсы), зарплата до вычета
+налога (gross) умножается на NET_RATIO. За значение вакансии берется середина
+вилки, а если указана одна граница - она сама.
+
+Для каждого сочетания профессия x регион поиска x уровень опыта хранятся
+квартили (p25, p50, p75) и число вакансий, а также сводки "все регионы" и
+"любой опыт". Таблица - словарь кортежей, поэтому ответ занимает микросекунды.
+После изменений в хранилище пересчитываются только профессии, у которых
+появились новые или обновленные вакансии.
+"""
+import logging
+import os
+import threading
+import time
+
+import http_client
+
+DICTIONARIES_URL = "https://api.hh.ru/dictionaries"
+
+# Доля зарплаты, которая остается после НДФЛ 13%
+NET_RATIO = 0.87
+
+# Курсы на случай, если справочник HH недоступен: сколько единиц валюты стоит 1 рубль (как в API HH)
+DEFAULT_CURRENCY_RATES = {
+    'RUR': 1.0,
+    'USD': 0.011,
+    'EUR': 0.0102,
+    'KZT': 5.6,
+    'BYR': 0.036,
+    'UAH': 0.45,
+    'UZS': 140.0,
+    'KGS': 0.96,
+    'AZN': 0.019,
+    'GEL': 0.03,
+}
+
+# Срок жизни загруженных курсов валют (по умолчанию сутки)
+CURRENCY_RATES_TTL = int(os.environ.get('HH_CURRENCY_RATES_TTL', str(24 * 3600)))
+
+# Опыт в вакансии HH -> уровень в дорожной карте. Вилка "3-6 лет" - middle: в нее попадают
+# и вакансии middle+, и senior, но отнесение ее к senior занижало бы квартили senior
+EXPERIENCE_LEVELS = {
+    'noExperience': 'junior',
+    'between1And3': 'middle',
+    'between3And6': 'middle',
+    'moreThan6': 'senior',
+}
+
+# Ключ сводки "все регионы" / "любой опыт"
+ANY = ''
+
+# Меньше вакансий в ячейке - берем более общую сводку
+MIN_SAMPLES = 5
+
+# Зарплаты вне этого диапазона (руб. в месяц на руки) считаем ошибками ввода
+MIN_SALARY = 5000
+MAX_SALARY = 5000000
+
+# Как часто проверять, изменилось ли хранилище
+REFRESH_CHECK_INTERVAL = 5
+
+logger = logging.getLogger(__name__)
+
+
+def load_currency_rates(headers=None):
+    """Курсы валют из справочника HH или DEFAULT_CURRENCY_RATES, если он недоступен"""
+    try:
+        response = http_client.get(DICTIONARIES_URL, headers=headers)
+        if response.status_code == 200:
+            rates = {item['code']: float(item['rate'])
+                     for item in response.json().get('currency', []) if item.get('rate')}
+            if rates:
+                return rates
+        logger.warning(f"Справочник валют HH вернул {response.status_code}, используются встроенные курсы")
+    except Exception as e:
+        logger.warning(f"Не удалось загрузить курсы валют HH: {e}. Используются встроенные курсы")
+    return dict(DEFAULT_CURRENCY_RATES)
+
+
+def salary_value(salary_from, salary_to, currency, gross, rates):
+    """
+    Зарплата вакансии в рублях на руки
+
+    Returns:
+        float: Середина вилки (или единственная граница) или None, если зарплату нельзя учесть
+    """
+    bounds = [bound for bound in (salary_from, salary_to) if bound]
+    if not bounds:
+        return None
+    rate = rates.get(currency or 'RUR')
+    if not rate:
+        return None
+    value = sum(bounds) / len(bounds) / rate
+    if gross:
+        value *= NET_RATIO
+    if not MIN_SALARY <= value <= MAX_SALARY:
+        return None
+    return value
+
+
+def quartiles(values):
+    """p25, p50, p75 отсортированного списка (линейная интерполяция, как numpy.percentile)"""
+    result = []
+    last = len(values) - 1
+    for fraction in (0.25, 0.5, 0.75):
+        position = fraction * last
+        lower = int(position)
+        upper = min(lower + 1, last)
+        result.append(values[lower] + (values[upper] - values[lower]) * (position - lower))
+    return result
+
+
+class SalaryStats:
+    """Предрасчитанные квартили зарплат: (профессия, регион, уровень) -> (p25, p50, p75, число вакансий)"""
+
+    def __init__(self, store, headers=None):
+        self.store = store
+        self.headers = headers
+        self._table = {}
+        self._lock = threading.Lock()
+        self._synced_at = None
+        self._store_version = None
+        self._checked_at = 0
+        self._rates = None
+        self._rates_loaded_at = 0
+        self._rates_lock = threading.Lock()
+        self._rates_refreshing = False
+        self._rates_changed = False
+
+    def currency_rates(self):
+        """
+        Курсы валют для пересчета зарплат
+
+        Справочник HH запрашивается в фоновом потоке, а до его ответа используются прежние
+        (или встроенные) курсы; после загрузки новых курсов статистика пересчитывается целиком.
+        """
+        if time.time() - self._rates_loaded_at >= CURRENCY_RATES_TTL:
+            with self._rates_lock:
+                start = not self._rates_refreshing
+                self._rates_refreshing = True
+            if start:
+                threading.Thread(target=self._refresh_rates, name='hh-currency-rates', daemon=True).start()
+        return self._rates or DEFAULT_CURRENCY_RATES
+
+    def _refresh_rates(self):
+        try:
+            rates = load_currency_rates(self.headers)
+            changed = rates != (self._rates or DEFAULT_CURRENCY_RATES)
+            # Сначала курсы, затем признак: пересчет, начатый между ними, уже видит новые курсы
+            self._rates = rates
+            self._rates_loaded_at = time.time()
+            if changed:
+                self._rates_changed = True
+                self._checked_at = 0
+        finally:
+            with self._rates_lock:
+                self._rates_refreshing = False
+
+    def refresh(self):
+        """
+        Пересчитывает статистику профессий, у которых изменились вакансии
+
+        Returns:
+            int: Количество пересчитанных профессий
+        """
+        with self._lock:
+            started = time.time()
+            version = self.store.version()
+            rates_changed, self._rates_changed = self._rates_changed, False
+            if self._synced_at is None or rates_changed:
+                professions = list(self.store.profession_view())
+            else:
+                # Небольшой запас на запись, которая шла одновременно с прошлым пересчетом
+                professions = self.store.changed_professions(self._synced_at - 1)
+            if professions:
+                self._recompute(professions)
+            self._synced_at = started
+            self._store_version = version
+            self._checked_at = time.time()
+            return len(professions)
+
+    def _recompute(self, professions):
+        rows = self.store.salary_rows(professions)
+        # Справочник валют нужен, только если есть зарплаты не в рублях
+        if any(row[6] not in (None, 'RUR') for row in rows):
+            rates = self.currency_rates()
+        else:
+            rates = {'RUR': 1.0}
+
+        samples = {}
+        counted = set()
+        for profession, area_id, vacancy_id, experience, salary_from, salary_to, currency, gross in rows:
+            value = salary_value(salary_from, salary_to, currency, gross, rates)
+            if value is None:
+                continue
+            level = EXPERIENCE_LEVELS.get(experience, ANY)
+            keys = {(profession, area_id, level), (profession, area_id, ANY)}
+            # Вакансия, найденная в нескольких регионах, входит в сводку по всем регионам один раз
+            if (profession, vacancy_id) not in counted:
+                counted.add((profession, vacancy_id))
+                keys.update([(profession, ANY, level), (profession, ANY, ANY)])
+            for key in keys:
+                samples.setdefault(key, []).append(value)
+
+        recomputed = set(professions)
+        table = {key: value for key, value in self._table.items() if key[0] not in recomputed}
+        for key, values in samples.items():
+            values.sort()
+            p25, p50, p75 = quartiles(values)
+            table[key] = (int(round(p25)), int(round(p50)), int(round(p75)), len(values))
+        # Таблица заменяется целиком, чтобы чтение без блокировки видело согласованное состояние
+        self._table = table
+
+    def _maybe_refresh(self):
+        if time.time() - self._checked_at < REFRESH_CHECK_INTERVAL:
+            return
+        self._checked_at = time.time()
+        if self._synced_at is None or self._rates_changed or self.store.version() != self._store_version:
+            self.refresh()
+
+    def lookup(self, profession, area_id=None, level=None, min_samples=MIN_SAMPLES):
+        """
+        Квартили зарплаты с переходом к более общей сводке, если вакансий мало
+
+        Args:
+            profession (str): Каноническое название профессии
+            area_id (str): Регион поиска (None - все регионы)
+            level (str): junior, middle или senior (None - любой опыт)
+            min_samples (int): Минимальное число вакансий в сводке
+
+        Returns:
+            dict: {'p25', 'p50', 'p75', 'count', 'region', 'level'} или None, если данных нет;
+                  region и level - фактически использованные ключи ('' - сводка по всем)
+        """
+        self._maybe_refresh()
+        area_id = str(area_id) if area_id else ANY
+        level = level or ANY
+        for key in dict.fromkeys([(profession, area_id, level), (profession, ANY, level),
+                                  (profession, area_id, ANY), (profession, ANY, ANY)]):
+            stats = self._table.get(key)
+            if stats is not None and stats[3] >= min_samples:
+                p25, p50, p75, count = stats
+                return {'p25': p25, 'p50': p50, 'p75': p75, 'count': count, 'region': key[1], 'level': key[2]}
+        return None
+
+
+_salary_stats = None
+_salary_stats_lock = threading.Lock()
+
+
+def get_salary_stats(store, headers=None):
+    """Возвращает общую статистику зарплат для хранилища вакансий"""
+    global _salary_stats
+    if _salary_stats is None or _salary_stats.store is not store:
+        with _salary_stats_lock:
+            if _salary_stats is None or _salary_stats.store is not store:
+                _salary_stats = SalaryStats(store, headers)
+    return _salary_stats
@@ -0,0 +1,37 @@
+"""
+Воспроизводимая генерация в шаблонных функциях.
+
+Шаблонные генераторы выбирают формулировки случайно: шаги практики навыков
+в плане обучения карты без LLM (fallback.py) и описания навыков
+(ProfessionAnalyzer.generate_skill_description). Чтобы одинаковый запрос
+давал одинаковый ответ (а значит, ответ можно было запомнить и отдать со
+строгим ETag), генератор случайных чисел создается от хеша канонического
+запроса: канонического названия профессии, уровня, региона и т.д.
+"""
+import hashlib
+import json
+import random
+
+
+def request_seed(*parts):
+    """
+    Зерно генератора по частям канонического запроса
+
+    Части сериализуются в JSON (ключи словарей сортируются), поэтому зерно
+    одинаково во всех процессах и не зависит от PYTHONHASHSEED.
+
+    Returns:
+        int: 64-битное зерно
+    """
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return int.from_bytes(hashlib.blake2b(payload.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def seeded_random(*parts):
+    """Отдельный генератор random.Random для запроса (общий модуль random не затрагивается)"""
+    return random.Random(request_seed(*parts))
+
+
+def content_etag(body):
+    """Строгий ETag для тела ответа (bytes): одинаковые байты - одинаковый тег"""
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
@@ -0,0 +1,212 @@
+"""
+Семантический кеш карьерных планов.
+
+Ключ плана - регион, уровень (junior/middle/senior) и каноническое название
+профессии (canonicalizer.py); точное совпадение ключа находится по словарю
+без вычисления эмбеддинга. Иначе название профессии превращается в вектор
+(embeddings.py), и среди планов того же региона и уровня ищется ближайший по
+косинусному сходству: "разработчик на python", которого нет в списке
+профессий, получит план "python разработчик", а повторный запрос не пойдет в
+LLM. Два разных названия из списка профессий - разные профессии ("python
+разработчик" и "java разработчик"), поэтому между ними сходство не
+сравнивается. Векторы хранятся в одной матрице numpy, поиск - одно матричное
+умножение; при переполнении вытесняются самые старые записи.
+
+Кешируются только запросы без информации о пользователе: персональный план
+зависит от нее и не может быть отдан другому пользователю.
+"""
+import copy
+import logging
+import os
+import threading
+from collections import OrderedDict, namedtuple
+
+from canonicalizer import get_canonicalizer, normalize_text
+from embeddings import EmbeddingError
+
+SEMANTIC_CACHE_ENABLED = os.environ.get('SEMANTIC_CACHE', '1') != '0'
+
+# Минимальное косинусное сходство запросов, при котором отдается сохраненный план
+SEMANTIC_CACHE_THRESHOLD = float(os.environ.get('SEMANTIC_CACHE_THRESHOLD', '0.95'))
+
+# Максимальное количество сохраненных планов
+SEMANTIC_CACHE_SIZE = int(os.environ.get('SEMANTIC_CACHE_SIZE', '2048'))
+
+# Сколько векторов промахнувшихся запросов держать до сохранения плана (чтобы не считать их дважды)
+PENDING_VECTORS = 256
+
+# Найденный план: значение (копия), сходство и текст сохраненного запроса
+SemanticHit = namedtuple('SemanticHit', ['value', 'similarity', 'query'])
+
+logger = logging.getLogger(__name__)
+
+
+def query_text(key):
+    """Текст ключа для журнала (например, junior python разработчик, москва)"""
+    region, level, profession = key
+    profession = f"{level} {profession}" if level else profession
+    return f"{profession}, {region}" if region else profession
+
+
+class SemanticCache:
+    """Планы по ближайшему запросу; потокобезопасен"""
+
+    def __init__(self, embedder, threshold=SEMANTIC_CACHE_THRESHOLD, max_entries=SEMANTIC_CACHE_SIZE,
+                 canonicalizer=None):
+        """
+        Args:
+            embedder: Модель эмбеддингов (embeddings.py)
+            threshold (float): Минимальное косинусное сходство названий профессий
+            max_entries (int): Максимальное количество планов
+            canonicalizer: ProfessionCanonicalizer; по умолчанию - из текущего каталога
+        """
+        self.embedder = embedder
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.canonicalizer = canonicalizer
+        self._lock = threading.Lock()
+        # (регион, уровень, каноническое название) -> номер записи
+        self._slots = {}
+        # Запись: (ключ, значение) или None
+        self._entries = [None] * max_entries
+        # Матрица векторов, номер группы (регион и уровень) записи и признак названия из
+        # списка профессий (создаются при первом сохранении)
+        self._vectors = None
+        self._groups = None
+        self._known = None
+        # (регион, уровень) -> [номер группы, число записей]; номера групп без записей
+        # освобождаются, поэтому групп не больше, чем записей
+        self._group_ids = {}
+        self._free_groups = []
+        self._next = 0
+        self._size = 0
+        self._pending = OrderedDict()
+
+    def __len__(self):
+        return self._size
+
+    def _key(self, profession, region):
+        """Ключ запроса и признак того, что профессия найдена в списке профессий"""
+        canonicalizer = self.canonicalizer or get_canonicalizer()
+        canonical = canonicalizer.canonicalize(profession or '')
+        key = (normalize_text(region), canonicalizer.level(profession or ''), canonical.id)
+        return key, canonical.title is not None
+
+    def _exact(self, key):
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                return None
+            return SemanticHit(copy.deepcopy(self._entries[slot][1]), 1.0, query_text(key))
+
+    def _nearest(self, key, known, vector):
+        """Ближайшая запись того же региона и уровня, если сходство не ниже порога"""
+        with self._lock:
+            self._pending[key] = vector
+            self._pending.move_to_end(key)
+            while len(self._pending) > PENDING_VECTORS:
+                self._pending.popitem(last=False)
+
+            group = self._group_ids.get(key[:2])
+            if group is None:
+                return None
+            scores = self._vectors[:self._size] @ vector
+            excluded = self._groups[:self._size] != group[0]
+            if known:
+                # Другое название из списка профессий - другая профессия, как бы ни были похожи векторы
+                excluded |= self._known[:self._size]
+            scores[excluded] = -1.0
+            slot = int(scores.argmax())
+            similarity = float(scores[slot])
+            if similarity < self.threshold:
+                return None
+            stored_key, value = self._entries[slot]
+            return SemanticHit(copy.deepcopy(value), similarity, query_text(stored_key))
+
+    def get(self, profession, region):
+        """
+        Сохраненный план для запроса или для похожей профессии того же региона и уровня
+
+        Args:
+            profession (str): Название профессии в том виде, в котором его указал пользователь
+            region (str): Регион (сравнивается после нормализации)
+
+        Returns:
+            SemanticHit или None; ошибка эмбеддингов считается промахом
+        """
+        key, known = self._key(profession, region)
+        hit = self._exact(key)
+        if hit is not None:
+            return hit
+        try:
+            vector = self.embedder.embed([key[2]])[0]
+        except EmbeddingError as e:
+            logger.warning(f"Семантический кеш недоступен: {e}")
+            return None
+        return self._nearest(key, known, vector)
+
+    async def aget(self, profession, region):
+        """Асинхронная версия get: эмбеддинг запроса не блокирует цикл событий"""
+        key, known = self._key(profession, region)
+        hit = self._exact(key)
+        if hit is not None:
+            return hit
+        try:
+            vector = (await self.embedder.aembed([key[2]]))[0]
+        except EmbeddingError as e:
+            logger.warning(f"Семантический кеш недоступен: {e}")
+            return None
+        return self._nearest(key, known, vector)
+
+    def _acquire_group(self, group_key):
+        group = self._group_ids.get(group_key)
+        if group is None:
+            # Все выданные номера либо заняты группами, либо свободны
+            number = self._free_groups.pop() if self._free_groups else len(self._group_ids)
+            group = self._group_ids[group_key] = [number, 0]
+        group[1] += 1
+        return group[0]
+
+    def _release_group(self, group_key):
+        group = self._group_ids[group_key]
+        group[1] -= 1
+        if not group[1]:
+            del self._group_ids[group_key]
+            self._free_groups.append(group[0])
+
+    def put(self, profession, region, value):
+        """Сохраняет копию плана; вектор запроса берется из последнего промаха или вычисляется заново"""
+        import numpy as np
+
+        key, known = self._key(profession, region)
+        with self._lock:
+            vector = self._pending.pop(key, None)
+        if vector is None:
+            try:
+                vector = self.embedder.embed([key[2]])[0]
+            except EmbeddingError as e:
+                logger.warning(f"План не сохранен в семантический кеш: {e}")
+                return False
+
+        value = copy.deepcopy(value)
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.max_entries, len(vector)), dtype=np.float32)
+                self._groups = np.full(self.max_entries, -1, dtype=np.int32)
+                self._known = np.zeros(self.max_entries, dtype=bool)
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._next
+                self._next = (self._next + 1) % self.max_entries
+                evicted = self._entries[slot]
+                if evicted is not None:
+                    del self._slots[evicted[0]]
+                    self._release_group(evicted[0][:2])
+                else:
+                    self._size += 1
+                self._slots[key] = slot
+                self._groups[slot] = self._acquire_group(key[:2])
+            self._entries[slot] = (key, value)
+            self._vectors[slot] = vector
+            self._known[slot] = known
+        return True
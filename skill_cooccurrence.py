@@ -0,0 +1,255 @@
+"""
+Совместная встречаемость навыков в вакансиях и выбор следующего навыка для изучения.
+
+B - бинарная разреженная матрица (вакансии x навыки), C = B^T B - число
+вакансий, где навыки i и j требуются вместе, P[i, j] = C[i, j] / C[i, i] -
+условная вероятность P(j | i) того, что вакансия с навыком i требует и навык j.
+
+Ценность навыка j для пользователя, который уже владеет навыками S, - прирост
+покрытия вакансий: каждая вакансия v с навыком j, которого нет в S, дает
+1 / (число навыков вакансии, которых нет в S). Вакансия, в которой не хватает
+только j, после изучения j покрывается полностью и дает 1. Прирост умножается на
+(1 + средняя P(j | i) по навыкам i из S), чтобы при прочих равных первыми шли
+навыки, которые обычно требуются вместе с уже известными.
+
+Для одного пользователя это два умножения разреженной матрицы на вектор, для
+пакета пользователей - на матрицу (rank_batch). Считаются только строки B
+вакансий профессии и столбцы встречающихся в них навыков; такие подматрицы кешируются.
+"""
+
+import threading
+from collections import OrderedDict
+
+# Сколько пользователей обрабатывается за одно умножение в rank_batch
+BATCH_CHUNK = 256
+# Сколько подматриц вакансий (по профессиям) держать в памяти
+BLOCK_CACHE_SIZE = 256
+
+
+class SkillCooccurrence:
+    """Матрицы совместной встречаемости навыков и ранжирование навыков по приросту покрытия"""
+
+    def __init__(self, presence, cooccurrence, conditional, conditional_t=None):
+        # CSR (вакансии x навыки), 1 - навык требуется в вакансии
+        self.presence = presence
+        # CSR (навыки x навыки): C и P(j | i)
+        self.cooccurrence = cooccurrence
+        self.conditional = conditional
+        # P^T в CSR, чтобы не транспонировать матрицу на каждом запросе
+        self._conditional_t = conditional.T.tocsr() if conditional_t is None else conditional_t
+        self._blocks = OrderedDict()
+        self._blocks_lock = threading.Lock()
+
+    def to_arrays(self):
+        """Матрицы для записи в каталог модели"""
+        return {'presence': self.presence, 'counts': self.cooccurrence,
+                'conditional': self.conditional, 'conditional_t': self._conditional_t}
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """Матрицы из каталога модели (без копирования и транспонирования)"""
+        return cls(arrays['presence'], arrays['counts'], arrays['conditional'], arrays['conditional_t'])
+
+    @classmethod
+    def build(cls, vacancy_matrix):
+        """
+        Строит матрицы по TF-IDF матрице вакансий (учитывается только наличие навыка)
+
+        Args:
+            vacancy_matrix (scipy.sparse.csr_matrix): Матрица вакансии x навыки
+
+        Returns:
+            SkillCooccurrence: Матрицы B, C и P
+        """
+        import numpy as np
+        from scipy import sparse
+
+        presence = vacancy_matrix.copy().tocsr()
+        presence.data = np.ones_like(presence.data, dtype=np.float32)
+        presence = presence.astype(np.float32)
+
+        cooccurrence = (presence.T @ presence).tocsr()
+        counts = cooccurrence.diagonal()
+        inverse = np.divide(1.0, counts, out=np.zeros_like(counts, dtype=np.float32), where=counts > 0)
+        conditional = (sparse.diags(inverse.astype(np.float32)) @ cooccurrence).tocsr()
+        return cls(presence, cooccurrence, conditional)
+
+    @property
+    def skill_count(self):
+        return self.presence.shape[1]
+
+    def probability(self, given, skill):
+        """P(skill | given) по номерам столбцов словаря навыков"""
+        return float(self.conditional[given, skill])
+
+    def conditional_row(self, column):
+        """Плотный вектор P(j | column) по всем навыкам j"""
+        return self.conditional[column].toarray().ravel()
+
+    def _block(self, key, vacancy_rows):
+        """
+        Подматрица B для подмножества вакансий (например, вакансий профессии), сжатая до
+        навыков, которые в них встречаются: у остальных навыков прирост покрытия нулевой.
+        Блоки кешируются по ключу.
+
+        Returns:
+            tuple: (номера навыков блока, B блока, B^T блока, P^T блока, число навыков каждой вакансии)
+        """
+        import numpy as np
+
+        block = self._blocks.get(key) if key is not None else None
+        if block is not None:
+            return block
+
+        presence = self.presence if vacancy_rows is None else self.presence[vacancy_rows]
+        columns = np.unique(presence.indices)
+        presence = presence[:, columns].tocsr()
+        block = (columns, presence, presence.T.tocsr(), self._conditional_t[columns],
+                 np.asarray(presence.sum(axis=1), dtype=np.float32).ravel())
+        if key is not None:
+            with self._blocks_lock:
+                self._blocks[key] = block
+                while len(self._blocks) > BLOCK_CACHE_SIZE:
+                    self._blocks.popitem(last=False)
+        return block
+
+    def _block_scores(self, block, known_columns, vacancy_weights):
+        """Прирост покрытия для навыков блока (known_columns - номера во всем словаре, без повторов)"""
+        import numpy as np
+
+        columns, presence, presence_t, conditional_t, sizes = block
+        known = np.zeros(len(columns), dtype=np.float32)
+        positions = np.searchsorted(columns, known_columns)
+        inside = positions < len(columns)
+        inside[inside] = columns[positions[inside]] == np.asarray(known_columns)[inside]
+        known[positions[inside]] = 1
+
+        missing = sizes - presence @ known
+        weights = np.divide(1.0, missing, out=np.zeros_like(missing), where=missing > 0)
+        if vacancy_weights is not None:
+            weights *= vacancy_weights
+        scores = presence_t @ weights
+
+        if known_columns:
+            affinity = np.asarray(self.conditional[known_columns].sum(axis=0)).ravel()[columns]
+            scores *= 1 + affinity / len(known_columns)
+            scores[known > 0] = 0
+        return scores
+
+    def gains(self, known_columns, vacancy_rows=None, vacancy_weights=None, key=None):
+        """
+        Прирост покрытия вакансий для каждого навыка
+
+        Args:
+            known_columns (list): Номера навыков, которыми пользователь уже владеет
+            vacancy_rows (numpy.ndarray): Номера учитываемых вакансий (None - все вакансии)
+            vacancy_weights (numpy.ndarray): Вес каждой из учитываемых вакансий (None - одинаковый)
+            key: Ключ кеша для подмножества вакансий (например, название профессии)
+
+        Returns:
+            numpy.ndarray: Ценность каждого навыка словаря; у известных навыков 0
+        """
+        import numpy as np
+
+        block = self._block(key, vacancy_rows)
+        scores = np.zeros(self.skill_count, dtype=np.float32)
+        scores[block[0]] = self._block_scores(block, list(dict.fromkeys(known_columns)), vacancy_weights)
+        return scores
+
+    def next_skills(self, known_columns, vacancy_rows=None, vacancy_weights=None, k=5, candidates=None, key=None):
+        """
+        Последовательность навыков для изучения: на каждом шаге выбирается навык
+        с наибольшим приростом покрытия, после чего он считается изученным
+
+        Args:
+            known_columns (list): Номера навыков, которыми пользователь уже владеет
+            vacancy_rows (numpy.ndarray): Номера учитываемых вакансий (None - все вакансии)
+            vacancy_weights (numpy.ndarray): Веса учитываемых вакансий
+            k (int): Длина последовательности
+            candidates (list): Номера навыков, из которых выбирать (None - из всех)
+            key: Ключ кеша для подмножества вакансий
+
+        Returns:
+            list: [(номер навыка, ценность на момент выбора)]
+        """
+        import numpy as np
+
+        block = self._block(key, vacancy_rows)
+        columns = block[0]
+        known = list(dict.fromkeys(known_columns))
+        allowed = None
+        if candidates is not None:
+            allowed = np.isin(columns, list(candidates))
+
+        sequence = []
+        for _ in range(k):
+            scores = self._block_scores(block, known, vacancy_weights)
+            if allowed is not None:
+                scores[~allowed] = 0
+            if not len(scores):
+                break
+            best = int(np.argmax(scores))
+            if scores[best] <= 0:
+                break
+            sequence.append((int(columns[best]), float(scores[best])))
+            known.append(int(columns[best]))
+        return sequence
+
+    def rank_batch(self, known_lists, vacancy_rows=None, vacancy_weights=None, k=5, key=None):
+        """
+        Лучшие следующие навыки для множества пользователей одним матричным умножением
+
+        Args:
+            known_lists (list): Для каждого пользователя - номера известных ему навыков
+            vacancy_rows (numpy.ndarray): Номера учитываемых вакансий (общие для всех пользователей)
+            vacancy_weights (numpy.ndarray): Веса учитываемых вакансий
+            k (int): Сколько навыков вернуть каждому пользователю
+            key: Ключ кеша для подмножества вакансий
+
+        Returns:
+            list: Для каждого пользователя [(номер навыка, ценность)] по убыванию ценности
+        """
+        import numpy as np
+        from scipy import sparse
+
+        columns, presence, presence_t, conditional_t, sizes = self._block(key, vacancy_rows)
+        if not len(columns):
+            return [[] for _ in known_lists]
+        positions = {column: position for position, column in enumerate(columns.tolist())}
+
+        results = []
+        for chunk_start in range(0, len(known_lists), BATCH_CHUNK):
+            chunk = [list(dict.fromkeys(known)) for known in known_lists[chunk_start:chunk_start + BATCH_CHUNK]]
+            rows = [column for known in chunk for column in known]
+            users = [user for user, known in enumerate(chunk) for _ in known]
+            # Известные навыки во всем словаре (для P) и в пределах блока (для покрытия)
+            known = sparse.csr_matrix(
+                (np.ones(len(rows), dtype=np.float32), (rows, users)), shape=(self.skill_count, len(chunk))
+            )
+            block_pairs = [(positions[column], user) for column, user in zip(rows, users) if column in positions]
+            block_rows = [row for row, _ in block_pairs]
+            block_users = [user for _, user in block_pairs]
+            known_block = sparse.csr_matrix(
+                (np.ones(len(block_pairs), dtype=np.float32), (block_rows, block_users)),
+                shape=(len(columns), len(chunk))
+            )
+
+            missing = sizes[:, None] - (presence @ known_block).toarray()
+            weights = np.divide(1.0, missing, out=np.zeros_like(missing), where=missing > 0)
+            if vacancy_weights is not None:
+                weights *= vacancy_weights[:, None]
+            scores = np.asarray(presence_t @ weights)
+
+            known_counts = np.array([len(known_columns) for known_columns in chunk], dtype=np.float32)
+            affinity = (conditional_t @ known).toarray()
+            scores *= 1 + np.divide(affinity, known_counts, out=np.zeros_like(affinity), where=known_counts > 0)
+            scores[block_rows, block_users] = 0
+
+            top_count = min(k, len(columns))
+            top = np.argpartition(-scores, top_count - 1, axis=0)[:top_count]
+            for user in range(len(chunk)):
+                order = top[:, user]
+                order = order[np.argsort(-scores[order, user], kind='stable')]
+                results.append([(int(columns[position]), float(scores[position, user]))
+                                for position in order if scores[position, user] > 0])
+        return results
@@ -0,0 +1,231 @@
+"""
+Извлечение навыков из текста вакансии.
+
+Паттерны компилируются один раз на уровне класса. Текст просматривается одним
+проходом общего регулярного выражения-триггера (альтернация литералов всех
+паттернов), после чего каждый паттерн проверяется только в найденных позициях.
+Результат совпадает с последовательным re.finditer по каждому паттерну:
+- паттерн, начинающийся с литерала ("знание", "опыт", "•"), может совпасть только
+  там, где начинается литерал, поэтому достаточно вызвать match в этих позициях,
+  соблюдая непересечение совпадений, как это делает finditer;
+- паттерн с литералом в конце ("... обследовани...") не пересекает разделители
+  [;,.], поэтому его достаточно искать в отрезках между разделителями, содержащих литерал;
+- контекст медицинского термина ([^.;:,]{0,50}термин[^.;:,]{0,100}) вычисляется
+  по позициям термина и разделителей без повторного сканирования текста.
+"""
+import bisect
+import re
+
+
+def _build_trigger(literals):
+    """Общий триггер: позиции начала любого из литералов (включая пересекающиеся) за один проход"""
+    alternatives = sorted(set(literals), key=len, reverse=True)
+    return re.compile('(?=(' + '|'.join(re.escape(literal) for literal in alternatives) + '))', re.IGNORECASE)
+
+
+class SkillExtractor:
+    """Извлекает навыки из текста вакансии по набору паттернов"""
+
+    # Паттерны вида "литерал + продолжение": (литерал, паттерн)
+    PREFIX_PATTERNS = [
+        # Стандартные паттерны
+        ('знание', r'знание\s+([^;,.]+)'),
+        ('опыт', r'опыт\s+работы\s+с\s+([^;,.]+)'),
+        ('опыт', r'опыт\s+([^;,.]+)'),
+        ('навыки', r'навыки\s+([^;,.]+)'),
+        ('умение', r'умение\s+([^;,.]+)'),
+        ('владение', r'владение\s+([^;,.]+)'),
+
+        # Паттерны для медицинских специальностей
+        ('диагностика', r'диагностика\s+([^;,.]+)'),
+        ('лечение', r'лечение\s+([^;,.]+)'),
+        ('опыт', r'опыт\s+проведения\s+([^;,.]+)'),
+        ('методы', r'методы\s+([^;,.]+)'),
+        ('работа', r'работа\s+с\s+([^;,.]+аппарат[^;,.]+)'),
+        ('работа', r'работа\s+с\s+([^;,.]+оборудован[^;,.]+)'),
+        ('профилактика', r'профилактика\s+([^;,.]+)'),
+
+        # Паттерны для списков навыков
+        ('•', r'•\s+([^;•]+)'),
+        ('‣', r'‣\s+([^;‣]+)'),
+        ('-', r'-\s+([^;-]+)'),
+        ('◦', r'◦\s+([^;◦]+)'),
+        ('✓', r'✓\s+([^;✓]+)'),
+    ]
+
+    # Паттерны вида "фраза + литерал": совпадение не выходит за разделители [;,.]
+    SUFFIX_PATTERNS = [
+        ('обследовани', r'([^;,.]+)\s+обследовани[^;,.]+'),
+        ('манипуляци', r'([^;,.]+)\s+манипуляци[^;,.]+'),
+        ('терапи', r'([^;,.]+)\s+терапи[^;,.]+'),
+        ('хирурги', r'([^;,.]+)\s+хирурги[^;,.]+'),
+    ]
+
+    # Медицинские термины и процедуры, которые ищутся в контексте фразы
+    MEDICAL_TERMS = [
+        'диагностика', 'терапия', 'хирургия', 'манипуляция',
+        'анализ', 'исследование', 'протокол', 'стандарт',
+        'узи', 'кт', 'мрт', 'экг', 'рентген',
+        'эндоскопия', 'лапароскопия', 'биопсия',
+        'реабилитация', 'профилактика', 'консультирование',
+        'операция', 'лечение', 'обследование'
+    ]
+
+    # Длина контекста медицинского термина слева и справа
+    MEDICAL_CONTEXT_BEFORE = 50
+    MEDICAL_CONTEXT_AFTER = 100
+
+    _prefix_compiled = [(literal, re.compile(pattern, re.IGNORECASE)) for literal, pattern in PREFIX_PATTERNS]
+    _suffix_compiled = [(literal, re.compile(pattern, re.IGNORECASE)) for literal, pattern in SUFFIX_PATTERNS]
+
+    _skill_delimiters = re.compile(r'[;,.]')
+    _medical_delimiters = re.compile(r'[.;:,]')
+    _list_marker = re.compile(r'^\s*[-•‣◦✓]\s*')
+    _has_letters = re.compile(r'[а-яА-Яa-zA-Z]')
+
+    _skill_trigger = _build_trigger([literal for literal, _ in PREFIX_PATTERNS + SUFFIX_PATTERNS])
+    _medical_trigger = _build_trigger(MEDICAL_TERMS)
+
+    def extract(self, all_text, list_items=(), full_text='', key_skills=()):
+        """
+        Извлекает навыки из текста вакансии
+
+        Args:
+            all_text (str): Блоки требований и описание вакансии
+            list_items (list): Тексты пунктов списков
+            full_text (str): Полный текст страницы (для поиска медицинских терминов)
+            key_skills (list): Навыки, указанные работодателем явно
+
+        Returns:
+            list: Отсортированный список уникальных навыков
+        """
+        skills = self.match_patterns(all_text)
+
+        # Пункты HTML списков с навыками
+        for item_text in list_items:
+            item_text = item_text.strip()
+            # Проверяем длину и осмысленность текста
+            if 3 < len(item_text) < 100:
+                skills.append(item_text)
+
+        # Фразы с медицинскими терминами во всем тексте страницы
+        skills.extend(self.medical_contexts(full_text))
+
+        # Нормализуем и чистим список навыков
+        normalized_skills = set()
+        for skill in skills:
+            # Очищаем от мусора
+            skill = self._list_marker.sub('', skill, count=1)
+            skill = skill.strip(',.;: ')
+
+            # Проверяем минимальную длину и наличие осмысленных символов
+            if len(skill) > 3 and self._has_letters.search(skill):
+                normalized_skills.add(skill)
+
+        # Навыки, указанные работодателем, добавляем без фильтра по длине (SQL, Git, 1С)
+        normalized_skills.update(skill.strip() for skill in key_skills if skill and skill.strip())
+
+        return sorted(normalized_skills)
+
+    def _literal_positions(self, trigger, text):
+        """Возвращает {литерал в нижнем регистре: список позиций} за один проход триггера"""
+        positions = {}
+        for match in trigger.finditer(text):
+            positions.setdefault(match.group(1).lower(), []).append(match.start())
+        return positions
+
+    def match_patterns(self, text):
+        """Навыки, найденные паттернами (та же группа 1, что и у re.finditer по каждому паттерну)"""
+        skills = []
+        if not text:
+            return skills
+
+        positions = self._literal_positions(self._skill_trigger, text)
+        if not positions:
+            return skills
+
+        for literal, pattern in self._prefix_compiled:
+            cursor = 0
+            for position in positions.get(literal, ()):
+                if position < cursor:
+                    continue
+                match = pattern.match(text, position)
+                if match:
+                    skill = match.group(1).strip()
+                    # Проверяем длину навыка (слишком короткие или длинные исключаем)
+                    if 3 < len(skill) < 100:
+                        skills.append(skill)
+                    cursor = match.end()
+
+        delimiters = None
+        for literal, pattern in self._suffix_compiled:
+            literal_positions = positions.get(literal)
+            if not literal_positions:
+                continue
+            if delimiters is None:
+                delimiters = [match.start() for match in self._skill_delimiters.finditer(text)]
+
+            last_segment = None
+            for position in literal_positions:
+                index = bisect.bisect_left(delimiters, position)
+                segment = (delimiters[index - 1] + 1 if index else 0,
+                           delimiters[index] if index < len(delimiters) else len(text))
+                if segment == last_segment:
+                    continue
+                last_segment = segment
+                for match in pattern.finditer(text, *segment):
+                    skill = match.group(1).strip()
+                    if 3 < len(skill) < 100:
+                        skills.append(skill)
+
+        return skills
+
+    def medical_contexts(self, text):
+        """Фразы вокруг медицинских терминов (как re.finditer по [^.;:,]{0,50}термин[^.;:,]{0,100})"""
+        contexts = []
+        if not text:
+            return contexts
+
+        positions = self._literal_positions(self._medical_trigger, text)
+        if not positions:
+            return contexts
+
+        delimiters = [match.start() for match in self._medical_delimiters.finditer(text)]
+        text_length = len(text)
+
+        for term in self.MEDICAL_TERMS:
+            occurrences = positions.get(term)
+            if not occurrences:
+                continue
+            term_length = len(term)
+            cursor = 0
+            index = 0
+            while True:
+                # Первое вхождение термина, не пересекающееся с предыдущим совпадением
+                index = bisect.bisect_left(occurrences, cursor, index)
+                if index == len(occurrences):
+                    break
+                first = occurrences[index]
+
+                # Самое левое начало совпадения: не дальше 50 символов и не раньше разделителя
+                delimiter_index = bisect.bisect_left(delimiters, first)
+                previous_delimiter = delimiters[delimiter_index - 1] if delimiter_index else -1
+                next_delimiter = delimiters[delimiter_index] if delimiter_index < len(delimiters) else text_length
+                start = max(cursor, first - self.MEDICAL_CONTEXT_BEFORE, previous_delimiter + 1)
+
+                # Жадный квантификатор выбирает последнее достижимое вхождение термина
+                reachable = min(start + self.MEDICAL_CONTEXT_BEFORE, next_delimiter - 1)
+                last = occurrences[bisect.bisect_right(occurrences, reachable) - 1]
+                end = min(last + term_length + self.MEDICAL_CONTEXT_AFTER, next_delimiter)
+
+                context = text[start:end].strip()
+                # Проверяем длину контекста
+                if 10 < len(context) < 150:
+                    contexts.append(context)
+                cursor = end
+
+        return contexts
+
+
+# Общий экземпляр: состояние хранится только в атрибутах класса
+skill_extractor = SkillExtractor()
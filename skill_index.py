@@ -0,0 +1,445 @@
+"""
+TF-IDF индекс навыков по корпусу вакансий.
+
+Каждая вакансия из хранилища - документ, ее навыки - термы. TfidfVectorizer
+обучается на списках навыков, матрица вакансий хранится в CSR, а матрица
+навыков (skill_vectors) - это транспонированная матрица вакансий с
+нормированными строками, поэтому близость навыков считается одним
+умножением разреженной матрицы на вектор.
+
+Профиль профессии - средний TF-IDF вектор ее вакансий. Для профессии, которой
+нет в хранилище, профиль собирается по похожим названиям вакансий (символьные n-граммы).
+Одинаковые названия объединяются заранее, поэтому запрос сравнивается только
+с уникальными названиями.
+
+Вместе с индексом строятся матрицы совместной встречаемости навыков
+(см. skill_cooccurrence.py) для выбора следующего навыка для изучения.
+
+Построение индекса (по хранилищу вакансий, см. vacancy_store.py):
+    python skill_index.py
+    python skill_index.py --model-path model/roadmap_model
+"""
+import logging
+import re
+import time
+
+from skill_cooccurrence import SkillCooccurrence
+
+# Сколько похожих названий вакансий учитывается для неизвестной профессии
+NAME_NEIGHBORS = 20
+# Минимальная близость названия вакансии и профессии
+NAME_MIN_SIMILARITY = 0.5
+# Ограничение словаря навыков
+MAX_SKILLS = 50000
+# Навык в свободном тексте ищется среди фраз до такого числа слов
+MAX_SKILL_WORDS = 4
+
+_WORD_SEPARATORS = re.compile(r"[^\w+#./-]+")
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_skill(skill):
+    """Ключ навыка в словаре: нижний регистр, ё -> е, без лишних пробелов"""
+    return ' '.join(skill.lower().replace('ё', 'е').split())
+
+
+def skill_tokens(skills):
+    """Анализатор TfidfVectorizer: документ уже является списком навыков"""
+    return [key for key in (normalize_skill(skill) for skill in skills) if key]
+
+
+# Параметры TfidfVectorizer для названий вакансий
+NAME_VECTORIZER_PARAMS = {'analyzer': 'char_wb', 'ngram_range': (2, 4), 'preprocessor': normalize_skill}
+
+
+def _vocabulary_keys(vectorizer):
+    """Термы словаря обученного TfidfVectorizer в порядке столбцов"""
+    keys = [None] * len(vectorizer.vocabulary_)
+    for key, column in vectorizer.vocabulary_.items():
+        keys[column] = key
+    return keys
+
+
+def _restore_vectorizer(vocabulary, idf, **params):
+    """Обученный TfidfVectorizer по сохраненному словарю и IDF (без повторного обучения)"""
+    import numpy as np
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    vectorizer = TfidfVectorizer(vocabulary=vocabulary, dtype=np.float32, **params)
+    vectorizer.idf_ = np.asarray(idf, dtype=np.float64)
+    return vectorizer
+
+
+def _top_k(scores, k, exclude=None):
+    """Индексы k наибольших положительных значений по убыванию (argpartition вместо полной сортировки)"""
+    import numpy as np
+
+    if exclude is not None:
+        scores[exclude] = 0
+    k = min(k, int(np.count_nonzero(scores > 0)))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    top = np.argpartition(-scores, k - 1)[:k]
+    # При равных значениях порядок по индексу, чтобы результат не зависел от argpartition
+    return top[np.lexsort((top, -scores[top]))]
+
+
+class SkillIndex:
+    """TF-IDF индекс навыков с запросами "профессия -> навыки" и "навык -> связанные навыки" """
+
+    def __init__(self, skill_keys, idf, skill_names, skill_vectors, vacancy_matrix,
+                 professions, profession_profiles, name_grams, name_idf, name_matrix, name_profiles,
+                 profession_vacancy_rows, vacancy_name_rows, cooccurrence, built_at=None):
+        # Ключи навыков (normalize_skill) и их IDF в порядке столбцов словаря
+        self.skill_keys = skill_keys
+        self.idf = idf
+        # Отображаемое название навыка для каждого столбца словаря
+        self.skill_names = skill_names
+        # CSR (навыки x вакансии), строки нормированы по L2
+        self.skill_vectors = skill_vectors
+        # CSR (вакансии x навыки), TF-IDF строки вакансий
+        self.vacancy_matrix = vacancy_matrix
+        self.professions = professions
+        # CSR (профессии x навыки), средние TF-IDF векторы вакансий профессии
+        self.profession_profiles = profession_profiles
+        # Символьные n-граммы названий вакансий и их IDF
+        self.name_grams = name_grams
+        self.name_idf = name_idf
+        # CSR (уникальные названия вакансий x n-граммы) и (уникальные названия x навыки)
+        self.name_matrix = name_matrix
+        self.name_profiles = name_profiles
+        # Номера вакансий каждой профессии и номер названия каждой вакансии
+        self.profession_vacancy_rows = profession_vacancy_rows
+        self.vacancy_name_rows = vacancy_name_rows
+        self.cooccurrence = cooccurrence
+        self.built_at = built_at or time.time()
+
+        self.vocabulary = {key: column for column, key in enumerate(skill_keys)}
+        self._name_vocabulary = {gram: column for column, gram in enumerate(name_grams)}
+        self._profession_rows = {name: row for row, name in enumerate(professions)}
+        # TfidfVectorizer восстанавливаются из словаря и IDF при первом обращении
+        self._vectorizer = None
+        self._name_vectorizer = None
+
+    @property
+    def vectorizer(self):
+        """TfidfVectorizer по спискам навыков вакансий"""
+        if self._vectorizer is None:
+            self._vectorizer = _restore_vectorizer(self.vocabulary, self.idf, analyzer=skill_tokens)
+        return self._vectorizer
+
+    @property
+    def name_vectorizer(self):
+        """TfidfVectorizer по символьным n-граммам названий вакансий"""
+        if self._name_vectorizer is None:
+            self._name_vectorizer = _restore_vectorizer(self._name_vocabulary, self.name_idf, **NAME_VECTORIZER_PARAMS)
+        return self._name_vectorizer
+
+    def to_artifact(self):
+        """
+        Массивы, строки и метаданные индекса для записи в каталог модели (см. model_artifact.py)
+
+        Returns:
+            tuple: ({имя: массив}, {имя: список строк}, метаданные)
+        """
+        import numpy as np
+
+        lengths = [len(rows) for rows in self.profession_vacancy_rows]
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        flat_rows = (np.concatenate(self.profession_vacancy_rows) if lengths
+                     else np.empty(0, dtype=np.int32)).astype(np.int32)
+
+        arrays = {
+            'skill_idf': self.idf,
+            'skill_vectors': self.skill_vectors,
+            'vacancy_matrix': self.vacancy_matrix,
+            'profession_profiles': self.profession_profiles,
+            'profession_vacancy_offsets': offsets,
+            'profession_vacancy_rows': flat_rows,
+            'name_idf': self.name_idf,
+            'name_matrix': self.name_matrix,
+            'name_profiles': self.name_profiles,
+            'vacancy_name_rows': self.vacancy_name_rows,
+        }
+        arrays.update({f"cooccurrence_{name}": array for name, array in self.cooccurrence.to_arrays().items()})
+        strings = {
+            'skill_keys': list(self.skill_keys),
+            'skill_names': list(self.skill_names),
+            'professions': list(self.professions),
+            'name_grams': list(self.name_grams),
+        }
+        return arrays, strings, {'built_at': self.built_at}
+
+    @classmethod
+    def from_artifact(cls, arrays, strings, metadata):
+        """Индекс по массивам из каталога модели (массивы не копируются)"""
+        offsets = arrays['profession_vacancy_offsets']
+        flat_rows = arrays['profession_vacancy_rows']
+        profession_vacancy_rows = [flat_rows[offsets[row]:offsets[row + 1]] for row in range(len(offsets) - 1)]
+        prefix = 'cooccurrence_'
+        cooccurrence = SkillCooccurrence.from_arrays(
+            {name[len(prefix):]: array for name, array in arrays.items() if name.startswith(prefix)}
+        )
+        return cls(strings['skill_keys'], arrays['skill_idf'], strings['skill_names'], arrays['skill_vectors'],
+                   arrays['vacancy_matrix'], strings['professions'], arrays['profession_profiles'],
+                   strings['name_grams'], arrays['name_idf'], arrays['name_matrix'], arrays['name_profiles'],
+                   profession_vacancy_rows, arrays['vacancy_name_rows'], cooccurrence, metadata.get('built_at'))
+
+    @property
+    def skill_count(self):
+        return len(self.skill_names)
+
+    @property
+    def vacancy_count(self):
+        return self.vacancy_matrix.shape[0]
+
+    @classmethod
+    def build(cls, vacancies, profession_links):
+        """
+        Обучает индекс на корпусе вакансий
+
+        Args:
+            vacancies (list): Вакансии с полями id, name и skills (см. VacancyStore.vacancies)
+            profession_links (dict): {каноническая профессия: список id вакансий}
+
+        Returns:
+            SkillIndex: Индекс или None, если в вакансиях нет навыков
+        """
+        import numpy as np
+        from collections import Counter
+        from scipy import sparse
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.preprocessing import normalize
+
+        vacancies = [vacancy for vacancy in vacancies if skill_tokens(vacancy.get('skills') or [])]
+        if not vacancies:
+            return None
+
+        vectorizer = TfidfVectorizer(analyzer=skill_tokens, max_features=MAX_SKILLS, dtype=np.float32)
+        vacancy_matrix = vectorizer.fit_transform([vacancy['skills'] for vacancy in vacancies]).tocsr()
+        skill_vectors = normalize(vacancy_matrix.T.tocsr(), norm='l2', copy=False)
+
+        # Отображаемое название - самое частое написание навыка в вакансиях
+        spellings = {}
+        for vacancy in vacancies:
+            for skill in vacancy['skills']:
+                spellings.setdefault(normalize_skill(skill), Counter())[skill.strip()] += 1
+        skill_names = [min(spellings[key].items(), key=lambda item: (-item[1], item[0]))[0]
+                       for key in _vocabulary_keys(vectorizer)]
+
+        rows = {str(vacancy['id']): row for row, vacancy in enumerate(vacancies)}
+        professions = []
+        profile_rows = []
+        profession_vacancy_rows = []
+        for profession in sorted(profession_links):
+            vacancy_rows = sorted({rows[str(vacancy_id)] for vacancy_id in profession_links[profession]
+                                   if str(vacancy_id) in rows})
+            if not vacancy_rows:
+                continue
+            professions.append(profession)
+            profession_vacancy_rows.append(np.asarray(vacancy_rows, dtype=np.int32))
+            profile_rows.append(sparse.csr_matrix(vacancy_matrix[vacancy_rows].mean(axis=0)))
+        if profile_rows:
+            profession_profiles = sparse.vstack(profile_rows, format='csr')
+        else:
+            profession_profiles = sparse.csr_matrix((0, len(skill_names)), dtype=np.float32)
+
+        # Профиль названия вакансии - средний TF-IDF вектор вакансий с этим названием
+        names = {}
+        name_rows = [names.setdefault(normalize_skill(vacancy.get('name') or ''), len(names))
+                     for vacancy in vacancies]
+        membership = sparse.csr_matrix(
+            (np.ones(len(vacancies), dtype=np.float32), (name_rows, np.arange(len(vacancies)))),
+            shape=(len(names), len(vacancies))
+        )
+        name_profiles = normalize(membership, norm='l1') @ vacancy_matrix
+
+        name_vectorizer = TfidfVectorizer(dtype=np.float32, **NAME_VECTORIZER_PARAMS)
+        name_matrix = name_vectorizer.fit_transform(list(names)).tocsr()
+
+        index = cls(_vocabulary_keys(vectorizer), vectorizer.idf_.astype(np.float32), skill_names, skill_vectors,
+                    vacancy_matrix, professions, profession_profiles,
+                    _vocabulary_keys(name_vectorizer), name_vectorizer.idf_.astype(np.float32),
+                    name_matrix, name_profiles.tocsr(), profession_vacancy_rows,
+                    np.asarray(name_rows, dtype=np.int32), SkillCooccurrence.build(vacancy_matrix))
+        index._vectorizer = vectorizer
+        index._name_vectorizer = name_vectorizer
+        return index
+
+    def _results(self, scores, top):
+        return [(self.skill_names[column], round(float(scores[column]), 4)) for column in top]
+
+    def profession_skills(self, profession, k=10):
+        """
+        Навыки, наиболее характерные для профессии
+
+        Args:
+            profession (str): Каноническое название профессии
+            k (int): Сколько навыков вернуть
+
+        Returns:
+            list: [(навык, вес)] по убыванию веса
+        """
+        row = self._profession_rows.get(profession)
+        if row is not None:
+            scores = self.profession_profiles[row].toarray().ravel()
+        else:
+            scores = self._profile_by_name(profession)
+            if scores is None:
+                return []
+        return self._results(scores, _top_k(scores, k))
+
+    def _name_similarity(self, profession):
+        """Близость профессии к уникальным названиям вакансий (только NAME_NEIGHBORS лучших) или None"""
+        import numpy as np
+
+        query = self.name_vectorizer.transform([profession])
+        if not query.nnz:
+            return None
+        # n-граммы, которых нет в названиях вакансий, отбрасываются при transform; без поправки
+        # на их долю запрос из незнакомых слов оказывался бы близок к случайным названиям
+        grams = self.name_vectorizer.build_analyzer()(profession)
+        known = sum(1 for gram in grams if gram in self._name_vocabulary)
+        similarity = (self.name_matrix @ query.T).toarray().ravel() * (known / len(grams))
+        similarity[similarity < NAME_MIN_SIMILARITY] = 0
+        neighbors = _top_k(similarity, NAME_NEIGHBORS)
+        if not len(neighbors):
+            return None
+        nearest = np.zeros_like(similarity)
+        nearest[neighbors] = similarity[neighbors]
+        return nearest, neighbors
+
+    def _profile_by_name(self, profession):
+        """Профиль неизвестной профессии: взвешенная сумма профилей похожих названий вакансий"""
+        import numpy as np
+
+        match = self._name_similarity(profession)
+        if match is None:
+            return None
+        similarity, neighbors = match
+        return np.asarray(self.name_profiles[neighbors].T @ similarity[neighbors]).ravel()
+
+    def related_skills(self, skill, k=10):
+        """
+        Навыки, которые чаще всего требуются вместе с данным (косинусная близость столбцов TF-IDF)
+
+        Args:
+            skill (str): Навык
+            k (int): Сколько навыков вернуть
+
+        Returns:
+            list: [(навык, близость)] по убыванию близости; пустой список для неизвестного навыка
+        """
+        column = self.vocabulary.get(normalize_skill(skill))
+        if column is None:
+            return []
+        scores = (self.skill_vectors @ self.skill_vectors[column].T).toarray().ravel()
+        return self._results(scores, _top_k(scores, k, exclude=column))
+
+    def skill_columns(self, skills):
+        """Номера известных индексу навыков из списка (неизвестные пропускаются)"""
+        vocabulary = self.vocabulary
+        columns = (vocabulary.get(normalize_skill(skill)) for skill in skills if skill)
+        return list(dict.fromkeys(column for column in columns if column is not None))
+
+    def skills_in_text(self, text):
+        """
+        Находит в свободном тексте (например, в рассказе пользователя о себе) навыки из словаря индекса
+
+        Returns:
+            list: Номера найденных навыков в порядке появления в тексте
+        """
+        if not text:
+            return []
+        vocabulary = self.vocabulary
+        words = [word.strip('.') for word in _WORD_SEPARATORS.split(normalize_skill(text))]
+        words = [word for word in words if word]
+        found = {}
+        for start in range(len(words)):
+            for length in range(1, min(MAX_SKILL_WORDS, len(words) - start) + 1):
+                column = vocabulary.get(' '.join(words[start:start + length]))
+                if column is not None:
+                    found.setdefault(column, start)
+        return list(found)
+
+    def vacancy_subset(self, profession=None):
+        """
+        Вакансии, по которым оценивается профессия
+
+        Returns:
+            tuple: (номера вакансий, их веса) - вакансии профессии из хранилища с весом 1 или вакансии
+                   с похожими названиями с весом, равным близости названия; (None, None) - все вакансии
+        """
+        import numpy as np
+
+        if profession is None:
+            return None, None
+        row = self._profession_rows.get(profession)
+        if row is not None:
+            return self.profession_vacancy_rows[row], None
+        match = self._name_similarity(profession)
+        if match is None:
+            return None, None
+        similarity = match[0][self.vacancy_name_rows]
+        rows = np.flatnonzero(similarity)
+        return rows, similarity[rows].astype(np.float32)
+
+    def next_skills(self, known_skills, profession=None, k=5, candidates=None):
+        """
+        Навыки, которые стоит изучить следующими, по приросту покрытия вакансий профессии
+
+        Args:
+            known_skills (list): Номера навыков, которыми пользователь уже владеет (см. skills_in_text)
+            profession (str): Каноническое название профессии (None - все вакансии)
+            k (int): Сколько навыков вернуть
+            candidates (list): Названия навыков, из которых выбирать (None - из всех)
+
+        Returns:
+            list: [(навык, ценность)] в порядке изучения
+        """
+        rows, weights = self.vacancy_subset(profession)
+        # Подматрицы кешируются только для профессий из хранилища: их набор вакансий не меняется
+        key = profession if profession in self._profession_rows else None
+        candidate_columns = None if candidates is None else self.skill_columns(candidates)
+        sequence = self.cooccurrence.next_skills(known_skills, rows, weights, k, candidate_columns, key)
+        return [(self.skill_names[column], round(score, 4)) for column, score in sequence]
+
+
+def build_from_store(store):
+    """Строит индекс по всем вакансиям хранилища"""
+    started = time.time()
+    index = SkillIndex.build(store.vacancies(), store.profession_links())
+    if index is None:
+        logger.warning("В хранилище нет вакансий с навыками, индекс навыков не построен")
+    else:
+        logger.info(f"Индекс навыков построен за {time.time() - started:.2f} с: "
+                    f"{index.vacancy_count} вакансий, {index.skill_count} навыков, "
+                    f"{len(index.professions)} профессий")
+    return index
+
+
+def main():
+    import argparse
+    import os
+    from model import JobRoadmapGenerator
+
+    parser = argparse.ArgumentParser(description='Построение TF-IDF индекса навыков по хранилищу вакансий')
+    parser.add_argument('--model-path', default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                             'model', 'roadmap_model'),
+                        help='Каталог модели, в который сохраняется индекс')
+    args = parser.parse_args()
+
+    generator = JobRoadmapGenerator(args.model_path)
+    index = generator.build_skill_index()
+    if index is None:
+        print("В хранилище нет вакансий с навыками. Сначала загрузите вакансии: python vacancy_store.py \"профессия\"")
+        return 1
+    generator.save_model(args.model_path)
+    print(f"Вакансий: {index.vacancy_count}, навыков: {index.skill_count}, профессий: {len(index.professions)}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
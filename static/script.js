@@ -12,6 +12,8 @@ document.addEventListener('DOMContentLoaded', function() {
     const softSkillsList = document.getElementById('soft-skills');
     const learningPlan = document.getElementById('learning-plan');
     const futureInsightsList = document.getElementById('future-insights');
+    const regionTrendsSection = document.getElementById('region-trends-section');
+    const regionTrendsList = document.getElementById('region-trends');
     const personalRecommendations = document.getElementById('personal-recommendations');
 
     generateButton.addEventListener('click', generateRoadmap);
@@ -555,6 +557,19 @@ document.addEventListener('DOMContentLoaded', function() {
                 futureInsightsList.appendChild(li);
                 console.error('Ошибка в формате futureInsights:', data.futureInsights);
             }
+            
+            // Заполняем тренды региона (рост спроса на навыки, вакансии и зарплаты)
+            regionTrendsList.innerHTML = '';
+            if (Array.isArray(data.regionTrends)) {
+                data.regionTrends.forEach(trend => {
+                    if (trend && typeof trend === 'string') {
+                        const li = document.createElement('li');
+                        li.textContent = trend;
+                        regionTrendsList.appendChild(li);
+                    }
+                });
+            }
+            regionTrendsSection.style.display = regionTrendsList.children.length ? '' : 'none';
         } catch (error) {
             console.error('Ошибка при заполнении дорожной карты:', error);
             alert('Произошла ошибка при отображении данных. Пожалуйста, попробуйте еще раз.');
@@ -0,0 +1,190 @@
+"""
+Классификация названий профессий по ключевым словам из data/taxonomy.json.
+
+Каждый классификатор (тип профессии, категория плана обучения, категория
+образовательных ресурсов и т.д.) - упорядоченный список категорий с ключевыми
+словами. Все ключевые слова классификатора собираются в один автомат
+Ахо-Корасик, который находит их вхождения за один проход по тексту.
+Побеждает категория, которая стоит в файле раньше (как в прежних цепочках
+проверок "if keyword in text"); вместе с ней возвращаются найденные
+фрагменты и доля текста, покрытая ключевыми словами категории.
+
+Файл загружается в составе каталога (catalog.py) и перечитывается при изменении.
+"""
+import json
+import os
+from collections import deque, namedtuple
+from functools import lru_cache
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TAXONOMY_PATH = os.environ.get('TAXONOMY_PATH', os.path.join(BASE_DIR, 'data', 'taxonomy.json'))
+
+# Версия формата data/taxonomy.json
+TAXONOMY_VERSION = 1
+
+# Количество запомненных результатов классификации в каждом классификаторе
+CLASSIFY_CACHE_SIZE = 4096
+
+# Вхождение ключевого слова: позиции [start, end) в тексте, слово и его категория
+KeywordMatch = namedtuple('KeywordMatch', ['start', 'end', 'keyword', 'category'])
+
+# Результат классификации: категория (или значение по умолчанию), доля покрытого текста и вхождения
+Classification = namedtuple('Classification', ['category', 'score', 'spans'])
+
+
+class KeywordMatcher:
+    """Автомат Ахо-Корасик: все вхождения набора строк (в том числе перекрывающиеся) за один проход"""
+
+    def __init__(self, keywords, priorities=None):
+        self.keywords = list(keywords)
+        # Приоритет слова (меньше - важнее); по умолчанию - порядок в списке
+        self.priorities = list(priorities) if priorities is not None else list(range(len(self.keywords)))
+        goto = [{}]
+        outputs = [[]]
+        for number, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                following = goto[state].get(char)
+                if following is None:
+                    following = len(goto)
+                    goto[state][char] = following
+                    goto.append({})
+                    outputs.append([])
+                state = following
+            outputs[state].append(number)
+
+        # Переходы по суффиксным ссылкам заранее добавляются в таблицу переходов,
+        # поэтому на каждый символ текста приходится один поиск в словаре
+        delta = [None] * len(goto)
+        delta[0] = dict(goto[0])
+        queue = deque((state, 0) for state in goto[0].values())
+        while queue:
+            state, fail = queue.popleft()
+            outputs[state] = outputs[state] + outputs[fail]
+            delta[state] = dict(delta[fail])
+            delta[state].update(goto[state])
+            for char, following in goto[state].items():
+                queue.append((following, delta[fail].get(char, 0)))
+
+        self._delta = delta
+        self._transitions = [transitions.get for transitions in delta]
+        self._outputs = [tuple(output) for output in outputs]
+        self._lengths = [len(keyword) for keyword in self.keywords]
+        # Наименьший приоритет среди слов, которые заканчиваются в состоянии (None - ни одного)
+        self._best = [min(self.priorities[number] for number in output) if output else None
+                      for output in self._outputs]
+        self._top_priority = min(self.priorities, default=None)
+
+    def find_all(self, text):
+        """
+        Returns:
+            list: (start, end, номер ключевого слова) для каждого вхождения в порядке окончания
+        """
+        delta = self._delta
+        outputs = self._outputs
+        lengths = self._lengths
+        state = 0
+        found = []
+        for position, char in enumerate(text, 1):
+            state = delta[state].get(char, 0)
+            if outputs[state]:
+                for number in outputs[state]:
+                    found.append((position - lengths[number], position, number))
+        return found
+
+    def best(self, text):
+        """Наименьший приоритет среди вхождений слов в текст (None, если вхождений нет)"""
+        transitions = self._transitions
+        best_by_state = self._best
+        top_priority = self._top_priority
+        state = 0
+        best = None
+        for char in text:
+            state = transitions[state](char, 0)
+            priority = best_by_state[state]
+            if priority is not None and (best is None or priority < best):
+                best = priority
+                # Слово с наивысшим приоритетом уже найдено: дальше текст можно не читать
+                if best == top_priority:
+                    break
+        return best
+
+
+class KeywordClassifier:
+    """Упорядоченные категории с ключевыми словами; первая категория в списке имеет наивысший приоритет"""
+
+    def __init__(self, name, categories, default=None):
+        self.name = name
+        self.default = default
+        self.categories = [category['name'] for category in categories]
+        keywords = []
+        priorities = []
+        for priority, category in enumerate(categories):
+            for keyword in category['keywords']:
+                keywords.append(keyword.lower())
+                priorities.append(priority)
+        # Приоритет ключевого слова - номер его категории
+        self.matcher = KeywordMatcher(keywords, priorities)
+        self.classify = lru_cache(maxsize=CLASSIFY_CACHE_SIZE)(self._classify)
+        self.category = lru_cache(maxsize=CLASSIFY_CACHE_SIZE)(self._category)
+
+    def _classify(self, text):
+        text = (text or '').lower()
+        found = self.matcher.find_all(text)
+        if not found:
+            return Classification(self.default, 0.0, ())
+
+        priorities = self.matcher.priorities
+        priority = min(priorities[number] for _, _, number in found)
+        category = self.categories[priority]
+        spans = tuple(KeywordMatch(start, end, self.matcher.keywords[number], category)
+                      for start, end, number in sorted(found)
+                      if priorities[number] == priority)
+
+        covered = 0
+        covered_until = 0
+        for span in spans:
+            if span.end > covered_until:
+                covered += span.end - max(span.start, covered_until)
+                covered_until = span.end
+        return Classification(category, covered / len(text), spans)
+
+    def _category(self, text):
+        """Категория текста или значение по умолчанию, если ключевых слов не найдено"""
+        priority = self.matcher.best((text or '').lower())
+        return self.default if priority is None else self.categories[priority]
+
+
+class Taxonomy:
+    """Классификаторы из файла таксономии"""
+
+    def __init__(self, data):
+        version = data.get('version')
+        if version != TAXONOMY_VERSION:
+            raise ValueError(f"Версия таксономии {version} не поддерживается (ожидается {TAXONOMY_VERSION})")
+        self.classifiers = {
+            name: KeywordClassifier(name, classifier['categories'], classifier.get('default'))
+            for name, classifier in data.get('classifiers', {}).items()
+        }
+
+    @classmethod
+    def load(cls, path=TAXONOMY_PATH):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def __getitem__(self, name):
+        return self.classifiers[name]
+
+    def classify(self, name, text):
+        """Категория, доля покрытого текста и найденные ключевые слова (см. Classification)"""
+        return self.classifiers[name].classify(text)
+
+    def category(self, name, text):
+        return self.classifiers[name].category(text)
+
+
+def get_taxonomy():
+    """Возвращает таксономию из текущего снимка каталога (см. catalog.py, перезагружается при изменении файла)"""
+    from catalog import get_catalog
+
+    return get_catalog().taxonomy
@@ -0,0 +1,123 @@
+"""
+Нормализация текстовых ответов LLM.
+
+Общие для всех обработчиков ответов модели шаги: удаление тегов <think> и
+обрамления ```json, разбиение на абзацы и предложения, удаление маркеров
+списков и кавычек, удаление дубликатов. Регулярные выражения компилируются
+один раз при импорте; каждая функция проходит по тексту один раз, а не
+применяет по несколько re.sub к каждой строке.
+"""
+import re
+
+# Пары <think>...</think> и одиночные теги (если модель не закрыла тег); общий префикс "<"
+# позволяет искать совпадения по первому символу
+THINK_PATTERN = re.compile(r'<(?:think>.*?</think>|/?think>)', re.DOTALL)
+
+# Обрамление блока кода markdown вокруг JSON
+CODE_FENCE_START = '```json'
+CODE_FENCE_END = '```'
+
+# Нумерация и маркеры списка в начале пункта
+LIST_MARKER_PATTERN = re.compile(r'[\d\-\*\.\)\s]*')
+
+# Кавычки, которые снимаются с начала и с конца пункта
+OPENING_QUOTES = '"\'«'
+CLOSING_QUOTES = '"\'»'
+
+# Конец абзаца в сплошном тексте: точка и перевод строки
+SENTENCE_BREAK_PATTERN = re.compile(r'\.\s*\n')
+
+# Разделители тенденций, которые модель вернула одной строкой
+INSIGHT_SEPARATOR_PATTERN = re.compile(r'[.\n]+')
+
+# Общие фразы в начале названия этапа плана обучения
+TOPIC_PREFIX_PATTERN = re.compile(r'^(?:(?:Изучение|Освоение|Практика|Знакомство с)\s+)?(?:(?:и|практика|навыки)\s+)?')
+
+
+def strip_think(text):
+    """Удаляет рассуждения модели в тегах <think>"""
+    return THINK_PATTERN.sub('', text)
+
+
+def strip_code_fence(text):
+    """
+    Удаляет ```json в начале и ``` в конце ответа вместе с пробелами рядом с ними
+
+    Проверяются только края строки: регулярное выражение с \\s*``` в конце
+    пробовало бы совпадение с каждой позиции ответа.
+    """
+    if text.startswith(CODE_FENCE_START):
+        text = text[len(CODE_FENCE_START):].lstrip()
+    # Как и "$" в регулярном выражении, конец допускает один завершающий перевод строки
+    end = len(text) - 1 if text.endswith('\n') else len(text)
+    if text.endswith(CODE_FENCE_END, 0, end):
+        text = text[:end - len(CODE_FENCE_END)].rstrip() + text[end:]
+    return text
+
+
+def clean_item(text):
+    """Пункт без нумерации, маркера списка и обрамляющих кавычек (по одной с каждой стороны)"""
+    text = text.strip()
+    text = text[LIST_MARKER_PATTERN.match(text).end():]
+    if text and text[0] in OPENING_QUOTES:
+        text = text[1:]
+    if text and text[-1] in CLOSING_QUOTES:
+        text = text[:-1]
+    return text
+
+
+def unique_items(items, limit=None):
+    """
+    Очищенные непустые пункты без повторов (в исходном порядке)
+
+    Args:
+        items: Строки
+        limit (int): Не более стольких пунктов
+    """
+    result = {}
+    for item in items:
+        item = clean_item(item)
+        if item:
+            result[item] = None
+            if limit is not None and len(result) >= limit:
+                break
+    return list(result)
+
+
+def split_paragraphs(text):
+    """
+    Абзацы текста: строки абзаца склеиваются через пробел, абзацы разделены пустыми строками
+
+    Если пустых строк нет, текст делится по точке в конце строки, а если и так
+    не делится - возвращается целиком.
+    """
+    text = text.strip()
+    paragraphs = []
+    current = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if line:
+            current.append(line)
+        elif current:
+            paragraphs.append(' '.join(current))
+            current = []
+    if current:
+        paragraphs.append(' '.join(current))
+
+    if len(paragraphs) <= 1 and text:
+        parts = SENTENCE_BREAK_PATTERN.split(text)
+        if len(parts) > 1:
+            return [part.strip() + '.' for part in parts if part.strip()]
+        return [text]
+    return paragraphs
+
+
+def split_insights(text):
+    """Список тенденций из строки (по точкам и переводам строк); без разделителей - весь текст"""
+    insights = [part.strip() for part in INSIGHT_SEPARATOR_PATTERN.split(text)]
+    return [insight for insight in insights if insight] or [text]
+
+
+def learning_topic(title):
+    """Тема для поиска ресурсов: название этапа без "Изучение", "Освоение" и т.п."""
+    return TOPIC_PREFIX_PATTERN.sub('', title, count=1)
@@ -0,0 +1,169 @@
+"""
+Разбор HTML-страницы вакансии HH.ru за один обход дерева.
+
+Каждый текстовый узел посещается один раз и относится к ближайшему блочному
+предку (div, p, li и т.д.). Из получившихся сегментов собираются описание
+вакансии, пункты списков, полный текст страницы и разделы с требованиями,
+поэтому время разбора линейно по размеру страницы.
+"""
+
+# Теги, которые начинают новый текстовый сегмент
+BLOCK_TAGS = frozenset([
+    'div', 'p', 'ul', 'ol', 'li', 'section', 'article', 'header', 'footer',
+    'table', 'tr', 'td', 'th', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'dl', 'dt', 'dd'
+])
+HEADING_TAGS = frozenset(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+
+# Слова, с которых начинается раздел требований
+REQUIREMENT_TRIGGERS = ('требовани', 'требуется', 'необходимые навыки', 'от вас')
+
+# Сегмент не длиннее этого и заканчивающийся двоеточием считается заголовком раздела ("Условия:")
+HEADING_MAX_LENGTH = 60
+
+# Начала разделов, которые завершают раздел требований, даже если текст идет в той же строке
+OTHER_SECTION_PREFIXES = ('условия', 'обязанности', 'мы предлагаем', 'предлагаем', 'задачи', 'о компании')
+
+
+class PageSegment:
+    """Текст, относящийся к одному блочному элементу"""
+
+    __slots__ = ('tag', 'parts', 'in_description')
+
+    def __init__(self, tag, in_description):
+        self.tag = tag
+        self.parts = []
+        self.in_description = in_description
+
+    @property
+    def text(self):
+        return ''.join(self.parts)
+
+
+def segment_page(soup):
+    """
+    Обходит дерево BeautifulSoup один раз и возвращает сегменты страницы
+
+    Args:
+        soup (BeautifulSoup): Разобранная страница вакансии
+
+    Returns:
+        tuple: (список PageSegment, тексты пунктов списков ul > li,
+                текст описания вакансии, полный текст страницы)
+    """
+    from bs4.element import Tag, NavigableString, CData
+
+    # Те же типы строк, что учитывает get_text(): без комментариев, скриптов и стилей
+    text_types = (NavigableString, CData)
+
+    segments = []
+    list_items = []
+    description_parts = []
+    full_parts = []
+    found_description = False
+
+    current_segment = None
+    current_block_id = None
+    # Элемент стека: (узел, (id блока, тег блока), внутри описания, индекс пункта ul > li)
+    root_block = (0, None)
+    stack = [(child, root_block, False, None) for child in reversed(soup.contents)]
+    next_block_id = 1
+
+    while stack:
+        node, block, in_description, list_item = stack.pop()
+
+        if isinstance(node, Tag):
+            name = node.name
+            if name in BLOCK_TAGS:
+                block = (next_block_id, name)
+                next_block_id += 1
+                if (name == 'div' and not found_description
+                        and node.get('data-qa') == 'vacancy-description'):
+                    in_description = found_description = True
+                if name == 'li' and node.parent is not None and node.parent.name == 'ul':
+                    list_item = len(list_items)
+                    list_items.append([])
+            stack.extend((child, block, in_description, list_item) for child in reversed(node.contents))
+            continue
+
+        if type(node) not in text_types:
+            continue
+
+        text = str(node)
+        full_parts.append(text)
+        if in_description:
+            description_parts.append(text)
+        if list_item is not None:
+            list_items[list_item].append(text)
+
+        if block[0] != current_block_id:
+            current_block_id = block[0]
+            current_segment = PageSegment(block[1], in_description)
+            segments.append(current_segment)
+        current_segment.parts.append(text)
+
+    return (segments, [''.join(parts) for parts in list_items],
+            ''.join(description_parts), ''.join(full_parts))
+
+
+def _is_heading(segment, text, lower):
+    """Заголовок другого раздела: тег h*, короткая строка с двоеточием или известное начало раздела"""
+    return (segment.tag in HEADING_TAGS
+            or (len(text) <= HEADING_MAX_LENGTH and text.endswith(':'))
+            or lower.startswith(OTHER_SECTION_PREFIXES))
+
+
+def requirement_sections(segments):
+    """
+    Собирает разделы требований: сегмент со словом-триггером и следующие за ним
+    сегменты до ближайшего заголовка другого раздела
+
+    Args:
+        segments (list): Сегменты страницы из segment_page
+
+    Returns:
+        list: Тексты сегментов разделов требований без повторов
+    """
+    sections = []
+    in_section = False
+    previous = None
+    for segment in segments:
+        text = segment.text.strip()
+        if not text:
+            continue
+        # Раздел не продолжается через границу описания вакансии
+        if previous is not None and previous.in_description != segment.in_description:
+            in_section = False
+        previous = segment
+
+        lower = text.lower()
+        if any(trigger in lower for trigger in REQUIREMENT_TRIGGERS):
+            in_section = True
+            sections.append(text)
+        elif in_section and _is_heading(segment, text, lower):
+            in_section = False
+        elif in_section:
+            sections.append(text)
+    return sections
+
+
+def page_texts(html):
+    """
+    Готовит тексты HTML-страницы вакансии для поиска навыков
+
+    Args:
+        html (str): HTML страницы вакансии
+
+    Returns:
+        tuple: (разделы требований и описание, тексты пунктов списков, полный текст страницы)
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    segments, list_items, vacancy_description, full_text = segment_page(soup)
+
+    # Если раздел требований не найден, используем все описание
+    requirements_block = "\n".join(requirement_sections(segments))
+    if not requirements_block:
+        requirements_block = vacancy_description
+
+    return requirements_block + "\n" + vacancy_description, list_items, full_text
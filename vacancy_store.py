@@ -0,0 +1,345 @@
+"""
+Локальное хранилище вакансий HH.ru (SQLite).
+
+Вакансия хранится по id вместе с исходным JSON из API, извлеченными навыками,
+зарплатой и временем загрузки. Связь "профессия -> вакансии" запоминается при
+поиске, поэтому данные о профессии доступны без обращения к сети. Повторная
+загрузка выполняется только для новых вакансий, вакансий, у которых изменилась
+дата публикации, и записей старше VACANCY_MAX_AGE.
+
+Обновление из командной строки:
+    python vacancy_store.py "Python разработчик" Москва --limit 100
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STORE_PATH = os.environ.get('VACANCY_STORE_PATH', os.path.join(BASE_DIR, 'model', 'cache', 'vacancies.sqlite3'))
+
+# Через сколько секунд сохраненная вакансия считается устаревшей (по умолчанию неделя)
+VACANCY_MAX_AGE = int(os.environ.get('VACANCY_MAX_AGE', str(7 * 24 * 3600)))
+
+# Сколько самых частых навыков профессии попадает в представление profession_data
+PROFESSION_TOP_SKILLS = 30
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS vacancies (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL DEFAULT '',
+    area_id TEXT NOT NULL DEFAULT '',
+    area_name TEXT NOT NULL DEFAULT '',
+    published_at TEXT,
+    experience TEXT,
+    salary_from REAL,
+    salary_to REAL,
+    salary_currency TEXT,
+    salary_gross INTEGER,
+    skills TEXT NOT NULL,
+    raw_json TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS profession_vacancies (
+    profession TEXT NOT NULL,
+    area_id TEXT NOT NULL DEFAULT '',
+    vacancy_id TEXT NOT NULL,
+    seen_at REAL NOT NULL,
+    PRIMARY KEY (profession, area_id, vacancy_id)
+);
+CREATE INDEX IF NOT EXISTS idx_profession_vacancies_vacancy ON profession_vacancies (vacancy_id);
+"""
+
+logger = logging.getLogger(__name__)
+
+
+def _most_common(counts, limit):
+    """Самые частые элементы; при равной частоте - по алфавиту, чтобы порядок не зависел от вставки"""
+    return sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+
+class VacancyStore:
+    """Хранилище вакансий и связей профессия -> вакансии"""
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            if path != ':memory:':
+                self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.executescript(SCHEMA)
+        # Счетчик изменений для сброса материализованного представления
+        self._writes = 0
+        self._view = None
+        self._view_version = None
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def _version(self):
+        """Версия данных: меняется при записи этим и другими процессами"""
+        data_version = self._connection.execute('PRAGMA data_version').fetchone()[0]
+        return self._writes, data_version
+
+    def version(self):
+        """Версия данных хранилища: меняется после любой записи"""
+        with self._lock:
+            return self._version()
+
+    def stale_ids(self, items, max_age=VACANCY_MAX_AGE):
+        """
+        Возвращает id вакансий из результатов поиска, которые нужно загрузить:
+        новые, опубликованные заново (изменилась published_at) или устаревшие
+
+        Args:
+            items (list): Вакансии из поиска API (нужны id и published_at)
+            max_age (int): Допустимый возраст сохраненной вакансии в секундах
+
+        Returns:
+            list: Идентификаторы вакансий для загрузки
+        """
+        ids = [str(item['id']) for item in items if item.get('id')]
+        if not ids:
+            return []
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT id, published_at, fetched_at FROM vacancies WHERE id IN ({','.join('?' * len(ids))})", ids
+            ).fetchall()
+        stored = {row['id']: row for row in rows}
+        deadline = time.time() - max_age
+
+        stale = []
+        for item in items:
+            vacancy_id = str(item.get('id') or '')
+            if not vacancy_id:
+                continue
+            row = stored.get(vacancy_id)
+            if (row is None or row['fetched_at'] < deadline
+                    or (item.get('published_at') and item['published_at'] != row['published_at'])):
+                stale.append(vacancy_id)
+        return stale
+
+    def upsert_vacancies(self, vacancies, skills_by_id):
+        """
+        Сохраняет вакансии (JSON из API) и извлеченные из них навыки
+
+        Args:
+            vacancies (dict): {id вакансии: JSON вакансии}
+            skills_by_id (dict): {id вакансии: список навыков}
+        """
+        now = time.time()
+        rows = []
+        for vacancy_id, vacancy in vacancies.items():
+            salary = vacancy.get('salary') or {}
+            area = vacancy.get('area') or {}
+            rows.append((
+                str(vacancy_id),
+                vacancy.get('name', ''),
+                str(area.get('id', '')),
+                area.get('name', ''),
+                vacancy.get('published_at'),
+                (vacancy.get('experience') or {}).get('id'),
+                salary.get('from'),
+                salary.get('to'),
+                salary.get('currency'),
+                None if salary.get('gross') is None else int(bool(salary.get('gross'))),
+                json.dumps(skills_by_id.get(vacancy_id, []), ensure_ascii=False),
+                json.dumps(vacancy, ensure_ascii=False),
+                now
+            ))
+        if not rows:
+            return
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO vacancies (id, name, area_id, area_name, published_at, experience, "
+                "salary_from, salary_to, salary_currency, salary_gross, skills, raw_json, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            self._writes += 1
+
+    def link_profession(self, profession, area_id, vacancy_ids):
+        """Запоминает, что вакансии найдены по запросу профессии в регионе"""
+        now = time.time()
+        rows = [(profession, str(area_id or ''), str(vacancy_id), now) for vacancy_id in vacancy_ids]
+        if not rows:
+            return
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO profession_vacancies (profession, area_id, vacancy_id, seen_at) "
+                "VALUES (?, ?, ?, ?)", rows
+            )
+            self._writes += 1
+
+    def vacancy_skills(self, profession=None, area_id=None):
+        """
+        Возвращает списки навыков сохраненных вакансий
+
+        Args:
+            profession (str): Каноническое название профессии (None - все вакансии)
+            area_id (str): Регион поиска (None - все регионы)
+
+        Returns:
+            dict: {id вакансии: список навыков}
+        """
+        query = "SELECT v.id, v.skills FROM vacancies v"
+        params = []
+        if profession is not None:
+            query += " JOIN profession_vacancies pv ON pv.vacancy_id = v.id WHERE pv.profession = ?"
+            params.append(profession)
+            if area_id is not None:
+                query += " AND pv.area_id = ?"
+                params.append(str(area_id))
+        with self._lock:
+            rows = self._connection.execute(query, params).fetchall()
+        return {row['id']: json.loads(row['skills']) for row in rows}
+
+    def profession_skills(self, profession, limit=20):
+        """Самые частые навыки профессии по сохраненным вакансиям: [(навык, число вакансий)]"""
+        counts = Counter()
+        for skills in self.vacancy_skills(profession).values():
+            counts.update(set(skills))
+        return _most_common(counts, limit)
+
+    def vacancies(self, profession=None):
+        """Возвращает сохраненные вакансии без исходного JSON (для статистики)"""
+        query = ("SELECT id, name, area_id, area_name, published_at, experience, salary_from, salary_to, "
+                 "salary_currency, salary_gross, skills, fetched_at FROM vacancies")
+        params = []
+        if profession is not None:
+            query += " WHERE id IN (SELECT vacancy_id FROM profession_vacancies WHERE profession = ?)"
+            params.append(profession)
+        with self._lock:
+            rows = self._connection.execute(query, params).fetchall()
+        result = []
+        for row in rows:
+            vacancy = dict(row)
+            vacancy['skills'] = json.loads(vacancy['skills'])
+            result.append(vacancy)
+        return result
+
+    def profession_links(self):
+        """Возвращает {профессия: список id вакансий} по всем регионам"""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT DISTINCT profession, vacancy_id FROM profession_vacancies ORDER BY profession, vacancy_id"
+            ).fetchall()
+        links = {}
+        for row in rows:
+            links.setdefault(row['profession'], []).append(row['vacancy_id'])
+        return links
+
+    def changed_professions(self, since):
+        """Профессии, у которых после момента since появились новые связи или обновились вакансии"""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT DISTINCT pv.profession FROM profession_vacancies pv JOIN vacancies v ON v.id = pv.vacancy_id "
+                "WHERE pv.seen_at > ? OR v.fetched_at > ?", (since, since)
+            ).fetchall()
+        return [row['profession'] for row in rows]
+
+    def salary_rows(self, professions):
+        """
+        Зарплаты вакансий профессий в разрезе региона поиска и опыта
+
+        Returns:
+            list: Строки (profession, area_id, id вакансии, experience, salary_from, salary_to,
+                  salary_currency, salary_gross)
+                  только для вакансий с указанной зарплатой
+        """
+        professions = list(professions)
+        if not professions:
+            return []
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT pv.profession, pv.area_id, v.id, v.experience, v.salary_from, v.salary_to, v.salary_currency, "
+                "v.salary_gross FROM profession_vacancies pv JOIN vacancies v ON v.id = pv.vacancy_id "
+                f"WHERE pv.profession IN ({','.join('?' * len(professions))}) "
+                "AND (v.salary_from IS NOT NULL OR v.salary_to IS NOT NULL)", professions
+            ).fetchall()
+        return [tuple(row) for row in rows]
+
+    def raw_vacancy(self, vacancy_id):
+        """Возвращает исходный JSON вакансии или None"""
+        with self._lock:
+            row = self._connection.execute("SELECT raw_json FROM vacancies WHERE id = ?", (str(vacancy_id),)).fetchone()
+        return json.loads(row['raw_json']) if row else None
+
+    def profession_view(self):
+        """
+        Материализованное представление "профессия -> сводка по вакансиям"
+
+        Пересчитывается только после изменения данных в хранилище.
+
+        Returns:
+            dict: {профессия: {'vacancies': число вакансий, 'skills': [[навык, число]], 'updated_at': время}}
+        """
+        with self._lock:
+            version = self._version()
+            if self._view is not None and version == self._view_version:
+                return self._view
+            rows = self._connection.execute(
+                "SELECT pv.profession, v.id, v.skills, v.fetched_at FROM profession_vacancies pv "
+                "JOIN vacancies v ON v.id = pv.vacancy_id"
+            ).fetchall()
+
+        view = {}
+        seen = set()
+        for row in rows:
+            # Вакансия, найденная в нескольких регионах, учитывается один раз
+            if (row['profession'], row['id']) in seen:
+                continue
+            seen.add((row['profession'], row['id']))
+            entry = view.setdefault(row['profession'], {'vacancies': 0, 'skills': Counter(), 'updated_at': 0})
+            entry['vacancies'] += 1
+            entry['skills'].update(set(json.loads(row['skills'])))
+            entry['updated_at'] = max(entry['updated_at'], row['fetched_at'])
+        for entry in view.values():
+            entry['skills'] = [list(item) for item in _most_common(entry['skills'], PROFESSION_TOP_SKILLS)]
+
+        with self._lock:
+            self._view = view
+            self._view_version = version
+        return view
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_vacancy_store():
+    """Возвращает общее хранилище вакансий, открывая его при первом обращении"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = VacancyStore()
+    return _store
+
+
+def main():
+    import argparse
+    from model import JobRoadmapGenerator
+
+    parser = argparse.ArgumentParser(description='Обновление хранилища вакансий HH.ru')
+    parser.add_argument('profession', help='Профессия для поиска')
+    parser.add_argument('region', nargs='?', default=None, help='Регион поиска')
+    parser.add_argument('--limit', type=int, default=50, help='Сколько вакансий запросить')
+    args = parser.parse_args()
+
+    generator = JobRoadmapGenerator()
+    stats = generator.refresh_vacancy_store(args.profession, args.region, args.limit)
+    print(f"Найдено вакансий: {stats['found']}, загружено: {stats['fetched']}, из хранилища: {stats['cached']}")
+    for skill, count in generator.vacancy_store.profession_skills(generator.canonical_profession(args.profession)):
+        print(f"  {count:4}  {skill}")
+
+
+if __name__ == '__main__':
+    main()